@@ -0,0 +1,66 @@
+import logging
+
+import hy
+import pytest
+
+from utms.core.services.audit import AuditLog, AuditSink, LoggingAuditSink, MemoryAuditSink, expression_hash
+from utms.core.services.dynamic import DynamicResolutionService
+
+
+def test_service_records_structured_events_without_source_text():
+    sink = MemoryAuditSink()
+    service = DynamicResolutionService(audit=AuditLog([sink]))
+    service.evaluate("variable", "double", "value", "(* rate 2)", {"rate": 2})
+    with pytest.raises(Exception):
+        service.evaluate("variable", "broken", "value", "(undefined-function 1)")
+    assert service.audit.flush()
+
+    ok, failed = sink.events
+    assert (ok.component_type, ok.component_label, ok.attribute) == ("variable", "double", "value")
+    assert ok.outcome == "evaluated" and ok.duration > 0
+    assert ok.expression_hash == expression_hash(hy.read("(* rate 2)"))
+    assert ok.source is None
+    assert failed.outcome == "error" and failed.level == logging.ERROR and failed.error
+
+
+def test_level_gating_and_sampling_skip_successes_but_keep_errors():
+    errors_only = MemoryAuditSink(level=logging.ERROR)
+    never_sampled = MemoryAuditSink(sample_rate=0.0, include_source=True)
+    audit = AuditLog([errors_only, never_sampled])
+    for _ in range(20):
+        audit.record("variable", "x", "value", hy.read("(+ 1 1)"), 0.001, "evaluated")
+    audit.record("variable", "x", "value", hy.read("(/ 1 0)"), 0.001, "error", error="division by zero")
+    assert audit.flush()
+
+    assert [event.outcome for event in errors_only.events] == ["error"]
+    assert [event.source for event in never_sampled.events] == ["'(/ 1 0)"]
+    assert audit.stats()["recorded"] == 1
+
+
+def test_full_queue_drops_events_instead_of_blocking():
+    audit = AuditLog([MemoryAuditSink()], max_queue=2)
+    audit._writer = object()  # keep the writer from draining the queue
+    for _ in range(5):
+        audit.record("variable", "x", "value", "1", 0.0, "evaluated")
+    assert audit.stats() == {"sinks": 1, "queued": 2, "recorded": 2, "dropped": 3}
+
+
+def test_sinks_must_implement_write_and_logging_keeps_successes_at_debug(caplog):
+    with pytest.raises(TypeError):
+        AuditSink()
+
+    logger = logging.getLogger("test-audit-sink")
+    sink = LoggingAuditSink(logger=logger)
+    audit = AuditLog([sink])
+    with caplog.at_level(logging.INFO, logger="test-audit-sink"):
+        assert not sink.accepts(logging.INFO)
+        audit.record("variable", "x", "value", "1", 0.001, "evaluated")
+        audit.record("variable", "x", "value", "1", 0.001, "error", error="boom")
+        assert audit.flush()
+    assert [record.levelno for record in caplog.records] == [logging.ERROR]
+
+    with caplog.at_level(logging.DEBUG, logger="test-audit-sink"):
+        caplog.clear()
+        audit.record("variable", "x", "value", "1", 0.001, "evaluated")
+        assert audit.flush()
+    assert [record.levelno for record in caplog.records] == [logging.DEBUG]
@@ -0,0 +1,56 @@
+import hy
+
+from utms.core.services.dependency import DependencyGraph, collect_dependencies, entity_token
+from utms.core.services.dynamic import DynamicResolutionService
+
+
+def test_collect_dependencies_finds_variables_and_entity_references():
+    tokens = collect_dependencies(
+        hy.read('(+ hourly_rate (get-attr (entity-ref "Task" "Work" "Review PR") "due_date"))')
+    )
+    assert "hourly-rate" in tokens
+    assert entity_token("task:work:Review PR") in tokens
+    assert entity_token("task:work:Review PR", "due-date") in tokens
+
+
+def test_affected_nodes_come_in_dependency_order_and_cycles_are_reported():
+    graph = DependencyGraph()
+    graph.set("total", {"subtotal", "tax"}, provides={"total"})
+    graph.set("subtotal", {"rate"}, provides={"subtotal"})
+    graph.set("tax", {"subtotal"}, provides={"tax"})
+    graph.set("unrelated", {"other"}, provides={"unrelated"})
+    graph.set("ping", {"pong", "rate"}, provides={"ping"})
+    graph.set("pong", {"ping"}, provides={"pong"})
+
+    ordered, cyclic = graph.affected({"rate"})
+    assert ordered == ["subtotal", "tax", "total"]
+    assert sorted(cyclic) == ["ping", "pong"]
+
+    graph.discard("tax")
+    assert graph.affected({"rate"})[0] == ["subtotal", "total"]
+
+
+def test_evaluate_affected_only_reevaluates_dependents():
+    service = DynamicResolutionService()
+    service.evaluate("variable", "rate", "value", "2", provides=("rate",))
+    service.evaluate("variable", "double", "value", "(* rate 2)", {"rate": 2}, provides=("double",))
+    service.evaluate("variable", "other", "value", "(+ 1 1)", provides=("other",))
+
+    results = service.evaluate_affected({"rate"}, {"rate": 5})
+    assert results == {"variable": {"double": {"value": 10}}}
+
+
+def test_evaluate_affected_hands_filtered_nodes_to_reevaluate():
+    service = DynamicResolutionService()
+    service.evaluate("variable", "rate", "value", "2", provides=("rate",))
+    service.evaluate("variable", "double", "value", "(* rate 2)", {"rate": 2}, provides=("double",))
+    service.dependencies.set(("entity_attribute", "task:a", "cost"), {"double"})
+    calls = []
+
+    def reevaluate(component_type, label, attribute):
+        calls.append((component_type, label, attribute))
+        return 42
+
+    results = service.evaluate_affected({"rate"}, component_type="entity_attribute", reevaluate=reevaluate)
+    assert calls == [("entity_attribute", "task:a", "cost")]
+    assert results == {"entity_attribute": {"task:a": {"cost": 42}}}
@@ -0,0 +1,50 @@
+import hy
+
+from utms.core.hy.ast import HyAST
+from utms.core.plugins.elements.dynamic_entity import compile_attribute_schema, plugin_generator
+from utms.core.plugins.registry import plugin_registry
+from utms.utms_types.field.types import AttributeDescriptor, FieldType
+
+
+def test_compiled_attribute_schema_reads_schema_once():
+    schema = hy.read('{:type "list" :item_type "string" :enum_choices ["a" "b"] :ref-type "task"}')
+    compiled = compile_attribute_schema(schema)
+
+    assert compiled is AttributeDescriptor.of(
+        FieldType.LIST, FieldType.STRING, ["a", "b"], referenced_entity_type="task"
+    )
+    assert compiled.field_type == FieldType.LIST
+    assert compiled.item_type == FieldType.STRING
+    assert compiled.enum_choices == ("a", "b")
+    assert compiled.referenced_entity_type == "task"
+    assert compile_attribute_schema(hy.models.Dict()).field_type is None
+
+
+def test_plugin_compiles_each_attribute_once():
+    plugin_class = plugin_generator.generate_plugin(
+        "widget", {"priority": hy.read('{:type "integer"}')}
+    )
+    plugin = plugin_class()
+
+    first = plugin.parse(hy.read('(def-widget "a" (priority "3"))'))
+    compiled = plugin._schemas["priority"]
+    second = plugin.parse(hy.read('(def-widget "b" (priority 4))'))
+
+    assert plugin._schemas["priority"] is compiled
+    assert first.attributes_typed["priority"].descriptor is compiled
+    assert second.attributes_typed["priority"].descriptor is compiled
+    assert first.attributes_typed["priority"].value == 3
+    assert second.attributes_typed["priority"].field_type == FieldType.INTEGER
+
+
+def test_dispatch_table_follows_registered_plugins(tmp_path):
+    plugin_class = plugin_generator.generate_plugin("gadget", {})
+    plugin_registry.register_node_plugin(plugin_class, overwrite=True)
+    assert "def-gadget" in plugin_registry.node_dispatch()
+
+    path = tmp_path / "gadgets.hy"
+    path.write_text('(def-gadget "g" (size 2))\n')
+    nodes = HyAST().parse_file(str(path))
+
+    assert [node.value for node in nodes] == ["g"]
+    assert nodes[0].entity_type_name_str == "gadget"
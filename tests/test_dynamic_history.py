@@ -0,0 +1,51 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from utms.core.services.dynamic import DynamicResolutionService
+from utms.utms_types import DynamicExpressionInfo
+
+
+def test_history_is_bounded_and_counters_cover_every_evaluation():
+    service = DynamicResolutionService()
+    service.configure_history(max_history=3)
+    for rate in range(10):
+        service.evaluate("variable", "double", "value", "(* rate 2)", {"rate": rate})
+
+    info = service.registry.get("variable", "double", "value")
+    assert [record.value for record in info.history] == [14, 16, 18]
+    assert info.evaluation_count == 10
+    assert info.error_count == 0
+    assert info.max_duration >= info.mean_duration > 0
+
+
+def test_errors_are_counted_and_old_records_expire():
+    service = DynamicResolutionService()
+    service.configure_history(max_history=None, max_age=timedelta(hours=1))
+    service.evaluate("variable", "ok", "value", "(+ 1 1)")
+    with pytest.raises(Exception):
+        service.evaluate("variable", "ok", "value", "(undefined-function 1)")
+
+    info = service.registry.get("variable", "ok", "value")
+    assert (info.evaluation_count, info.error_count) == (2, 1)
+
+    info.history[0].timestamp = datetime.now() - timedelta(hours=2)
+    stats = service.history_stats()
+    assert stats["retained_records"] == 1
+    assert stats["evaluations"] == 2
+    assert stats["errors"] == 1
+
+
+def test_absorb_keeps_the_most_recent_records():
+    previous = DynamicExpressionInfo(original="x")
+    for value in range(4):
+        previous.add_evaluation(value, duration=0.5)
+    current = DynamicExpressionInfo(original="x")
+    current.set_max_history(2)
+    current.add_evaluation(4, duration=1.5)
+
+    current.absorb(previous)
+    assert [record.value for record in current.history] == [3, 4]
+    assert current.evaluation_count == 5
+    assert current.max_duration == 1.5
+    assert current.mean_duration == pytest.approx(0.7)
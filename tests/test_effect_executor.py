@@ -0,0 +1,96 @@
+import threading
+
+import pytest
+
+from utms.core.services.effects import EffectExecutor, EffectRejectedError, EffectTimeoutError
+
+
+def test_run_returns_results_and_records_latency():
+    executor = EffectExecutor(max_workers=2)
+    assert executor.run("add", lambda a, b: a + b, 2, 3) == 5
+    with pytest.raises(ZeroDivisionError):
+        executor.run("divide", lambda: 1 / 0)
+
+    stats = executor.stats()
+    assert stats["queued"] == 0 and stats["running"] == 0
+    assert stats["effects"]["add"]["completed"] == 1
+    assert stats["effects"]["add"]["mean_run"] is not None
+    assert stats["effects"]["divide"]["failed"] == 1
+    executor.shutdown()
+
+
+def test_run_times_out_and_fire_rejects_past_max_pending():
+    executor = EffectExecutor(max_workers=1, max_pending=2)
+    release = threading.Event()
+    with pytest.raises(EffectTimeoutError):
+        executor.run("slow", release.wait, timeout=0.05)
+    assert executor.fire("slow", release.wait) is not None
+    assert executor.fire("slow", release.wait) is None
+    with pytest.raises(EffectRejectedError):
+        executor.submit("slow", release.wait)
+
+    stats = executor.stats()
+    assert stats["running"] == 1 and stats["queued"] == 1
+    assert stats["effects"]["slow"]["timed_out"] == 1
+    assert stats["effects"]["slow"]["rejected"] == 2
+    release.set()
+    executor.shutdown()
+    assert executor.stats()["effects"]["slow"]["completed"] == 2
+
+
+def test_effects_started_on_a_worker_run_on_their_own_thread():
+    executor = EffectExecutor(max_workers=1)
+
+    def hook():
+        # Would deadlock waiting for the only worker if it were queued.
+        return executor.run("shell", lambda: threading.current_thread().name)
+
+    assert executor.run("hook", hook, timeout=1) == "utms-effect-shell"
+    executor.shutdown()
+
+
+def test_effects_started_on_a_worker_are_bounded_by_the_timeout():
+    executor = EffectExecutor(max_workers=1, timeout=0.05)
+    release = threading.Event()
+
+    def hook():
+        with pytest.raises(EffectTimeoutError):
+            executor.run("shell", release.wait)
+        return "hook finished"
+
+    assert executor.run("hook", hook, timeout=1) == "hook finished"
+    assert executor.stats()["effects"]["shell"]["timed_out"] == 1
+    release.set()
+    executor.shutdown()
+
+
+def test_effects_started_on_a_worker_are_counted_and_capped():
+    executor = EffectExecutor(max_workers=2)
+    release = threading.Event()
+    started = threading.Barrier(3)
+
+    def shell():
+        started.wait()
+        release.wait()
+
+    def hook():
+        # Runs as if on a worker, so its effects get threads of their own.
+        executor._local.active = True
+        executor.run("shell", shell, timeout=1)
+
+    hooks = [threading.Thread(target=hook) for _ in range(2)]
+    for thread in hooks:
+        thread.start()
+    started.wait()
+    assert executor.stats()["running"] == 2 and executor.stats()["queued"] == 0
+    executor._local.active = True
+    with pytest.raises(EffectRejectedError):
+        executor.run("shell", release.wait)
+    executor._local.active = False
+
+    release.set()
+    for thread in hooks:
+        thread.join()
+    stats = executor.stats()["effects"]["shell"]
+    assert stats["completed"] == 2 and stats["rejected"] == 1
+    assert executor.stats()["running"] == 0
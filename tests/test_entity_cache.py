@@ -0,0 +1,97 @@
+import threading
+
+import pytest
+
+from utms.core.services.entity_cache import EntityComponentCache
+
+
+class FakeComponent:
+    def __init__(self, name):
+        self.name = name
+        self.loads = 0
+        self.syncs = 0
+        self._items = {}
+
+    def load(self):
+        self.loads += 1
+
+    def is_loaded(self):
+        return self.loads > 0
+
+    def sync_from_disk(self):
+        self.syncs += 1
+        return False
+
+
+def test_cache_loads_once_and_syncs_on_hit():
+    cache = EntityComponentCache(max_users=4)
+    first = cache.get("alice", lambda: FakeComponent("alice"))
+    second = cache.get("alice", lambda: FakeComponent("other"))
+
+    assert first is second
+    assert first.loads == 1
+    assert first.syncs == 1
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_cache_evicts_least_recently_used_user():
+    cache = EntityComponentCache(max_users=2)
+    alice = cache.get("alice", lambda: FakeComponent("alice"))
+    cache.get("bob", lambda: FakeComponent("bob"))
+    cache.get("alice", lambda: FakeComponent("alice"))
+    cache.get("carol", lambda: FakeComponent("carol"))
+
+    assert cache.get("alice", lambda: FakeComponent("new-alice")) is alice
+    assert cache.get("bob", lambda: FakeComponent("new-bob")).name == "new-bob"
+    assert cache.stats()["evictions"] >= 1
+
+
+def test_failed_load_is_not_cached():
+    cache = EntityComponentCache()
+
+    class Broken(FakeComponent):
+        def load(self):
+            raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        cache.get("alice", lambda: Broken("alice"))
+    assert cache.stats()["users"] == 0
+    assert cache.get("alice", lambda: FakeComponent("alice")).loads == 1
+
+
+def test_load_that_reports_failure_is_not_cached():
+    cache = EntityComponentCache()
+
+    class Unloaded(FakeComponent):
+        def is_loaded(self):
+            return False
+
+    with pytest.raises(RuntimeError):
+        cache.get("alice", lambda: Unloaded("alice"))
+    assert cache.stats()["users"] == 0
+
+
+def test_checkout_holds_the_component_until_released_on_any_thread():
+    cache = EntityComponentCache()
+    checkout = cache.checkout("alice", lambda: FakeComponent("alice"))
+    component = checkout.__enter__()
+
+    acquired = threading.Event()
+
+    def other_request():
+        with cache.checkout("alice", lambda: FakeComponent("other")) as other:
+            assert other is component
+            acquired.set()
+
+    waiter = threading.Thread(target=other_request)
+    waiter.start()
+    assert not acquired.wait(0.2)
+
+    # FastAPI may finish a dependency on a different worker thread.
+    releaser = threading.Thread(target=checkout.__exit__, args=(None, None, None))
+    releaser.start()
+    releaser.join()
+    assert acquired.wait(5)
+    waiter.join()
+    assert cache.stats()["hits"] == 1
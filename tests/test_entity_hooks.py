@@ -0,0 +1,94 @@
+import threading
+
+import pytest
+
+from utms.core.components.elements.entity import EntityComponent
+from utms.core.models.elements.entity import Entity
+from utms.core.plugins.discovery import discover_plugins, initialize_plugins
+from utms.utms_types.field.types import FieldType, TypedValue
+
+SCHEMA = """(def-entity "TASK" entity-type
+  (title {:type "string" :label "Title" :required True})
+  (status {:type "string" :label "Status" :default_value "pending"})
+)
+"""
+
+TASKS = """(def-task "Call"
+  (title "Call")
+  (status "pending")
+)
+"""
+
+
+class FakeConfigComponent:
+    def get_config_value(self, key, default=None):
+        return default
+
+
+class FakeComponentManager:
+    def __init__(self):
+        self.components = {"variables": {}, "config": FakeConfigComponent()}
+
+    def get(self, name):
+        return self.components.get(name)
+
+
+@pytest.fixture
+def component(tmp_path, monkeypatch):
+    monkeypatch.setenv("HOME", str(tmp_path / "home"))
+    user_dir = tmp_path / "config" / "users" / "tester"
+    (user_dir / "entities").mkdir(parents=True)
+    (user_dir / "entities" / "default.hy").write_text(SCHEMA)
+    (user_dir / "tasks").mkdir()
+    (user_dir / "tasks" / "home.hy").write_text(TASKS)
+    discover_plugins()
+    initialize_plugins()
+    component = EntityComponent(
+        str(tmp_path / "config"), component_manager=FakeComponentManager(), username="tester"
+    )
+    component.load()
+    yield component
+    component.flush()
+
+
+def _lock_is_free(lock):
+    free = []
+    thread = threading.Thread(target=lambda: free.append(lock.acquire(timeout=1) and lock.release() is None))
+    thread.start()
+    thread.join()
+    return free == [True]
+
+
+def test_hook_runs_without_the_lock_and_journals_on_the_current_entity(component, monkeypatch):
+    # The hook was queued with an entity object a reload has since replaced.
+    stale = Entity(name="Call", entity_type="task", category="home")
+    lock_free_during_hook = []
+
+    def evaluate(expression, context, **kwargs):
+        lock_free_during_hook.append(_lock_is_free(component._persistence_lock))
+        context["self"].set_attribute_typed("status", TypedValue("done", FieldType.STRING))
+
+    monkeypatch.setattr(component._loader._dynamic_service, "evaluate", evaluate)
+    component.update_entity_attribute("task", "home", "Call", "title", "Call back")
+
+    current = component.evaluate_hook(stale, "on-start-hook", None, "entity_hook")
+
+    assert lock_free_during_hook == [True]
+    assert current is component.get_entity("task", "home", "Call")
+    assert current.get_attribute_value("status") == "done"
+    assert current.get_attribute_value("title") == "Call back"
+    records = [r for r in component._get_journal().records() if r.get("attr") == "status"]
+    assert [r["value"]["value"] for r in records] == ["done"]
+
+
+def test_hook_changes_to_a_removed_entity_are_dropped(component, monkeypatch):
+    entity = component.get_entity("task", "home", "Call")
+
+    def evaluate(expression, context, **kwargs):
+        component._entity_manager.remove(entity.get_identifier())
+        context["self"].set_attribute_typed("status", TypedValue("done", FieldType.STRING))
+
+    monkeypatch.setattr(component._loader._dynamic_service, "evaluate", evaluate)
+
+    assert component.evaluate_hook(entity, "on-start-hook", None, "entity_hook") is None
+    assert entity.get_attribute_value("status") == "pending"
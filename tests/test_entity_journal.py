@@ -0,0 +1,47 @@
+from datetime import datetime, timezone
+
+from utms.core.services.journal import EntityJournal
+
+
+def _record(value):
+    return {"op": "append", "entity": "metric:health:weight", "items": [{"value": value}]}
+
+
+def test_journal_round_trip_and_reset(tmp_path):
+    journal = EntityJournal(str(tmp_path / "entities.journal"))
+    assert journal.is_empty
+    assert journal.records() == []
+
+    stamp = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    journal.append(_record(1))
+    journal.append({"op": "set", "entity": "task:work:a", "value": {"value": stamp}})
+    assert not journal.is_empty
+
+    reopened = EntityJournal(journal.path)
+    assert reopened.records() == [_record(1), {"op": "set", "entity": "task:work:a", "value": {"value": stamp}}]
+
+    with reopened.locked():
+        reopened.reset()
+    assert reopened.is_empty
+    assert EntityJournal(journal.path).records() == []
+
+
+def test_torn_trailing_record_is_ignored_and_repaired(tmp_path):
+    path = tmp_path / "entities.journal"
+    journal = EntityJournal(str(path))
+    journal.append(_record(1))
+    journal.append(_record(2))
+
+    # Simulate a crash in the middle of writing the second record.
+    path.write_bytes(path.read_bytes()[:-5])
+    assert EntityJournal(str(path)).records() == [_record(1)]
+
+    other_writer = EntityJournal(str(path))
+    other_writer.append(_record(3))
+    assert EntityJournal(str(path)).records() == [_record(1), _record(3)]
+
+
+def test_unpicklable_record_is_refused(tmp_path):
+    journal = EntityJournal(str(tmp_path / "entities.journal"))
+    assert journal.append({"op": "set", "entity": "x", "value": lambda: None}) is False
+    assert journal.is_empty
@@ -0,0 +1,66 @@
+from datetime import datetime
+
+from utms.core.managers.elements.entity import EntityManager
+from utms.utms_types.field.types import FieldType, TypedValue
+
+
+def _tv(value, field_type=FieldType.STRING):
+    return TypedValue(value=value, field_type=field_type)
+
+
+def _manager():
+    manager = EntityManager()
+    manager.set_indexed_attributes("task", ["status"])
+    manager.create("A", "task", {"status": _tv("todo")}, category="work", source_file="/work.hy")
+    manager.create("B", "task", {"status": _tv("done")}, category="work", source_file="/work.hy")
+    manager.create("C", "task", {"status": _tv("todo")}, category="home", source_file="/home.hy")
+    manager.create("W", "metric", {}, category="health", source_file="/health.hy")
+    return manager
+
+
+def test_type_category_and_source_indexes():
+    manager = _manager()
+    assert [e.name for e in manager.get_by_type("task")] == ["A", "B", "C"]
+    assert [e.name for e in manager.get_by_type("TASK", "Work")] == ["A", "B"]
+    assert manager.get_categories_for_entity_type("task") == ["home", "work"]
+
+    manager.remove_by_source_file("/work.hy")
+    assert [e.name for e in manager.get_by_type("task")] == ["C"]
+    assert manager.get_categories_for_entity_type("task") == ["home"]
+    assert len(manager) == 2
+
+
+def test_indexes_follow_attribute_changes():
+    manager = _manager()
+    a = manager.get_by_name_type_category("A", "task", "work")
+
+    assert [e.name for e in manager.get_by_attribute("status", "todo", "task")] == ["A", "C"]
+    a.set_attribute_typed("status", _tv("done"))
+    assert [e.name for e in manager.get_by_attribute("status", "todo", "task")] == ["C"]
+    assert [e.name for e in manager.get_by_attribute("status", "done", "task", "work")] == ["A", "B"]
+
+    assert manager.get_all_active_entities() == []
+    a.set_attribute_typed(
+        "active_occurrence_start_time", _tv(datetime(2025, 1, 1), FieldType.DATETIME)
+    )
+    assert manager.get_all_active_entities() == [a]
+    a.remove_attribute("active-occurrence-start-time")
+    assert manager.get_all_active_entities() == []
+
+
+def test_category_change_rekeys_entity():
+    manager = _manager()
+    a = manager.get_by_name_type_category("A", "task", "work")
+
+    a.category = "home"
+    a.source_file = "/home.hy"
+
+    assert "task:work:A" not in manager
+    assert manager.get_by_name_type_category("A", "task", "home") is a
+    assert [e.name for e in manager.get_by_type("task", "home")] == ["C", "A"]
+    assert [e.name for e in manager.get_by_source_file("/home.hy")] == ["C", "A"]
+
+    manager.remove_entity("A", "task", "home")
+    a.category = "work"  # detached entities no longer touch the manager
+    assert "task:work:A" not in manager
+    assert [e.name for e in manager.get_by_type("task", "work")] == ["B"]
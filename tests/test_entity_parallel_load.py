@@ -0,0 +1,89 @@
+import pytest
+
+import utms.core.components.elements.entity as entity_module
+from utms.core.components.elements.entity import EntityComponent
+from utms.core.plugins.discovery import discover_plugins, initialize_plugins
+
+SCHEMA = """(def-entity "TASK" entity-type
+  (title {:type "string" :label "Title" :required True})
+  (description {:type "string" :label "Description" :default_value ""})
+  (priority {:type "integer" :label "Priority" :default_value 0})
+  (status {:type "string" :label "Status" :default_value "pending"})
+  (occurrences {:type "list" :item_schema_type "OCCURRENCE"})
+)
+"""
+
+TASK = """(def-task "{name}"
+  (title "{name}")
+  (priority {priority})
+  (description (+ "p" (str (+ {priority} 2))))
+  (occurrences [{{:start_time (datetime 2025 6 13 17 37 32) :end_time (datetime 2025 6 13 17 40 0) :notes "" :metadata {{}}}}])
+)
+"""
+
+
+class FakeConfigComponent:
+    def __init__(self, values):
+        self.values = values
+
+    def get_config_value(self, key, default=None):
+        return self.values.get(key, default)
+
+
+class FakeComponentManager:
+    def __init__(self, workers):
+        self.components = {
+            "variables": {},
+            "config": FakeConfigComponent({"entity-load-workers": workers}),
+        }
+
+    def get(self, name):
+        return self.components.get(name)
+
+
+@pytest.fixture
+def config_dir(tmp_path, monkeypatch):
+    # The entity snapshot lives under ~/.cache.
+    monkeypatch.setenv("HOME", str(tmp_path / "home"))
+    user_dir = tmp_path / "config" / "users" / "tester"
+    (user_dir / "entities").mkdir(parents=True)
+    (user_dir / "entities" / "default.hy").write_text(SCHEMA)
+    (user_dir / "tasks").mkdir()
+    for category in ("home", "work", "errands"):
+        (user_dir / "tasks" / f"{category}.hy").write_text(
+            "".join(TASK.format(name=f"{category} {i}", priority=i) for i in range(3))
+        )
+    discover_plugins()
+    initialize_plugins()
+    return str(tmp_path / "config")
+
+
+def _load(config_dir, workers):
+    component = EntityComponent(config_dir, component_manager=FakeComponentManager(workers), username="tester")
+    component.load()
+    return {
+        key: {name: typed_value.serialize() for name, typed_value in entity.attributes.items()}
+        for key, entity in component._items.items()
+    }
+
+
+def test_parallel_load_matches_serial_load(config_dir, monkeypatch):
+    serial = _load(config_dir, workers=1)
+
+    parsed_in_workers = []
+    parse_in_parallel = EntityComponent._parse_category_files_in_parallel
+
+    def spy(self, misses, context, workers):
+        results = parse_in_parallel(self, misses, context, workers)
+        parsed_in_workers.extend(results)
+        return results
+
+    monkeypatch.setattr(entity_module, "PARALLEL_LOAD_MIN_FILES", 1)
+    monkeypatch.setattr(EntityComponent, "_parse_category_files_in_parallel", spy)
+    # A cold load: the serial one above left a snapshot behind.
+    monkeypatch.setenv("HOME", str(config_dir) + "-parallel-home")
+    parallel = _load(config_dir, workers=2)
+
+    assert len(parsed_in_workers) == 3
+    assert len(serial) == 9
+    assert parallel == serial
@@ -0,0 +1,120 @@
+import os
+import stat
+
+import hy
+
+from utms.core.hy.utils import collect_symbols
+from utms.core.services.snapshot import (
+    EntitySnapshot,
+    content_hash,
+    file_fingerprint,
+    value_fingerprint,
+)
+
+
+def test_snapshot_round_trip_and_patch(tmp_path):
+    path = str(tmp_path / "user.snapshot")
+    snapshot = EntitySnapshot(path)
+    assert not snapshot.exists
+
+    snapshot.put("/a.hy", {"mtime_ns": 1, "size": 10}, ["a"])
+    snapshot.put("/b.hy", {"mtime_ns": 2, "size": 20}, ["b"])
+    snapshot.commit()
+
+    reopened = EntitySnapshot(path)
+    assert reopened.get_fingerprint("/a.hy") == {"mtime_ns": 1, "size": 10}
+    assert reopened.read("/b.hy") == ["b"]
+
+    # Patch one entry; the other is copied over untouched.
+    reopened.put("/a.hy", {"mtime_ns": 3, "size": 11}, ["a2"])
+    reopened.commit()
+
+    patched = EntitySnapshot(path)
+    assert patched.read("/a.hy") == ["a2"]
+    assert patched.read("/b.hy") == ["b"]
+
+
+def test_snapshot_garbage_collects_unretained_sources(tmp_path):
+    path = str(tmp_path / "user.snapshot")
+    snapshot = EntitySnapshot(path)
+    snapshot.put("/a.hy", {"mtime_ns": 1, "size": 1}, 1)
+    snapshot.put("/gone.hy", {"mtime_ns": 1, "size": 1}, 2)
+    snapshot.commit()
+
+    snapshot.retain_only(["/a.hy"])
+    snapshot.commit()
+
+    assert list(EntitySnapshot(path).sources()) == ["/a.hy"]
+
+
+def test_snapshot_extras_survive_commits_and_garbage_collection(tmp_path):
+    path = str(tmp_path / "user.snapshot")
+    snapshot = EntitySnapshot(path)
+    snapshot.put("/a.hy", {"mtime_ns": 1, "size": 1}, ["a"])
+    snapshot.put_extra("memo", {"entries": [1, 2]})
+    snapshot.commit()
+
+    reopened = EntitySnapshot(path)
+    assert reopened.read_extra("memo") == {"entries": [1, 2]}
+    assert reopened.read_extra("missing") is None
+    reopened.retain_only([])
+    reopened.put("/b.hy", {"mtime_ns": 1, "size": 1}, ["b"])
+    reopened.commit()
+
+    patched = EntitySnapshot(path)
+    assert patched.read_extra("memo") == {"entries": [1, 2]}
+    assert patched.read("/b.hy") == ["b"]
+
+
+def test_corrupt_snapshot_is_ignored(tmp_path):
+    path = tmp_path / "user.snapshot"
+    path.write_bytes(b"not a snapshot at all")
+    snapshot = EntitySnapshot(str(path))
+    assert not snapshot.exists
+    assert snapshot.read("/a.hy") is None
+
+
+def test_file_fingerprint_tracks_size_and_mtime(tmp_path):
+    source = tmp_path / "work.hy"
+    source.write_text("(def-task \"A\")")
+    first = file_fingerprint(str(source))
+    source.write_text("(def-task \"A\" (priority 1))")
+    assert file_fingerprint(str(source)) != first
+    assert file_fingerprint(str(tmp_path / "missing.hy")) is None
+
+
+def test_content_hash_ignores_touch_but_not_edits(tmp_path):
+    source = tmp_path / "work.hy"
+    source.write_text("(def-task \"A\")")
+    original = content_hash(str(source))
+    os.utime(source, ns=(1, 1))
+    assert content_hash(str(source)) == original
+    source.write_text("(def-task \"B\")")
+    assert content_hash(str(source)) != original
+
+
+def test_collect_symbols_only_keeps_dotted_roots():
+    expr = hy.read("(+ day-start (timedelta :days 3) current-time.year self.priority)")
+    assert collect_symbols(expr) == {"+", "day-start", "timedelta", "current-time", "self"}
+    assert value_fingerprint({"a": 1}) == value_fingerprint({"a": 1})
+
+
+def test_commit_syncs_file_before_rename_and_directory_after(tmp_path, monkeypatch):
+    events = []
+    real_fsync, real_replace = os.fsync, os.replace
+
+    def fsync(fd):
+        events.append("fsync-dir" if stat.S_ISDIR(os.fstat(fd).st_mode) else "fsync-file")
+        real_fsync(fd)
+
+    def replace(src, dst):
+        events.append("replace")
+        real_replace(src, dst)
+
+    monkeypatch.setattr(os, "fsync", fsync)
+    monkeypatch.setattr(os, "replace", replace)
+    snapshot = EntitySnapshot(str(tmp_path / "user.snapshot"))
+    snapshot.put("/a.hy", {"mtime_ns": 1, "size": 1}, ["a"])
+    snapshot.commit()
+
+    assert events == ["fsync-file", "replace", "fsync-dir"]
@@ -0,0 +1,57 @@
+import hy
+
+from utms.core.hy.purity import Purity, classify
+from utms.core.hy.resolvers.base import HyResolver
+from utms.core.hy.scope import MISSING
+from utms.core.services.dynamic import DynamicResolutionService
+from utms.core.services.memo import ExpressionMemo
+
+
+def test_classify_expressions_by_purity():
+    assert classify(hy.read("(datetime 2025 1 1 9 30)")) is Purity.PURE
+    assert classify(hy.read('(+ hourly-rate (entity-ref "task" "work" "A") current-time.year)')) is Purity.PURE
+    assert classify(hy.read("(get-ntp-date)")) is Purity.TIME_DEPENDENT
+    assert classify(hy.read("(+ 1 (. (datetime.now) year))")) is Purity.TIME_DEPENDENT
+    assert classify(hy.read('(shell "ls")')) is Purity.SIDE_EFFECTING
+    assert classify(hy.read('(notify "done" (datetime.now))')) is Purity.SIDE_EFFECTING
+    assert classify(hy.read("(some-user-function 1)")) is Purity.SIDE_EFFECTING
+
+
+def test_memo_keys_on_referenced_values_and_expires_time_dependent_results(monkeypatch):
+    memo = ExpressionMemo(time_ttl=10)
+    expr = hy.read("(* rate 2)")
+    memo.put(memo.key(expr, {"rate": 2, "unrelated": 1}), 4)
+    assert memo.get(memo.key(expr, {"rate": 2, "unrelated": 5})) == 4
+    assert memo.get(memo.key(expr, {"rate": 3})) is MISSING
+    assert memo.key(hy.read('(shell "ls")'), {}) is None
+
+    now = [100.0]
+    monkeypatch.setattr("utms.core.services.memo.time.monotonic", lambda: now[0])
+    clock_key = memo.key(hy.read("(get-ntp-date)"))
+    memo.put(clock_key, "09:00")
+    assert memo.get(clock_key) == "09:00"
+    now[0] += 11
+    assert memo.get(clock_key) is MISSING
+
+    restored = ExpressionMemo()
+    restored.import_pure(memo.export_pure())
+    assert restored.get(restored.key(expr, {"rate": 2})) == 4
+    assert restored.stats()["entries"] == 1
+
+
+def test_service_skips_resolution_of_memoized_pure_expressions():
+    resolver = HyResolver()
+    resolutions = []
+    original_resolve = resolver.resolve
+
+    def counting_resolve(*args, **kwargs):
+        resolutions.append(kwargs["expr"])
+        return original_resolve(*args, **kwargs)
+
+    resolver.resolve = counting_resolve
+    service = DynamicResolutionService(resolver=resolver)
+    for label in ("a", "b"):
+        value, info = service.evaluate("variable", label, "value", "(+ 40 2)")
+        assert value == 42
+    assert len(resolutions) == 1
+    assert info.history[-1].metadata["memoized"] is True
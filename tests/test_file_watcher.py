@@ -0,0 +1,50 @@
+
+import pytest
+
+from utms.core.services.file_watcher import FileWatcher, InotifyWatcher, create_file_watcher
+from utms.utils import write_file_atomically
+
+
+def _inotify_watcher():
+    watcher = create_file_watcher("inotify")
+    if not isinstance(watcher, InotifyWatcher):
+        pytest.skip("inotify is not available here")
+    return watcher
+
+
+def test_polling_watcher_always_asks_for_a_rescan(tmp_path):
+    watcher = create_file_watcher("poll")
+    assert type(watcher) is FileWatcher
+    watcher.watch(str(tmp_path))
+    (tmp_path / "work.hy").write_text("(def-task \"A\")")
+    assert watcher.poll() is None
+
+
+def test_inotify_reports_changed_files(tmp_path):
+    watcher = _inotify_watcher()
+    watcher.watch(str(tmp_path))
+    assert watcher.poll() == set()
+
+    work = tmp_path / "work.hy"
+    write_file_atomically(str(work), "(def-task \"A\")")
+    (tmp_path / "home.hy").write_text("(def-task \"B\")")
+    changed = watcher.poll()
+    assert str(work) in changed
+    assert str(tmp_path / "home.hy") in changed
+    assert watcher.poll() == set()
+
+    # A second write within the same mtime tick is still reported.
+    work.write_text("(def-task \"C\")")
+    assert watcher.poll() == {str(work)}
+
+    work.unlink()
+    assert watcher.poll() == {str(work)}
+    watcher.close()
+
+
+def test_inotify_asks_for_rescan_when_directories_change(tmp_path):
+    watcher = _inotify_watcher()
+    watcher.watch(str(tmp_path))
+    (tmp_path / "tasks").mkdir()
+    assert watcher.poll() is None
+    assert watcher.poll() == set()
@@ -0,0 +1,35 @@
+import os
+
+import pytest
+
+from utms.utils import write_file_atomically
+
+
+def test_write_file_atomically_replaces_contents(tmp_path):
+    target = tmp_path / "work.hy"
+    write_file_atomically(str(target), "(def-task \"A\")")
+    write_file_atomically(str(target), "(def-task \"B\")")
+
+    assert target.read_text() == "(def-task \"B\")"
+    assert os.listdir(tmp_path) == ["work.hy"]
+
+
+def test_failed_write_keeps_old_contents(tmp_path):
+    target = tmp_path / "work.hy"
+    target.write_text("(def-task \"A\")")
+
+    with pytest.raises(UnicodeEncodeError):
+        write_file_atomically(str(target), "(def-task \"\ud800\")")
+
+    assert target.read_text() == "(def-task \"A\")"
+    assert os.listdir(tmp_path) == ["work.hy"]
+
+
+def test_write_file_atomically_keeps_the_existing_mode(tmp_path):
+    target = tmp_path / "work.hy"
+    target.write_text("(def-task \"A\")")
+    os.chmod(target, 0o640)
+
+    write_file_atomically(str(target), "(def-task \"B\")")
+
+    assert os.stat(target).st_mode & 0o7777 == 0o640
@@ -0,0 +1,120 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from utms.core.services.http import HttpClient
+
+
+class Handler(BaseHTTPRequestHandler):
+    requests_seen = []
+    cookies_seen = []
+    active = 0
+    max_active = 0
+    lock = threading.Lock()
+
+    def do_GET(self):
+        cls = type(self)
+        with cls.lock:
+            cls.requests_seen.append((self.path, self.headers.get("If-None-Match")))
+            cls.cookies_seen.append(self.headers.get("Cookie"))
+            cls.active += 1
+            cls.max_active = max(cls.max_active, cls.active)
+        try:
+            if self.path == "/slow":
+                time.sleep(0.1)
+            if self.path == "/etag" and self.headers.get("If-None-Match") == '"v1"':
+                self.send_response(304)
+                self.send_header("ETag", '"v1"')
+                self.end_headers()
+                return
+            body = f"body of {self.path}".encode()
+            self.send_response(200)
+            if self.path == "/etag":
+                self.send_header("ETag", '"v1"')
+                self.send_header("Cache-Control", "no-cache")
+            elif self.path == "/max-age":
+                self.send_header("Cache-Control", "max-age=60")
+            elif self.path == "/login":
+                self.send_header("Set-Cookie", "session=alice; Path=/")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        finally:
+            with cls.lock:
+                cls.active -= 1
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    Handler.requests_seen = []
+    Handler.cookies_seen = []
+    Handler.max_active = 0
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_responses_are_cached_only_when_asked(server):
+    client = HttpClient()
+    for _ in range(3):
+        assert client.get(f"{server}/max-age").text == "body of /max-age"
+    for _ in range(2):
+        assert client.get(f"{server}/plain", ttl=60).text == "body of /plain"
+    client.get(f"{server}/max-age", cache=True)
+    client.get(f"{server}/max-age", cache=True)
+
+    paths = [path for path, _ in Handler.requests_seen]
+    assert paths.count("/max-age") == 4
+    assert paths.count("/plain") == 1
+    assert client.stats()["hits"] == 2
+
+
+def test_stale_responses_are_revalidated_with_their_etag(server):
+    client = HttpClient()
+    first = client.get(f"{server}/etag", cache=True)
+    second = client.get(f"{server}/etag", cache=True)
+
+    assert second is first and second.text == "body of /etag"
+    assert Handler.requests_seen == [("/etag", None), ("/etag", '"v1"')]
+    assert client.stats()["revalidated"] == 1
+
+
+def test_concurrent_requests_per_host_are_limited(server):
+    client = HttpClient(max_per_host=2)
+    threads = [threading.Thread(target=client.get, args=(f"{server}/slow",)) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(Handler.requests_seen) == 6
+    assert Handler.max_active <= 2
+
+
+def test_cached_responses_are_not_shared_across_credentials(server):
+    client = HttpClient()
+    client.get(f"{server}/max-age", cache=True, auth=("alice", "secret"))
+    client.get(f"{server}/max-age", cache=True, auth=("bob", "secret"))
+    client.get(f"{server}/max-age", cache=True, cookies={"session": "bob"})
+    client.get(f"{server}/max-age", cache=True, auth=("alice", "secret"))
+
+    assert [path for path, _ in Handler.requests_seen].count("/max-age") == 3
+    assert client.stats()["hits"] == 1
+
+
+def test_cookies_set_by_a_response_are_not_sent_on_later_requests(server):
+    client = HttpClient()
+    client.get(f"{server}/login")
+    client.get(f"{server}/plain")
+    client.get(f"{server}/plain", cookies={"session": "bob"})
+
+    assert Handler.cookies_seen == [None, None, "session=bob"]
+    assert len(client.session.cookies) == 0
@@ -0,0 +1,40 @@
+import hy
+import pytest
+
+from utms.core.hy.evaluation import (
+    CompiledExpressionCache,
+    compiled_expression_cache,
+    evaluate_hy_expression,
+    structural_key,
+)
+
+
+def test_identical_expressions_reuse_compiled_code():
+    compiled_expression_cache.clear()
+    before = compiled_expression_cache.stats()
+
+    assert evaluate_hy_expression(hy.read("(+ x (* 2 y))"), {"x": 1, "y": 2}) == 5
+    assert evaluate_hy_expression(hy.read("(+ x (* 2 y))"), {"x": 10, "y": 3}) == 16
+
+    stats = compiled_expression_cache.stats()
+    assert stats["misses"] == before["misses"] + 1
+    assert stats["hits"] == before["hits"] + 1
+
+
+def test_structural_key_distinguishes_model_types():
+    assert structural_key(hy.read("(f a)")) == structural_key(hy.read("(f a)"))
+    assert structural_key(hy.read('(f "a")')) != structural_key(hy.read("(f a)"))
+    assert structural_key(hy.read("[1 2]")) != structural_key(hy.read("(1 2)"))
+    assert structural_key(hy.read("0.0")) != structural_key(hy.read("-0.0"))
+    with pytest.raises(TypeError):
+        structural_key(hy.models.Expression([hy.models.Symbol("f"), object()]))
+
+
+def test_cache_is_bounded():
+    cache = CompiledExpressionCache(max_entries=2)
+    for source in ("(+ 1 1)", "(+ 1 2)", "(+ 1 3)"):
+        cache.compile(hy.read(source))
+    assert cache.stats()["entries"] == 2
+    assert cache.stats()["evictions"] == 1
+    assert cache.compile(hy.models.Expression([hy.models.Symbol("f"), object()])) is None
+    assert cache.stats()["uncacheable"] == 1
@@ -0,0 +1,55 @@
+import os
+
+from utms.core.hy.ast import HyAST, parsed_file_cache
+from utms.core.plugins.discovery import discover_plugins
+
+discover_plugins()
+
+
+def _write(path, text, mtime_ns=None):
+    path.write_text(text)
+    if mtime_ns is not None:
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def test_unchanged_file_is_served_from_cache(tmp_path):
+    path = tmp_path / "variables.hy"
+    _write(path, ";; Variables\n(def-var answer 42)\n")
+    parsed_file_cache.clear()
+
+    first = HyAST().parse_file(str(path))
+    hits = parsed_file_cache.stats()["hits"]
+    ast = HyAST()
+    second = ast.parse_file(str(path))
+
+    assert parsed_file_cache.stats()["hits"] == hits + 1
+    assert [node.type for node in second] == [node.type for node in first] == ["def-var"]
+    assert ast.header_comments == [";; Variables"]
+
+
+def test_changed_file_is_parsed_again(tmp_path):
+    path = tmp_path / "variables.hy"
+    _write(path, "(def-var answer 42)\n", mtime_ns=1_000_000_000)
+    parsed_file_cache.clear()
+    HyAST().parse_file(str(path))
+    hits = parsed_file_cache.stats()["hits"]
+
+    # Same size and mtime, different content.
+    _write(path, "(def-var answer 43)\n", mtime_ns=1_000_000_000)
+    nodes = HyAST().parse_file(str(path))
+
+    assert parsed_file_cache.stats()["hits"] == hits
+    assert nodes[0].value["typed_value_for_var_value"].value == 43
+
+
+def test_cached_nodes_are_not_shared(tmp_path):
+    path = tmp_path / "variables.hy"
+    _write(path, "(def-var answer 42)\n")
+    parsed_file_cache.clear()
+
+    first = HyAST().parse_file(str(path))
+    first[0].value["typed_value_for_var_value"].value = 0
+    second = HyAST().parse_file(str(path))
+
+    assert second is not first
+    assert second[0].value["typed_value_for_var_value"].value == 42
@@ -138,3 +138,30 @@ def test_resolver_evaluates_expression_within_data_structure(base_resolver):
     assert result == expected_result
     assert isinstance(result, dict)
     assert isinstance(result['b'], list)
+
+
+# --- Group 4: Scope Construction ---
+
+def test_scope_layers_shadow_and_alias():
+    from utms.core.hy.scope import MISSING, HyScope
+
+    scope = HyScope({"x": 1, "day_start": 9}, {"x": 2}, None)
+    assert scope.lookup("x") == 2
+    assert scope.lookup("day-start") == 9
+    assert scope.lookup("missing") is MISSING
+
+    child = scope.child({"x": 3})
+    assert child.lookup("x") == 3 and scope.lookup("x") == 2
+    assert child.to_dict() == {"x": 3, "day_start": 9}
+
+
+def test_resolve_builds_scope_once(base_resolver, monkeypatch):
+    calls = []
+    original = base_resolver._layered_scope
+    monkeypatch.setattr(
+        base_resolver, "_layered_scope", lambda *a: calls.append(a) or original(*a)
+    )
+    expr = hy.read("(max (min a b) (abs c))")
+    value, _ = base_resolver.resolve(expr, None, {"a": 1, "b": 2, "c": -5})
+    assert value == 5
+    assert len(calls) == 1
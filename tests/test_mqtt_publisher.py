@@ -0,0 +1,115 @@
+import threading
+import time
+from types import SimpleNamespace
+
+from utms.core.services.mqtt import MqttPublisher
+
+
+class FakeBroker:
+    """Stands in for a paho client and the broker behind it."""
+
+    def __init__(self, ack=True):
+        self.ack = ack
+        self.online = False
+        self.published = []
+        self.connects = 0
+        self._mid = 0
+        self._lock = threading.Lock()
+
+    # paho client interface
+    def reconnect_delay_set(self, min_delay, max_delay):
+        pass
+
+    def connect_async(self, host, port, keepalive):
+        pass
+
+    def loop_start(self):
+        pass
+
+    def loop_stop(self):
+        pass
+
+    def disconnect(self):
+        pass
+
+    def publish(self, topic, payload, qos=0, retain=False):
+        with self._lock:
+            if not self.online:
+                return SimpleNamespace(rc=4, mid=0)
+            self._mid += 1
+            mid = self._mid
+            self.published.append((topic, payload, qos))
+        if qos > 0 and self.ack:
+            self.on_publish(self, None, mid, None, None)
+        return SimpleNamespace(rc=0, mid=mid)
+
+    # broker side
+    def start(self):
+        self.online = True
+        self.connects += 1
+        self.on_connect(self, None, None, SimpleNamespace(is_failure=False), None)
+
+    def stop(self):
+        self.online = False
+        self.on_disconnect(self, None, None, "broker went away", None)
+
+
+def wait_for(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return predicate()
+
+
+def test_messages_are_buffered_until_the_broker_is_up_and_share_one_connection():
+    broker = FakeBroker()
+    publisher = MqttPublisher("broker", client_factory=lambda: broker)
+    publisher.publish("utms/command/pc/notify", '{"message": "a"}', qos=1)
+    publisher.publish("utms/command/pc/speak", '{"message": "b"}')
+    assert publisher.stats()["buffered"] == 2 and broker.published == []
+
+    broker.start()
+    assert publisher.flush(2.0)
+    for i in range(10):
+        publisher.publish("utms/command/pc/notify", str(i), qos=1)
+    assert publisher.flush(2.0)
+
+    assert [payload for _, payload, _ in broker.published][:2] == ['{"message": "a"}', '{"message": "b"}']
+    assert len(broker.published) == 12 and broker.connects == 1
+    assert publisher.stats()["acknowledged"] == 11
+    publisher.close()
+
+
+def test_unacknowledged_messages_are_resent_after_a_reconnect():
+    broker = FakeBroker(ack=False)
+    publisher = MqttPublisher("broker", client_factory=lambda: broker, max_inflight=2)
+    broker.start()
+    for i in range(3):
+        publisher.publish("t", str(i), qos=1)
+    publisher.publish("t", "fire-and-forget", qos=0)
+    assert wait_for(lambda: len(broker.published) == 2)
+    # Only max_inflight QoS 1 messages go out without acknowledgements.
+    time.sleep(0.05)
+    assert publisher.stats()["inflight"] == 2 and len(broker.published) == 2
+
+    broker.stop()
+    broker.ack = True
+    broker.start()
+    assert publisher.flush(2.0)
+    payloads = [payload for _, payload, _ in broker.published]
+    assert payloads == ["0", "1", "0", "1", "2", "fire-and-forget"]
+    publisher.close()
+
+
+def test_full_buffer_drops_the_oldest_messages():
+    broker = FakeBroker()
+    publisher = MqttPublisher("broker", client_factory=lambda: broker, max_buffer=2)
+    for i in range(4):
+        publisher.publish("t", str(i))
+    broker.start()
+    assert publisher.flush(2.0)
+    assert [payload for _, payload, _ in broker.published] == ["2", "3"]
+    assert publisher.stats()["dropped"] == 2
+    publisher.close()
@@ -0,0 +1,58 @@
+import itertools
+import operator
+from datetime import datetime, timezone
+from decimal import Decimal
+
+import pytest
+
+from utms.core.time import DecimalTimeLength, DecimalTimeStamp, NanoTimeLength, NanoTimeStamp
+
+VALUES = [0, 5, -7, 1.5, -2.25, Decimal("3.000000001"), Decimal("0.1234567891234"), 1760000000.123456]
+OPERATORS = [
+    operator.add, operator.sub, operator.mul, operator.truediv, operator.floordiv, operator.mod,
+    operator.lt, operator.le, operator.gt, operator.ge, operator.eq,
+]
+
+
+def _value(result):
+    if isinstance(result, (NanoTimeStamp, NanoTimeLength)):
+        return type(result).__name__[4:], result.to_decimal()
+    if isinstance(result, (DecimalTimeStamp, DecimalTimeLength)):
+        return type(result).__name__[7:], Decimal(str(result))
+    return result
+
+
+@pytest.mark.parametrize("decimal_type,nano_type", [(DecimalTimeStamp, NanoTimeStamp), (DecimalTimeLength, NanoTimeLength)])
+@pytest.mark.parametrize("op", OPERATORS, ids=lambda op: op.__name__)
+def test_operators_match_decimal_types(decimal_type, nano_type, op):
+    for a, b in itertools.product(VALUES, VALUES):
+        for wrap in (True, False):
+            try:
+                expected = _value(op(decimal_type(a), decimal_type(b) if wrap else b))
+            except ArithmeticError:
+                with pytest.raises(ArithmeticError):
+                    op(nano_type(a), nano_type(b) if wrap else b)
+                continue
+            assert _value(op(nano_type(a), nano_type(b) if wrap else b)) == expected, (a, b, wrap)
+
+
+def test_sub_nanosecond_values_stay_exact():
+    tiny = NanoTimeLength(Decimal("1e-12"))
+    assert tiny.to_decimal() == Decimal("1e-12")
+    assert (tiny * 1000).to_decimal() == Decimal("1e-9")
+    assert (tiny * 1000).nanoseconds == 1
+
+    third = NanoTimeStamp(1) / 3
+    assert third * 3 == DecimalTimeStamp(1) / 3 * 3
+    assert str(NanoTimeStamp(1.5)) == "1.5"
+    assert str(NanoTimeLength(-90)) == "-90"
+
+
+def test_construction_from_datetime_is_exact():
+    moment = datetime(2025, 6, 1, 12, 30, 15, 123456, tzinfo=timezone.utc)
+    stamp = NanoTimeStamp(moment)
+
+    assert stamp.nanoseconds == 1748781015123456000
+    assert stamp == DecimalTimeStamp(moment)
+    assert stamp.to_gregorian() == moment
+    assert abs(float(NanoTimeStamp.now()) - float(DecimalTimeStamp.now())) < 1
@@ -0,0 +1,100 @@
+from datetime import datetime
+
+import pytest
+import pytz
+
+from utms.core.services.occurrences import OccurrenceCache
+from utms.core.time import DecimalTimeLength, DecimalTimeStamp
+from utms.utms_types.recurrence.pattern import RecurrencePattern
+
+BERLIN = pytz.timezone("Europe/Berlin")
+START = DecimalTimeStamp(BERLIN.localize(datetime(2025, 3, 20, 7, 12, 30)))
+END = DecimalTimeStamp(BERLIN.localize(datetime(2025, 4, 20)))
+
+
+def _labelled(pattern, label):
+    pattern.label = label
+    return pattern
+
+
+PATTERNS = [
+    lambda: _labelled(RecurrencePattern.every(DecimalTimeLength(900)), "quarter"),
+    lambda: _labelled(RecurrencePattern().at("09:00", "16:30").on("monday", "friday"), "twice"),
+    lambda: _labelled(RecurrencePattern().at("10:00", "10:01", "10:30").between("10:01", "11:00"), "adjacent"),
+    lambda: _labelled(RecurrencePattern.every(DecimalTimeLength(3600)).between("08:00", "20:00"), "hourly"),
+    lambda: _labelled(RecurrencePattern.every(DecimalTimeLength(5400)).between("09:00", "17:00"), "waits"),
+]
+
+
+@pytest.mark.parametrize("make_pattern", PATTERNS)
+def test_cached_occurrences_match_expansion(make_pattern):
+    cache = OccurrenceCache()
+    expected = list(make_pattern().iter_occurrences(START, END, BERLIN))
+
+    assert cache.occurrences(make_pattern(), START, END, BERLIN) == expected
+    misses = cache.stats()["misses"]
+    assert cache.occurrences(make_pattern(), START, END, BERLIN) == expected
+    assert cache.stats()["misses"] == misses
+
+
+def test_first_occurrence_after_a_dst_change_keeps_its_wall_clock_time():
+    pacific = pytz.timezone("US/Pacific")
+    start = DecimalTimeStamp(pacific.localize(datetime(2025, 3, 7, 8, 39)))
+    end = DecimalTimeStamp(pacific.localize(datetime(2025, 3, 21)))
+    pattern = _labelled(
+        RecurrencePattern().at("04:15", "18:15").on("monday", "thursday", "sunday").between("06:15", "19:07"),
+        "evenings",
+    )
+    expected = list(pattern.iter_occurrences(start, end, pacific))
+
+    occurrences = OccurrenceCache().occurrences(pattern, start, end, pacific)
+
+    assert occurrences == expected
+    assert occurrences[0].to_gregorian().astimezone(pacific) == pacific.localize(datetime(2025, 3, 9, 18, 15))
+
+
+def test_changed_definition_and_invalidation_miss():
+    cache = OccurrenceCache()
+    pattern = _labelled(RecurrencePattern().at("09:00"), "daily")
+    before = cache.next_occurrence(pattern, START, BERLIN)
+
+    changed = _labelled(RecurrencePattern().at("10:00"), "daily")
+    assert cache.next_occurrence(changed, START, BERLIN) == changed.next_occurrence(START, BERLIN)
+    assert cache.stats()["entries"] == 2
+
+    cache.invalidate("daily")
+    assert cache.stats()["entries"] == 0
+    assert cache.next_occurrence(pattern, START, BERLIN) == before
+    assert cache.stats()["hits"] == 0
+
+
+def test_next_occurrence_reads_fixed_schedules_from_the_week_buckets():
+    cache = OccurrenceCache()
+    pattern = _labelled(RecurrencePattern().at("09:00", "16:30").on("monday", "friday"), "twice")
+    for minutes in range(0, 3 * 86400 // 60, 37):
+        # The agent looks up from the clock: a new starting point every tick.
+        from_time = DecimalTimeStamp(float(START) + minutes * 60)
+        assert cache.next_occurrence(pattern, from_time, pytz.utc) == pattern.next_occurrence(from_time)
+
+    assert cache.stats()["entries"] <= 2
+
+
+def test_next_occurrence_of_start_dependent_patterns_is_not_cached():
+    cache = OccurrenceCache()
+    pattern = _labelled(RecurrencePattern.every(DecimalTimeLength(5400)).between("09:00", "17:00"), "waits")
+    for minutes in (0, 1, 2):
+        from_time = DecimalTimeStamp(float(START) + minutes * 60)
+        assert cache.next_occurrence(pattern, from_time, BERLIN) == pattern.next_occurrence(from_time, BERLIN)
+
+    assert cache.stats()["entries"] == 0
+
+
+def test_cache_is_bounded_by_occurrences():
+    cache = OccurrenceCache(max_occurrences=3000)
+    for label in ("a", "b", "c"):
+        cache.occurrences(_labelled(RecurrencePattern.every(DecimalTimeLength(900)), label), START, END, BERLIN)
+
+    stats = cache.stats()
+    assert stats["occurrences"] <= 3000
+    assert cache.occurrences(_labelled(RecurrencePattern.every(DecimalTimeLength(900)), "c"), START, END, BERLIN)
+    assert cache.stats()["hits"] == 1
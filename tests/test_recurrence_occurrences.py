@@ -0,0 +1,76 @@
+from datetime import datetime
+
+import pytest
+import pytz
+
+from utms.core.time import DecimalTimeLength, DecimalTimeStamp
+from utms.utms_types.recurrence.pattern import RecurrencePattern
+
+UTC = pytz.utc
+BERLIN = pytz.timezone("Europe/Berlin")
+WEEKDAYS = ("monday", "tuesday", "wednesday", "thursday", "friday")
+
+
+def _chained(pattern, start, end, tz):
+    """The occurrences as the calendar used to collect them."""
+    occurrences = []
+    current = pattern.next_occurrence(start, local_tz=tz)
+    while current < end:
+        occurrences.append(current.to_gregorian())
+        current = pattern.next_occurrence(current, local_tz=tz)
+    return occurrences
+
+
+PATTERNS = [
+    lambda: RecurrencePattern.every(DecimalTimeLength(900)),
+    lambda: RecurrencePattern().at("09:00", "16:30").on(*WEEKDAYS),
+    lambda: RecurrencePattern().at("10:00", "10:01", "10:30").between("10:01", "11:00"),
+    lambda: RecurrencePattern.every(DecimalTimeLength(3600)).at_minute(15),
+    lambda: RecurrencePattern.every(DecimalTimeLength(5400)).between("09:00", "17:00").except_between("12:00", "13:00"),
+    lambda: RecurrencePattern.every(DecimalTimeLength(86400)).between("12:00", "13:00").on(*WEEKDAYS),
+    lambda: RecurrencePattern().between("18:00", "18:05").on("sunday"),
+    # Arbitrary constraints go through next_occurrence().
+    lambda: _odd_days(RecurrencePattern().at("08:00")),
+]
+
+
+def _odd_days(pattern):
+    pattern.add_constraint(lambda dt: dt.day % 2 == 1, "Odd days")
+    return pattern
+
+
+@pytest.mark.parametrize("make_pattern", PATTERNS)
+@pytest.mark.parametrize("tz", [UTC, BERLIN])
+def test_occurrences_match_chained_next_occurrence(make_pattern, tz):
+    start = DecimalTimeStamp(tz.localize(datetime(2025, 6, 2, 7, 12, 30)))
+    end = DecimalTimeStamp(tz.localize(datetime(2025, 6, 16)))
+
+    expanded = [ts.to_gregorian() for ts in make_pattern().occurrences_between(start, end, local_tz=tz)]
+
+    assert expanded == _chained(make_pattern(), start, end, tz)
+    assert expanded
+
+
+def test_occurrences_keep_local_time_across_dst():
+    pattern = RecurrencePattern().at("09:00")
+    start = DecimalTimeStamp(BERLIN.localize(datetime(2025, 3, 28)))
+    end = DecimalTimeStamp(BERLIN.localize(datetime(2025, 4, 2)))
+
+    local_times = [ts.to_gregorian().astimezone(BERLIN) for ts in pattern.iter_occurrences(start, end, BERLIN)]
+
+    assert [dt.day for dt in local_times] == [28, 29, 30, 31, 1]
+    assert {(dt.hour, dt.minute) for dt in local_times} == {(9, 0)}
+    assert local_times[1].utcoffset() != local_times[2].utcoffset()
+
+
+def test_occurrences_as_array_of_epoch_seconds():
+    numpy = pytest.importorskip("numpy")
+    pattern = RecurrencePattern.every(DecimalTimeLength(3600)).at_minute(0)
+    start = DecimalTimeStamp(UTC.localize(datetime(2025, 6, 1)))
+    end = DecimalTimeStamp(UTC.localize(datetime(2025, 6, 2)))
+
+    array = pattern.occurrences_between(start, end, as_array=True)
+
+    assert isinstance(array, numpy.ndarray) and len(array) == 23
+    assert numpy.all(numpy.diff(array) == 3600)
+    assert array[0] == float(start) + 3600
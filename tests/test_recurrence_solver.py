@@ -0,0 +1,270 @@
+import random
+from datetime import datetime, time, timedelta
+
+import pytest
+import pytz
+
+from utms.core.time import DecimalTimeLength, DecimalTimeStamp
+from utms.utms_types.recurrence.pattern import RecurrencePattern
+
+UTC = pytz.utc
+PACIFIC = pytz.timezone("US/Pacific")
+BERLIN = pytz.timezone("Europe/Berlin")
+HOUR = 3600
+DAY = 86400
+
+
+# RecurrencePattern.next_occurrence as it was before the solver, verbatim.
+
+def baseline_next_occurrence(self, from_time: DecimalTimeStamp, local_tz: pytz.BaseTzInfo = pytz.utc) -> DecimalTimeStamp:
+    gregorian_time = from_time.to_gregorian()
+    if gregorian_time is None:
+        raise ValueError(f"Cannot convert from_time '{from_time}' to a valid datetime object.")
+
+    start_dt_local = gregorian_time.astimezone(local_tz)
+
+    # Extract at rules and times once
+    at_rules = dict(self.spec.at_args) if hasattr(self.spec, 'at_args') and self.spec.at_args else {}
+    at_times = []
+    if hasattr(self.spec, 'times') and self.spec.times:
+        for t_str in self.spec.times:
+            try: at_times.append(time.fromisoformat(str(t_str)))
+            except ValueError: continue
+
+    # Get interval in seconds as a float
+    interval_seconds = float(self.spec.interval._seconds) if self.spec.interval else None
+
+    # Fast path for simple interval patterns with no constraints
+    if not self.constraints and not at_times and not at_rules and interval_seconds:
+        # Just add the interval
+        next_dt = start_dt_local + timedelta(seconds=interval_seconds)
+        return DecimalTimeStamp(next_dt)
+
+    # For patterns with specific times or constraints, use smarter jumping
+    candidate_dt = start_dt_local
+
+    # Safety limit - but now we'll jump more efficiently
+    max_days = 365
+    end_search = start_dt_local + timedelta(days=max_days)
+
+    # Track when we started for interval calculations
+    search_start = start_dt_local
+
+    while candidate_dt < end_search:
+        # Jump to next minute initially
+        candidate_dt = candidate_dt.replace(second=0, microsecond=0) + timedelta(minutes=1)
+
+        # Smart jumping based on constraints
+        if at_times and not interval_seconds:
+            # Jump to the next valid time on the same day or next day
+            current_time = candidate_dt.time().replace(second=0, microsecond=0)
+            next_time = None
+
+            # Find next time today
+            for t in sorted(at_times):
+                if t > current_time:
+                    next_time = t
+                    break
+
+            if next_time:
+                # Jump to that time today
+                candidate_dt = candidate_dt.replace(hour=next_time.hour, minute=next_time.minute, second=0, microsecond=0)
+            else:
+                # No more times today, jump to first time tomorrow
+                candidate_dt = (candidate_dt + timedelta(days=1)).replace(
+                    hour=min(at_times).hour, 
+                    minute=min(at_times).minute, 
+                    second=0, 
+                    microsecond=0
+                )
+
+        # Check constraints
+        if not all(constraint.func(candidate_dt) for constraint in self.constraints):
+            continue
+
+        # Check if this is a trigger time
+        is_trigger_time = False
+
+        if at_times:
+            candidate_time_simple = candidate_dt.time().replace(second=0, microsecond=0)
+            if candidate_time_simple in at_times:
+                is_trigger_time = True
+        elif at_rules:
+            if all(getattr(candidate_dt, key) == value for key, value in at_rules.items()):
+                is_trigger_time = True
+        elif interval_seconds:
+            # For interval patterns with constraints
+            # We need to check if we've passed the interval since last run
+            time_since_last = (candidate_dt - search_start).total_seconds()
+            if time_since_last >= interval_seconds:
+                is_trigger_time = True
+        else:
+            # No specific timing rules, any valid time is a trigger
+            is_trigger_time = True
+
+        if is_trigger_time:
+            # Ensure proper timezone
+            if candidate_dt.tzinfo is None:
+                candidate_dt = local_tz.localize(candidate_dt)
+            elif candidate_dt.tzinfo != local_tz:
+                candidate_dt = candidate_dt.astimezone(local_tz)
+            return DecimalTimeStamp(candidate_dt)
+
+    raise RuntimeError(f"Could not find a matching next occurrence for pattern '{self.label}' from {start_dt_local}")
+
+
+def _pattern(interval=None, at=(), at_minute=None, on=(), between=None, except_between=()):
+    pattern = RecurrencePattern.every(DecimalTimeLength(interval)) if interval else RecurrencePattern()
+    if at:
+        pattern.at(*at)
+    if at_minute is not None:
+        pattern.at_minute(at_minute)
+    if on:
+        pattern.on(*on)
+    if between:
+        pattern.between(*between)
+    for window in except_between:
+        pattern.except_between(*window)
+    return pattern
+
+
+WEEKDAYS = ("monday", "tuesday", "wednesday", "thursday", "friday")
+
+# (pattern arguments, time zone, local start time)
+CASES = [
+    (dict(at=("09:00", "16:30")), UTC, datetime(2025, 8, 20, 9, 30)),
+    (dict(at=("09:00", "16:30")), UTC, datetime(2025, 8, 20, 16, 30)),
+    # One minute before an at-time, and an at-time right after a rejected one.
+    (dict(at=("10:00",)), UTC, datetime(2025, 8, 20, 9, 59, 30)),
+    (dict(at=("10:00", "10:01", "10:30"), between=("10:01", "11:00")), UTC, datetime(2025, 8, 20, 9, 0)),
+    (dict(at=("23:59", "00:00")), UTC, datetime(2025, 8, 20, 23, 58, 10)),
+    (dict(at=("07:15",), on=("saturday",)), PACIFIC, datetime(2025, 8, 18, 12, 0)),
+    (dict(at=("08:00", "12:00", "18:00"), on=WEEKDAYS, except_between=[("11:00", "13:00")]), BERLIN, datetime(2025, 8, 22, 9, 0)),
+    (dict(interval=DAY, at=("09:00",)), UTC, datetime(2025, 8, 20, 8, 59, 1)),
+    (dict(interval=HOUR, at_minute=0), PACIFIC, datetime(2025, 8, 20, 9, 15)),
+    (dict(interval=HOUR, at_minute=30, on=("sunday",)), UTC, datetime(2025, 8, 18, 0, 0)),
+    (dict(at_minute=45, between=("22:00", "23:00")), UTC, datetime(2025, 8, 20, 22, 45, 0, 1)),
+    (dict(interval=DAY, between=("12:00", "13:00"), on=WEEKDAYS), PACIFIC, datetime(2025, 8, 22, 12, 30)),
+    (dict(interval=HOUR, on=("saturday",), between=("10:00", "11:00")), UTC, datetime(2025, 8, 18, 10, 30)),
+    (dict(interval=5400, between=("09:00", "17:00"), except_between=[("12:00", "13:00")]), BERLIN, datetime(2025, 8, 20, 11, 20, 42)),
+    (dict(interval=900, except_between=[("00:00", "06:00")]), UTC, datetime(2025, 8, 20, 23, 50)),
+    (dict(interval=7 * DAY, on=("monday",)), UTC, datetime(2025, 8, 18, 9, 0)),
+    (dict(on=("wednesday",)), UTC, datetime(2025, 8, 20, 23, 59, 59)),
+    (dict(between=("18:30", "18:31")), PACIFIC, datetime(2025, 8, 20, 18, 30)),
+    # Across daylight saving transitions.
+    (dict(at=("02:30",)), PACIFIC, datetime(2025, 3, 8, 12, 0)),
+    (dict(at=("01:30",)), PACIFIC, datetime(2025, 11, 1, 23, 0)),
+    (dict(interval=HOUR, between=("02:00", "03:00")), BERLIN, datetime(2025, 3, 29, 23, 0)),
+    (dict(interval=DAY, on=("sunday",), between=("09:00", "10:00")), BERLIN, datetime(2025, 10, 25, 9, 30)),
+]
+
+
+@pytest.mark.parametrize("kwargs, tz, start", CASES)
+def test_solver_matches_baseline_scan(kwargs, tz, start):
+    from_time = DecimalTimeStamp(tz.localize(start))
+
+    solved = _pattern(**kwargs).next_occurrence(from_time, local_tz=tz)
+    expected = baseline_next_occurrence(_pattern(**kwargs), from_time, local_tz=tz)
+
+    assert solved.to_gregorian() == expected.to_gregorian()
+
+
+def test_impossible_pattern_raises_like_baseline():
+    kwargs = dict(at=("10:00",), between=("11:00", "12:00"))
+    from_time = DecimalTimeStamp(UTC.localize(datetime(2025, 8, 20)))
+
+    with pytest.raises(RuntimeError):
+        _pattern(**kwargs).next_occurrence(from_time)
+    with pytest.raises(RuntimeError):
+        baseline_next_occurrence(_pattern(**kwargs), from_time)
+
+
+def test_unknown_constraints_fall_back_to_scan():
+    pattern = _pattern(at=("10:00",), except_between=[("12:00", "13:00")])
+    pattern.add_constraint(lambda dt: dt.day % 2 == 1, "Odd days")
+    start = DecimalTimeStamp(UTC.localize(datetime(2025, 8, 20, 9, 0)))
+
+    assert pattern._daily_schedule([time(10, 0)], {}) is None
+    assert pattern.next_occurrence(start).to_gregorian() == UTC.localize(datetime(2025, 8, 21, 10, 0))
+    # The exclusion windows stay out of the serialized spec.
+    assert pattern.spec.except_times is None
+
+
+DAYS = ("monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday")
+# Starting points near daylight saving transitions in US/Pacific and Europe/Berlin.
+DST_DATES = [datetime(2025, 3, 8), datetime(2025, 3, 29), datetime(2025, 10, 25), datetime(2025, 11, 1)]
+
+
+def _random_clock(rng):
+    return f"{rng.randrange(24):02d}:{rng.choice((0, 0, 15, 30, 45, rng.randrange(60))):02d}"
+
+
+def _minutes(clock):
+    hours, minutes = clock.split(":")
+    return int(hours) * 60 + int(minutes)
+
+
+def _random_window(rng, containing=None, avoiding=None):
+    """A random HH:MM window; mostly one that contains, or avoids, a given time."""
+    while True:
+        start = rng.randrange(24 * 60 - 1)
+        end = rng.randrange(start + 1, min(start + 12 * 60, 24 * 60))
+        if rng.random() < 0.03:
+            break
+        if containing is not None and not start <= _minutes(containing) <= end:
+            continue
+        if avoiding is not None and start <= _minutes(avoiding) <= end:
+            continue
+        break
+    return f"{start // 60:02d}:{start % 60:02d}", f"{end // 60:02d}:{end % 60:02d}"
+
+
+def _random_case(rng):
+    """
+    Random pattern arguments, time zone and local start time. The windows
+    mostly keep a time the pattern can trigger at, since the baseline scans a
+    whole year before it gives up on a pattern that never occurs.
+    """
+    kwargs = {}
+    timing = rng.choice(("at", "at", "at_minute", "none"))
+    if timing == "at":
+        kwargs["at"] = tuple(_random_clock(rng) for _ in range(rng.randint(1, 3)))
+    elif timing == "at_minute":
+        kwargs["at_minute"] = rng.randrange(60)
+    if timing != "at" or rng.random() < 0.3:
+        kwargs["interval"] = rng.choice((300, 900, HOUR, 5400, DAY, 7 * DAY))
+    if rng.random() < 0.4:
+        kwargs["on"] = tuple(rng.sample(DAYS, rng.randint(1, 5)))
+    # A time the pattern could trigger at, for the windows to keep.
+    if "at" in kwargs:
+        anchor = kwargs["at"][0]
+    elif "at_minute" in kwargs:
+        anchor = f"{rng.randrange(24):02d}:{kwargs['at_minute']:02d}"
+    else:
+        anchor = None
+    if rng.random() < 0.4:
+        kwargs["between"] = _random_window(rng, containing=anchor)
+        anchor = anchor or kwargs["between"][0]
+    if rng.random() < 0.3:
+        kwargs["except_between"] = [_random_window(rng, avoiding=anchor)]
+
+    tz = rng.choice((UTC, PACIFIC, BERLIN))
+    day = rng.choice(DST_DATES) if rng.random() < 0.3 else datetime(2025, 1, 1) + timedelta(days=rng.randrange(365))
+    start = day + timedelta(seconds=rng.randrange(DAY), microseconds=rng.choice((0, rng.randrange(10**6))))
+    return kwargs, tz, start
+
+
+@pytest.mark.parametrize("seed", range(300))
+def test_solver_matches_baseline_scan_on_random_patterns(seed):
+    kwargs, tz, start = _random_case(random.Random(seed))
+    from_time = DecimalTimeStamp(tz.localize(start))
+
+    try:
+        expected = baseline_next_occurrence(_pattern(**kwargs), from_time, local_tz=tz)
+    except RuntimeError:
+        with pytest.raises(RuntimeError):
+            _pattern(**kwargs).next_occurrence(from_time, local_tz=tz)
+        return
+    solved = _pattern(**kwargs).next_occurrence(from_time, local_tz=tz)
+
+    assert solved.to_gregorian() == expected.to_gregorian(), (kwargs, tz, start)
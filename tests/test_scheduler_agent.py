@@ -0,0 +1,84 @@
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import hy
+
+from utms.core.agent import agent as agent_module
+from utms.core.agent.agent import SchedulerAgent
+from utms.core.managers.elements.entity import EntityManager
+from utms.utms_types.field.types import FieldType, TypedValue
+
+
+class FakeEntityComponent:
+    """Records journaled blocks and the hooks evaluated before them."""
+
+    username = "tester"
+
+    def __init__(self):
+        self.events = []
+        self._lock = threading.RLock()
+        self._loader = SimpleNamespace(_dynamic_service=SimpleNamespace(evaluate=self._evaluate))
+
+    @contextmanager
+    def journaled_changes(self, entity):
+        with self._lock:
+            self.events.append("begin")
+            yield entity
+            self.events.append(("journal", entity.get_attribute_value("status")))
+
+    def _evaluate(self, expression, context, **kwargs):
+        self.events.append("hook")
+        context["self"].set_attribute_typed("status", TypedValue("done", FieldType.STRING))
+
+    def evaluate_hook(self, entity, hook_attribute_name, code_to_run, component_type):
+        # Like EntityComponent.evaluate_hook: evaluate first, then journal.
+        working_copy = _reminder(entity.get_attribute_value("due"))
+        self._evaluate(code_to_run, {"self": working_copy})
+        with self.journaled_changes(entity):
+            entity.set_attribute_typed("status", working_copy.get_attribute_typed("status"))
+        return entity
+
+
+def _reminder(trigger):
+    hook = hy.models.Expression([hy.models.Symbol("quote"), hy.read('(print "due")')])
+    return EntityManager().create(
+        "Call",
+        "reminder",
+        {
+            "status": TypedValue("todo", FieldType.STRING),
+            "due": TypedValue(trigger, FieldType.DATETIME),
+            "on-due-hook": TypedValue(hook, FieldType.CODE),
+        },
+        category="home",
+    )
+
+
+def test_hook_changes_are_journaled_after_the_hook_runs():
+    component = FakeEntityComponent()
+    entity = _reminder(datetime(2025, 1, 1, tzinfo=timezone.utc))
+
+    SchedulerAgent(config=None)._run_hook(entity, "on-due-hook", hy.read("(print 1)"), component)
+
+    assert component.events == ["hook", "begin", ("journal", "done")]
+
+
+def test_triggered_hook_runs_in_its_own_journaled_block(monkeypatch):
+    queued = []
+    monkeypatch.setattr(
+        agent_module, "effect_executor",
+        SimpleNamespace(fire=lambda name, fn, *args: queued.append((fn, args))),
+    )
+    component = FakeEntityComponent()
+    now = datetime(2025, 1, 1, 12, tzinfo=timezone.utc)
+    entity = _reminder(now - timedelta(minutes=5))
+
+    agent = SchedulerAgent(config=None)
+    agent._process_datetime_trigger(entity, "due", entity.get_attribute_typed("due"), "on-due-hook", now, component)
+    # The cursor is journaled while the hook is still queued.
+    assert component.events == ["begin", ("journal", "todo")]
+
+    for fn, args in queued:
+        fn(*args)
+    assert component.events[2:] == ["hook", "begin", ("journal", "done")]
@@ -0,0 +1,87 @@
+import operator
+from datetime import timezone
+from decimal import Decimal
+
+import pytest
+import pytz
+
+np = pytest.importorskip("numpy")
+
+from utms.core.time import DecimalTimeLength, DecimalTimeRange, DecimalTimeStamp
+from utms.core.time.arrays import TimeLengthArray, TimeRangeArray, TimeStampArray
+
+VALUES = [0, 5, -7, 1.5, -2.25, 1743296400, 1760000000.125, 86400]
+OPERANDS = [DecimalTimeStamp(3), DecimalTimeLength(-2), 4, 2.5]
+OPERATORS = [
+    operator.add, operator.sub, operator.mul, operator.truediv, operator.floordiv, operator.mod,
+    operator.lt, operator.le, operator.gt, operator.ge, operator.eq,
+]
+
+
+def _scalar(value):
+    if isinstance(value, (DecimalTimeStamp, DecimalTimeLength)):
+        return type(value).__name__[7:], Decimal(str(value))
+    return value
+
+
+@pytest.mark.parametrize("scalar_type,array_type", [(DecimalTimeStamp, TimeStampArray), (DecimalTimeLength, TimeLengthArray)])
+@pytest.mark.parametrize("op", OPERATORS, ids=lambda op: op.__name__)
+def test_operators_match_scalars(scalar_type, array_type, op):
+    array = array_type(VALUES)
+    for operand in OPERANDS:
+        result = op(array, operand)
+        expected = [_scalar(op(scalar_type(value), operand)) for value in VALUES]
+        if isinstance(result, (TimeStampArray, TimeLengthArray)):
+            actual = [_scalar(item) for item in result]
+            # Inexact products and quotients are float64 precise.
+            for (kind, got), (want_kind, want) in zip(actual, expected):
+                assert kind == want_kind
+                assert abs(got - want) <= Decimal("1e-9") + abs(want) * Decimal("1e-15"), (op, operand)
+        else:
+            assert [bool(x) if isinstance(x, np.bool_) else int(x) for x in result] == expected
+
+
+@pytest.mark.parametrize("op", [operator.truediv, operator.floordiv, operator.mod], ids=lambda op: op.__name__)
+def test_zero_divisors_raise_like_scalars(op):
+    lengths = TimeLengthArray(VALUES)
+    with pytest.raises(ArithmeticError):
+        op(DecimalTimeLength(5), DecimalTimeLength(0))
+
+    with pytest.raises(ZeroDivisionError):
+        op(lengths, 0)
+    with pytest.raises(ZeroDivisionError):
+        op(lengths, TimeLengthArray([1] * (len(VALUES) - 1) + [0]))
+    with pytest.raises(ZeroDivisionError):
+        op(10, lengths)
+
+
+def test_gregorian_and_dates_match_scalars():
+    stamps = TimeStampArray(VALUES)
+    berlin = pytz.timezone("Europe/Berlin")
+
+    assert stamps.to_gregorian() == [DecimalTimeStamp(value).to_gregorian() for value in VALUES]
+    assert list(stamps.date()) == [np.datetime64(DecimalTimeStamp(value).date()) for value in VALUES]
+    assert list(stamps.date(berlin)) == [
+        np.datetime64(DecimalTimeStamp(value).to_gregorian().astimezone(berlin).date()) for value in VALUES
+    ]
+    assert list(stamps.date(timezone.utc)) == [
+        np.datetime64(DecimalTimeStamp(value).to_gregorian().date()) for value in VALUES
+    ]
+
+
+def test_ranges_contain_and_overlap_like_decimal_ranges():
+    starts = [0, 100, 200, 300]
+    durations = [50, 100, 10, 0]
+    ranges = TimeRangeArray(TimeStampArray(starts), TimeLengthArray(durations))
+    scalar_ranges = [DecimalTimeRange(DecimalTimeStamp(s), DecimalTimeLength(d)) for s, d in zip(starts, durations)]
+
+    for moment in (0, 50, 150, 205, 300):
+        assert list(ranges.contains(DecimalTimeStamp(moment))) == [r.contains(DecimalTimeStamp(moment)) for r in scalar_ranges]
+    other = DecimalTimeRange(DecimalTimeStamp(40), DecimalTimeLength(170))
+    assert list(ranges.overlaps(other)) == [r.overlaps(other) for r in scalar_ranges]
+
+    # Element-wise against arrays of timestamps and ranges.
+    assert list(ranges.contains(TimeStampArray([10, 10, 205, 300]))) == [True, False, True, False]
+    assert list(ranges.overlaps(TimeRangeArray(TimeStampArray([40, 0, 0, 0]), TimeLengthArray([10] * 4)))) == [
+        True, False, False, False,
+    ]
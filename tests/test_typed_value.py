@@ -0,0 +1,56 @@
+import gc
+import pickle
+
+import hy
+
+from utms.core.models.elements.entity import Entity
+from utms.utms_types.field.types import AttributeDescriptor, FieldType, TypedValue
+
+
+def test_values_of_one_attribute_share_a_descriptor():
+    todo = TypedValue("todo", "enum", enum_choices=["todo", "done"])
+    done = TypedValue("done", FieldType.ENUM, enum_choices=["todo", "done"])
+    assert todo.descriptor is done.descriptor
+    assert done.enum_choices == ["todo", "done"]
+    assert TypedValue("x", "enum", enum_choices=["x"]).descriptor is not todo.descriptor
+
+    restored = pickle.loads(pickle.dumps(todo))
+    assert restored.descriptor is todo.descriptor
+    assert restored.value == "todo"
+
+
+def test_changing_metadata_swaps_the_descriptor():
+    first = TypedValue([], FieldType.LIST, item_schema_type="occurrence")
+    second = TypedValue([], FieldType.LIST, item_schema_type="occurrence")
+
+    second.item_schema_type = "metric-entry"
+    assert first.item_schema_type == "occurrence"
+    assert second.descriptor is AttributeDescriptor.of(FieldType.LIST, item_schema_type="metric-entry")
+
+
+def test_equal_metadata_of_different_types_is_not_merged():
+    flags = AttributeDescriptor.of(FieldType.ENUM, enum_choices=[1, 0])
+    booleans = AttributeDescriptor.of(FieldType.ENUM, enum_choices=[True, False])
+    assert booleans is not flags
+    assert [type(choice) for choice in booleans.enum_choices] == [bool, bool]
+
+    hy_schema = AttributeDescriptor.of(FieldType.LIST, item_schema_type=hy.models.String("occurrence"))
+    str_schema = AttributeDescriptor.of(FieldType.LIST, item_schema_type="occurrence")
+    assert type(str_schema.item_schema_type) is str
+    assert hy_schema is not str_schema
+
+
+def test_unused_descriptors_leave_the_intern_table():
+    AttributeDescriptor.of(FieldType.ENUM, enum_choices=["only", "used", "once"])
+    gc.collect()
+    assert not any(
+        descriptor.enum_choices == ("only", "used", "once")
+        for descriptor in AttributeDescriptor._interned.values()
+    )
+
+
+def test_models_have_no_instance_dict():
+    entity = Entity("A", "task", attributes={"priority": TypedValue(1, FieldType.INTEGER)})
+    assert not hasattr(entity, "__dict__")
+    assert not hasattr(entity.attributes["priority"], "__dict__")
+    assert entity.logger is not None
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Benchmark the per-entity memory footprint of Entity and TypedValue.
+
+Builds the same synthetic task entities twice: once with the current slotted
+models, where schema metadata is shared through interned AttributeDescriptors,
+and once with stand-ins for the previous layout, where every TypedValue carried
+its own copy of that metadata in a per-instance ``__dict__``. Memory is measured
+with ``tracemalloc`` and reported in bytes per entity.
+
+Usage
+-----
+    python tools/bench_entity_memory.py [--entities 20000]
+"""
+
+import argparse
+import gc
+import tracemalloc
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+from utms.core.models.elements.entity import Entity
+from utms.utms_types.field.types import FieldType, TypedValue
+
+STATUS_CHOICES = ["todo", "next", "waiting", "done", "cancelled"]
+
+
+class LegacyTypedValue:
+    """The previous TypedValue layout: all schema metadata stored on each value."""
+
+    def __init__(self, value, field_type, item_type=None, enum_choices=None, item_schema_type=None):
+        self.field_type = field_type
+        self.item_type = item_type
+        self.is_dynamic = False
+        self.enum_choices = enum_choices or []
+        self.item_schema_type = item_schema_type
+        self.referenced_entity_type = None
+        self.referenced_entity_category = None
+        self._value = value
+        self.original = None
+
+
+@dataclass
+class LegacyEntity:
+    """The previous Entity layout: a plain dataclass with a ``__dict__``."""
+
+    name: str
+    entity_type: str
+    category: str = "default"
+    source_file: Optional[str] = None
+    attributes: Dict[str, Any] = field(default_factory=dict)
+
+
+def _attribute_specs(index: int) -> List[tuple]:
+    # The loader converts the schema's enum choices anew for every entity,
+    # hence the list() copy.
+    return [
+        ("status", STATUS_CHOICES[index % 5], FieldType.ENUM, None, list(STATUS_CHOICES), None),
+        ("priority", index % 4, FieldType.INTEGER, None, None, None),
+        ("description", f"Task number {index}", FieldType.STRING, None, None, None),
+        ("tags", ["home", "errand"], FieldType.LIST, FieldType.STRING, None, None),
+        ("occurrences", [], FieldType.LIST, None, None, "occurrence"),
+    ]
+
+
+def build_current(count: int) -> List[Entity]:
+    entities = []
+    for i in range(count):
+        attributes = {
+            name: TypedValue(
+                value,
+                field_type,
+                item_type=item_type,
+                enum_choices=choices,
+                item_schema_type=schema_type,
+            )
+            for name, value, field_type, item_type, choices, schema_type in _attribute_specs(i)
+        }
+        entities.append(Entity(f"Task {i}", "task", "home", "/tasks/home.hy", attributes))
+    return entities
+
+
+def build_legacy(count: int) -> List[LegacyEntity]:
+    entities = []
+    for i in range(count):
+        attributes = {
+            name: LegacyTypedValue(value, field_type, item_type, choices, schema_type)
+            for name, value, field_type, item_type, choices, schema_type in _attribute_specs(i)
+        }
+        entities.append(LegacyEntity(f"Task {i}", "task", "home", "/tasks/home.hy", attributes))
+    return entities
+
+
+def measure(build: Callable[[int], list], count: int) -> float:
+    """Bytes allocated per entity by `build(count)`, kept alive while measuring."""
+    gc.collect()
+    tracemalloc.start()
+    entities = build(count)
+    allocated, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del entities
+    return allocated / count
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--entities", type=int, default=20000)
+    args = parser.parse_args()
+
+    # Warm up the descriptor intern table and the logger cache first.
+    build_current(10)
+
+    before = measure(build_legacy, args.entities)
+    after = measure(build_current, args.entities)
+    print(f"entities:            {args.entities}")
+    print(f"before (bytes/entity): {before:8.0f}")
+    print(f"after  (bytes/entity): {after:8.0f}")
+    print(f"saved:                 {before - after:8.0f} ({(before - after) / before:.0%})")
+
+
+if __name__ == "__main__":
+    main()
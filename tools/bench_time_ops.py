@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark of the timestamp and length operators.
+
+Times construction, arithmetic and comparisons for DecimalTimeStamp and
+DecimalTimeLength against the int-nanosecond NanoTimeStamp and
+NanoTimeLength, on operands typical of calendar and recurrence code: epoch
+timestamps, whole-second lengths, int and float scalars.
+
+Usage
+-----
+    python tools/bench_time_ops.py [--number 20000]
+"""
+
+import argparse
+import logging
+import operator
+import timeit
+from datetime import datetime, timezone
+from decimal import Decimal
+
+from utms.core.time import DecimalTimeLength, DecimalTimeStamp, NanoTimeLength, NanoTimeStamp
+
+MOMENT = datetime(2025, 6, 1, 12, 30, 15, 123456, tzinfo=timezone.utc)
+
+CONSTRUCTORS = {
+    "from int": 1748781015,
+    "from float": 1748781015.123456,
+    "from Decimal": Decimal("1748781015.123456"),
+    "from datetime": MOMENT,
+}
+
+# name -> (operator, right operand kind)
+OPERATORS = {
+    "stamp + length": (operator.add, "length"),
+    "stamp - stamp": (operator.sub, "stamp"),
+    "stamp + int": (operator.add, 3600),
+    "stamp - float": (operator.sub, 0.5),
+    "stamp // length": (operator.floordiv, "length"),
+    "stamp % length": (operator.mod, "length"),
+    "length * int": (operator.mul, 7),
+    "length / int": (operator.truediv, 4),
+    "stamp < stamp": (operator.lt, "stamp"),
+    "stamp == stamp": (operator.eq, "stamp"),
+}
+
+
+def _operands(stamp_type, length_type):
+    stamp = stamp_type(1748781015)
+    operands = {"stamp": stamp_type(1748781015 + 86400), "length": length_type(900)}
+    return stamp, length_type(86400), operands
+
+
+def run(stamp_type, length_type, number: int) -> dict:
+    """Microseconds per call for every benchmarked operation."""
+    results = {}
+    for name, value in CONSTRUCTORS.items():
+        results[name] = timeit.timeit(lambda: stamp_type(value), number=number) / number
+    stamp, length, operands = _operands(stamp_type, length_type)
+    for name, (op, right) in OPERATORS.items():
+        left = length if name.startswith("length") else stamp
+        right = operands.get(right, right)
+        results[name] = timeit.timeit(lambda: op(left, right), number=number) / number
+    return {name: seconds * 1e6 for name, seconds in results.items()}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--number", type=int, default=20000)
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+
+    decimal = run(DecimalTimeStamp, DecimalTimeLength, args.number)
+    nanos = run(NanoTimeStamp, NanoTimeLength, args.number)
+    print(f"{'operation':<18} {'Decimal (us)':>13} {'int ns (us)':>12} {'speedup':>8}")
+    for name in decimal:
+        speedup = decimal[name] / nanos[name]
+        print(f"{name:<18} {decimal[name]:13.3f} {nanos[name]:12.3f} {speedup:7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -12,6 +12,8 @@ from utms.utms_types.field.types import FieldType, TypedValue
 from utms.core.time import DecimalTimeStamp
 from utms.core.logger import get_logger
 from utms.core.hy.converter import converter
+from utms.core.services.effects import effect_executor
+from utms.core.services.occurrences import occurrence_cache
 from utms.utils.hytools.conversion import list_to_dict
 
 class SchedulerAgent:
@@ -193,16 +195,16 @@ class SchedulerAgent:
             return
 
         code_to_run = hook_tv.value[1]
-        self.logger.info(f"Executing '{event_type}' hook for '{entity.get_identifier()}': {hy.repr(code_to_run)}")
+        self.logger.info(f"Queueing '{event_type}' hook for '{entity.get_identifier()}'.")
+        # Hooks run on the effect executor so that a slow one cannot hold up the tick.
+        effect_executor.fire("agent-hook", self._run_hook, entity, hook_name, code_to_run, entity_component)
+
+    def _run_hook(self, entity: Entity, hook_name: str, code_to_run, entity_component: EntityComponent):
         try:
-            resolution_service = entity_component._loader._dynamic_service
-            resolution_service.evaluate(
-                expression=code_to_run,
-                context={"self": entity},
-                component_label=entity.get_identifier(),
-                component_type="agent_hook",
-                attribute=hook_name
-            )
+            # The hook runs after the trigger's own block has been journaled, so
+            # the component applies and journals its changes once it is done,
+            # without holding the tick's writes up while it runs.
+            entity_component.evaluate_hook(entity, hook_name, code_to_run, "agent_hook")
             self.logger.info(f"Successfully executed hook for '{entity.get_identifier()}'.")
         except Exception as e:
             self.logger.error(f"Error executing hook for '{entity.get_identifier()}': {e}", exc_info=True)
@@ -241,18 +243,17 @@ class SchedulerAgent:
             if cursor_dt_utc is None or cursor_dt_utc < trigger_dt_utc:
                 self.logger.info(f"        !!!! TRIGGERING '{hook_name}' on '{entity.get_identifier()}' !!!!")
                 self._execute_hook(entity, hook_name, "datetime trigger", entity_component)
-
-                cursors[cursor_key] = now_utc
-
-                py_structure_to_save = [{'cursors': cursors}]
-                hy_model_to_save = converter.py_to_model(py_structure_to_save)
-                new_agent_state_tv = TypedValue(
-                    value=hy_model_to_save,
-                    field_type=FieldType.LIST,
-                    item_schema_type="AGENT_STATE"
-                )
-                entity.set_attribute_typed("agent-state", new_agent_state_tv)
-                entity_component._save_entities_in_category(entity.entity_type, entity.category)
+                with entity_component.journaled_changes(entity):
+                    cursors[cursor_key] = now_utc
+
+                    py_structure_to_save = [{'cursors': cursors}]
+                    hy_model_to_save = converter.py_to_model(py_structure_to_save)
+                    new_agent_state_tv = TypedValue(
+                        value=hy_model_to_save,
+                        field_type=FieldType.LIST,
+                        item_schema_type="AGENT_STATE"
+                    )
+                    entity.set_attribute_typed("agent-state", new_agent_state_tv)
 
             return None
         else:
@@ -296,30 +297,29 @@ class SchedulerAgent:
             last_processed_time = now_utc - interval_delta
             self.logger.debug(f"No cursor found for '{entity.get_identifier()}'. Starting check from a past point: {last_processed_time}")
 
-        next_scheduled_dt = pattern.next_occurrence(from_time=DecimalTimeStamp(last_processed_time)).to_gregorian().replace(tzinfo=timezone.utc)
+        next_scheduled_dt = occurrence_cache.next_occurrence(pattern, DecimalTimeStamp(last_processed_time)).to_gregorian().replace(tzinfo=timezone.utc)
         if next_scheduled_dt > now_utc:
             return next_scheduled_dt
 
         self.logger.info(f"        !!!! CATCH-UP TRIGGERING '{hook_name}' on '{entity.get_identifier()}' for missed event at {next_scheduled_dt} !!!!")
-        self._execute_hook(entity, hook_name, "pattern trigger catch-up", entity_component)
-
         new_cursor_target = now_utc
-        self.logger.info(f"        -> Catch-up complete. Aligning cursor for '{entity.get_identifier()}' to current time: {new_cursor_target}")
+        self._execute_hook(entity, hook_name, "pattern trigger catch-up", entity_component)
+        with entity_component.journaled_changes(entity):
+            self.logger.info(f"        -> Catch-up complete. Aligning cursor for '{entity.get_identifier()}' to current time: {new_cursor_target}")
 
-        cursors[cursor_key] = new_cursor_target
+            cursors[cursor_key] = new_cursor_target
 
-        py_structure_to_save = [{'cursors': cursors}]
+            py_structure_to_save = [{'cursors': cursors}]
 
-        hy_model_to_save = converter.py_to_model(py_structure_to_save)
-        new_agent_state_tv = TypedValue(
-            value=hy_model_to_save,
-            field_type=FieldType.LIST,
-            item_schema_type="AGENT_STATE"
-        )
-        entity.set_attribute_typed("agent-state", new_agent_state_tv)
-        entity_component._save_entities_in_category(entity.entity_type, entity.category)
+            hy_model_to_save = converter.py_to_model(py_structure_to_save)
+            new_agent_state_tv = TypedValue(
+                value=hy_model_to_save,
+                field_type=FieldType.LIST,
+                item_schema_type="AGENT_STATE"
+            )
+            entity.set_attribute_typed("agent-state", new_agent_state_tv)
 
-        final_next_event_dt = pattern.next_occurrence(from_time=DecimalTimeStamp(new_cursor_target)).to_gregorian().replace(tzinfo=timezone.utc)
+        final_next_event_dt = occurrence_cache.next_occurrence(pattern, DecimalTimeStamp(new_cursor_target)).to_gregorian().replace(tzinfo=timezone.utc)
         self.logger.info(f"        -> Next future event for '{entity.get_identifier()}' scheduled for: {final_next_event_dt}")
 
         return final_next_event_dt
@@ -115,6 +115,14 @@ class ConfigComponent(SystemComponent):
         """Get a config by key."""
         return self._config_manager.get(key)
 
+    def get_config_value(self, key: str, default: Any = None) -> Any:
+        """Get the plain value of a config entry, or `default` if it is not set."""
+        config = self.get_config(key)
+        if config is None:
+            return default
+        value = config.get_value()
+        return default if value is None else value
+
     def get_configs_by_dynamic_field(self, field_name: str, is_dynamic: bool) -> List[Config]:
         """Get configs filtered by dynamic status of a specific field."""
         return self._config_manager.get_configs_by_dynamic_field(field_name, is_dynamic)
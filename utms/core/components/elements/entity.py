@@ -1,7 +1,17 @@
+import multiprocessing
 import os
 import shutil
+import atexit
+import copy
+import functools
+import logging
+import threading
+import weakref
+from contextlib import contextmanager
+from types import SimpleNamespace
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from datetime import datetime, timezone, timedelta
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple, Union
 import pickle
 import hashlib
 from decimal import Decimal
@@ -13,19 +23,113 @@ import sh
 from utms.core.components.base import SystemComponent
 from utms.core.hy.ast import HyAST
 from utms.core.loaders.base import LoaderContext
-from utms.core.loaders.elements.entity import EntityLoader
+from utms.core.loaders.elements.entity import (
+    EVALUATION_ERROR_PREFIX,
+    EntityLoader,
+    is_evaluated_as_expression,
+)
 from utms.core.managers.elements.entity import EntityManager
 from utms.core.models.elements.entity import Entity
 from utms.core.plugins import plugin_registry
 from utms.core.plugins.elements.dynamic_entity import plugin_generator
+from utms.core.services.dependency import (
+    DependencyGraph,
+    collect_dependencies,
+    entity_token,
+    variable_token,
+)
+from utms.core.services.effects import (
+    DEFAULT_EFFECT_MAX_PENDING,
+    DEFAULT_EFFECT_TIMEOUT,
+    DEFAULT_EFFECT_WORKERS,
+    effect_executor,
+)
+from utms.core.services.http import (
+    DEFAULT_HTTP_CACHE_SIZE,
+    DEFAULT_HTTP_MAX_PER_HOST,
+    DEFAULT_HTTP_TIMEOUT,
+    http_client,
+)
+from utms.core.services.file_watcher import FileWatcher, create_file_watcher
+from utms.core.services.journal import EntityJournal
+from utms.core.services.snapshot import (
+    EntitySnapshot,
+    content_hash,
+    file_fingerprint,
+    value_fingerprint,
+)
+from utms.core.hy.utils import collect_symbols
 from utms.core.hy.converter import converter
-from utms.utils import list_to_dict, sanitize_filename
+from utms.utils import list_to_dict, sanitize_filename, write_file_atomically
 from utms.utms_types import HyNode
+from utms.utms_types.hy.types import DEFAULT_HISTORY_SIZE
 from utms.utms_types.field.types import FieldType, TypedValue, infer_type
 from utms.utils import get_ntp_date
 from dataclasses import dataclass
 from utms.core.hy.converter import py_list_to_hy_expression
 
+# Parallel parsing only pays off once enough files need parsing to amortize
+# starting the worker processes. Each worker takes about 2.3s to start (imports,
+# plugins and schemas), while a 20-entity category file takes about 50ms to
+# parse serially, so even 4 workers on 4 idle cores only break even past about
+# 56 such files; on a single core, 40 files load in 2.3s serially and 6.2s
+# with 4 workers. Below this many changed files, loading stays serial.
+PARALLEL_LOAD_MIN_FILES = 64
+DEFAULT_MAX_LOAD_WORKERS = 4
+
+JOURNAL_FILENAME = "entities.journal"
+# The journal is folded back into the category files once it grows past
+# `entity-journal-max-bytes` or `entity-journal-compact-seconds` after its
+# first record, whichever comes first.
+DEFAULT_JOURNAL_MAX_BYTES = 1024 * 1024
+DEFAULT_JOURNAL_COMPACT_SECONDS = 600
+
+# Category files changed in memory are written at most this long after the
+# first change (`entity-save-debounce-ms`); 0 writes them immediately.
+DEFAULT_SAVE_DEBOUNCE_MS = 500
+
+# How sync_from_disk() learns about changed category files
+# (`entity-file-watcher`): "inotify" where available, otherwise "poll".
+DEFAULT_FILE_WATCHER = "inotify"
+
+# Snapshot extra holding the memoized results of pure dynamic expressions, so
+# that reparsing a file does not re-evaluate what an earlier load already did.
+DYNAMIC_MEMO_EXTRA = "dynamic-memo"
+
+# Evaluation records the dynamic registry keeps per expression
+# (`dynamic-history-size`, 0 for no limit) and their maximum age
+# (`dynamic-history-max-age-seconds`, 0 for no limit). Hooks and dynamic
+# attributes are re-evaluated for as long as the process runs.
+DEFAULT_DYNAMIC_HISTORY_MAX_AGE_SECONDS = 0
+
+# Dynamic evaluations reach the audit sinks from this level on
+# (`dynamic-audit-level`: successes are INFO, failures ERROR), successes
+# sampled at `dynamic-audit-sample-rate`.
+DEFAULT_DYNAMIC_AUDIT_LEVEL = "INFO"
+
+# Components with category writes still waiting for their debounce window.
+_components_with_pending_writes: "weakref.WeakValueDictionary[int, EntityComponent]" = (
+    weakref.WeakValueDictionary()
+)
+
+
+@atexit.register
+def _flush_pending_writes() -> None:
+    for component in list(_components_with_pending_writes.values()):
+        component.flush()
+
+
+def _serialized(method):
+    """
+    Run an EntityComponent method under the component's persistence lock, so
+    that a background save never serializes an entity while it is changing.
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._persistence_lock:
+            return method(self, *args, **kwargs)
+    return wrapper
+
 @dataclass
 class CachedEntityData:
     """A simple, pickle-safe container for entity data."""
@@ -35,6 +139,57 @@ class CachedEntityData:
     attributes: Dict[str, Dict[str, Any]]
 
 
+_worker_component: Optional["EntityComponent"] = None
+
+
+def _get_worker_mp_context():
+    """
+    Workers must not be forked from a process that may be running server or
+    agent threads, so prefer a forkserver (preloaded with this module) and fall
+    back to spawn where it is unavailable.
+    """
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context("forkserver")
+        context.set_forkserver_preload([__name__])
+        return context
+    return multiprocessing.get_context("spawn")
+
+
+def _init_category_file_worker(config_dir: str, username: str) -> None:
+    """Prepares a worker process: plugins, entity schemas and a private component."""
+    global _worker_component
+    from utms.core.plugins.discovery import discover_plugins, initialize_plugins
+
+    discover_plugins()
+    initialize_plugins()
+    _worker_component = EntityComponent(config_dir, component_manager=None, username=username)
+    _worker_component._load_schema_definitions()
+    _worker_component._register_entity_type_plugins()
+
+
+def _parse_category_file_worker(
+    entity_type_key: str, filepath: str, variables: Dict[str, Any]
+) -> Tuple[List[CachedEntityData], Set[str], Set[str]]:
+    """
+    Parses a single category file in a worker process. Returns its entities and
+    the names of the variables it references, as `_load_category_file()` does.
+    """
+    component = _worker_component
+    component._entity_manager.clear()
+    context = LoaderContext(
+        config_dir=component._entity_type_instances_base_dir, variables=variables
+    )
+    loaded = component._load_category_file(entity_type_key, filepath, context)
+    if loaded is None:
+        return [], set(), set()
+    loaded_entities, referenced_variables, reparse_variables = loaded
+    return (
+        component._entities_to_cache_data(loaded_entities),
+        referenced_variables,
+        reparse_variables,
+    )
+
+
 class EntityComponent(SystemComponent):
     """Component managing UTMS entities with TypedValue attributes and categories."""
 
@@ -65,7 +220,25 @@ class EntityComponent(SystemComponent):
 
         self.entity_types: Dict[str, Dict[str, Any]] = {}
         self.complex_types: Dict[str, Dict[str, Any]] = {}
-        self._file_mod_times: Dict[str, float] = {}
+        self._file_fingerprints: Dict[str, Dict[str, int]] = {}
+        # Content hashes of the category files as last read or written.
+        self._file_hashes: Dict[str, Optional[str]] = {}
+        self._file_watcher: Optional[FileWatcher] = None
+        # Whether the dependency graph covers the dynamic attributes of every
+        # loaded entity, including those restored from the snapshot unevaluated.
+        self._entity_dependencies_tracked = False
+        self._snapshot: Optional[EntitySnapshot] = None
+        # `pure_version` of the loader's memo when it was last persisted.
+        self._persisted_memo_version: Optional[int] = None
+        self._schema_hashes: Dict[str, str] = {}
+        self._journal: Optional[EntityJournal] = None
+        # Guards the journal and the write-behind state; held while writing files.
+        self._persistence_lock = threading.RLock()
+        self._dirty_categories: Dict[Tuple[str, str], None] = {}
+        self._save_timer: Optional[threading.Timer] = None
+        self._journal_fingerprint: Optional[Dict[str, int]] = None
+        self._journal_timer: Optional[threading.Timer] = None
+        self._compacting_journal = False
         self._items: Dict[str, Entity] = self._entity_manager._items
 
     def _ensure_dirs(self):
@@ -89,71 +262,50 @@ class EntityComponent(SystemComponent):
                 if not os.path.exists(type_dir):
                     os.makedirs(type_dir)
 
-    def _get_cache_path_for_file(self, source_filepath: str) -> str:
-        """Generates a unique, safe cache file path for a given source file."""
-        abs_path = os.path.abspath(source_filepath)
-        path_hash = hashlib.md5(abs_path.encode('utf-8')).hexdigest()
+    def _get_cache_dir(self) -> str:
         cache_dir = os.path.join(os.path.expanduser("~"), ".cache", "utms", "entities")
         os.makedirs(cache_dir, exist_ok=True)
+        return cache_dir
+
+    def _get_snapshot(self) -> EntitySnapshot:
+        """The user's entity snapshot, keyed by user directory so config dirs never collide."""
+        if self._snapshot is None:
+            abs_user_dir = os.path.abspath(self._entity_type_instances_base_dir)
+            dir_hash = hashlib.md5(abs_user_dir.encode("utf-8")).hexdigest()[:12]
+            snapshot_name = f"{sanitize_filename(self.username)}-{dir_hash}.snapshot"
+            self._snapshot = EntitySnapshot(os.path.join(self._get_cache_dir(), snapshot_name))
+        return self._snapshot
+
+    def _remove_legacy_file_caches(self, filepaths: List[str]) -> None:
+        """Removes the per-file pickles that predate the snapshot."""
+        cache_dir = self._get_cache_dir()
+        for filepath in filepaths:
+            path_hash = hashlib.md5(os.path.abspath(filepath).encode("utf-8")).hexdigest()
+            try:
+                os.remove(os.path.join(cache_dir, f"{path_hash}.pkl"))
+            except FileNotFoundError:
+                pass
+            except OSError as e_remove:
+                self.logger.debug(f"Could not remove legacy cache for '{filepath}': {e_remove}")
 
-        return os.path.join(cache_dir, f"{path_hash}.pkl")
-
+    @_serialized
     def load(self) -> None:
         if self._loaded:
             self.logger.debug("EntityComponent already loaded.")
             return
         self.logger.info("Loading Entities...")
         self._entity_manager.clear()
+        self._dependency_graph().clear()
+        self._entity_dependencies_tracked = False
         self.entity_types = {}
         self.complex_types = {}
 
         self._ensure_dirs()
         try:
-            self.logger.info(
-                f"Scanning for entity type definitions in: {self._entity_schema_def_dir}"
-            )
-            if os.path.isdir(self._entity_schema_def_dir):  # Check if it's a directory
-                for filename in os.listdir(self._entity_schema_def_dir):
-                    if filename.endswith(".hy"):
-                        filepath = os.path.join(self._entity_schema_def_dir, filename)
-                        self.logger.debug(f"Parsing entity type definitions from: {filepath}")
-                        try:
-                            type_def_nodes = self._ast_manager.parse_file(filepath)
-                            # Pass source_file for better error messages and tracking
-                            self._extract_entity_types_from_nodes(
-                                type_def_nodes, source_file=filename
-                            )
-                        except Exception as e_schema_file:
-                            self.logger.error(
-                                f"Error parsing entity schema file '{filepath}': {e_schema_file}",
-                                exc_info=True,
-                            )
-            else:
-                self.logger.warning(
-                    f"Entity type definition directory not found or is not a directory: {self._entity_schema_def_dir}"
-                )
-            self.logger.info(
-                f"Scanning for complex type definitions in: {self._complex_type_def_dir}"
-            )
-            if os.path.isdir(self._complex_type_def_dir):  
-                for filename in os.listdir(self._complex_type_def_dir):
-                    if filename.endswith(".hy"):
-                        filepath = os.path.join(self._complex_type_def_dir, filename)
-                        self.logger.debug(f"Parsing complex type definitions from: {filepath}")
-                        try:
-                            complex_type_nodes = self._ast_manager.parse_file(filepath)
-                            self._extract_complex_types_from_nodes(
-                                complex_type_nodes, source_file=filename
-                            )
-                        except Exception as e_ctype_file:
-                            self.logger.error(
-                                f"Error parsing complex type file '{filepath}': {e_ctype_file}",
-                                exc_info=True,
-                            )
-            else:
-                self.logger.warning(
-                    f"Complex type definition directory not found or is not a directory: {self._complex_type_def_dir}"
-                )
+            self._load_schema_definitions()
+            self._schema_hashes = self._compute_schema_hashes()
+            self._configure_attribute_indexes()
+            self._configure_dynamic_service()
             variables_component = self.get_component("variables")
             variables = {name: var.value for name, var in variables_component.items()}
             self.logger.debug(f"Entity loader context populated with variables: {list(variables.keys())}")
@@ -200,7 +352,12 @@ class EntityComponent(SystemComponent):
             if self.entity_types:
                 self._register_entity_type_plugins()
                 self._ensure_dirs()
+                # Watch before reading, so that nothing written meanwhile is missed.
+                self._start_file_watcher()
+                self._restore_dynamic_memo()
                 self._load_entities_from_all_category_files(context_for_entity_loading)
+                if self._replay_journal():
+                    self._schedule_journal_compaction()
             else:
                 self.logger.info("No entity types defined. Skipping instance loading.")
 
@@ -222,6 +379,67 @@ class EntityComponent(SystemComponent):
             self._loaded = False
             raise
 
+    def _load_schema_definitions(self) -> None:
+        """Parse the entity type and complex type definition files of the user."""
+        self.logger.info(
+            f"Scanning for entity type definitions in: {self._entity_schema_def_dir}"
+        )
+        if os.path.isdir(self._entity_schema_def_dir):  # Check if it's a directory
+            for filename in os.listdir(self._entity_schema_def_dir):
+                if filename.endswith(".hy"):
+                    filepath = os.path.join(self._entity_schema_def_dir, filename)
+                    self.logger.debug(f"Parsing entity type definitions from: {filepath}")
+                    try:
+                        type_def_nodes = self._ast_manager.parse_file(filepath)
+                        # Pass source_file for better error messages and tracking
+                        self._extract_entity_types_from_nodes(
+                            type_def_nodes, source_file=filename
+                        )
+                    except Exception as e_schema_file:
+                        self.logger.error(
+                            f"Error parsing entity schema file '{filepath}': {e_schema_file}",
+                            exc_info=True,
+                        )
+        else:
+            self.logger.warning(
+                f"Entity type definition directory not found or is not a directory: {self._entity_schema_def_dir}"
+            )
+        self.logger.info(
+            f"Scanning for complex type definitions in: {self._complex_type_def_dir}"
+        )
+        if os.path.isdir(self._complex_type_def_dir):  
+            for filename in os.listdir(self._complex_type_def_dir):
+                if filename.endswith(".hy"):
+                    filepath = os.path.join(self._complex_type_def_dir, filename)
+                    self.logger.debug(f"Parsing complex type definitions from: {filepath}")
+                    try:
+                        complex_type_nodes = self._ast_manager.parse_file(filepath)
+                        self._extract_complex_types_from_nodes(
+                            complex_type_nodes, source_file=filename
+                        )
+                    except Exception as e_ctype_file:
+                        self.logger.error(
+                            f"Error parsing complex type file '{filepath}': {e_ctype_file}",
+                            exc_info=True,
+                        )
+        else:
+            self.logger.warning(
+                f"Complex type definition directory not found or is not a directory: {self._complex_type_def_dir}"
+            )
+
+    def _configure_attribute_indexes(self) -> None:
+        """Give every attribute whose schema says `:indexed True` a value index in the manager."""
+        for entity_type_key, type_def in self.entity_types.items():
+            indexed = [
+                attr_name
+                for attr_name, attr_schema in type_def.get("attributes_schema", {}).items()
+                if isinstance(attr_schema, dict)
+                and str(attr_schema.get("indexed", False)).lower() == "true"
+            ]
+            self._entity_manager.set_indexed_attributes(entity_type_key, indexed)
+            if indexed:
+                self.logger.debug(f"Indexing attributes {indexed} of entity type '{entity_type_key}'.")
+
     def get_sanitized_entity_schema(self, entity_type_str: str) -> Optional[Dict[str, Any]]:
         """
         Retrieves the schema for an entity type and returns a fully sanitized,
@@ -370,127 +588,526 @@ class EntityComponent(SystemComponent):
                     f"Error registering plugin for '{entity_type_key}': {e}", exc_info=True
                 )
 
-    def _load_entities_from_all_category_files(self, context: LoaderContext) -> None:
-        self.logger.debug(
-            f"_load_entities_from_all_category_files called. Context variables keys: {list(context.variables.keys())}"
-        )
-        total_instances_loaded_all_types = 0
-        for entity_type_key in self.entity_types.keys():
+    def _list_category_files(self) -> List[Tuple[str, str]]:
+        """
+        Returns (entity_type_key, filepath) for every category file, sorted so
+        that entity creation order does not depend on directory listing order.
+        """
+        category_files: List[Tuple[str, str]] = []
+        for entity_type_key in sorted(self.entity_types.keys()):
             type_specific_instance_dir = os.path.join(
                 self._entity_type_instances_base_dir, f"{entity_type_key}s"
             )
             if not os.path.isdir(type_specific_instance_dir):
                 continue
+            for filename in sorted(os.listdir(type_specific_instance_dir)):
+                if filename.endswith(".hy") and not filename.startswith("."):
+                    category_files.append(
+                        (entity_type_key, os.path.join(type_specific_instance_dir, filename))
+                    )
+        return category_files
+
+    def _build_category_context(
+        self, context: LoaderContext, entity_type_key: str, filepath: str
+    ) -> LoaderContext:
+        category_name = sanitize_filename(os.path.splitext(os.path.basename(filepath))[0])
+        return LoaderContext(
+            config_dir=context.config_dir,
+            variables=context.variables,
+            current_category=category_name,
+            current_entity_type=entity_type_key,
+            current_entity_schema=self.entity_types.get(entity_type_key.lower(), {}).get(
+                "attributes_schema", {}
+            ),
+            known_complex_type_schemas=self.complex_types,
+            source_file=filepath,
+        )
 
-            category_files = [
-                f for f in os.listdir(type_specific_instance_dir) if f.endswith(".hy")
-            ]
-            if not category_files:
-                continue
+    @staticmethod
+    def _entities_to_cache_data(entities: List[Entity]) -> List[CachedEntityData]:
+        return [
+            CachedEntityData(
+                name=entity.name,
+                entity_type=entity.entity_type,
+                category=entity.category,
+                attributes={
+                    attr_name: tv.serialize()
+                    for attr_name, tv in entity.get_all_attributes_typed().items()
+                },
+            )
+            for entity in entities
+        ]
 
-            for filename in category_files:
-                filepath = os.path.join(type_specific_instance_dir, filename)
-                try:
-                    self._file_mod_times[filepath] = os.path.getmtime(filepath)
-                except FileNotFoundError:
-                    continue
-                cache_filepath = self._get_cache_path_for_file(filepath)
+    def _create_entities_from_cache_data(
+        self, cached_data_list: List[CachedEntityData], filepath: str
+    ) -> int:
+        for cached_data in cached_data_list:
+            deserialized_attributes = {
+                attr_name: TypedValue.deserialize(attr_data)
+                for attr_name, attr_data in cached_data.attributes.items()
+            }
+            self._entity_manager.create(
+                name=cached_data.name,
+                entity_type=cached_data.entity_type,
+                category=cached_data.category,
+                attributes=deserialized_attributes,
+                source_file=filepath,
+            )
+        return len(cached_data_list)
 
-                is_cache_valid = False
-                if os.path.exists(cache_filepath):
-                    try:
-                        if os.path.getmtime(filepath) <= os.path.getmtime(cache_filepath):
-                            is_cache_valid = True
-                    except FileNotFoundError:
-                        is_cache_valid = False
+    def _compute_schema_hashes(self) -> Dict[str, str]:
+        """
+        Hash each entity type's schema together with the complex types it uses,
+        so that editing either invalidates the cached entities of that type.
+        """
+        schema_hashes = {}
+        for entity_type_key, type_def in self.entity_types.items():
+            attributes_schema = type_def.get("attributes_schema", {})
+            used_complex_types = sorted(
+                {
+                    str(attr_schema.get("item_schema_type"))
+                    for attr_schema in attributes_schema.values()
+                    if isinstance(attr_schema, dict) and attr_schema.get("item_schema_type")
+                }
+            )
+            schema_hashes[entity_type_key] = value_fingerprint(
+                (
+                    sorted(attributes_schema.items()),
+                    [
+                        (name, sorted(self.complex_types[name]["attributes_schema"].items()))
+                        for name in used_complex_types
+                        if name in self.complex_types
+                    ],
+                )
+            )
+        return schema_hashes
 
-                if is_cache_valid:
-                    self.logger.debug(f"CACHE HIT for '{filepath}'. Loading from cache.")
-                    try:
-                        with open(cache_filepath, 'rb') as f:
-                            cached_data_list: List[CachedEntityData] = pickle.load(f)
-
-                        for cached_data in cached_data_list:
-                            deserialized_attributes = {
-                                attr_name: TypedValue.deserialize(attr_data)
-                                for attr_name, attr_data in cached_data.attributes.items()
-                            }
-                            self._entity_manager.create(
-                                name=cached_data.name,
-                                entity_type=cached_data.entity_type,
-                                category=cached_data.category,
-                                attributes=deserialized_attributes,
-                            )
+    @staticmethod
+    def _fingerprint_variables(names: Set[str], variables: Dict[str, Any]) -> Dict[str, Optional[str]]:
+        return {
+            name: value_fingerprint(variables[name]) if name in variables else None
+            for name in sorted(names)
+        }
 
-                        total_instances_loaded_all_types += len(cached_data_list)
-                        continue
+    def _referenced_variables(
+        self, instance_nodes: List[HyNode], variables: Dict[str, Any]
+    ) -> Tuple[Set[str], Set[str]]:
+        """
+        Names of the context variables that the entities of a file actually use,
+        and the subset of them used outside dynamic attribute expressions (e.g.
+        in complex list items), whose changes the dependency graph cannot follow.
+        """
+        symbols: Set[str] = set()
+        reparse_symbols: Set[str] = set()
+        for node in instance_nodes:
+            for typed_value in getattr(node, "attributes_typed", {}).values():
+                collect_symbols(typed_value.value, symbols)
+                if not is_evaluated_as_expression(typed_value):
+                    collect_symbols(typed_value.value, reparse_symbols)
+        referenced = set()
+        reparse = set()
+        for symbol in symbols:
+            for name in (symbol, symbol.replace("-", "_"), symbol.replace("_", "-")):
+                if name in variables:
+                    referenced.add(name)
+                    if symbol in reparse_symbols:
+                        reparse.add(name)
+                    break
+        return referenced, reparse
+
+    def _build_cache_key(
+        self,
+        entity_type_key: str,
+        stat_fingerprint: Dict[str, int],
+        file_hash: Optional[str],
+        referenced_variables: Set[str],
+        variables: Dict[str, Any],
+        reparse_variables: Set[str],
+    ) -> Dict[str, Any]:
+        return {
+            **stat_fingerprint,
+            "content_hash": file_hash,
+            "schema_hash": self._schema_hashes.get(entity_type_key),
+            "variables": self._fingerprint_variables(referenced_variables, variables),
+            "reparse_variables": sorted(reparse_variables),
+        }
 
-                    except Exception as e_cache:
-                        self.logger.warning(f"Failed to load from cache file '{cache_filepath}': {e_cache}. Falling back to full load.")
-                self.logger.debug(f"CACHE MISS for '{filepath}'. Performing full load.")
-                category_name = sanitize_filename(os.path.splitext(filename)[0])
-                try:
-                    instance_nodes = self._ast_manager.parse_file(filepath)
-                    if not instance_nodes:
-                        if os.path.exists(cache_filepath):
-                            os.remove(cache_filepath)
-                        continue
+    def _is_cache_key_current(
+        self,
+        filepath: str,
+        entity_type_key: str,
+        stat_fingerprint: Dict[str, int],
+        variables: Dict[str, Any],
+    ) -> bool:
+        """
+        True if the snapshot entry of `filepath` is still valid.
 
-                    entity_schema_for_loader = self.entity_types.get(
-                        entity_type_key.lower(), {}
-                    ).get("attributes_schema", {})
-                    complex_types_for_loader = self.complex_types
-
-                    category_context = LoaderContext(
-                        config_dir=context.config_dir,
-                        variables=context.variables,
-                        current_category=category_name,
-                        current_entity_type=entity_type_key,
-                        current_entity_schema=entity_schema_for_loader,
-                        known_complex_type_schemas=complex_types_for_loader,
-                        source_file=filepath,
-                    )
-                    loaded_instances_dict = self._loader.process(instance_nodes, category_context)
-                    loaded_entities_list = list(loaded_instances_dict.values())
-                    try:
-                        entities_to_cache = []
-                        for entity in loaded_entities_list:
-                            serialized_attributes = {
-                                attr_name: tv.serialize()
-                                for attr_name, tv in entity.get_all_attributes_typed().items()
-                            }
-                            entities_to_cache.append(
-                                CachedEntityData(
-                                    name=entity.name,
-                                    entity_type=entity.entity_type,
-                                    category=entity.category,
-                                    attributes=serialized_attributes
-                                )
-                            )
-                        with open(cache_filepath, 'wb') as f:
-                            pickle.dump(entities_to_cache, f)
-                        self.logger.debug(f"Cache created for '{filepath}' at '{cache_filepath}'.")
-                    except Exception as e_cache_write:
-                        self.logger.error(f"Failed to write cache file '{cache_filepath}': {e_cache_write}", exc_info=True)
+        An entry is valid while the schema hash of its entity type, the values of
+        the variables it referenced and the file content are unchanged. The
+        content is only hashed when the stat fingerprint differs, so an
+        untouched file is never opened.
+        """
+        snapshot = self._get_snapshot()
+        cache_key = snapshot.get_fingerprint(filepath)
+        if not cache_key:
+            return False
+        if cache_key.get("schema_hash") != self._schema_hashes.get(entity_type_key):
+            self.logger.debug(f"Schema of '{entity_type_key}' changed; '{filepath}' is stale.")
+            return False
+        if not self._are_variables_current(filepath, variables):
+            return False
+        if all(cache_key.get(k) == v for k, v in stat_fingerprint.items()):
+            return True
+        if cache_key.get("content_hash") != content_hash(filepath):
+            return False
+        snapshot.update_fingerprint(filepath, {**cache_key, **stat_fingerprint})
+        return True
 
+    def _are_variables_current(self, filepath: str, variables: Dict[str, Any]) -> bool:
+        """False if a variable referenced by the file changed value since it was parsed."""
+        cache_key = self._get_snapshot().get_fingerprint(filepath) or {}
+        stored_variables = cache_key.get("variables", {})
+        if stored_variables != self._fingerprint_variables(set(stored_variables), variables):
+            self.logger.debug(f"Variables referenced by '{filepath}' changed; it is stale.")
+            return False
+        return True
 
-                    total_instances_loaded_all_types += len(loaded_instances_dict)
+    def _read_snapshot_entry(
+        self,
+        filepath: str,
+        entity_type_key: str,
+        stat_fingerprint: Dict[str, int],
+        variables: Dict[str, Any],
+    ) -> Optional[List[CachedEntityData]]:
+        if not self._is_cache_key_current(filepath, entity_type_key, stat_fingerprint, variables):
+            return None
+        snapshot = self._get_snapshot()
+        try:
+            return snapshot.read(filepath)
+        except Exception as e_cache:
+            self.logger.warning(
+                f"Failed to load '{filepath}' from snapshot: {e_cache}. Falling back to full load."
+            )
+            snapshot.discard(filepath)
+            return None
 
+    def _commit_snapshot(self) -> None:
+        snapshot = self._get_snapshot()
+        memo = self._loader._dynamic_service.memo
+        memo_version = memo.pure_version
+        if memo_version != self._persisted_memo_version:
+            snapshot.put_extra(DYNAMIC_MEMO_EXTRA, memo.export_pure())
+        try:
+            snapshot.commit()
+        except Exception as e_cache_write:
+            self.logger.error(f"Failed to write entity snapshot: {e_cache_write}", exc_info=True)
+            return
+        self._persisted_memo_version = memo_version
 
-                except Exception as e_file:
-                    self.logger.error(f"Error loading from '{filepath}': {e_file}", exc_info=True)
-                    if os.path.exists(cache_filepath):
-                        os.remove(cache_filepath)
+    def _restore_dynamic_memo(self) -> None:
+        """Seed the loader's memo with the pure results persisted by earlier loads."""
+        memo = self._loader._dynamic_service.memo
+        try:
+            restored = memo.import_pure(self._get_snapshot().read_extra(DYNAMIC_MEMO_EXTRA))
+        except Exception as e_memo:
+            self.logger.warning(f"Ignoring unreadable memoized expression results: {e_memo}")
+            return
+        self._persisted_memo_version = memo.pure_version
+        self.logger.debug(f"Restored {restored} memoized expression results.")
+
+    def _get_config_value(self, key: str, default: Any) -> Any:
+        """A config value, or `default` if it is unset or there is no config component."""
+        try:
+            config_component = self.get_component("config")
+        except Exception:
+            config_component = None
+        if config_component is None:
+            return default
+        return config_component.get_config_value(key, default)
+
+    def _get_config_int(self, key: str, default: int) -> int:
+        """An integer config value, or `default` if it is unset or invalid."""
+        try:
+            return int(self._get_config_value(key, default))
+        except (TypeError, ValueError):
+            self.logger.warning(f"Invalid '{key}' config value. Using the default.")
+            return default
+
+    def _configure_dynamic_service(self) -> None:
+        """
+        Apply the `dynamic-history-*` retention settings to the entity dynamic
+        registry, the `dynamic-audit-*` settings to its audit log, the
+        `effect-*` limits to the executor running side-effecting builtins and
+        the `http-*` limits to the client behind `http-get`.
+        """
+        size = self._get_config_int("dynamic-history-size", DEFAULT_HISTORY_SIZE)
+        max_age = self._get_config_int(
+            "dynamic-history-max-age-seconds", DEFAULT_DYNAMIC_HISTORY_MAX_AGE_SECONDS
+        )
+        self._loader._dynamic_service.configure_history(
+            max_history=size if size > 0 else None,
+            max_age=timedelta(seconds=max_age) if max_age > 0 else None,
+        )
+        level_name = str(self._get_config_value("dynamic-audit-level", DEFAULT_DYNAMIC_AUDIT_LEVEL))
+        level = logging.getLevelName(level_name.upper())
+        if not isinstance(level, int):
+            self.logger.warning("Invalid 'dynamic-audit-level' config value. Using the default.")
+            level = logging.getLevelName(DEFAULT_DYNAMIC_AUDIT_LEVEL)
+        try:
+            sample_rate = float(self._get_config_value("dynamic-audit-sample-rate", 1.0))
+        except (TypeError, ValueError):
+            self.logger.warning("Invalid 'dynamic-audit-sample-rate' config value. Using the default.")
+            sample_rate = 1.0
+        self._loader._dynamic_service.audit.configure(level=level, sample_rate=sample_rate)
+        effect_executor.configure(
+            max_workers=self._get_config_int("effect-workers", DEFAULT_EFFECT_WORKERS),
+            max_pending=self._get_config_int("effect-max-pending", DEFAULT_EFFECT_MAX_PENDING),
+            timeout=self._get_config_int("effect-timeout-seconds", int(DEFAULT_EFFECT_TIMEOUT)),
+        )
+        http_client.configure(
+            timeout=self._get_config_int("http-timeout-seconds", int(DEFAULT_HTTP_TIMEOUT)),
+            max_per_host=self._get_config_int("http-max-per-host", DEFAULT_HTTP_MAX_PER_HOST),
+            cache_size=self._get_config_int("http-cache-size", DEFAULT_HTTP_CACHE_SIZE),
+        )
+
+    def _get_load_workers(self) -> int:
+        """Number of worker processes used to parse category files, from `entity-load-workers`."""
+        default_workers = min(DEFAULT_MAX_LOAD_WORKERS, os.cpu_count() or 1)
+        return max(0, self._get_config_int("entity-load-workers", default_workers))
+
+    def _parse_category_files_in_parallel(
+        self, misses: List[Tuple[str, str]], context: LoaderContext, workers: int
+    ) -> Dict[str, Tuple[List[CachedEntityData], Set[str], Set[str]]]:
+        """
+        Parses cache-miss category files in a process pool.
+
+        Returns the CachedEntityData and referenced variables of every file
+        that parsed successfully.
+        Files missing from the result are loaded serially by the caller, so a
+        failure here only costs time, never entities.
+        """
+        try:
+            pickle.dumps(context.variables)
+        except Exception as e_pickle:
+            self.logger.info(
+                f"Loader variables cannot be sent to worker processes ({e_pickle}). Loading serially."
+            )
+            return {}
+
+        results: Dict[str, Tuple[List[CachedEntityData], Set[str], Set[str]]] = {}
+        try:
+            with ProcessPoolExecutor(
+                max_workers=min(workers, len(misses)),
+                mp_context=_get_worker_mp_context(),
+                initializer=_init_category_file_worker,
+                initargs=(self._config_dir, self.username),
+            ) as pool:
+                futures = {
+                    pool.submit(
+                        _parse_category_file_worker, entity_type_key, filepath, context.variables
+                    ): filepath
+                    for entity_type_key, filepath in misses
+                }
+                for future in as_completed(futures):
+                    filepath = futures[future]
+                    try:
+                        results[filepath] = future.result()
+                    except Exception as e_worker:
+                        self.logger.warning(
+                            f"Worker failed to parse '{filepath}': {e_worker}. It will be loaded serially."
+                        )
+        except Exception as e_pool:
+            self.logger.warning(f"Parallel entity loading unavailable ({e_pool}). Loading serially.")
+        return results
+
+    def _load_category_file(
+        self, entity_type_key: str, filepath: str, context: LoaderContext
+    ) -> Optional[Tuple[List[Entity], Set[str], Set[str]]]:
+        """
+        Parses one category file in this process and loads its entities.
+        Returns the entities, the names of the variables they reference and
+        those of them referenced outside dynamic attribute expressions.
+        """
+        instance_nodes = self._ast_manager.parse_file(filepath)
+        if not instance_nodes:
+            return None
+        category_context = self._build_category_context(context, entity_type_key, filepath)
+        loaded_instances_dict = self._loader.process(instance_nodes, category_context)
+        referenced_variables, reparse_variables = self._referenced_variables(
+            instance_nodes, context.variables
+        )
+        return list(loaded_instances_dict.values()), referenced_variables, reparse_variables
+
+    def _reload_category_file(
+        self, entity_type_key: str, filepath: str, context: LoaderContext
+    ) -> int:
+        """Parses a category file and stages its entities in the snapshot."""
+        snapshot = self._get_snapshot()
+        file_hash = content_hash(filepath)
+        self._file_hashes[filepath] = file_hash
+        try:
+            loaded = self._load_category_file(entity_type_key, filepath, context)
+        except Exception as e_file:
+            self.logger.error(f"Error loading from '{filepath}': {e_file}", exc_info=True)
+            snapshot.discard(filepath)
+            return 0
+        if loaded is None:
+            snapshot.discard(filepath)
+            return 0
+        loaded_entities_list, referenced_variables, reparse_variables = loaded
+        snapshot.put(
+            filepath,
+            self._build_cache_key(
+                entity_type_key,
+                self._file_fingerprints[filepath],
+                file_hash,
+                referenced_variables,
+                context.variables,
+                reparse_variables,
+            ),
+            self._entities_to_cache_data(loaded_entities_list),
+        )
+        return len(loaded_entities_list)
+
+    def _load_entities_from_all_category_files(self, context: LoaderContext) -> None:
+        self.logger.debug(
+            f"_load_entities_from_all_category_files called. Context variables keys: {list(context.variables.keys())}"
+        )
+        category_files = self._list_category_files()
+        snapshot = self._get_snapshot()
+        if not snapshot.exists:
+            self._remove_legacy_file_caches([filepath for _, filepath in category_files])
+
+        cached_results: Dict[str, List[CachedEntityData]] = {}
+        misses: List[Tuple[str, str]] = []
+        for entity_type_key, filepath in category_files:
+            fingerprint = file_fingerprint(filepath)
+            if fingerprint is None:
+                continue
+            self._file_fingerprints[filepath] = fingerprint
+            cached_data_list = self._read_snapshot_entry(
+                filepath, entity_type_key, fingerprint, context.variables
+            )
+            if cached_data_list is None:
+                self.logger.debug(f"CACHE MISS for '{filepath}'. Performing full load.")
+                misses.append((entity_type_key, filepath))
+            else:
+                self.logger.debug(f"CACHE HIT for '{filepath}'. Loading from snapshot.")
+                self._file_hashes[filepath] = snapshot.get_fingerprint(filepath).get("content_hash")
+                cached_results[filepath] = cached_data_list
+
+        workers = self._get_load_workers()
+        if workers > 1 and len(misses) >= PARALLEL_LOAD_MIN_FILES:
+            self.logger.info(f"Parsing {len(misses)} changed category files with {workers} workers.")
+            parsed_results = self._parse_category_files_in_parallel(misses, context, workers)
+            for entity_type_key, filepath in misses:
+                if filepath not in parsed_results:
+                    continue
+                cached_data_list, referenced_variables, reparse_variables = parsed_results[filepath]
+                self._file_hashes[filepath] = content_hash(filepath)
+                cache_key = self._build_cache_key(
+                    entity_type_key,
+                    self._file_fingerprints[filepath],
+                    self._file_hashes[filepath],
+                    referenced_variables,
+                    context.variables,
+                    reparse_variables,
+                )
+                snapshot.put(filepath, cache_key, cached_data_list)
+                cached_results[filepath] = cached_data_list
+
+        # Merge in file order so that entity creation, and therefore claim
+        # registration, is identical whether or not files were parsed in parallel.
+        total_instances_loaded_all_types = 0
+        for entity_type_key, filepath in category_files:
+            if filepath not in self._file_fingerprints:
+                continue
+            if filepath in cached_results:
+                total_instances_loaded_all_types += self._create_entities_from_cache_data(
+                    cached_results[filepath], filepath
+                )
+                continue
+            total_instances_loaded_all_types += self._reload_category_file(
+                entity_type_key, filepath, context
+            )
 
+        snapshot.retain_only(self._file_fingerprints.keys())
+        self._commit_snapshot()
         self.logger.debug(
             f"Total instances from category files: {total_instances_loaded_all_types}"
         )
 
 
-    def sync_from_disk(self) -> None:
-        """Efficiently syncs in-memory entities with changes on disk."""
+    @_serialized
+    def sync_from_disk(self) -> bool:
+        """
+        Efficiently syncs in-memory entities with changes on disk.
+
+        Returns True if any category file was reloaded or removed.
+        """
         self.logger.debug("Checking for entity file changes on disk...")
-        
+        changed = False
+        # Write pending changes first, so that reloading a file never drops them.
+        self.flush()
+
+        variables = self._current_variables()
+        context = LoaderContext(config_dir=self._entity_type_instances_base_dir, variables=variables)
+
+        changed_paths = self._poll_file_watcher()
+        if changed_paths is None:
+            # No watcher, or it lost track of changes: stat every category file.
+            category_files = self._list_category_files()
+        else:
+            category_files = self._category_files_after_changes(changed_paths)
+
+        reloaded_files: Set[str] = set()
+        variable_stale_files: List[Tuple[str, str]] = []
+        for entity_type_key, filepath in category_files:
+            if changed_paths is None or os.path.abspath(filepath) in changed_paths:
+                fingerprint = file_fingerprint(filepath)
+                if fingerprint is None:
+                    continue
+                modified = self._is_file_modified(filepath, fingerprint, changed_paths is not None)
+            else:
+                fingerprint = self._file_fingerprints[filepath]
+                modified = False
+            if not modified:
+                if not self._are_variables_current(filepath, variables):
+                    variable_stale_files.append((entity_type_key, filepath))
+                continue
+
+            self.logger.info(f"Detected change in '{filepath}'. Reloading it.")
+            self._entity_manager.remove_by_source_file(filepath)
+            self._file_fingerprints[filepath] = fingerprint
+            self._reload_category_file(entity_type_key, filepath, context)
+            reloaded_files.add(filepath)
+
+        if reloaded_files or variable_stale_files:
+            changed = True
+            self._update_dependents(variable_stale_files, reloaded_files, context)
+
+        all_current_files = {filepath for _, filepath in category_files}
+        deleted_files = set(self._file_fingerprints.keys()) - all_current_files
+        for filepath in deleted_files:
+            self.logger.info(f"Detected deletion of '{filepath}'. Removing its entities.")
+            self._entity_manager.remove_by_source_file(filepath)
+            del self._file_fingerprints[filepath]
+            self._file_hashes.pop(filepath, None)
+            self._get_snapshot().discard(filepath)
+            changed = True
+
+        if changed:
+            self._commit_snapshot()
+
+        # Reloaded files lost the journaled changes layered on top of them, and
+        # another process may have journaled changes of its own.
+        if changed or self._get_journal().fingerprint() != self._journal_fingerprint:
+            if self._replay_journal():
+                changed = True
+        return changed
+
+    def _current_variables(self) -> Dict[str, Any]:
+        """Variable values for evaluating entity expressions, under both spellings."""
         variables_component = self.get_component("variables")
         variables = {}
         if variables_component:
@@ -500,55 +1117,236 @@ class EntityComponent(SystemComponent):
                     variables[name] = raw_value
                     if '-' in name:
                         variables[name.replace('-', '_')] = raw_value
-        context = LoaderContext(config_dir=self._entity_type_instances_base_dir, variables=variables)
+        return variables
 
-        all_current_files = set()
-        for entity_type_key in self.entity_types.keys():
-            type_dir = os.path.join(self._entity_type_instances_base_dir, f"{entity_type_key}s")
-            if not os.path.isdir(type_dir): continue
+    # --- Dynamic attribute dependencies ---
 
-            for filename in os.listdir(type_dir):
-                if not filename.endswith(".hy") or filename.startswith('.'): continue
-                
-                filepath = os.path.join(type_dir, filename)
-                all_current_files.add(filepath)
+    def _dependency_graph(self) -> DependencyGraph:
+        return self._loader._dynamic_service.dependencies
+
+    @staticmethod
+    def _dynamic_attribute_source(typed_value: TypedValue) -> Optional[str]:
+        """
+        The expression of a dynamic attribute the loader evaluates, including one
+        whose last evaluation failed; None for anything else.
+        """
+        original = typed_value.original or ""
+        if not typed_value.is_dynamic:
+            if not original.startswith(EVALUATION_ERROR_PREFIX):
+                return None
+            original = original[len(EVALUATION_ERROR_PREFIX):]
+        stripped = original.strip()
+        # Quoted attributes are kept unevaluated.
+        if not stripped or stripped == "None" or stripped.startswith(("'", "(quote")):
+            return None
+        return original
 
+    def _track_entity_dependencies(self, entities: Iterable[Entity], refresh: bool = False) -> None:
+        """
+        Add the dynamic attributes of `entities` to the dependency graph. Ones
+        already in it are kept unless `refresh` is set, since the loader records
+        the attributes it evaluates itself.
+        """
+        graph = self._dependency_graph()
+        for entity in entities:
+            entity_key = entity.get_identifier()
+            for attr_name, typed_value in entity.get_all_attributes_typed().items():
+                node = ("entity_attribute", entity_key, attr_name.replace("-", "_"))
+                if node in graph and not refresh:
+                    continue
+                source = self._dynamic_attribute_source(typed_value)
+                if source is None:
+                    graph.discard(node)
+                    continue
                 try:
-                    current_mtime = os.path.getmtime(filepath)
-                except FileNotFoundError: continue
+                    expression = hy.read(source)
+                except Exception as e_read:
+                    self.logger.warning(
+                        f"Cannot track dependencies of '{entity_key}.{attr_name}': {e_read}"
+                    )
+                    graph.discard(node)
+                    continue
+                graph.set(node, collect_dependencies(expression), (entity_token(entity_key, attr_name),))
 
-                last_mtime = self._file_mod_times.get(filepath)
+    def _ensure_entity_dependencies(self) -> None:
+        if not self._entity_dependencies_tracked:
+            self._track_entity_dependencies(self._entity_manager.get_all_entities())
+            self._entity_dependencies_tracked = True
 
-                if last_mtime is None or current_mtime > last_mtime:
-                    self.logger.info(f"Detected change in '{filepath}'. Reloading it.")
-                    
-                    self._entity_manager.remove_by_source_file(filepath)
-                    
-                    category_name = sanitize_filename(os.path.splitext(filename)[0])
-                    category_context = LoaderContext(
-                        config_dir=context.config_dir,
-                        variables=context.variables,
-                        current_category=category_name,
-                        current_entity_type=entity_type_key,
-                        current_entity_schema=self.entity_types.get(entity_type_key.lower(), {}).get("attributes_schema", {}),
-                        known_complex_type_schemas=self.complex_types,
-                        source_file=filepath,
-                    )
+    def _reevaluate_dependents(
+        self,
+        changed: Iterable[str],
+        variables: Optional[Dict[str, Any]] = None,
+        skip_files: Optional[Set[str]] = None,
+    ) -> Set[str]:
+        """
+        Re-evaluate, in dependency order, the dynamic entity attributes that
+        depend on the `changed` dependency tokens, leaving entities loaded from
+        `skip_files` alone. Returns the files of the entities that were updated.
+        """
+        self._ensure_entity_dependencies()
+        touched_files: Set[str] = set()
+        context: Optional[Dict[str, Any]] = None
+
+        def reevaluate(_component_type: str, entity_key: str, attr_name: str) -> Any:
+            nonlocal context
+            entity = self._entity_manager.get(entity_key)
+            if entity is None or (skip_files and entity.source_file in skip_files):
+                return None
+            typed_value = entity.get_attribute_typed(attr_name)
+            source = self._dynamic_attribute_source(typed_value) if typed_value else None
+            if source is None:
+                return None
+            if context is None:
+                # The same evaluation context the loader uses for instance attributes.
+                current = variables if variables is not None else self._current_variables()
+                context = {"self": SimpleNamespace(), **current}
+            resolved = self._loader.resolve_dynamic_attribute(
+                entity_key, attr_name, typed_value, expression=source, original=source, context=context
+            )
+            entity.set_attribute_typed(attr_name, resolved)
+            if entity.source_file:
+                touched_files.add(entity.source_file)
+            return resolved.value
 
-                    try:
-                        instance_nodes = self._ast_manager.parse_file(filepath)
-                        self._loader.process(instance_nodes, category_context)
-                    except Exception as e:
-                        self.logger.error(f"Failed to reload file '{filepath}': {e}", exc_info=True)
+        results = self._loader._dynamic_service.evaluate_affected(
+            changed, component_type="entity_attribute", reevaluate=reevaluate
+        )
+        if results:
+            self.logger.debug(
+                f"Re-evaluated dependent attributes of {len(results['entity_attribute'])} entities."
+            )
+        return touched_files
 
-                    self._file_mod_times[filepath] = current_mtime
+    def _update_dependents(
+        self,
+        variable_stale_files: List[Tuple[str, str]],
+        reloaded_files: Set[str],
+        context: LoaderContext,
+    ) -> None:
+        """
+        Bring everything that depends on changed variables or reloaded entities
+        up to date.
 
-        deleted_files = set(self._file_mod_times.keys()) - all_current_files
-        for filepath in deleted_files:
-            self.logger.info(f"Detected deletion of '{filepath}'. Removing its entities.")
+        A file whose only change is in the values of variables it uses is
+        updated in place, re-evaluating just the dynamic attributes that use
+        them, unless one of those variables is also used elsewhere (e.g. in a
+        complex list item): then the file is reparsed.
+        """
+        snapshot = self._get_snapshot()
+        variables = context.variables
+        self._ensure_entity_dependencies()
+        graph = self._dependency_graph()
+
+        changed_tokens: Set[str] = set()
+        updated_in_place: Set[str] = set()
+        for entity_type_key, filepath in variable_stale_files:
+            cache_key = snapshot.get_fingerprint(filepath) or {}
+            stored_variables = cache_key.get("variables", {})
+            current_variables = self._fingerprint_variables(set(stored_variables), variables)
+            changed_names = {
+                name
+                for name, fingerprint in stored_variables.items()
+                if current_variables.get(name) != fingerprint
+            }
+            file_tokens = {variable_token(name) for name in changed_names}
+            tracked_tokens: Set[str] = set()
+            for entity in self._entity_manager.get_by_source_file(filepath):
+                entity_key = entity.get_identifier()
+                for attr_name in entity.get_all_attributes_typed():
+                    tracked_tokens |= graph.depends_on(
+                        ("entity_attribute", entity_key, attr_name.replace("-", "_"))
+                    )
+            # Entries written before reparse variables were recorded lack the key.
+            reparse_names = set(cache_key.get("reparse_variables", stored_variables))
+            if file_tokens <= tracked_tokens and not changed_names & reparse_names:
+                changed_tokens |= file_tokens
+                updated_in_place.add(filepath)
+                continue
+            self.logger.info(f"Variables used by '{filepath}' changed. Reloading it.")
             self._entity_manager.remove_by_source_file(filepath)
-            del self._file_mod_times[filepath]
+            self._reload_category_file(entity_type_key, filepath, context)
+            reloaded_files.add(filepath)
+
+        for filepath in reloaded_files:
+            for entity in self._entity_manager.get_by_source_file(filepath):
+                changed_tokens.add(entity_token(entity.get_identifier()))
+
+        touched_files = self._reevaluate_dependents(changed_tokens, variables, skip_files=reloaded_files)
+        for filepath in (updated_in_place | touched_files) - reloaded_files:
+            self._restage_snapshot_entry(filepath, variables)
+
+    def _restage_snapshot_entry(self, filepath: str, variables: Dict[str, Any]) -> None:
+        """Stage the in-memory entities of an unchanged file, with current variable fingerprints."""
+        snapshot = self._get_snapshot()
+        cache_key = snapshot.get_fingerprint(filepath)
+        if not cache_key:
+            return
+        snapshot.put(
+            filepath,
+            {
+                **cache_key,
+                "variables": self._fingerprint_variables(set(cache_key.get("variables", {})), variables),
+            },
+            self._entities_to_cache_data(self._entity_manager.get_by_source_file(filepath)),
+        )
 
+    def _start_file_watcher(self) -> None:
+        if self._file_watcher is None:
+            backend = str(self._get_config_value("entity-file-watcher", DEFAULT_FILE_WATCHER))
+            self._file_watcher = create_file_watcher(backend)
+            self.logger.debug(f"Watching entity files with the '{self._file_watcher.backend}' backend.")
+        self._watch_entity_dirs()
+
+    def _watch_entity_dirs(self) -> None:
+        """Watch the user directory (for new type directories) and every type directory."""
+        self._file_watcher.watch(self._entity_type_instances_base_dir)
+        for entity_type_key in self.entity_types:
+            type_dir = os.path.join(self._entity_type_instances_base_dir, f"{entity_type_key}s")
+            if os.path.isdir(type_dir):
+                self._file_watcher.watch(type_dir)
+
+    def _poll_file_watcher(self) -> Optional[Set[str]]:
+        """Absolute paths changed since the last sync, or None if everything must be rescanned."""
+        if self._file_watcher is None:
+            return None
+        changed_paths = self._file_watcher.poll()
+        if changed_paths is None:
+            self._watch_entity_dirs()
+        return changed_paths
+
+    def _category_files_after_changes(self, changed_paths: Set[str]) -> List[Tuple[str, str]]:
+        """
+        The category files `_list_category_files()` would return, worked out from
+        the known files and the watcher's changed paths instead of listing directories.
+        """
+        category_files = {filepath: None for filepath in self._file_fingerprints}
+        for path in changed_paths:
+            filename = os.path.basename(path)
+            if not filename.endswith(".hy") or filename.startswith("."):
+                continue
+            type_dir_name = os.path.basename(os.path.dirname(path))
+            filepath = os.path.join(self._entity_type_instances_base_dir, type_dir_name, filename)
+            if os.path.abspath(filepath) != path:
+                continue
+            if os.path.exists(filepath):
+                category_files[filepath] = None
+            else:
+                category_files.pop(filepath, None)
+
+        result = []
+        for filepath in category_files:
+            entity_type_key = os.path.basename(os.path.dirname(filepath))[:-1]
+            if entity_type_key in self.entity_types:
+                result.append((entity_type_key, filepath))
+        return sorted(result)
+
+    def _is_file_modified(self, filepath: str, fingerprint: Dict[str, int], reported: bool) -> bool:
+        if self._file_fingerprints.get(filepath) != fingerprint:
+            return True
+        # Size and mtime can survive a quick rewrite. When the watcher saw the
+        # file change, only the content tells whether it actually did.
+        return reported and content_hash(filepath) != self._file_hashes.get(filepath)
 
     def get_complex_type_schema(self, complex_type_name: str) -> Optional[Dict[str, Any]]:
         """
@@ -600,11 +1398,13 @@ class EntityComponent(SystemComponent):
                     f"Error saving entity type defs to '{output_filepath}': {e_save_schema}", exc_info=True
                 )
 
-    def _save_entities_in_category(self, entity_type: str, category: str):
+    def _save_entities_in_category(self, entity_type: str, category: str) -> bool:
+        """Rewrite the category file from memory. Returns False if it could not be written."""
         entity_type_key = entity_type.lower()
         category_key = category.lower()
+        self._dirty_categories.pop((entity_type_key, category_key), None)
 
-        entities_to_save = [e for e in self._items.values() if e.entity_type == entity_type_key and e.category == category_key]
+        entities_to_save = self._entity_manager.get_by_type(entity_type_key, category_key)
         
         type_specific_dir = os.path.join(self._entity_type_instances_base_dir, f"{entity_type_key}s")
         if not os.path.exists(type_specific_dir): os.makedirs(type_specific_dir)
@@ -615,13 +1415,18 @@ class EntityComponent(SystemComponent):
             if os.path.exists(instance_file_path):
                 self.logger.info(f"Last entity from '{instance_file_path}' removed. Deleting empty category file.")
                 try: os.remove(instance_file_path)
-                except OSError as e_remove: self.logger.error(f"Error removing empty category file {instance_file_path}: {e_remove}")
-            return
+                except OSError as e_remove:
+                    self.logger.error(f"Error removing empty category file {instance_file_path}: {e_remove}")
+                    return False
+            self._file_fingerprints.pop(instance_file_path, None)
+            self._file_hashes.pop(instance_file_path, None)
+            self._journal_checkpoint(entity_type_key, category_key)
+            return True
 
         instance_plugin = plugin_registry.get_node_plugin(f"def-{entity_type_key}")
         if not instance_plugin:
             self.logger.warning(f"No plugin for 'def-{entity_type_key}'. Cannot save entities for category '{category_key}'.")
-            return
+            return False
 
         instance_hy_lines = []
         for entity_instance in sorted(entities_to_save, key=lambda inst: inst.name):
@@ -649,6 +1454,7 @@ class EntityComponent(SystemComponent):
 
                             final_hy_objects.append(converter.py_to_model(py_dict))
                         attr_tv.value = hy.models.List(final_hy_objects)
+                        entity_instance.set_attribute_typed(attr_name, attr_tv)
                         final_hy_list_object = hy.models.List(final_hy_objects)
                         
                         adapted_tv = TypedValue(
@@ -663,11 +1469,301 @@ class EntityComponent(SystemComponent):
             instance_hy_lines.append("")
 
         try:
-            with open(instance_file_path, "w", encoding="utf-8") as f:
-                f.write("\n".join(instance_hy_lines))
+            write_file_atomically(instance_file_path, "\n".join(instance_hy_lines))
+            # Record our own write so sync_from_disk() does not reparse it, and
+            # tie the entities to the file they now live in.
+            self._file_fingerprints[instance_file_path] = file_fingerprint(instance_file_path)
+            self._file_hashes[instance_file_path] = content_hash(instance_file_path)
+            for entity_instance in entities_to_save:
+                entity_instance.source_file = instance_file_path
             self.logger.info(f"Saved {len(entities_to_save)} entities of type '{entity_type_key}' (cat: '{category_key}') to {instance_file_path}")
         except Exception as e_save_inst:
             self.logger.error(f"Error saving entities to '{instance_file_path}': {e_save_inst}", exc_info=True)
+            return False
+        self._journal_checkpoint(entity_type_key, category_key)
+        return True
+
+    def _mark_category_dirty(self, entity_type: str, category: str) -> None:
+        """
+        Schedule a category file to be rewritten from memory. Changes within the
+        debounce window are coalesced into a single write.
+        """
+        debounce_ms = self._get_config_int("entity-save-debounce-ms", DEFAULT_SAVE_DEBOUNCE_MS)
+        if debounce_ms <= 0:
+            self._save_entities_in_category(entity_type, category)
+            return
+        with self._persistence_lock:
+            self._dirty_categories[(entity_type.lower(), category.lower())] = None
+            _components_with_pending_writes[id(self)] = self
+            if self._save_timer is None:
+                self._save_timer = threading.Timer(debounce_ms / 1000.0, self._flush_in_background)
+                self._save_timer.daemon = True
+                self._save_timer.start()
+
+    def flush(self) -> int:
+        """Write every category file with pending changes now. Returns how many were written."""
+        with self._persistence_lock:
+            if self._save_timer is not None:
+                if self._save_timer is not threading.current_thread():
+                    self._save_timer.cancel()
+                self._save_timer = None
+            pending = list(self._dirty_categories)
+            written = sum(
+                1 for entity_type, category in pending
+                if self._save_entities_in_category(entity_type, category)
+            )
+            _components_with_pending_writes.pop(id(self), None)
+        if pending:
+            self.logger.debug(f"Flushed {written} of {len(pending)} pending category files.")
+        return written
+
+    def _flush_in_background(self) -> None:
+        try:
+            self.flush()
+        except Exception as e:
+            self.logger.error(f"Background flush of entity category files failed: {e}", exc_info=True)
+
+    # --- Journal ---
+
+    def _get_journal(self) -> EntityJournal:
+        if self._journal is None:
+            self._journal = EntityJournal(
+                os.path.join(self._entity_type_instances_base_dir, JOURNAL_FILENAME)
+            )
+        return self._journal
+
+    @staticmethod
+    def _attribute_state(serialized: Dict[str, Any]) -> Tuple[str, str, Optional[int], Optional[str]]:
+        """
+        Fingerprints of a serialized TypedValue: of all of it, of everything but its
+        value, and, for lists, the length and fingerprint of the value.
+        """
+        value = serialized.get("value")
+        metadata = {k: v for k, v in serialized.items() if k not in ("value", "original")}
+        if isinstance(value, list):
+            return value_fingerprint(serialized), value_fingerprint(metadata), len(value), value_fingerprint(value)
+        return value_fingerprint(serialized), value_fingerprint(metadata), None, None
+
+    def _capture_journal_baseline(self, entity: Entity) -> Dict[str, Tuple]:
+        """Remember the state of an entity's attributes before mutating it."""
+        return {
+            attr_name: self._attribute_state(typed_value.serialize())
+            for attr_name, typed_value in entity.get_all_attributes_typed().items()
+        }
+
+    def _journal_entity_changes(self, entity: Entity, baseline: Dict[str, Tuple]) -> None:
+        """
+        Persist what changed on `entity` since `baseline` as journal records: items
+        appended to a list become an `append` record with just the new items, any
+        other change a `set` (or `remove`) of the attribute. If a change cannot be
+        journaled, the entity's category file is rewritten instead.
+        """
+        target = {
+            "entity": entity.get_identifier(),
+            "type": entity.entity_type,
+            "category": entity.category,
+            "name": entity.name,
+        }
+        records = []
+        attributes = entity.get_all_attributes_typed()
+        for attr_name in baseline.keys() - attributes.keys():
+            records.append({**target, "op": "remove", "attr": attr_name})
+        for attr_name, typed_value in attributes.items():
+            serialized = typed_value.serialize()
+            state = self._attribute_state(serialized)
+            before = baseline.get(attr_name)
+            if before is not None and before[0] == state[0]:
+                continue
+            value = serialized.get("value")
+            if (
+                before is not None
+                and before[2] is not None
+                and state[2] is not None
+                and state[2] > before[2]
+                and before[1] == state[1]
+                and value_fingerprint(value[: before[2]]) == before[3]
+            ):
+                records.append({**target, "op": "append", "attr": attr_name, "items": value[before[2]:]})
+            else:
+                records.append({**target, "op": "set", "attr": attr_name, "value": serialized})
+        if not records:
+            return
+
+        journal = self._get_journal()
+        with self._persistence_lock:
+            for record in records:
+                if not journal.append(record):
+                    self._mark_category_dirty(entity.entity_type, entity.category)
+                    return
+            self._journal_fingerprint = journal.fingerprint()
+        self.logger.debug(f"Journaled {len(records)} change(s) to '{target['entity']}'.")
+        self._schedule_journal_compaction()
+
+    @contextmanager
+    def journaled_changes(self, entity: Entity):
+        """
+        Persist every change made to `entity` inside the block through the journal
+        instead of rewriting its whole category file. Blocks on other threads,
+        and background saves, wait until the block is done.
+        """
+        with self._persistence_lock:
+            baseline = self._capture_journal_baseline(entity)
+            try:
+                yield entity
+            finally:
+                self._journal_entity_changes(entity, baseline)
+
+    def _journal_checkpoint(self, entity_type: str, category: str) -> None:
+        """Record that a category file now holds everything journaled for it so far."""
+        if self._compacting_journal:
+            return
+        journal = self._get_journal()
+        if journal.is_empty:
+            return
+        with self._persistence_lock:
+            journal.append({"op": "checkpoint", "type": entity_type, "category": category})
+            self._journal_fingerprint = journal.fingerprint()
+
+    def _apply_journal_record(self, record: Dict[str, Any]) -> bool:
+        """Apply one record to the entity it targets. Replaying a record twice is harmless."""
+        entity = self._entity_manager.get_by_name_type_category(
+            record["name"], record["type"], record["category"]
+        )
+        if entity is None:
+            self.logger.warning(f"Skipping journal record for unknown entity '{record['entity']}'.")
+            return False
+
+        op = record["op"]
+        if op == "set":
+            entity.set_attribute_typed(record["attr"], TypedValue.deserialize(record["value"]))
+        elif op == "remove":
+            entity.remove_attribute(record["attr"])
+        elif op == "append":
+            typed_value = entity.get_attribute_typed(record["attr"])
+            if typed_value is None:
+                self.logger.warning(
+                    f"Skipping journaled append to missing attribute '{record['attr']}' of '{record['entity']}'."
+                )
+                return False
+            serialized = typed_value.serialize()
+            current = serialized.get("value") if isinstance(serialized.get("value"), list) else []
+            new_items = [item for item in record["items"] if item not in current]
+            if not new_items:
+                return False
+            serialized["value"] = current + new_items
+            if not serialized.get("is_dynamic"):
+                serialized.pop("original", None)
+            entity.set_attribute_typed(record["attr"], TypedValue.deserialize(serialized))
+        else:
+            self.logger.warning(f"Skipping journal record with unknown operation '{op}'.")
+            return False
+        if self._entity_dependencies_tracked:
+            self._track_entity_dependencies([entity], refresh=True)
+        return True
+
+    def _replay_journal(self) -> Set[Tuple[str, str]]:
+        """
+        Apply the journal on top of the entities loaded from the category files,
+        skipping records already folded into a file by a later checkpoint.
+        Returns the (type, category) pairs that have records pending compaction.
+        """
+        journal = self._get_journal()
+        with self._persistence_lock:
+            records = journal.records()
+            self._journal_fingerprint = journal.fingerprint()
+        if not records:
+            return set()
+
+        last_checkpoint: Dict[Tuple[str, str], int] = {}
+        for index, record in enumerate(records):
+            if record.get("op") == "checkpoint":
+                last_checkpoint[(record["type"], record["category"])] = index
+
+        pending: Set[Tuple[str, str]] = set()
+        applied = 0
+        for index, record in enumerate(records):
+            if record.get("op") == "checkpoint":
+                continue
+            category_key = (record["type"], record["category"])
+            if index < last_checkpoint.get(category_key, -1):
+                continue
+            pending.add(category_key)
+            try:
+                if self._apply_journal_record(record):
+                    applied += 1
+            except Exception as e:
+                self.logger.error(f"Failed to replay journal record for '{record.get('entity')}': {e}", exc_info=True)
+        self.logger.info(
+            f"Replayed entity journal: {applied} of {len(records)} records applied, "
+            f"{len(pending)} categories pending compaction."
+        )
+        return pending
+
+    def compact_journal(self) -> int:
+        """
+        Write pending category files, then fold the journal back into them and
+        empty it. Records appended by other processes are replayed first, so
+        none are lost.
+        Returns the number of category files rewritten.
+        """
+        with self._persistence_lock:
+            self._cancel_journal_compaction()
+            self.flush()
+            journal = self._get_journal()
+            if journal.is_empty:
+                return 0
+            with journal.locked():
+                if journal.is_empty:
+                    return 0
+                pending = self._replay_journal()
+                self._compacting_journal = True
+                try:
+                    saved = [
+                        self._save_entities_in_category(entity_type, category)
+                        for entity_type, category in sorted(pending)
+                    ]
+                finally:
+                    self._compacting_journal = False
+                if not all(saved):
+                    self.logger.error("Could not write every journaled category. Keeping the journal.")
+                    return sum(saved)
+                journal.reset()
+                self._journal_fingerprint = journal.fingerprint()
+        self.logger.info(f"Compacted the entity journal into {len(saved)} category files.")
+        return len(saved)
+
+    def _schedule_journal_compaction(self) -> None:
+        """Compact in the background now if the journal is large, otherwise after the time threshold."""
+        max_bytes = self._get_config_int("entity-journal-max-bytes", DEFAULT_JOURNAL_MAX_BYTES)
+        if max_bytes > 0 and self._get_journal().size_bytes >= max_bytes:
+            delay = 0.0
+        else:
+            delay = float(
+                self._get_config_int("entity-journal-compact-seconds", DEFAULT_JOURNAL_COMPACT_SECONDS)
+            )
+            if delay <= 0:
+                return
+        with self._persistence_lock:
+            if self._journal_timer is not None:
+                if delay > 0:
+                    return
+                self._journal_timer.cancel()
+            self._journal_timer = threading.Timer(delay, self._compact_journal_in_background)
+            self._journal_timer.daemon = True
+            self._journal_timer.start()
+
+    def _cancel_journal_compaction(self) -> None:
+        with self._persistence_lock:
+            if self._journal_timer is not None:
+                if self._journal_timer is not threading.current_thread():
+                    self._journal_timer.cancel()
+                self._journal_timer = None
+
+    def _compact_journal_in_background(self) -> None:
+        try:
+            self.compact_journal()
+        except Exception as e:
+            self.logger.error(f"Background compaction of the entity journal failed: {e}", exc_info=True)
 
 
     def _get_entity_schema(self, entity_type_str: str) -> Optional[Dict[str, Any]]:
@@ -731,6 +1827,7 @@ class EntityComponent(SystemComponent):
             )
         return details
 
+    @_serialized
     def create_entity(
         self,
         name: str,
@@ -827,9 +1924,12 @@ class EntityComponent(SystemComponent):
             attributes=final_typed_attributes,
             category=category_key,
         )
-        self._save_entities_in_category(entity_type_key, category_key)
+        self._mark_category_dirty(entity_type_key, category_key)
+        if self._entity_dependencies_tracked:
+            self._track_entity_dependencies([entity_instance])
         return entity_instance
 
+    @_serialized
     def update_entity_attribute(
         self,
         entity_type: str,
@@ -874,11 +1974,20 @@ class EntityComponent(SystemComponent):
             item_schema_type=item_schema_type_from_schema
         )
         entity.set_attribute_typed(attr_name, updated_typed_value)
-        self._save_entities_in_category(entity_type, category)
+        self._mark_category_dirty(entity_type, category)
         self.logger.info(
             f"Updated attribute '{attr_name}' for entity '{entity_type}:{category}:{name}'. New TV: {repr(updated_typed_value)}"
         )
+        if self._entity_dependencies_tracked:
+            self._track_entity_dependencies([entity], refresh=True)
+        variables = self._current_variables()
+        touched_files = self._reevaluate_dependents(
+            [entity_token(entity.get_identifier(), attr_name)], variables
+        )
+        for filepath in touched_files:
+            self._restage_snapshot_entry(filepath, variables)
 
+    @_serialized
     def remove_entity(self, entity_type: str, category: str, name: str) -> None:
         """Remove an entity by its unique type, category, and name."""
         entity_type_key = entity_type.lower().strip()
@@ -890,9 +1999,10 @@ class EntityComponent(SystemComponent):
                 f"Entity not found in manager for removal: type='{entity_type_key}', category='{category_key}', name='{name_key}'"
             )
         else:
-            self._save_entities_in_category(entity_type_key, category_key)
+            self._mark_category_dirty(entity_type_key, category_key)
             self.logger.info(f"Removed entity: {entity_type_key}:{category_key}:{name_key}")
 
+    @_serialized
     def rename_entity(
         self,
         entity_type: str,
@@ -901,6 +2011,8 @@ class EntityComponent(SystemComponent):
         new_name: str,
         new_category: Optional[str] = None,
     ) -> None:
+        # Journal records name entities by identity; fold them in before it changes.
+        self.compact_journal()
         entity_type_key = entity_type.lower().strip()
         old_category_key = (
             old_category.strip().lower() if old_category and old_category.strip() else "default"
@@ -938,7 +2050,7 @@ class EntityComponent(SystemComponent):
             attributes=entity_to_rename.attributes,
         )
 
-        self._save_entities_in_category(entity_type_key, old_category_key)  
+        self._mark_category_dirty(entity_type_key, old_category_key)  
         self.logger.info(
             f"Renamed entity from '{entity_type_key}:{old_category_key}:{old_name_key}' "
             f"to '{entity_type_key}:{new_category_key}:{new_name_key}'."
@@ -959,6 +2071,7 @@ class EntityComponent(SystemComponent):
         unique_categories = sorted(list(set(c for c in categories if c)))
         return unique_categories
 
+    @_serialized
     def create_category(self, entity_type_str: str, category_name: str) -> bool:
         entity_type_key = entity_type_str.lower()
         category_filename_part = sanitize_filename(category_name.lower())
@@ -982,9 +2095,11 @@ class EntityComponent(SystemComponent):
             self.logger.error(f"Failed to create {category_filepath}: {e}", exc_info=True)
             return False
 
+    @_serialized
     def rename_category(
         self, entity_type_str: str, old_category_name: str, new_category_name: str
     ) -> bool:
+        self.compact_journal()
         entity_type_key = entity_type_str.lower()
         old_cat_fn_part = sanitize_filename(old_category_name.lower())
         new_cat_fn_part = sanitize_filename(new_category_name.lower())
@@ -1001,15 +2116,13 @@ class EntityComponent(SystemComponent):
         if os.path.exists(new_filepath):
             self.logger.warning(f"New category name '{new_filepath}' already exists.")
             return False
-        entities_to_update = [
-            e
-            for e in self._items.values()
-            if e.entity_type == entity_type_key and e.category == old_cat_fn_part
-        ]
+        entities_to_update = self._entity_manager.get_by_type(entity_type_key, old_cat_fn_part)
         try:
             shutil.move(old_filepath, new_filepath)
             for entity in entities_to_update:
+                # The manager re-keys and re-indexes the entity on each assignment.
                 entity.category = new_cat_fn_part
+                entity.source_file = new_filepath
             self.logger.info(
                 f"Renamed category '{old_filepath}' to '{new_filepath}'. Updated {len(entities_to_update)} entities in memory."
             )
@@ -1018,9 +2131,11 @@ class EntityComponent(SystemComponent):
             self.logger.error(f"Error renaming category: {e}", exc_info=True)
             return False
 
+    @_serialized
     def delete_category(
         self, entity_type_str: str, category_name: str, move_entities_to_default: bool = True
     ) -> bool:
+        self.compact_journal()
         entity_type_key = entity_type_str.lower()
         category_to_delete_fn_part = sanitize_filename(category_name.lower())
         if not category_to_delete_fn_part or category_to_delete_fn_part == "default":
@@ -1033,11 +2148,9 @@ class EntityComponent(SystemComponent):
         if not os.path.exists(category_filepath):
             self.logger.warning(f"Category to delete '{category_filepath}' not found.")
             return True  # Idempotent
-        entities_in_category = [
-            e
-            for e in self._items.values()
-            if e.entity_type == entity_type_key and e.category == category_to_delete_fn_part
-        ]
+        entities_in_category = self._entity_manager.get_by_type(
+            entity_type_key, category_to_delete_fn_part
+        )
         try:
             os.remove(category_filepath)
             self.logger.info(f"Deleted category file: {category_filepath}")
@@ -1049,8 +2162,9 @@ class EntityComponent(SystemComponent):
                 )
             else:
                 for entity in entities_in_category:
-                    if f"{entity.entity_type}:{entity.name}" in self._items:
-                        del self._items[f"{entity.entity_type}:{entity.name}"]
+                    self._entity_manager.remove_entity(
+                        entity.name, entity.entity_type, entity.category
+                    )
                 self.logger.info(
                     f"Deleted {len(entities_in_category)} entities from category '{category_name}'."
                 )
@@ -1059,9 +2173,11 @@ class EntityComponent(SystemComponent):
             self.logger.error(f"Error deleting category '{category_name}': {e}", exc_info=True)
             return False
 
+    @_serialized
     def move_entity_to_category(
         self, entity_type: str, old_category: str, entity_name: str, new_category_name: str
     ) -> bool:
+        self.compact_journal()
         entity = self.get_entity(entity_type, old_category, entity_name)  
         if not entity:
             self.logger.error(
@@ -1100,6 +2216,7 @@ class EntityComponent(SystemComponent):
 
         return self._entity_manager.get_all_active_entities()
 
+    @_serialized
     def start_occurrence(
         self, entity_type: str, category: str, name: str, list_attribute_name: str = "occurrences" 
     ) -> Entity:
@@ -1119,6 +2236,8 @@ class EntityComponent(SystemComponent):
         if entity_to_start.get_attribute_value(active_start_time_attr) is not None:
             raise ValueError(f"An occurrence is already in progress for entity '{name}'.")
 
+        journal_baseline = self._capture_journal_baseline(entity_to_start)
+
         if entity_to_start.has_attribute("checklist"):
             self.logger.info(f"Resetting checklist state for new occurrence of '{entity_to_start.get_identifier()}'.")
             checklist_tv = entity_to_start.get_attribute_typed("checklist")
@@ -1139,6 +2258,7 @@ class EntityComponent(SystemComponent):
                     updated_checklist_items.append(converter.py_to_model(py_dict))
 
                 checklist_tv.value = updated_checklist_items
+                entity_to_start.set_attribute_typed("checklist", checklist_tv)
 
         newly_claimed_resources = entity_to_start.get_exclusive_resource_claims()
         entity_to_start_id = entity_to_start.get_identifier()
@@ -1200,9 +2320,10 @@ class EntityComponent(SystemComponent):
                 )
 
         self._run_hook_code(entity_to_start, "on_start_hook", "start")
-        self._save_entities_in_category(entity_to_start.entity_type, entity_to_start.category)
+        self._journal_entity_changes(entity_to_start, journal_baseline)
         return entity_to_start
 
+    @_serialized
     def end_occurrence(
         self,
         entity_type: str,
@@ -1223,12 +2344,14 @@ class EntityComponent(SystemComponent):
         if not entity_to_stop.has_attribute(active_start_time_attr) or not entity_to_stop.has_attribute(list_attribute_name):
             raise TypeError(f"Entity '{name}' (type: {entity_type}) is not configured to track occurrences correctly.")
 
+        journal_baseline = self._capture_journal_baseline(entity_to_stop)
+
         start_time = entity_to_stop.get_attribute_value(active_start_time_attr)
         if start_time is None:
             if _is_system_triggered:
                  self.logger.debug(f"Entity '{entity_to_stop.get_identifier()}' was already stopped (system trigger).")
                  self._entity_manager.release_claims(entity_to_stop)
-                 self._save_entities_in_category(entity_to_stop.entity_type, entity_to_stop.category)
+                 self._journal_entity_changes(entity_to_stop, journal_baseline)
                  return entity_to_stop
             else:
                 raise ValueError(f"No active occurrence was found to end for entity '{name}'.")
@@ -1278,6 +2401,7 @@ class EntityComponent(SystemComponent):
                                 self.logger.error(f"Failed to run default action for '{step_name}': {e}")
                     updated_checklist_items.append(converter.py_to_model(py_dict))
                 checklist_tv.value = updated_checklist_items
+                entity_to_stop.set_attribute_typed("checklist", checklist_tv)
 
         occurrences_tv = entity_to_stop.get_attribute_typed(list_attribute_name)
         if not occurrences_tv:
@@ -1293,7 +2417,8 @@ class EntityComponent(SystemComponent):
                     current_list.append(converter.py_to_model(item))
         new_occurrence_hy_dict = converter.py_to_model(new_occurrence_data)
         new_list = current_list + [new_occurrence_hy_dict]
-        occurrences_tv.value = new_list 
+        occurrences_tv.value = new_list
+        entity_to_stop.set_attribute_typed(list_attribute_name, occurrences_tv)
 
         cleared_start_time_tv = TypedValue(value=None, field_type=FieldType.DATETIME, original="None")
         entity_to_stop.set_attribute_typed(active_start_time_attr, cleared_start_time_tv)
@@ -1302,10 +2427,11 @@ class EntityComponent(SystemComponent):
         entity_id = entity_to_stop.get_identifier()
         self.logger.info(f"Ended and logged occurrence for '{entity_id}' in memory.")
         self._run_hook_code(entity_to_stop, "on_end_hook", "end")
-        self._save_entities_in_category(entity_to_stop.entity_type, entity_to_stop.category)
+        self._journal_entity_changes(entity_to_stop, journal_baseline)
         return entity_to_stop
 
 
+    @_serialized
     def toggle_checklist_step(self, entity_type: str, category: str, name: str, step_name: str, new_status: bool) -> Entity:
         entity = self.get_entity(entity_type, category, name)
         if not entity: raise ValueError(f"Entity '{entity_type}:{category}:{name}' not found.")
@@ -1317,6 +2443,7 @@ class EntityComponent(SystemComponent):
         mutable_checklist = checklist_tv.value
         item_found = False
         action_to_run = None
+        journal_baseline = self._capture_journal_baseline(entity)
 
         for item_dict in mutable_checklist:
             if isinstance(item_dict, dict) and item_dict.get("name") == step_name:
@@ -1337,7 +2464,7 @@ class EntityComponent(SystemComponent):
         if not item_found:
             raise ValueError(f"Step '{step_name}' not found in the checklist for entity '{name}'.")
 
-        self._save_entities_in_category(entity.entity_type, entity.category)
+        self._journal_entity_changes(entity, journal_baseline)
 
         if action_to_run:
             self.logger.info(f"Executing action for completing step '{step_name}': {hy.repr(action_to_run)}")
@@ -1351,18 +2478,21 @@ class EntityComponent(SystemComponent):
                 )
             except Exception as e:
                 self.logger.error(f"Action for step '{step_name}' failed: {e}. Reverting completed status.")
+                journal_baseline = self._capture_journal_baseline(entity)
                 for item_dict in mutable_checklist:
                     if item_dict.get("name") == step_name:
                         item_dict['completed'] = not new_status
                         break
-                self._save_entities_in_category(entity.entity_type, entity.category)
+                self._journal_entity_changes(entity, journal_baseline)
                 raise e
 
         return entity
 
     def _run_hook_code(self, entity: Entity, hook_attribute_name: str, event_name: str):
         """
-        Finds and executes the Hy code defined in a hook attribute on an entity.
+        Finds the Hy code defined in a hook attribute on an entity and queues it
+        on the effect executor, so that a slow hook cannot hold up the request
+        that started or ended the occurrence.
         """
         self.logger.debug(
             f"Checking for '{hook_attribute_name}' on '{entity.name}' for '{event_name}' event."
@@ -1378,26 +2508,90 @@ class EntityComponent(SystemComponent):
             self.logger.warning(f"Hook '{hook_attribute_name}' on '{entity.name}' is not a quoted expression. Skipping.")
             return
         code_to_run = hook_expression[1] 
-        self.logger.info(f"Executing '{event_name}' hook for '{entity.name}': {hy.repr(code_to_run)}")
+        self.logger.info(f"Queueing '{event_name}' hook for '{entity.name}': {hy.repr(code_to_run)}")
+        effect_executor.fire(
+            "entity-hook", self._evaluate_hook_code, entity, hook_attribute_name, event_name, code_to_run
+        )
 
+    def _evaluate_hook_code(
+        self, entity: Entity, hook_attribute_name: str, event_name: str, code_to_run: Any
+    ) -> None:
+        """Evaluates a queued hook, logging rather than raising its errors."""
         try:
-            hook_context = {"self": entity}
-
-            _, _ = self._loader._dynamic_service.evaluate(
-                expression=code_to_run,
-                context=hook_context,
-                component_type="entity_hook",
-                component_label=entity.get_identifier(),
-                attribute=hook_attribute_name,
-            )
+            self.evaluate_hook(entity, hook_attribute_name, code_to_run, "entity_hook")
             self.logger.info(f"Successfully executed '{event_name}' hook for '{entity.name}'.")
-
         except Exception as e:
             self.logger.error(
                 f"Error executing '{hook_attribute_name}' for entity '{entity.name}': {e}",
                 exc_info=True,
             )
 
+    def evaluate_hook(
+        self, entity: Entity, hook_attribute_name: str, code_to_run: Any, component_type: str
+    ) -> Optional[Entity]:
+        """
+        Evaluates a hook's code with `self` bound to a copy of the entity, without
+        holding the persistence lock: a hook's shell or HTTP calls can take up to
+        the effect timeout, and requests and background saves must not wait for
+        them. The attributes the hook changed are then applied to, and journaled
+        on, the entity as it is loaded now.
+        Returns that entity, or None if it no longer exists.
+        """
+        identifier = entity.get_identifier()
+        with self._persistence_lock:
+            current = self._entity_manager.get_by_name_type_category(
+                entity.name, entity.entity_type, entity.category
+            )
+            if current is None:
+                self.logger.warning(
+                    f"Skipping hook '{hook_attribute_name}': '{identifier}' no longer exists."
+                )
+                return None
+            working_copy = Entity(
+                name=current.name,
+                entity_type=current.entity_type,
+                category=current.category,
+                source_file=current.source_file,
+                attributes=copy.deepcopy(current.get_all_attributes_typed()),
+            )
+            baseline = self._capture_journal_baseline(working_copy)
+
+        self._loader._dynamic_service.evaluate(
+            expression=code_to_run,
+            context={"self": working_copy},
+            component_type=component_type,
+            component_label=identifier,
+            attribute=hook_attribute_name,
+        )
+
+        changed = {
+            attr_name: typed_value
+            for attr_name, typed_value in working_copy.get_all_attributes_typed().items()
+            if baseline.get(attr_name, (None,))[0]
+            != self._attribute_state(typed_value.serialize())[0]
+        }
+        removed = baseline.keys() - working_copy.get_all_attributes_typed().keys()
+        if not changed and not removed:
+            return current
+
+        with self._persistence_lock:
+            current = self._entity_manager.get_by_name_type_category(
+                entity.name, entity.entity_type, entity.category
+            )
+            if current is None:
+                self.logger.warning(
+                    f"Dropping changes of hook '{hook_attribute_name}': "
+                    f"'{identifier}' was removed while it ran."
+                )
+                return None
+            with self.journaled_changes(current):
+                for attr_name, typed_value in changed.items():
+                    current.set_attribute_typed(attr_name, typed_value)
+                for attr_name in removed:
+                    current.remove_attribute(attr_name)
+        return current
+
+    @_serialized
     def log_metric(
         self,
         category: str,
@@ -1423,6 +2617,8 @@ class EntityComponent(SystemComponent):
         if not defined_type_str:
             raise TypeError(f"Metric '{name}' does not have a 'metric_type' defined and cannot be logged against.")
 
+        journal_baseline = self._capture_journal_baseline(metric_entity)
+
         is_valid = False
         if defined_type_str == "decimal":
             is_valid = isinstance(value, (float, int, Decimal))
@@ -1473,10 +2669,12 @@ class EntityComponent(SystemComponent):
         new_list = sanitized_current_list + [new_entry]
         entries_tv.value = new_list
         entries_tv.original = converter.py_to_string(new_list)
+        metric_entity.set_attribute_typed("entries", entries_tv)
         self.logger.info(f"Logged new entry for metric '{name}': {new_entry}")
-        self._save_entities_in_category(metric_entity.entity_type, metric_entity.category)
+        self._journal_entity_changes(metric_entity, journal_baseline)
         return metric_entity
 
+    @_serialized
     def remove_metric_entry(self, category: str, name: str, timestamp_iso: str) -> Entity:
         """
         Removes a specific entry from a METRIC's entries list, identified by its ISO timestamp.
@@ -1511,13 +2709,15 @@ class EntityComponent(SystemComponent):
 
         entries_tv.value = new_list
         entries_tv.original = converter.py_to_string(new_list)
+        metric_entity.set_attribute_typed("entries", entries_tv)
 
         self.logger.info(f"Removed entry at {timestamp_iso} from metric '{name}'.")
 
-        self._save_entities_in_category(metric_entity.entity_type, metric_entity.category)
+        self._mark_category_dirty(metric_entity.entity_type, metric_entity.category)
 
         return metric_entity    
 
+    @_serialized
     def start_timer(self, category: str, name: str) -> Entity:
         entity = self.get_entity("timer", category, name)
         if not entity:
@@ -1546,6 +2746,7 @@ class EntityComponent(SystemComponent):
         return self.get_entity("timer", category, name)
 
 
+    @_serialized
     def pause_timer(self, category: str, name: str) -> Entity:
         entity = self.get_entity("timer", category, name)
         if not entity:
@@ -1570,6 +2771,7 @@ class EntityComponent(SystemComponent):
         return self.get_entity("timer", category, name)
 
 
+    @_serialized
     def reset_timer(self, category: str, name: str) -> Entity:
         entity = self.get_entity("timer", category, name)
         if not entity:
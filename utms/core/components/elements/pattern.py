@@ -5,6 +5,7 @@ from utms.core.components.base import SystemComponent
 from utms.core.hy.ast import HyAST
 from utms.core.loaders.elements.pattern import PatternLoader
 from utms.core.managers.elements.pattern import PatternManager
+from utms.core.services.occurrences import occurrence_cache
 from utms.utms_types.recurrence.pattern import RecurrencePattern
 from utms.core.loaders.base import LoaderContext
 from utms.utms_types.field.types import TypedValue
@@ -56,6 +57,7 @@ class PatternComponent(SystemComponent):
                 except Exception as e_file:
                     self.logger.error(f"Error processing pattern file '{filepath}': {e_file}")
 
+        previous_labels = list(self._items)
         self._pattern_manager.clear()
         self._items = self._pattern_manager.get_all()
 
@@ -78,6 +80,8 @@ class PatternComponent(SystemComponent):
         _process_dir(self._global_patterns_dir, context) 
         _process_dir(self._user_patterns_dir, context)   
 
+        for label in set(previous_labels) | set(self._items):
+            occurrence_cache.invalidate(label)
         self._loaded = True
 
     def save(self) -> None:
@@ -110,6 +114,7 @@ class PatternComponent(SystemComponent):
         if not pattern.label:
             pattern.label = pattern.name
         self[pattern.label] = pattern
+        occurrence_cache.invalidate(pattern.label)
 
     def get_all_patterns(self) -> Dict[str, RecurrencePattern]:
         """Get all patterns"""
@@ -136,6 +141,7 @@ class PatternComponent(SystemComponent):
             between=between, on=on, except_between=except_between, groups=groups,
         )
         self._items[label] = pattern
+        occurrence_cache.invalidate(label)
         return pattern
 
     def remove_pattern(self, label: str) -> None:
@@ -143,6 +149,7 @@ class PatternComponent(SystemComponent):
         if label in self._items:
             del self._items[label]
             self._pattern_manager.remove(label)
+            occurrence_cache.invalidate(label)
 
     @property
     def patterns(self) -> Dict[str, RecurrencePattern]:
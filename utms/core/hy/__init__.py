@@ -1,3 +1,3 @@
 from .ast import HyAST
-from .evaluation import evaluate_hy_expression, evaluate_hy_file
+from .evaluation import compiled_expression_cache, evaluate_hy_expression, evaluate_hy_file
 from .resolvers import HyResolver
@@ -1,5 +1,11 @@
+import copy
+import hashlib
+import logging
+import os
+import threading
+from collections import OrderedDict
 from io import StringIO
-from typing import List, TYPE_CHECKING
+from typing import Dict, Hashable, List, Optional, Tuple, TYPE_CHECKING
 
 import hy
 
@@ -11,15 +17,98 @@ if TYPE_CHECKING:
 
 from .utils import format_expression
 
+DEFAULT_PARSE_CACHE_SIZE = 512
+
+
+class ParsedFileCache(LoggerMixin):
+    """
+    Process-wide LRU cache of parsed Hy files, shared by every HyAST.
+
+    An entry is keyed by the file's size, mtime, content hash and the plugin
+    registry version, so it is used only while both the file and the plugins
+    that parse it are unchanged. The cached nodes are private: `get()` returns
+    a deep copy, since loaders hand parts of the nodes (e.g. their
+    TypedValues) on to the models they build. Copying is still an order of
+    magnitude cheaper than reading and dispatching the expressions again.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_PARSE_CACHE_SIZE):
+        self.max_entries = max_entries
+        # path -> (key, nodes, header comments)
+        self._entries: "OrderedDict[str, Tuple[Hashable, List[HyNode], List[str]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, path: str, key: Hashable) -> Optional[Tuple[List["HyNode"], List[str]]]:
+        """Copies of the nodes and header comments cached for `path` under `key`, or None."""
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is None or entry[0] != key:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(path)
+            self.hits += 1
+        return copy.deepcopy(entry[1]), list(entry[2])
+
+    def put(
+        self, path: str, key: Hashable, nodes: List["HyNode"], header_comments: List[str]
+    ) -> None:
+        if self.max_entries <= 0:
+            return
+        try:
+            entry = (key, copy.deepcopy(nodes), list(header_comments))
+        except Exception as e:
+            self.logger.debug(f"Not caching parsed nodes of {path}: {e}")
+            return
+        with self._lock:
+            self._entries[path] = entry
+            self._entries.move_to_end(path)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+# Global parsed file cache instance
+parsed_file_cache = ParsedFileCache()
+
 
 class HyAST(LoggerMixin):
     """Base AST manager for Hy code."""
 
     def parse_file(self, filename: str) -> List["HyNode"]:
-        """Parse a Hy file into our AST."""
+        """
+        Parse a Hy file into our AST, reusing the nodes of an earlier parse of
+        the same file contents (see `ParsedFileCache`).
+        """
+        stat_result = os.stat(filename)
         with open(filename) as f:
             content = f.read()
 
+        path = os.path.abspath(filename)
+        key = (
+            stat_result.st_size,
+            stat_result.st_mtime_ns,
+            hashlib.blake2b(content.encode("utf-8"), digest_size=16).hexdigest(),
+            plugin_registry.version,
+        )
+        cached = parsed_file_cache.get(path, key)
+        if cached is not None:
+            nodes, self.header_comments = cached
+            return nodes
+
+        nodes = self._parse_content(content, filename)
+        parsed_file_cache.put(path, key, nodes, self.header_comments)
+        return nodes
+
+    def _parse_content(self, content: str, filename: str) -> List["HyNode"]:
         lines = content.split("\n")
 
         # Store header comments
@@ -58,13 +147,12 @@ class HyAST(LoggerMixin):
         """Convert Hy expressions into our AST nodes."""
         nodes = []
         self.logger.debug("Parsing %s expressions", len(expressions))
+        dispatch = plugin_registry.node_dispatch()
 
         for expr in expressions:
             if isinstance(expr, hy.models.Expression):
                 expr_type = str(expr[0])
-                self.logger.debug("Looking for plugin for expression type: %s", expr_type)
-                self.logger.debug("Available plugins: %s", plugin_registry.list_node_plugins())
-                plugin = plugin_registry.get_node_plugin(expr_type)
+                plugin = dispatch.get(expr_type)
                 if plugin:
                     self.logger.debug("Found plugin for %s %s", expr_type, plugin)
                     try:
@@ -80,7 +168,10 @@ class HyAST(LoggerMixin):
                         self.logger.error(traceback.format_exc())
                 else:
                     self.logger.warning(f"No plugin found for expression type: {expr_type}")
-                    self.logger.debug("Available plugins: %s", plugin_registry.list_node_plugins())
+                    if self.logger.isEnabledFor(logging.DEBUG):
+                        self.logger.debug(
+                            "Available plugins: %s", plugin_registry.list_node_plugins()
+                        )
 
         return nodes
 
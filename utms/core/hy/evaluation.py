@@ -1,9 +1,15 @@
+import sys
+import threading
 import uuid
+from collections import OrderedDict
+from types import CodeType
+from typing import Any, Dict, Hashable, Optional, Tuple
 
 import hy
-from hy.compiler import hy_eval
+from hy.compiler import hy_compile, hy_eval
 
 from utms.core.logger import get_logger
+from utms.core.mixins import ServiceMixin
 from utms.utms_types.hy.types import (
     EvaluatedResult,
     ExpressionList,
@@ -16,6 +22,128 @@ from utms.utms_types.hy.types import (
 
 logger = get_logger()
 
+DEFAULT_COMPILED_CACHE_SIZE = 2048
+
+CompiledExpression = Tuple[CodeType, CodeType]
+
+
+def structural_key(model: Any) -> Hashable:
+    """
+    A hashable key that is equal for structurally identical Hy models.
+
+    Model types are part of the key, since `Symbol("a") == String("a")` as far
+    as Python is concerned. Raises TypeError for trees that contain anything
+    other than Hy models, or unhashable ones.
+    """
+    model_type = type(model)
+    if isinstance(model, hy.models.FComponent):
+        return (model_type, model.conversion, tuple(structural_key(item) for item in model))
+    if isinstance(model, hy.models.Sequence):
+        return (model_type, tuple(structural_key(item) for item in model))
+    if isinstance(model, (hy.models.Float, hy.models.Complex)):
+        # 0.0 == -0.0, but they compile to different constants.
+        return (model_type, repr(model))
+    if isinstance(model, hy.models.Object):
+        return (model_type, model)
+    raise TypeError(f"Not a Hy model: {model_type.__name__}")
+
+
+class CompiledExpressionCache(ServiceMixin):
+    """
+    Bounded LRU cache of compiled Hy expressions, keyed by `structural_key()`.
+
+    Holds the two code objects `hy_eval` would build (the statement body and
+    the final expression), so evaluating a cached expression skips macro
+    expansion, Hy compilation and Python compilation and only runs bytecode
+    against the caller's locals.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_COMPILED_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, CompiledExpression]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.uncacheable = 0
+
+    def configure(self, max_entries: int) -> None:
+        with self._lock:
+            self.max_entries = max(0, int(max_entries))
+            self._evict_locked()
+
+    def compile(self, expr: Any) -> Optional[CompiledExpression]:
+        """The compiled form of `expr`, or None if it cannot be cached."""
+        try:
+            key = structural_key(expr)
+            hash(key)
+        except TypeError:
+            with self._lock:
+                self.uncacheable += 1
+            return None
+
+        with self._lock:
+            compiled = self._entries.get(key)
+            if compiled is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return compiled
+            self.misses += 1
+
+        compiled = _compile_expression(expr)
+        with self._lock:
+            self._entries[key] = compiled
+            self._evict_locked()
+        return compiled
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "uncacheable": self.uncacheable,
+            }
+
+    def _evict_locked(self) -> None:
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+
+def _compile_expression(expr: Any) -> CompiledExpression:
+    # The same compilation hy_eval performs when called from this module.
+    filename = getattr(expr, "filename", None) or "<string>"
+    body, final_expr = hy_compile(
+        expr,
+        sys.modules[__name__],
+        get_expr=True,
+        filename=filename,
+        source=getattr(expr, "source", None),
+    )
+    return compile(body, filename, "exec"), compile(final_expr, filename, "eval")
+
+
+# Global cache instance
+compiled_expression_cache = CompiledExpressionCache()
+
+
+def _eval_compiled(expr: Any, locals_dict: LocalsDict) -> EvaluatedResult:
+    """`hy_eval(expr, locals_dict)`, reusing the compiled code of identical expressions."""
+    compiled = compiled_expression_cache.compile(expr)
+    if compiled is None:
+        return hy_eval(expr, locals_dict)
+    body, final_expr = compiled
+    module_globals = globals()
+    eval(body, module_globals, locals_dict)
+    return eval(final_expr, module_globals, locals_dict)
+
 
 def evaluate_hy_file(hy_file_path: str) -> ExpressionList:
     """Evaluates the HyLang file and returns the resulting data structures."""
@@ -50,7 +178,7 @@ def evaluate_hy_expression(expr: HyExpression, locals_dict: LocalsDict = None) -
             return handle_dot_operator(expr, locals_dict)
 
     try:
-        result = hy_eval(expr, locals_dict)
+        result = _eval_compiled(expr, locals_dict)
         logger.debug("Evaluation result: %s", result)
         return result
     except Exception as e:
@@ -113,7 +241,7 @@ def handle_expression_with_dot(expr, locals_dict):
 
         
         try:
-            return hy_eval(hy.models.Expression(processed_elements), locals_dict)
+            return _eval_compiled(hy.models.Expression(processed_elements), locals_dict)
         except Exception as e:
             logger.error(f"Error evaluating processed expression: {e}")
             
@@ -0,0 +1,183 @@
+from enum import IntEnum
+from typing import Any, Optional
+
+import hy
+
+
+class Purity(IntEnum):
+    """
+    What the value of a Hy expression depends on, from most to least cacheable.
+    Combining sub-expressions keeps the highest level.
+    """
+
+    PURE = 0  # Only literals and the values of the names it references.
+    TIME_DEPENDENT = 1  # Also the current time.
+    SIDE_EFFECTING = 2  # Anything else: effects, external or mutable state, unknown calls.
+
+
+def _both_spellings(*names: str) -> frozenset:
+    return frozenset(names) | frozenset(name.replace("-", "_") for name in names)
+
+
+# Calls whose result depends only on their arguments.
+PURE_CALLS = _both_spellings(
+    "+",
+    "-",
+    "*",
+    "/",
+    "//",
+    "%",
+    "**",
+    "abs",
+    "round",
+    "min",
+    "max",
+    "sum",
+    "divmod",
+    "=",
+    "!=",
+    "<",
+    ">",
+    "<=",
+    ">=",
+    "is",
+    "is-not",
+    "in",
+    "not-in",
+    "and",
+    "or",
+    "not",
+    "if",
+    "when",
+    "unless",
+    "cond",
+    "do",
+    "str",
+    "int",
+    "float",
+    "bool",
+    "Decimal",
+    "list",
+    "dict",
+    "tuple",
+    "set",
+    "frozenset",
+    "len",
+    "sorted",
+    "reversed",
+    "range",
+    "get",
+    "hy.repr",
+    "datetime",
+    "date",
+    "timedelta",
+    "entity-ref",
+)
+
+# Calls that read the clock.
+TIME_DEPENDENT_CALLS = _both_spellings(
+    "get-ntp-date",
+    "current-time",
+    "now",
+    "today",
+    "datetime.now",
+    "datetime.today",
+    "datetime.utcnow",
+    "date.today",
+    "time.time",
+    "time.time-ns",
+    "time.monotonic",
+    "time.localtime",
+    "time.gmtime",
+)
+
+# Calls with effects outside the expression, or reading mutable state.
+# Unknown calls are treated the same way; these are listed to document intent.
+SIDE_EFFECTING_CALLS = _both_spellings(
+    "shell",
+    "http-get",
+    "execute-on",
+    "notify",
+    "speak",
+    "log-metric",
+    "start-occurrence",
+    "end-occurrence",
+    "create-entity",
+    "update-entity-attribute",
+    "get-attr",
+    "print",
+    "setv",
+    "import",
+    "require",
+    "eval",
+    "hy.eval",
+    "random",
+)
+
+_LITERAL_FORMS = frozenset({"quote", "quasiquote"})
+
+
+def _dotted_name(expr: Any) -> Optional[str]:
+    """`datetime.now` for the `(. datetime now)` that Hy reads `datetime.now` as."""
+    if (
+        isinstance(expr, hy.models.Expression)
+        and len(expr) >= 3
+        and expr[0] == hy.models.Symbol(".")
+        and all(isinstance(part, hy.models.Symbol) for part in expr[1:])
+    ):
+        return ".".join(str(part) for part in expr[1:])
+    return None
+
+
+def _classify_call(head: Any) -> Purity:
+    name = _dotted_name(head) if isinstance(head, hy.models.Expression) else None
+    if name is None and isinstance(head, hy.models.Symbol):
+        name = str(head)
+    if name is None:
+        return Purity.SIDE_EFFECTING
+    if name in TIME_DEPENDENT_CALLS:
+        return Purity.TIME_DEPENDENT
+    if name in PURE_CALLS:
+        return Purity.PURE
+    return Purity.SIDE_EFFECTING
+
+
+def classify(expr: Any) -> Purity:
+    """
+    Statically classify a Hy model by what its value depends on.
+
+    Symbols count as references to names whose values the caller keys a cache
+    on, so `(* hourly-rate 2)` is pure. Attribute reads (`current-time.year`)
+    are pure unless they name a clock function. Calls are classified by their
+    head; calls to anything not known to be pure or time-dependent, including
+    method calls, are side-effecting.
+    """
+    if isinstance(expr, hy.models.Expression):
+        if not expr:
+            return Purity.PURE
+        head = expr[0]
+        if isinstance(head, hy.models.Symbol) and str(head) in _LITERAL_FORMS:
+            return Purity.PURE
+        dotted = _dotted_name(expr)
+        if dotted is not None:
+            return Purity.TIME_DEPENDENT if dotted in TIME_DEPENDENT_CALLS else Purity.PURE
+        if isinstance(head, hy.models.Symbol) and str(head) == ".":
+            if len(expr) >= 3 and all(isinstance(part, hy.models.Symbol) for part in expr[2:]):
+                # Attribute read on a computed object, e.g. `(. (datetime.now) year)`.
+                return classify(expr[1])
+            # Method call through the dot form, e.g. `(. obj (method arg))`.
+            return Purity.SIDE_EFFECTING
+        purity = _classify_call(head)
+        for arg in expr[1:]:
+            if purity is Purity.SIDE_EFFECTING:
+                break
+            purity = max(purity, classify(arg))
+        return Purity(purity)
+    if isinstance(expr, hy.models.Sequence):
+        purity = Purity.PURE
+        for item in expr:
+            if purity is Purity.SIDE_EFFECTING:
+                break
+            purity = max(purity, classify(item))
+        return Purity(purity)
+    return Purity.PURE
@@ -7,6 +7,7 @@ import hy
 from hy.compiler import hy_eval
 
 from utms.core.hy import evaluate_hy_expression
+from utms.core.hy.scope import MISSING, HyScope
 from utms.core.hy.utils import is_dynamic_content
 from utms.core.mixins import ResolverMixin
 from utms.core.hy.converter import converter
@@ -80,11 +81,16 @@ class HyResolver(ResolverMixin):
         # Create dynamic expression info first
         dynamic_info = DynamicExpressionInfo(original=expr, is_dynamic=is_dynamic_content(expr))
         self.logger.debug(
-            f"HyResolver.resolve: expr='{expr}', type(expr)='{type(expr)}', is_dynamic='{dynamic_info.is_dynamic}'"
+            "HyResolver.resolve: expr='%s', type(expr)='%s', is_dynamic='%s'",
+            expr,
+            type(expr),
+            dynamic_info.is_dynamic,
         )
 
+        started = time.perf_counter()
         try:
-            resolved_value = self._resolve_value(expr, context, local_names)
+            scope = self.build_scope(context, local_names)
+            resolved_value = self._resolve_value(expr, context, scope)
             dynamic_info.add_evaluation(
                 resolved_value,
                 original_expr=expr,
@@ -92,8 +98,9 @@ class HyResolver(ResolverMixin):
                     "context_type": str(type(context).__name__) if context else None,
                     "local_names_keys": list(local_names.keys()) if local_names else None,
                 },
+                duration=time.perf_counter() - started,
             )
-            self.logger.debug(f"HyResolver.resolve: SUCCESS, resolved_value='{resolved_value}'")
+            self.logger.debug("HyResolver.resolve: SUCCESS, resolved_value='%s'", resolved_value)
             return resolved_value, dynamic_info
         except Exception as e:
             self.logger.error(f"HyResolver.resolve: FAILED for expr='{expr}': {e}", exc_info=True)
@@ -101,6 +108,7 @@ class HyResolver(ResolverMixin):
                 None,
                 original_expr=expr,
                 metadata={"error_type": type(e).__name__, "error_message": str(e)},
+                duration=time.perf_counter() - started,
             )
             raise
 
@@ -108,7 +116,7 @@ class HyResolver(ResolverMixin):
         self, expr: "HyValue", context: "Context" = None, local_names: "LocalsDict" = None
     ) -> "ResolvedValue":
         from utms.utms_types import HySymbol, HyExpression, HyList, HyDict, HyKeyword
-        self.logger.debug(f"HyResolver._resolve_value: expr='{expr}' (type: {type(expr)})")
+        self.logger.debug("HyResolver._resolve_value: expr='%s' (type: %s)", expr, type(expr))
 
         if isinstance(expr, hy.models.String):
             return str(expr)
@@ -159,20 +167,33 @@ class HyResolver(ResolverMixin):
         `component_context`: 'self' or other component-specific objects.
         `local_scope_names`: Variables defined in the current scope (e.g., from let bindings or previous defs).
         """
-        full_locals = {**self.default_globals}
-        full_locals.update(self.get_additional_globals() or {})
-
-        if isinstance(component_context, dict):
-            full_locals.update(component_context)
-        elif component_context is not None:
-            full_locals["self"] = component_context
-
-        if local_scope_names:
-            full_locals.update(local_scope_names)
-
+        full_locals = self._layered_scope(component_context, local_scope_names).to_dict()
         self.logger.debug(f"HyResolver.get_locals_dict: final keys: {list(full_locals.keys())}")
         return full_locals
 
+    def build_scope(self, context: "Context", local_names: "LocalsDict" = None) -> HyScope:
+        """
+        The scope a whole `resolve()` call evaluates in. An existing HyScope is
+        passed through unchanged, so nested resolution never rebuilds it.
+        """
+        if isinstance(local_names, HyScope):
+            return local_names
+        if type(self).get_locals_dict is not HyResolver.get_locals_dict:
+            # The subclass assembles its own namespace; use it as a single layer.
+            return HyScope(self.get_locals_dict(context, local_names))
+        return self._layered_scope(context, local_names)
+
+    def _layered_scope(self, context: "Context", local_names: "LocalsDict" = None) -> HyScope:
+        if isinstance(context, dict):
+            context_layer = context
+        elif context is not None:
+            context_layer = {"self": context}
+        else:
+            context_layer = None
+        return HyScope(
+            self.default_globals, self.get_additional_globals(), context_layer, local_names
+        )
+
     def _resolve_symbol(
         self, sym: "HySymbol", context: "Context", local_names: "LocalsDict"
     ) -> "ResolvedValue":
@@ -183,7 +204,7 @@ class HyResolver(ResolverMixin):
         """
         from utms.utms_types import HyExpression, HySymbol, HyList, HyDict
         symbol_name = str(sym)
-        self.logger.debug(f"HyResolver._resolve_symbol: '{symbol_name}'")
+        self.logger.debug("HyResolver._resolve_symbol: '%s'", symbol_name)
         if symbol_name == "True":
             return True
         if symbol_name == "False":
@@ -191,19 +212,11 @@ class HyResolver(ResolverMixin):
         if symbol_name == "None":
             return None
 
-        evaluation_scope = self.get_locals_dict(context, local_names)
-
-        value_from_scope: Any = None
-        found_in_scope = False
+        evaluation_scope = self.build_scope(context, local_names)
+        # Falls back to the Pythonic (snake_case) name.
+        value_from_scope = evaluation_scope.lookup(symbol_name)
 
-        if symbol_name in evaluation_scope:
-            value_from_scope = evaluation_scope[symbol_name]
-            found_in_scope = True
-        elif symbol_name.replace("-", "_") in evaluation_scope:  # Check for Pythonic name
-            value_from_scope = evaluation_scope[symbol_name.replace("-", "_")]
-            found_in_scope = True
-
-        if found_in_scope:
+        if value_from_scope is not MISSING:
             self.logger.debug(
                 f"HyResolver._resolve_symbol: '{symbol_name}' found in scope, value_type: {type(value_from_scope)}, value: {value_from_scope}"
             )
@@ -211,7 +224,7 @@ class HyResolver(ResolverMixin):
                 self.logger.debug(
                     f"HyResolver._resolve_symbol: '{symbol_name}' resolved to another Hy object, recursing _resolve_value."
                 )
-                return self._resolve_value(value_from_scope, context, local_names)
+                return self._resolve_value(value_from_scope, context, evaluation_scope)
             else:
                 return value_from_scope
         else:
@@ -233,7 +246,7 @@ class HyResolver(ResolverMixin):
         Helper to fully resolve an argument expression to its Python native value.
         `current_scope_locals` is the dictionary of names for the *current* expression's evaluation.
         """
-        self.logger.debug(f"HyResolver._resolve_argument_to_native: arg_expr='{arg_expr}'")
+        self.logger.debug("HyResolver._resolve_argument_to_native: arg_expr='%s'", arg_expr)
         resolved_arg = self._resolve_value(arg_expr, context, current_scope_locals)
         final_py_arg = converter.model_to_py(resolved_arg, raw=True)
         self.logger.debug(
@@ -249,14 +262,13 @@ class HyResolver(ResolverMixin):
         `local_names` are the variables/bindings available in the scope of `expr`.
         """
         from utms.utms_types import HySymbol, HyKeyword
-        self.logger.debug(
-            f"HyResolver._resolve_expression: expr='{expr}', local_names_keys: {list(local_names.keys()) if local_names else 'None'}"
-        )
+        self.logger.debug("HyResolver._resolve_expression: expr='%s'", expr)
+        current_scope_locals = self.build_scope(context, local_names)
         if len(expr) == 1 and isinstance(expr[0], HySymbol):
             self.logger.debug(
                 f"Resolving single-symbol expression {expr} as a direct symbol lookup."
             )
-            resolved_symbol_value = self._resolve_symbol(expr[0], context, local_names)
+            resolved_symbol_value = self._resolve_symbol(expr[0], context, current_scope_locals)
             if callable(resolved_symbol_value):
                 self.logger.debug(
                     f"Resolved single-symbol expression to a callable function '{resolved_symbol_value.__name__}'. Calling it."
@@ -269,7 +281,6 @@ class HyResolver(ResolverMixin):
                 "HyResolver._resolve_expression: Empty expression, returning empty list."
             )
             return []
-        current_scope_locals = self.get_locals_dict(context, local_names)
 
         first_element_expr = expr[0]
 
@@ -279,7 +290,7 @@ class HyResolver(ResolverMixin):
 
             obj_expr_to_resolve = expr[1]
             resolved_obj_intermediate = self._resolve_value(
-                obj_expr_to_resolve, context, local_names
+                obj_expr_to_resolve, context, current_scope_locals
             )
             py_obj = converter.model_to_py(
                 resolved_obj_intermediate,
@@ -335,7 +346,7 @@ class HyResolver(ResolverMixin):
                     f"HyResolver: Accessing dot-op attribute: {prop_name} on {py_obj}"
                 )
                 return method_or_attr
-        callable_candidate = self._resolve_value(first_element_expr, context, local_names)
+        callable_candidate = self._resolve_value(first_element_expr, context, current_scope_locals)
 
         py_callable = converter.model_to_py(callable_candidate, raw=True)
 
@@ -396,7 +407,7 @@ class HyResolver(ResolverMixin):
                 )
 
             try:
-                return evaluate_hy_expression(expr, current_scope_locals)
+                return evaluate_hy_expression(expr, current_scope_locals.to_dict())
             except Exception as e_fallback:
                 self.logger.error(
                     f"Fallback 'evaluate_hy_expression' failed for {expr}: {e_fallback}",
@@ -1,7 +1,6 @@
+import functools
 import subprocess
-import requests
 import json
-import paho.mqtt.publish as publish
 
 from types import SimpleNamespace
 from typing import Any, Dict, List, Optional, Union, TYPE_CHECKING
@@ -13,6 +12,9 @@ from utms.core.services.dynamic import (
     dynamic_resolution_service,
 )
 from utms.core.hy.converter import converter
+from utms.core.services.effects import effect_executor
+from utms.core.services.http import http_client
+from utms.core.services.mqtt import get_mqtt_publisher
 from utms.utils import get_ntp_date, get_timezone_from_seconds
 from utms.utms_types import (
     Context,
@@ -29,6 +31,12 @@ from utms.utms_types import (
 if TYPE_CHECKING:
     from utms.core.components.entities import EntityComponent
 
+# Commands are fire-and-forget by default, as they were before the shared
+# connection; setting the "mqtt-qos" config to 1 delivers them at least once,
+# so they survive a broker reconnect.
+DEFAULT_MQTT_COMMAND_QOS = 0
+
+
 class EntityResolver(HyResolver):
     """Resolver for entity expressions in Hy code."""
 
@@ -39,16 +47,16 @@ class EntityResolver(HyResolver):
         custom_functions = {
             "entity-ref": self._hy_entity_ref,
             "get-attr": self._hy_get_attr,
-            "shell": lambda *args, **kwargs: self._hy_shell(*args, **kwargs),
-            "http-get": lambda url, *args, **kwargs: requests.get(url, *args, **kwargs),
+            "shell": self._effect("shell", self._hy_shell),
+            "http-get": self._effect("http-get", self._hy_http_get),
             "log-metric": lambda category, name, value, **kwargs: self.component.log_metric(category, name, value, **kwargs),
             "start-occurrence": lambda type, cat, name: self.component.start_occurrence(type, cat, name),
             "end-occurrence": lambda type, cat, name, **kwargs: self.component.end_occurrence(type, cat, name, **kwargs),
             "create-entity": lambda type, cat, name, **kwargs: self.component.create_entity(name, type, category=cat, attributes_raw=kwargs.get("attributes", {})),
             "update-entity-attribute": lambda type, cat, name, attr, val: self.component.update_entity_attribute(type, cat, name, attr, val),
-            "execute-on": self._hy_execute_on,
-            "notify": self._hy_notify,
-            "speak": self._hy_speak,
+            "execute-on": self._effect("execute-on", self._hy_execute_on),
+            "notify": self._effect("notify", self._hy_notify),
+            "speak": self._effect("speak", self._hy_speak),
         }
         
         # Populate default_globals with both kebab-case and snake_case versions
@@ -56,23 +64,18 @@ class EntityResolver(HyResolver):
         for name, func in custom_functions.items():
             if "-" in name:
                 self.default_globals[name.replace("-", "_")] = func
+        self.default_globals.update(
+            {
+                "get_ntp_date": get_ntp_date,
+                "get_timezone": get_timezone_from_seconds,
+            }
+        )
 
-
-    def get_locals_dict(self, context: Context, local_names: LocalsDict = None) -> LocalsDict:
-        """Provide entity-specific context for Hy evaluation"""
-        locals_dict = super().get_locals_dict(context, local_names)
-
-        utility_functions = {
-            "get_ntp_date": get_ntp_date,
-            "get_timezone": get_timezone_from_seconds,
-        }
-
-        for k, v in utility_functions.items():
-            if k not in locals_dict:
-                locals_dict[k] = v
-
-        self.logger.debug("EntityResolver locals_dict keys: %s", list(locals_dict.keys()))
-        return locals_dict
+    def _effect(self, name: str, fn):
+        """`fn` as a Hy builtin that runs on the effect executor, bounded by its timeout."""
+        def call(*args, **kwargs):
+            return effect_executor.run(name, functools.partial(fn, *args, **kwargs))
+        return call
 
     def _hy_entity_ref(self, entity_type_str: str, category_str: str, name_str: str) -> str:
         """
@@ -245,6 +248,13 @@ class EntityResolver(HyResolver):
         else:
             return typed_value_attr.value
 
+    def _hy_http_get(self, url: str, *args, **kwargs):
+        """
+        (http-get url ...) takes the arguments of `requests.get`, plus
+        `:cache True` or `:ttl <seconds>` to reuse a cached response.
+        """
+        return http_client.get(url, *args, **kwargs)
+
     def _hy_shell(self, command_string: str, bg: bool = False):
         """
         Implementation for the (shell "...") Hy function.
@@ -271,6 +281,7 @@ class EntityResolver(HyResolver):
                     capture_output=True,
                     text=True,
                     encoding="utf-8",
+                    timeout=effect_executor.timeout,
                 )
                 if result.stdout:
                     self.logger.info(f"Shell command stdout: {result.stdout.strip()}")
@@ -283,6 +294,21 @@ class EntityResolver(HyResolver):
                 self.logger.error(f"Shell command failed with exit code {e.returncode}: {command_string}")
                 self.logger.error(f"Stderr: {e.stderr.strip()}")
                 raise e
+            except subprocess.TimeoutExpired as e:
+                self.logger.error(f"Shell command timed out after {e.timeout}s: {command_string}")
+                raise
+
+    def _publish_command(self, target_executor_id: str, command: str, payload: Dict[str, Any]) -> None:
+        """Queue a command for an executor on the shared connection to the configured broker."""
+        topic = f"utms/command/{target_executor_id}/{command}"
+        config_component = self.component.get_component("config")
+        broker = config_component.get_config("mqtt-broker").value.value
+        port = config_component.get_config("mqtt-port").value.value
+
+        payload_json = json.dumps(payload)
+        self.logger.info(f"Publishing to MQTT -> Topic: {topic}, Payload: {payload_json}")
+        qos = int(config_component.get_config_value("mqtt-qos", DEFAULT_MQTT_COMMAND_QOS))
+        get_mqtt_publisher(broker, port).publish(topic, payload_json, qos=qos)
 
     def _hy_execute_on(self, target_executor_id: str, command_string: str, blocking: bool = True):
         self.logger.info(f"Executing remote command on '{target_executor_id}': {command_string} (Blocking: {blocking})")
@@ -293,17 +319,8 @@ class EntityResolver(HyResolver):
             "command": command_string,
             "blocking": blocking
         }
-        topic = f"utms/command/{target_executor_id}/shell"
         try:
-            config_component = self.component.get_component("config")
-            broker = config_component.get_config("mqtt-broker").value.value
-            port = config_component.get_config("mqtt-port").value.value
-            
-            payload_json = json.dumps(command_payload)
-
-            self.logger.info(f"Publishing to MQTT -> Topic: {topic}, Payload: {payload_json}")
-            publish.single(topic, payload=payload_json, hostname=broker, port=port)
-            
+            self._publish_command(target_executor_id, "shell", command_payload)
             return f"Published command to {target_executor_id}"
         except Exception as e:
             self.logger.error(f"Failed to publish MQTT command for (execute-on): {e}", exc_info=True)
@@ -323,19 +340,8 @@ class EntityResolver(HyResolver):
             "title": title,
             "message": message
         }
-        
-        topic = f"utms/command/{target_executor_id}/notify"
-
         try:
-            config_component = self.component.get_component("config")
-            broker = config_component.get_config("mqtt-broker").value.value
-            port = config_component.get_config("mqtt-port").value.value
-            
-            payload_json = json.dumps(command_payload)
-
-            self.logger.info(f"Publishing to MQTT -> Topic: {topic}, Payload: {payload_json}")
-            publish.single(topic, payload=payload_json, hostname=broker, port=port)
-            
+            self._publish_command(target_executor_id, "notify", command_payload)
             return f"Sent notification to {target_executor_id}"
         except Exception as e:
             self.logger.error(f"Failed to publish MQTT notification: {e}", exc_info=True)
@@ -350,20 +356,9 @@ class EntityResolver(HyResolver):
         command_payload = {
             "message": message
         }
-        
-        topic = f"utms/command/{target_executor_id}/speak"
-
         try:
-            config_component = self.component.get_component("config")
-            broker = config_component.get_config("mqtt-broker").value.value
-            port = config_component.get_config("mqtt-port").value.value
-            
-            payload_json = json.dumps(command_payload)
-
-            self.logger.info(f"Publishing to MQTT -> Topic: {topic}, Payload: {payload_json}")
-            publish.single(topic, payload=payload_json, hostname=broker, port=port)
-            
+            self._publish_command(target_executor_id, "speak", command_payload)
             return f"Sent message to {target_executor_id}"
         except Exception as e:
             self.logger.error(f"Failed to publish MQTT message: {e}", exc_info=True)
-            raise        
+            raise
@@ -1,5 +1,3 @@
-import time
-from datetime import datetime
 from typing import TYPE_CHECKING
 
 from utms.core.hy.resolvers.base import HyResolver
@@ -25,24 +23,11 @@ if TYPE_CHECKING:
 class VariableResolver(HyResolver):
     def __init__(self) -> None:
         super().__init__()
-
-    def get_locals_dict(self, context: "Context", local_names: "LocalsDict" = None) -> "LocalsDict":
-        """
-        Provide variable-specific context for Hy evaluation.
-        This resolver's locals_dict will primarily get its context from the `context` parameter
-        (which comes from `DynamicResolutionService`).
-        """
-        locals_dict = super().get_locals_dict(context, local_names)
-
-        utility_functions = {
-            "datetime": datetime,
-            "time": time,
-            "get_ntp_date": get_ntp_date,
-            "get_timezone": get_timezone_from_seconds,
-        }
-        for k, v in utility_functions.items():
-            if k not in locals_dict:
-                locals_dict[k] = v
-
-        self.logger.debug("Locals dict contains: %s", locals_dict.keys())
-        return locals_dict
+        # Variables get their values through the `context` passed in by
+        # DynamicResolutionService; these are only fallbacks behind it.
+        self.default_globals.update(
+            {
+                "get_ntp_date": get_ntp_date,
+                "get_timezone": get_timezone_from_seconds,
+            }
+        )
@@ -0,0 +1,85 @@
+from functools import lru_cache
+from typing import Any, Dict, Iterator, Mapping, Optional, Tuple
+
+# Returned by `HyScope.lookup()` for names that are not bound.
+MISSING = object()
+
+
+@lru_cache(maxsize=4096)
+def python_name(name: str) -> str:
+    """The snake_case spelling of a kebab-case Hy name."""
+    return name.replace("-", "_")
+
+
+class HyScope(Mapping):
+    """
+    Immutable chain of name layers used to resolve Hy symbols.
+
+    Layers are given outermost first (globals, then context, then local names)
+    and inner layers shadow outer ones. Building a scope only stores references
+    to its layers, so the resolver can build one per `resolve()` call and hand
+    it down through every sub-expression. Layers are never mutated through the
+    scope; callers must not mutate them while it is in use either.
+    """
+
+    __slots__ = ("_layers", "_flat")
+
+    def __init__(self, *layers: Optional[Mapping[str, Any]]):
+        # Innermost first, which is the lookup order.
+        self._layers: Tuple[Mapping[str, Any], ...] = tuple(
+            layer for layer in reversed(layers) if layer
+        )
+        self._flat: Optional[Dict[str, Any]] = None
+
+    def child(self, bindings: Optional[Mapping[str, Any]]) -> "HyScope":
+        """A new scope with `bindings` shadowing this one."""
+        if not bindings:
+            return self
+        scope = HyScope()
+        scope._layers = (bindings,) + self._layers
+        return scope
+
+    def lookup(self, name: str) -> Any:
+        """
+        The value bound to `name`, or to its snake_case spelling if `name` itself
+        is unbound. Returns MISSING if neither is.
+        """
+        for layer in self._layers:
+            if name in layer:
+                return layer[name]
+        alias = python_name(name)
+        if alias != name:
+            for layer in self._layers:
+                if alias in layer:
+                    return layer[alias]
+        return MISSING
+
+    def to_dict(self) -> Dict[str, Any]:
+        """A new, mutable dict of every visible binding, e.g. as `hy_eval` locals."""
+        return dict(self._flattened())
+
+    def _flattened(self) -> Dict[str, Any]:
+        if self._flat is None:
+            flat: Dict[str, Any] = {}
+            for layer in reversed(self._layers):
+                flat.update(layer)
+            self._flat = flat
+        return self._flat
+
+    def __getitem__(self, name: str) -> Any:
+        for layer in self._layers:
+            if name in layer:
+                return layer[name]
+        raise KeyError(name)
+
+    def __contains__(self, name: object) -> bool:
+        return any(name in layer for layer in self._layers)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._flattened())
+
+    def __len__(self) -> int:
+        return len(self._flattened())
+
+    def __repr__(self) -> str:
+        return f"HyScope({len(self._layers)} layers)"
@@ -1,6 +1,6 @@
 from datetime import datetime
 from decimal import Decimal
-from typing import Any, List, Optional
+from typing import Any, List, Optional, Set
 
 import hy
 
@@ -22,6 +22,25 @@ def is_dynamic_content(value: Any) -> bool:
         return any(is_dynamic_content(x) for x in value)
     return False
 
+def collect_symbols(value: Any, symbols: Optional[Set[str]] = None) -> Set[str]:
+    """
+    Collect the names of all symbols referenced anywhere in a Hy model.
+
+    Dotted access contributes only its root (`current-time.year` -> `current-time`).
+    """
+    if symbols is None:
+        symbols = set()
+    if isinstance(value, hy.models.Symbol):
+        symbols.add(str(value))
+    elif isinstance(value, hy.models.Expression) and value and value[0] == hy.models.Symbol("."):
+        # `a.b.c` reads as `(. a b c)`: only the object is a reference.
+        if len(value) > 1:
+            collect_symbols(value[1], symbols)
+    elif isinstance(value, (hy.models.Sequence, list, tuple)):
+        for item in value:
+            collect_symbols(item, symbols)
+    return symbols
+
 def python_to_hy_string(value: Any) -> str:
     """Converts a PURE PYTHON value to a Hy string representation."""
     if isinstance(value, datetime):
@@ -9,6 +9,7 @@ from utms.core.hy.utils import is_dynamic_content, get_from_hy_dict
 from utms.core.loaders.base import ComponentLoader, LoaderContext
 from utms.core.managers.elements.entity import EntityManager
 from utms.core.models.elements.entity import Entity
+from utms.core.services.dependency import entity_token
 from utms.core.services.dynamic import DynamicResolutionService, dynamic_resolution_service
 from utms.utils import py_list_to_hy_expression, list_to_dict
 from utms.core.hy.converter import converter
@@ -18,6 +19,27 @@ from utms.utms_types.field.types import FieldType, TypedValue, infer_type
 if TYPE_CHECKING:
     from utms.core.components.elements.entity import EntityComponent
 
+# Marks the original of a dynamic attribute whose expression failed to evaluate.
+EVALUATION_ERROR_PREFIX = "EVALUATION_ERROR: "
+
+
+def is_evaluated_as_expression(typed_value: TypedValue) -> bool:
+    """
+    True if `EntityLoader.create_object()` evaluates this instance attribute as
+    one dynamic expression, i.e. it is dynamic, not quoted and not a list of
+    complex type items (whose items are evaluated one by one).
+    """
+    if (
+        typed_value.field_type == FieldType.LIST
+        and typed_value.item_schema_type
+        and isinstance(typed_value.value, list)
+    ):
+        return False
+    original_str = (typed_value.original or "").strip()
+    if original_str.startswith("'") or original_str.startswith("(quote"):
+        return False
+    return bool(typed_value.is_dynamic)
+
 def python_value_to_hy_repr_string_for_original(value: Any) -> str:
     """
     Creates a string representation of a Python value that resembles its
@@ -92,6 +114,52 @@ class EntityLoader(ComponentLoader[Entity, EntityManager]):
         return parsed_entity_definitions
 
 
+    def resolve_dynamic_attribute(
+        self,
+        entity_key: str,
+        attr_name: str,
+        typed_value: TypedValue,
+        expression: Any,
+        original: Optional[str],
+        context: Dict[str, Any],
+    ) -> TypedValue:
+        """
+        Evaluate `expression` as the dynamic attribute `attr_name` of `entity_key`.
+
+        The result keeps the type metadata of `typed_value`. If evaluation
+        fails, the error is logged and the attribute becomes a static None
+        whose original is marked with EVALUATION_ERROR_PREFIX.
+        """
+        try:
+            resolved_hybrid_value, _ = self._dynamic_service.evaluate(
+                expression=expression,
+                context=context,
+                component_type="entity_attribute",
+                component_label=entity_key,
+                attribute=attr_name,
+                provides=(entity_token(entity_key, attr_name),),
+            )
+            if attr_name == 'checklist':
+                resolved_python_value = converter.model_to_py_preserving_quoted_expressions(resolved_hybrid_value)
+            else:
+                resolved_python_value = converter.model_to_py(resolved_hybrid_value)
+            final_tv_props = typed_value.serialize()
+            final_tv_props['value'] = resolved_python_value
+            final_tv_props['is_dynamic'] = True
+            final_tv_props['original'] = original
+            return TypedValue.deserialize(final_tv_props)
+        except Exception as e:
+            self.logger.error(
+                f"Failed to dynamically evaluate attribute '{attr_name}' for entity '{entity_key}'. "
+                f"Original expression: '{original}'. Error: {e}"
+            )
+            return TypedValue(
+                value=None,
+                field_type=typed_value.field_type,
+                is_dynamic=False,
+                original=f"{EVALUATION_ERROR_PREFIX}{original}"
+            )
+
     def create_object(self, definition_processing_key: str, properties: Dict[str, Any]) -> Entity:
         entity_instance_name = properties["name"]
         entity_type_name_str = properties["entity_type_str"]
@@ -174,32 +242,14 @@ class EntityLoader(ComponentLoader[Entity, EntityManager]):
 
             elif initial_typed_value.is_dynamic:
                 self.logger.debug(f"  Evaluating dynamic attribute '{attr_name}': {original_str}")
-                try:
-                    resolved_hybrid_value, _ = self._dynamic_service.evaluate(
-                        expression=initial_typed_value.value,
-                        context={"self": self_object_for_eval, **global_variables_for_evaluation},
-                        component_type="entity_attribute",
-                        component_label=definition_processing_key,
-                        attribute=attr_name
-                    )
-                    if attr_name == 'checklist':
-                        resolved_python_value = converter.model_to_py_preserving_quoted_expressions(resolved_hybrid_value)
-                    else:
-                        resolved_python_value = converter.model_to_py(resolved_hybrid_value)
-                    final_tv_props = initial_typed_value.serialize()
-                    final_tv_props['value'] = resolved_python_value
-                    final_attributes_for_model[attr_name] = TypedValue.deserialize(final_tv_props)
-                except Exception as e:
-                    self.logger.error(
-                        f"Failed to dynamically evaluate attribute '{attr_name}' for entity '{definition_processing_key}'. "
-                        f"Original expression: '{initial_typed_value.original}'. Error: {e}"
-                    )
-                    final_attributes_for_model[attr_name] = TypedValue(
-                        value=None,
-                        field_type=initial_typed_value.field_type,
-                        is_dynamic=False,
-                        original=f"EVALUATION_ERROR: {initial_typed_value.original}"
-                    )
+                final_attributes_for_model[attr_name] = self.resolve_dynamic_attribute(
+                    definition_processing_key,
+                    attr_name,
+                    initial_typed_value,
+                    expression=initial_typed_value.value,
+                    original=initial_typed_value.original,
+                    context={"self": self_object_for_eval, **global_variables_for_evaluation},
+                )
             else:
                 attr_schema_details = entity_schema.get(raw_attr_name, {})
                 
@@ -7,6 +7,7 @@ from utms.core.hy.resolvers.elements.variable import VariableResolver
 from utms.core.loaders.base import ComponentLoader, LoaderContext
 from utms.core.managers.elements.variable import VariableManager
 from utms.core.models import Variable
+from utms.core.services.dependency import variable_token
 from utms.core.services.dynamic import DynamicResolutionService
 from utms.core.hy.converter import converter
 from utms.utms_types import HyNode
@@ -76,6 +77,7 @@ class VariableLoader(ComponentLoader[Variable, VariableManager]):
             attribute="value_load",
             expression=expression_to_evaluate,
             context=evaluation_context_for_resolver,
+            provides=(variable_token(key),),
         )
         resolved_value_for_model = converter.model_to_py(resolved_val_raw, raw=True)
         self.logger.debug(
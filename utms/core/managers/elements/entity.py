@@ -1,27 +1,262 @@
-from typing import Any, Dict, List, Optional, Union
+import itertools
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple, Union
 
 from utms.core.managers.base import BaseManager
 from utms.core.models.elements.entity import Entity
 from utms.utms_types import EntityManagerProtocol
 from utms.utms_types.field.types import TypedValue
 
+ACTIVE_OCCURRENCE_ATTRIBUTE = "active-occurrence-start-time"
+
+# An ordered set of entity keys. Plain dicts keep insertion order, so index
+# lookups return entities in the same order a scan of `_items` would.
+KeySet = Dict[str, None]
+
+
+@dataclass(frozen=True)
+class _IndexEntry:
+    """What an entity was indexed under, so it can be unindexed after it changed."""
+
+    entity_type: str
+    category: str
+    source_file: Optional[str]
+    active: bool
+    # (attribute name, value, hashable) for every indexed attribute the entity has
+    attribute_values: Tuple[Tuple[str, Any, bool], ...]
+
 
 class EntityManager(BaseManager[Entity], EntityManagerProtocol):  # Renamed
-    """Manages entities, now with category-aware unique keys."""
+    """
+    Manages entities, now with category-aware unique keys.
+
+    Besides the primary `_items` map, the manager maintains secondary indexes by
+    type, by (type, category), by source file, of entities with an active
+    occurrence and, for attributes whose schema declares `:indexed True`, by
+    attribute value. Managed entities report changes to their type, category,
+    name, source file and attributes back to the manager, which keeps the
+    indexes (and the composite key) consistent.
+    """
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs) 
         self._claimed_resources: Dict[str, str] = {}
+        self._index_entries: Dict[str, _IndexEntry] = {}
+        # Insertion sequence of each key, mirroring its position in `_items`.
+        self._sequence: Dict[str, int] = {}
+        self._sequence_counter = itertools.count()
+        self._keys_by_entity_id: Dict[int, str] = {}
+        self._by_type: Dict[str, KeySet] = {}
+        self._by_type_category: Dict[Tuple[str, str], KeySet] = {}
+        self._by_source_file: Dict[str, KeySet] = {}
+        self._active: KeySet = {}
+        self._indexed_attributes: Dict[str, Set[str]] = {}
+        self._by_attribute_value: Dict[Tuple[str, str], Dict[Any, KeySet]] = {}
+        self._unhashable_attribute_values: Dict[Tuple[str, str], KeySet] = {}
 
     def _generate_key(self, entity_type: str, category: str, name: str) -> str:
         """Helper to generate the consistent composite key."""
         return f"{entity_type.lower().strip()}:{category.lower().strip()}:{name.strip()}"
 
+    def add(self, label: str, item: Entity) -> None:
+        super().add(label, item)
+        self._sequence[label] = next(self._sequence_counter)
+        self._reindex(label, None, self._build_index_entry(item))
+        self._keys_by_entity_id[id(item)] = label
+        item._index_observer = self
+
+    def remove(self, label: str) -> Optional[Entity]:
+        entity = super().remove(label)
+        if entity is not None:
+            self._reindex(label, self._index_entries.get(label), None)
+            self._sequence.pop(label, None)
+            self._keys_by_entity_id.pop(id(entity), None)
+            entity._index_observer = None
+        return entity
+
+    def load_objects(self, objects: Dict[str, Entity]) -> None:
+        for label, entity in objects.items():
+            if label in self._items:
+                self.remove(label)
+            self.add(label, entity)
+        self._initialized = True
+
     def clear(self):
+        for entity in self._items.values():
+            entity._index_observer = None
         super().clear() 
         self._claimed_resources.clear()
+        self._index_entries.clear()
+        self._sequence.clear()
+        self._keys_by_entity_id.clear()
+        self._by_type.clear()
+        self._by_type_category.clear()
+        self._by_source_file.clear()
+        self._active.clear()
+        self._by_attribute_value.clear()
+        self._unhashable_attribute_values.clear()
         self.logger.debug("Cleared all entities and resource claims from EntityManager.")
 
+    def set_indexed_attributes(self, entity_type: str, attr_names: Iterable[str]) -> None:
+        """Declare which attributes of an entity type get a value index, and (re)build them."""
+        entity_type_key = entity_type.lower().strip()
+        self._indexed_attributes[entity_type_key] = {
+            str(attr_name).replace("_", "-") for attr_name in attr_names
+        }
+        for key in list(self._by_type.get(entity_type_key, {})):
+            self._reindex(key, self._index_entries.get(key), self._build_index_entry(self._items[key]))
+
+    def is_attribute_indexed(self, entity_type: str, attr_name: str) -> bool:
+        return str(attr_name).replace("_", "-") in self._indexed_attributes.get(
+            entity_type.lower().strip(), ()
+        )
+
+    # --- Index maintenance ---
+
+    def _build_index_entry(self, entity: Entity) -> _IndexEntry:
+        attribute_values = []
+        for attr_name in sorted(self._indexed_attributes.get(entity.entity_type, ())):
+            if not entity.has_attribute(attr_name):
+                continue
+            value = entity.get_attribute_value(attr_name)
+            try:
+                hash(value)
+                hashable = True
+            except TypeError:
+                hashable = False
+            attribute_values.append((attr_name, value, hashable))
+
+        return _IndexEntry(
+            entity_type=entity.entity_type,
+            category=entity.category,
+            source_file=entity.source_file,
+            active=entity.get_attribute_value(ACTIVE_OCCURRENCE_ATTRIBUTE) is not None,
+            attribute_values=tuple(attribute_values),
+        )
+
+    @staticmethod
+    def _add_to(index: Dict[Any, KeySet], index_key: Any, key: str) -> None:
+        index.setdefault(index_key, {})[key] = None
+
+    @staticmethod
+    def _discard_from(index: Dict[Any, KeySet], index_key: Any, key: str) -> None:
+        keys = index.get(index_key)
+        if keys is None:
+            return
+        keys.pop(key, None)
+        if not keys:
+            del index[index_key]
+
+    def _reindex(self, key: str, old: Optional[_IndexEntry], new: Optional[_IndexEntry]) -> None:
+        """
+        Move `key` from the index buckets of `old` to those of `new`. Either may be
+        None (on add and remove). Buckets that did not change are left alone, so
+        an entity keeps its position in them.
+        """
+        old_type = (old.entity_type, old.category) if old else None
+        new_type = (new.entity_type, new.category) if new else None
+        if old_type != new_type:
+            if old:
+                self._discard_from(self._by_type, old.entity_type, key)
+                self._discard_from(self._by_type_category, old_type, key)
+            if new:
+                self._add_to(self._by_type, new.entity_type, key)
+                self._add_to(self._by_type_category, new_type, key)
+
+        old_source = old.source_file if old else None
+        new_source = new.source_file if new else None
+        if old_source != new_source:
+            if old_source:
+                self._discard_from(self._by_source_file, old_source, key)
+            if new_source:
+                self._add_to(self._by_source_file, new_source, key)
+
+        if new and new.active:
+            self._active[key] = None
+        else:
+            self._active.pop(key, None)
+
+        old_values = [(old.entity_type,) + v for v in old.attribute_values] if old else []
+        new_values = [(new.entity_type,) + v for v in new.attribute_values] if new else []
+        for entity_type, attr_name, value, hashable in old_values:
+            if (entity_type, attr_name, value, hashable) in new_values:
+                continue
+            index_key = (entity_type, attr_name)
+            if hashable:
+                values = self._by_attribute_value.get(index_key, {})
+                self._discard_from(values, value, key)
+                if not values:
+                    self._by_attribute_value.pop(index_key, None)
+            else:
+                self._discard_from(self._unhashable_attribute_values, index_key, key)
+        for entity_type, attr_name, value, hashable in new_values:
+            if (entity_type, attr_name, value, hashable) in old_values:
+                continue
+            index_key = (entity_type, attr_name)
+            if hashable:
+                self._add_to(self._by_attribute_value.setdefault(index_key, {}), value, key)
+            else:
+                self._add_to(self._unhashable_attribute_values, index_key, key)
+
+        if new is None:
+            self._index_entries.pop(key, None)
+        else:
+            self._index_entries[key] = new
+
+    def _on_entity_changed(self, entity: Entity) -> None:
+        """
+        Called by a managed entity after one of its indexed fields or attributes
+        changed. Reindexes it and, if its identity changed (e.g. its category was
+        renamed), moves it to its new composite key.
+        """
+        key = self._keys_by_entity_id.get(id(entity))
+        if key is None or self._items.get(key) is not entity:
+            return
+
+        new_key = entity.get_identifier()
+        if new_key == key:
+            self._reindex(key, self._index_entries.get(key), self._build_index_entry(entity))
+            return
+
+        displaced = self._items.get(new_key)
+        if displaced is not None:
+            self.logger.warning(
+                f"Entity '{key}' now has the identifier '{new_key}' of an existing entity, "
+                f"which it replaces."
+            )
+            self.release_claims(displaced)
+            self.remove(new_key)
+        self._reindex(key, self._index_entries.get(key), None)
+        del self._items[key]
+        del self._sequence[key]
+        self._items[new_key] = entity
+        self._sequence[new_key] = next(self._sequence_counter)
+        self._keys_by_entity_id[id(entity)] = new_key
+        self._reindex(new_key, None, self._build_index_entry(entity))
+
+    def _entities_for(self, keys: Iterable[str], ordered: bool = False) -> List[Entity]:
+        """
+        Entities for index keys. With `ordered`, they come back in `_items` order,
+        for buckets whose own order follows attribute changes rather than insertion.
+        """
+        if ordered:
+            keys = sorted(keys, key=self._sequence.__getitem__)
+        return [self._items[key] for key in keys]
+
+    def _candidate_keys(
+        self, entity_type: Optional[str] = None, category: Optional[str] = None
+    ) -> Iterable[str]:
+        """Keys narrowed down by the type and (type, category) indexes."""
+        if entity_type:
+            entity_type_key = entity_type.lower().strip()
+            if category:
+                return self._by_type_category.get((entity_type_key, category.strip().lower()), {})
+            return self._by_type.get(entity_type_key, {})
+        if category:
+            category_key = category.strip().lower()
+            return [key for key in self._items if self._index_entries[key].category == category_key]
+        return self._items.keys()
+
     def create(
         self,
         name: str,
@@ -47,6 +282,7 @@ class EntityManager(BaseManager[Entity], EntityManagerProtocol):  # Renamed
             existing_entity_to_replace = self._items.get(generated_key)
             if existing_entity_to_replace:
                 self.release_claims(existing_entity_to_replace) 
+                self.remove(generated_key)
 
         entity = Entity(
             name=name_key,
@@ -62,10 +298,7 @@ class EntityManager(BaseManager[Entity], EntityManagerProtocol):  # Renamed
 
     def remove_by_source_file(self, source_filepath: str):
         """Removes all entities that originated from a specific file."""
-        keys_to_remove = [
-            key for key, entity in self._items.items()
-            if entity.source_file == source_filepath
-        ]
+        keys_to_remove = list(self._by_source_file.get(source_filepath, {}))
         if not keys_to_remove:
             return
 
@@ -103,13 +336,7 @@ class EntityManager(BaseManager[Entity], EntityManagerProtocol):  # Renamed
 
     def get_all_active_entities(self) -> List[Entity]:
         """Returns a list of all entities that currently have an active occurrence."""
-        active_entities = []
-        for entity in self._items.values():
-            # Assuming 'active_occurrence_start_time' is the indicator
-            # and its TypedValue.value will be a datetime object if active, or None if not.
-            if entity.get_attribute_value("active_occurrence_start_time") is not None:
-                active_entities.append(entity)
-        return active_entities
+        return self._entities_for(self._active, ordered=True)
 
     def register_claims(self, entity: Entity) -> None:
         """Registers the exclusive resource claims for the given entity."""
@@ -161,14 +388,11 @@ class EntityManager(BaseManager[Entity], EntityManagerProtocol):  # Renamed
         return self._claimed_resources.get(resource)
 
     def get_by_type(self, entity_type: str, category: Optional[str] = None) -> List[Entity]:
-        entity_type_key = entity_type.lower().strip()
-        entities_of_type = [
-            entity for entity in self._items.values() if entity.entity_type == entity_type_key
-        ]
-        if category:
-            category_key = category.strip().lower()
-            return [entity for entity in entities_of_type if entity.category == category_key]
-        return entities_of_type
+        return self._entities_for(self._candidate_keys(entity_type, category))
+
+    def get_by_source_file(self, source_filepath: str) -> List[Entity]:
+        """Returns the entities that were loaded from, or last saved to, a file."""
+        return self._entities_for(self._by_source_file.get(source_filepath, {}), ordered=True)
 
     def get_by_attribute(
         self,
@@ -180,17 +404,34 @@ class EntityManager(BaseManager[Entity], EntityManagerProtocol):  # Renamed
         """
         Get entities with a specific attribute value.
         Optionally filters by entity_type and category.
+
+        Uses the attribute's value index when the schema of `entity_type`
+        declares it indexed; otherwise scans the entities of the type/category.
         """
+        if entity_type and self.is_attribute_indexed(entity_type, attr_name):
+            index_key = (entity_type.lower().strip(), str(attr_name).replace("_", "-"))
+            try:
+                keys = list(self._by_attribute_value.get(index_key, {}).get(attr_value_to_match, {}))
+            except TypeError:  # unhashable value to match
+                keys = []
+            keys.extend(self._unhashable_attribute_values.get(index_key, {}))
+            category_key = category.strip().lower() if category else None
+            candidates = sorted(
+                (
+                    key for key in keys
+                    if category_key is None or self._index_entries[key].category == category_key
+                ),
+                key=self._sequence.__getitem__,
+            )
+        else:
+            candidates = self._candidate_keys(entity_type, category)
+
         results = []
-        for entity in self._items.values():
-            type_match = not entity_type or entity.entity_type == entity_type.lower()
-            category_match = not category or entity.category == category.strip().lower()
-            attr_match = (
+        for entity in self._entities_for(candidates):
+            if (
                 entity.has_attribute(attr_name)
                 and entity.get_attribute_value(attr_name) == attr_value_to_match
-            )
-
-            if type_match and category_match and attr_match:
+            ):
                 results.append(entity)
         return results
 
@@ -206,26 +447,20 @@ class EntityManager(BaseManager[Entity], EntityManagerProtocol):  # Renamed
         Optionally filters by entity_type and category.
         """
         results = []
-        for entity in self._items.values():
-            type_match = not entity_type or entity.entity_type == entity_type.lower()
-            category_match = not category or entity.category == category.strip().lower()
-            dynamic_match = (
+        for entity in self._entities_for(self._candidate_keys(entity_type, category)):
+            if (
                 entity.has_attribute(attr_name)
                 and entity.is_attribute_dynamic(attr_name) == is_dynamic
-            )
-
-            if type_match and category_match and dynamic_match:
+            ):
                 results.append(entity)
         return results
 
     def get_categories_for_entity_type(self, entity_type: str) -> List[str]:
         """Gets all unique category names for a given entity type."""
         entity_type_key = entity_type.lower()
-        categories = set()
-        for entity in self._items.values():
-            if entity.entity_type == entity_type_key:
-                categories.add(entity.category)
-        return sorted(list(categories))
+        return sorted(
+            category for (type_key, category) in self._by_type_category if type_key == entity_type_key
+        )
 
     def serialize(self) -> Dict[str, Dict[str, Any]]:
         """Convert all managed entities to a serializable dictionary format.
@@ -2,8 +2,17 @@ from utms.core.logger import get_logger
 
 
 class LoggerMixin:
+    # Empty so that slotted subclasses stay free of a per-instance __dict__.
+    __slots__ = ()
+
     @property
     def logger(self):
-        if not hasattr(self, "_logger"):
-            self._logger = get_logger(f"{self.__class__.__module__}.{self.__class__.__name__}")
-        return self._logger
+        try:
+            return self._logger
+        except AttributeError:
+            logger = get_logger(f"{self.__class__.__module__}.{self.__class__.__name__}")
+            try:
+                self._logger = logger
+            except AttributeError:
+                pass  # slotted subclass without room to cache it
+            return logger
@@ -2,4 +2,4 @@ from .base import LoggerMixin
 
 
 class ModelMixin(LoggerMixin):
-    pass
+    __slots__ = ()
@@ -7,15 +7,27 @@ from utms.utms_types.field.types import FieldType, TypedValue
 
 logger = get_logger()
 
+_UNSET = object()
 
-@dataclass
+
+@dataclass(slots=True)
 class Entity(ModelMixin):
     """
     Base class for all entities.
     Each attribute of a entity is stored as a TypedValue.
     Entities now also belong to a category.
+
+    An entity held by an EntityManager notifies it (through `_index_observer`)
+    whenever its identity fields or attributes change, so the manager's
+    secondary indexes never go stale.
+
+    Entities are slotted: a user can hold tens of thousands of them, and a
+    per-instance `__dict__` would be the largest part of each one.
     """
 
+    # Fields the owning manager indexes on; assigning to them notifies it.
+    _INDEXED_FIELDS = frozenset({"name", "entity_type", "category", "source_file"})
+
     name: str
     entity_type: str  # e.g., "task", "event"
 
@@ -23,6 +35,7 @@ class Entity(ModelMixin):
     category: str = field(default="default")
     source_file: Optional[str] = field(default=None, repr=False) 
     attributes: Dict[str, TypedValue] = field(default_factory=dict)
+    _index_observer: Any = field(default=None, init=False, repr=False, compare=False)
 
     def __post_init__(self):
         if self.attributes is None:
@@ -54,6 +67,20 @@ class Entity(ModelMixin):
             normalized_attributes[canonical_key] = val
         self.attributes = normalized_attributes
 
+    def __setattr__(self, name: str, value: Any) -> None:
+        if name not in self._INDEXED_FIELDS:
+            object.__setattr__(self, name, value)
+            return
+        previous = getattr(self, name, _UNSET)
+        object.__setattr__(self, name, value)
+        if previous is not _UNSET and previous != value:
+            self._notify_index_observer()
+
+    def _notify_index_observer(self) -> None:
+        observer = getattr(self, "_index_observer", None)
+        if observer is not None:
+            observer._on_entity_changed(self)
+
     def _normalize_key(self, key: str) -> str:
         """Converts any key to the canonical kebab-case form."""
         return str(key).replace('_', '-')
@@ -74,12 +101,13 @@ class Entity(ModelMixin):
             )
         canonical_name = self._normalize_key(attr_name)
         self.attributes[canonical_name] = typed_value
-
+        self._notify_index_observer()
 
     def remove_attribute(self, attr_name: str) -> None:
         canonical_name = self._normalize_key(attr_name)
         if canonical_name in self.attributes:
             del self.attributes[canonical_name]
+            self._notify_index_observer()
 
     def has_attribute(self, attr_name: str) -> bool:
         canonical_name = self._normalize_key(attr_name)
@@ -103,6 +131,7 @@ class Entity(ModelMixin):
             enum_choices=enum_choices_from_schema,
             item_type=item_type_from_schema,
         )
+        self._notify_index_observer()
 
     def is_attribute_dynamic(self, attr_name: str) -> bool:
         typed_value = self.attributes.get(attr_name)
@@ -6,10 +6,35 @@ from utms.core.hy.utils import is_dynamic_content, get_from_hy_dict
 from utms.core.mixins.base import LoggerMixin
 from utms.core.plugins import NodePlugin
 from utms.utms_types import HyNode
-from utms.utms_types.field.types import FieldType, TypedValue, infer_type
+from utms.utms_types.field.types import AttributeDescriptor, FieldType, TypedValue, infer_type
 from utms.core.hy.converter import converter
 
 
+def compile_attribute_schema(schema: Any) -> AttributeDescriptor:
+    """
+    The descriptor of an attribute's schema, read from the schema once per
+    entity type instead of once per instance. Its field_type is None if the
+    schema declares none, in which case each value's type is inferred.
+    """
+
+    def read(key: str, default: Any = None) -> Any:
+        return converter.model_to_py(get_from_hy_dict(schema, key, default=default), raw=True)
+
+    declared_type_str = read("type")
+    item_type_str = read("item_type")
+    return AttributeDescriptor.of(
+        field_type=FieldType.from_string(declared_type_str) if declared_type_str else None,
+        item_type=FieldType.from_string(item_type_str) if item_type_str else None,
+        enum_choices=read("enum_choices", default=[]),
+        item_schema_type=read("item_schema_type"),
+        referenced_entity_type=read("ref-type"),
+        referenced_entity_category=read("referenced_entity_category"),
+    )
+
+
+UNDECLARED_ATTRIBUTE = AttributeDescriptor.of(field_type=None)
+
+
 class DynamicEntityPlugin(NodePlugin, LoggerMixin):
     """
     Base class for dynamically generated plugins that parse specific entity instances
@@ -28,6 +53,8 @@ class DynamicEntityPlugin(NodePlugin, LoggerMixin):
         """
         self._entity_type_str = entity_type_str
         self._attribute_schemas = (attribute_schemas or {}).copy()
+        # Canonical attribute name -> compiled descriptor, filled on first use.
+        self._schemas: Dict[str, AttributeDescriptor] = {}
 
         self.logger.debug(
             f"Initialized DynamicEntityPlugin for type '{self._entity_type_str}' "
@@ -50,6 +77,16 @@ class DynamicEntityPlugin(NodePlugin, LoggerMixin):
     def initialize(self, system_context: Dict[str, Any]):
         pass
 
+    def _schema(self, attr_name: str) -> Optional[AttributeDescriptor]:
+        """The compiled descriptor of `attr_name`, or None if the type does not declare it."""
+        schema = self._schemas.get(attr_name)
+        if schema is None:
+            attr_schema_details = self._attribute_schemas.get(attr_name)
+            if not attr_schema_details:
+                return None
+            schema = self._schemas[attr_name] = compile_attribute_schema(attr_schema_details)
+        return schema
+
     def parse(self, expr: hy.models.Expression) -> Optional[HyNode]:
         """
         Parse an entity instance definition (e.g., a (def-task "My Task" (priority 10)) form).
@@ -66,8 +103,10 @@ class DynamicEntityPlugin(NodePlugin, LoggerMixin):
 
         entity_instance_name = str(expr[1])
         self.logger.debug(
-            f"Parsing {self.node_type} instance: '{entity_instance_name}' "
-            f"using schema for '{self._entity_type_str}'"
+            "Parsing %s instance: '%s' using schema for '%s'",
+            self.node_type,
+            entity_instance_name,
+            self._entity_type_str,
         )
 
         parsed_attributes_typed: Dict[str, TypedValue] = {}
@@ -76,45 +115,40 @@ class DynamicEntityPlugin(NodePlugin, LoggerMixin):
             if not (
                 isinstance(attr_expr_in_hy, hy.models.Expression) and len(attr_expr_in_hy) >= 2
             ):
-                self.logger.debug(f"  Skipping invalid attribute expression: {attr_expr_in_hy}")
+                self.logger.debug("  Skipping invalid attribute expression: %s", attr_expr_in_hy)
                 continue
 
             attr_name_from_hy = str(attr_expr_in_hy[0])
             raw_hy_value_object = attr_expr_in_hy[1]
             canonical_attr_name = attr_name_from_hy.replace('_', '-')
             
-            self.logger.debug(f"  Attribute from Hy: '{attr_name_from_hy}' (canonical: '{canonical_attr_name}') = {raw_hy_value_object}")
+            self.logger.debug(
+                "  Attribute from Hy: '%s' (canonical: '%s') = %s",
+                attr_name_from_hy,
+                canonical_attr_name,
+                raw_hy_value_object,
+            )
 
-            attr_schema_details = self._attribute_schemas.get(canonical_attr_name)
-            if not attr_schema_details:
+            schema = self._schema(canonical_attr_name)
+            if schema is None:
                 self.logger.warning(
-                    f"No schema definition found for attribute '{canonical_attr_name}' "
-                    f"in entity type '{self._entity_type_str}' (instance: '{entity_instance_name}'). "
-                    f"Will attempt to infer type, but this is not ideal."
+                    "No schema definition found for attribute '%s' in entity type '%s' "
+                    "(instance: '%s'). Will attempt to infer type, but this is not ideal.",
+                    canonical_attr_name,
+                    self._entity_type_str,
+                    entity_instance_name,
                 )
-                attr_schema_details = hy.models.Dict()
+                schema = UNDECLARED_ATTRIBUTE
 
-            declared_type_str = converter.model_to_py(get_from_hy_dict(attr_schema_details, "type"), raw=True)
-
-            field_type_enum: FieldType
-            if declared_type_str:
-                field_type_enum = FieldType.from_string(declared_type_str)
-            else:
+            if schema.field_type is None:
                 # Fallback if schema 'type' is missing (should be logged by schema parser ideally)
                 self.logger.warning(
-                    f"Missing schema 'type' for '{canonical_attr_name}' in '{self._entity_type_str}'. "
-                    f"Inferring type from value: {raw_hy_value_object}"
+                    "Missing schema 'type' for '%s' in '%s'. Inferring type from value: %s",
+                    canonical_attr_name,
+                    self._entity_type_str,
+                    raw_hy_value_object,
                 )
-                field_type_enum = infer_type(raw_hy_value_object)
-
-            item_type_str = converter.model_to_py(get_from_hy_dict(attr_schema_details, "item_type"), raw=True)
-            item_type_enum = FieldType.from_string(item_type_str) if item_type_str else None
-            enum_choices_from_schema = converter.model_to_py(get_from_hy_dict(attr_schema_details, "enum_choices", default=[]), raw=True)
-
-            item_schema_type_str = converter.model_to_py(get_from_hy_dict(attr_schema_details, "item_schema_type"), raw=True)
-            ref_type_from_schema = converter.model_to_py(get_from_hy_dict(attr_schema_details, "ref-type"), raw=True)
-            referenced_entity_type_str = ref_type_from_schema
-            referenced_entity_category_str = converter.model_to_py(get_from_hy_dict(attr_schema_details, "referenced_entity_category"), raw=True)
+                schema = schema.replace(field_type=infer_type(raw_hy_value_object))
 
             is_dynamic_attr = is_dynamic_content(raw_hy_value_object)
             original_expr_str_for_typed_value = None
@@ -124,14 +158,9 @@ class DynamicEntityPlugin(NodePlugin, LoggerMixin):
             try:
                 typed_value_for_attr = TypedValue(
                     value=raw_hy_value_object,
-                    field_type=field_type_enum,
-                    item_type=item_type_enum,
                     is_dynamic=is_dynamic_attr,
                     original=original_expr_str_for_typed_value,
-                    enum_choices=enum_choices_from_schema,
-                    item_schema_type=item_schema_type_str,
-                    referenced_entity_type=referenced_entity_type_str,
-                    referenced_entity_category=referenced_entity_category_str,
+                    descriptor=schema,
                 )
                 parsed_attributes_typed[canonical_attr_name] = typed_value_for_attr
             except Exception as e_typed_value:
@@ -149,8 +178,10 @@ class DynamicEntityPlugin(NodePlugin, LoggerMixin):
         setattr(node, "entity_type_name_str", self._entity_type_str)  # e.g., "task"
 
         self.logger.debug(
-            f"HyNode for '{entity_instance_name}' ({self.node_type}) parsed with "
-            f"{len(parsed_attributes_typed)} initial TypedValue attributes."
+            "HyNode for '%s' (%s) parsed with %s initial TypedValue attributes.",
+            entity_instance_name,
+            self.node_type,
+            len(parsed_attributes_typed),
         )
         return node
 
@@ -22,6 +22,12 @@ class PluginRegistry(LoggerMixin):
         self._active_node_plugins: Dict[str, NodePlugin] = {}
         self._active_generic_plugins: Dict[str, UTMSPlugin] = {}
 
+        # Bumped whenever the node plugins change, which changes how files parse.
+        self.version = 0
+        # Head symbol -> plugin instance, rebuilt when `version` changes.
+        self._dispatch: Dict[str, NodePlugin] = {}
+        self._dispatch_version = -1
+
     def has_plugin(self, node_type: str) -> bool:
         """Checks if a plugin for the given node_type is already registered."""
         return node_type in self._node_plugins
@@ -48,8 +54,10 @@ class PluginRegistry(LoggerMixin):
                 raise ValueError(f"Node plugin for {node_type} already registered")
 
             self._node_plugins[node_type] = plugin_class
+            self._active_node_plugins.pop(node_type, None)
+            self.version += 1
             self.logger.debug("Registered plugin class for %s", node_type)
-            self.logger.debug("Current plugins: %s", list(self._node_plugins.keys()))
+            self.logger.debug("Current plugins: %s", self._node_plugins.keys())
         except Exception as e:
             self.logger.error("Error registering plugin %s", e)
             import traceback
@@ -86,7 +94,7 @@ class PluginRegistry(LoggerMixin):
             Instantiated NodePlugin or None if not found
         """
         self.logger.debug("Looking for plugin for node_type %s", node_type)
-        self.logger.debug("Available plugins: %s", list(self._node_plugins.keys()))
+        self.logger.debug("Available plugins: %s", self._node_plugins.keys())
         plugin_class = self._node_plugins.get(node_type)
         if plugin_class:
             self.logger.debug("Found plugin class for %s: %s", node_type, plugin_class.__name__)
@@ -104,6 +112,24 @@ class PluginRegistry(LoggerMixin):
         self.logger.warning("No plugin found for node_type %s", node_type)
         return None
 
+    def node_dispatch(self) -> Dict[str, NodePlugin]:
+        """
+        Plugin instances by node type, for dispatching many expressions by
+        their head symbol without a lookup through `get_node_plugin` each.
+        The returned table must not be modified.
+        """
+        if self._dispatch_version != self.version:
+            version = self.version
+            dispatch = {}
+            for node_type in list(self._node_plugins):
+                instance = self._active_node_plugins.get(node_type)
+                if instance is None:
+                    instance = self.get_node_plugin(node_type)
+                if instance is not None:
+                    dispatch[node_type] = instance
+            self._dispatch, self._dispatch_version = dispatch, version
+        return self._dispatch
+
     def get_generic_plugin(self, plugin_name: str) -> Optional[UTMSPlugin]:
         """
         Retrieve a generic plugin by name.
@@ -139,6 +165,7 @@ class PluginRegistry(LoggerMixin):
         self._generic_plugins.clear()
         self._active_node_plugins.clear()
         self._active_generic_plugins.clear()
+        self.version += 1
 
 
 # Global singleton registry
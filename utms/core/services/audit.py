@@ -0,0 +1,335 @@
+import atexit
+import hashlib
+import json
+import logging
+import queue
+import random
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Deque, Dict, Iterable, List, Optional, Tuple, Union
+
+import hy
+
+from utms.core.logger import get_logger
+from utms.core.mixins import ServiceMixin
+
+DEFAULT_AUDIT_QUEUE_SIZE = 10000
+# Events the writer hands to the sinks at once.
+AUDIT_BATCH_SIZE = 256
+
+OUTCOME_EVALUATED = "evaluated"
+OUTCOME_MEMOIZED = "memoized"
+OUTCOME_ERROR = "error"
+
+
+@dataclass
+class AuditEvent:
+    """
+    One dynamic evaluation.
+
+    `expression` is kept as given; the writer thread fills in
+    `expression_hash`, and `source` when a sink asked for it, so that the
+    evaluating thread never formats the expression.
+    """
+
+    component_type: str
+    component_label: str
+    attribute: str
+    expression: Any
+    duration: float
+    outcome: str
+    level: int = logging.INFO
+    error: Optional[str] = None
+    timestamp: float = field(default_factory=time.time)
+    expression_hash: Optional[str] = None
+    source: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = {
+            "timestamp": datetime.fromtimestamp(self.timestamp).isoformat(),
+            "component_type": self.component_type,
+            "component_label": self.component_label,
+            "attribute": self.attribute,
+            "expression_hash": self.expression_hash,
+            "duration": self.duration,
+            "outcome": self.outcome,
+        }
+        if self.error is not None:
+            data["error"] = self.error
+        if self.source is not None:
+            data["source"] = self.source
+        return data
+
+
+def expression_hash(expression: Any) -> str:
+    """A short digest identifying `expression` across runs."""
+    return hashlib.blake2b(repr(expression).encode("utf-8"), digest_size=8).hexdigest()
+
+
+def expression_source(expression: Any) -> str:
+    try:
+        return hy.repr(expression)
+    except Exception:
+        return str(expression)
+
+
+class AuditSink(ABC):
+    """
+    Receives audit events from the writer thread. Subclasses implement
+    `write()`.
+
+    Only events at `level` or above reach the sink. Events below WARNING are
+    sampled at `sample_rate` (0 to 1); errors and warnings always pass. Set
+    `wants_source` to get the Hy source of the expression in `event.source`.
+    """
+
+    wants_source = False
+
+    def __init__(self, level: int = logging.INFO, sample_rate: float = 1.0):
+        self.level = level
+        self.sample_rate = sample_rate
+
+    def accepts(self, level: int) -> bool:
+        if level < self.level:
+            return False
+        if level >= logging.WARNING or self.sample_rate >= 1.0:
+            return True
+        return random.random() < self.sample_rate
+
+    @abstractmethod
+    def write(self, events: List[AuditEvent]) -> None:
+        """Record a batch of accepted events."""
+
+    def close(self) -> None:
+        pass
+
+
+class LoggingAuditSink(AuditSink):
+    """
+    Writes one log line per event; gated on the logger's own level too.
+    Successful evaluations are logged at DEBUG, so that every hook and
+    dynamic attribute does not add a line to the INFO log.
+    """
+
+    def __init__(
+        self,
+        logger: Optional[logging.Logger] = None,
+        level: int = logging.INFO,
+        sample_rate: float = 1.0,
+    ):
+        super().__init__(level, sample_rate)
+        self._logger = logger
+
+    @property
+    def logger(self) -> logging.Logger:
+        if self._logger is None:
+            self._logger = get_logger(__name__)
+        return self._logger
+
+    @staticmethod
+    def _log_level(level: int) -> int:
+        return level if level >= logging.WARNING else logging.DEBUG
+
+    def accepts(self, level: int) -> bool:
+        return self.logger.isEnabledFor(self._log_level(level)) and super().accepts(level)
+
+    def write(self, events: List[AuditEvent]) -> None:
+        for event in events:
+            self.logger.log(
+                self._log_level(event.level),
+                "Dynamic evaluation %s: %s -> %s.%s [%s] in %.3f ms%s",
+                event.outcome,
+                event.component_type,
+                event.component_label,
+                event.attribute,
+                event.expression_hash,
+                event.duration * 1000,
+                f" ({event.error})" if event.error else "",
+            )
+
+
+class JsonLinesAuditSink(AuditSink):
+    """Appends every event as a JSON line to `path`."""
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        level: int = logging.INFO,
+        sample_rate: float = 1.0,
+        include_source: bool = False,
+    ):
+        super().__init__(level, sample_rate)
+        self.path = Path(path)
+        self.wants_source = include_source
+
+    def write(self, events: List[AuditEvent]) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as f:
+            for event in events:
+                f.write(json.dumps(event.to_dict(), default=str) + "\n")
+
+
+class MemoryAuditSink(AuditSink):
+    """Keeps the last `max_events` events, e.g. for inspection or tests."""
+
+    def __init__(
+        self,
+        max_events: int = 1000,
+        level: int = logging.DEBUG,
+        sample_rate: float = 1.0,
+        include_source: bool = False,
+    ):
+        super().__init__(level, sample_rate)
+        self.events: Deque[AuditEvent] = deque(maxlen=max_events)
+        self.wants_source = include_source
+
+    def write(self, events: List[AuditEvent]) -> None:
+        self.events.extend(events)
+
+
+class AuditLog(ServiceMixin):
+    """
+    Structured audit trail of dynamic evaluations.
+
+    `record()` only decides which sinks want the event and puts it on a
+    bounded queue; a background thread, started on the first event, hashes
+    the expressions and hands the events to the sinks in batches. When the
+    queue is full new events are dropped and counted in `dropped`.
+    """
+
+    def __init__(
+        self,
+        sinks: Iterable[AuditSink] = (),
+        max_queue: int = DEFAULT_AUDIT_QUEUE_SIZE,
+    ):
+        self._sinks: Tuple[AuditSink, ...] = tuple(sinks)
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_queue)
+        self._writer: Optional[threading.Thread] = None
+        self._writer_lock = threading.Lock()
+        self.recorded = 0
+        self.dropped = 0
+
+    @property
+    def sinks(self) -> Tuple[AuditSink, ...]:
+        return self._sinks
+
+    def add_sink(self, sink: AuditSink) -> None:
+        self._sinks = self._sinks + (sink,)
+
+    def remove_sink(self, sink: AuditSink) -> None:
+        self._sinks = tuple(s for s in self._sinks if s is not sink)
+
+    def configure(self, level: Optional[int] = None, sample_rate: Optional[float] = None) -> None:
+        """Set the level and/or sample rate of every sink."""
+        for sink in self._sinks:
+            if level is not None:
+                sink.level = level
+            if sample_rate is not None:
+                sink.sample_rate = min(1.0, max(0.0, float(sample_rate)))
+
+    def record(
+        self,
+        component_type: str,
+        component_label: str,
+        attribute: str,
+        expression: Any,
+        duration: float,
+        outcome: str,
+        error: Optional[str] = None,
+    ) -> None:
+        sinks = self._sinks
+        if not sinks:
+            return
+        level = logging.ERROR if outcome == OUTCOME_ERROR else logging.INFO
+        targets = tuple(sink for sink in sinks if sink.accepts(level))
+        if not targets:
+            return
+        event = AuditEvent(
+            component_type, component_label, attribute, expression, duration, outcome, level, error
+        )
+        try:
+            self._queue.put_nowait((event, targets))
+        except queue.Full:
+            self.dropped += 1
+            return
+        self.recorded += 1
+        if self._writer is None:
+            self._start_writer()
+
+    def _start_writer(self) -> None:
+        with self._writer_lock:
+            if self._writer is not None:
+                return
+            self._writer = threading.Thread(target=self._run, name="utms-audit-writer", daemon=True)
+            self._writer.start()
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < AUDIT_BATCH_SIZE:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            self._write(batch)
+
+    def _write(self, batch: List[Any]) -> None:
+        by_sink: Dict[int, Tuple[AuditSink, List[AuditEvent]]] = {}
+        for item in batch:
+            if isinstance(item, threading.Event):
+                # Everything queued before a flush marker has been written.
+                self._deliver(by_sink)
+                by_sink = {}
+                item.set()
+                continue
+            event, targets = item
+            try:
+                event.expression_hash = expression_hash(event.expression)
+                if any(sink.wants_source for sink in targets):
+                    event.source = expression_source(event.expression)
+            except Exception as e:
+                self.logger.debug(f"Could not describe audited expression: {e}")
+            for sink in targets:
+                by_sink.setdefault(id(sink), (sink, []))[1].append(event)
+        self._deliver(by_sink)
+
+    def _deliver(self, by_sink: Dict[int, Tuple[AuditSink, List[AuditEvent]]]) -> None:
+        for sink, events in by_sink.values():
+            try:
+                sink.write(events)
+            except Exception as e:
+                self.logger.error(f"Audit sink {type(sink).__name__} failed: {e}")
+
+    def flush(self, timeout: Optional[float] = 5.0) -> bool:
+        """Wait until the queued events have been written. Returns False on timeout."""
+        if self._writer is None:
+            return True
+        done = threading.Event()
+        self._queue.put(done)
+        return done.wait(timeout)
+
+    def close(self) -> None:
+        self.flush()
+        for sink in self._sinks:
+            try:
+                sink.close()
+            except Exception as e:
+                self.logger.error(f"Error closing audit sink {type(sink).__name__}: {e}")
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "sinks": len(self._sinks),
+            "queued": self._queue.qsize(),
+            "recorded": self.recorded,
+            "dropped": self.dropped,
+        }
+
+
+# Global audit log instance
+audit_log = AuditLog(sinks=[LoggingAuditSink()])
+atexit.register(audit_log.flush, 1.0)
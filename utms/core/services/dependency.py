@@ -0,0 +1,181 @@
+import threading
+from collections import deque
+from typing import Any, Dict, FrozenSet, Hashable, Iterable, List, Optional, Set, Tuple
+
+import hy
+
+from utms.core.hy.utils import collect_symbols
+from utms.core.mixins.service import ServiceMixin
+
+_ENTITY_REF_HEADS = frozenset({"entity-ref", "entity_ref"})
+_GET_ATTR_HEADS = frozenset({"get-attr", "get_attr"})
+
+
+def variable_token(name: str) -> str:
+    """Dependency token of a variable (or any other symbol), in kebab-case."""
+    return name.replace("_", "-")
+
+
+def entity_token(entity_key: str, attribute: Optional[str] = None) -> str:
+    """
+    Dependency token of an entity (`entity:task:work:Review PR`) or of one of
+    its attributes (`entity:task:work:Review PR#status`).
+    """
+    if attribute is None:
+        return f"entity:{entity_key}"
+    return f"entity:{entity_key}#{variable_token(attribute)}"
+
+
+def _entity_ref_key(expr: Any) -> Optional[str]:
+    """The entity key of a literal `(entity-ref "type" "category" "name")`."""
+    if (
+        isinstance(expr, hy.models.Expression)
+        and len(expr) == 4
+        and isinstance(expr[0], hy.models.Symbol)
+        and str(expr[0]) in _ENTITY_REF_HEADS
+        and all(isinstance(arg, hy.models.String) for arg in expr[1:])
+    ):
+        entity_type, category, name = (str(arg) for arg in expr[1:])
+        # Same normalization as EntityManager keys.
+        return f"{entity_type.lower().strip()}:{category.lower().strip()}:{name.strip()}"
+    return None
+
+
+def _collect_entity_tokens(expr: Any, tokens: Set[str]) -> None:
+    if not isinstance(expr, hy.models.Sequence):
+        return
+    if isinstance(expr, hy.models.Expression) and expr:
+        entity_key = _entity_ref_key(expr)
+        if entity_key is not None:
+            tokens.add(entity_token(entity_key))
+            return
+        head = expr[0]
+        if (
+            isinstance(head, hy.models.Symbol)
+            and str(head) in _GET_ATTR_HEADS
+            and len(expr) == 3
+            and isinstance(expr[2], hy.models.String)
+        ):
+            target_key = _entity_ref_key(expr[1])
+            if target_key is not None:
+                tokens.add(entity_token(target_key, str(expr[2])))
+    for item in expr:
+        _collect_entity_tokens(item, tokens)
+
+
+def collect_dependencies(expr: Any) -> Set[str]:
+    """
+    Dependency tokens of a Hy expression.
+
+    Every symbol counts as a variable reference; literal `entity-ref` calls add
+    the referenced entity, and `get-attr` on one adds that attribute as well.
+    References computed at run time cannot be seen and are not included.
+    """
+    tokens = {variable_token(symbol) for symbol in collect_symbols(expr)}
+    _collect_entity_tokens(expr, tokens)
+    return tokens
+
+
+class DependencyGraph(ServiceMixin):
+    """
+    Which dynamic expressions depend on which names.
+
+    Each node (any hashable, e.g. a `(component_type, label, attribute)`
+    triple) declares the tokens it reads and the tokens its value provides.
+    `affected()` turns a set of changed tokens into the nodes that need
+    re-evaluation, ordered so that a node comes after every affected node it
+    depends on.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._depends_on: Dict[Hashable, FrozenSet[str]] = {}
+        self._provides: Dict[Hashable, FrozenSet[str]] = {}
+        self._dependents: Dict[str, Set[Hashable]] = {}
+
+    def set(self, node: Hashable, depends_on: Iterable[str], provides: Iterable[str] = ()) -> None:
+        """Record (or replace) the dependencies of `node`."""
+        with self._lock:
+            self._discard(node)
+            self._depends_on[node] = frozenset(depends_on)
+            self._provides[node] = frozenset(provides)
+            for token in self._depends_on[node]:
+                self._dependents.setdefault(token, set()).add(node)
+
+    def discard(self, node: Hashable) -> None:
+        with self._lock:
+            self._discard(node)
+
+    def _discard(self, node: Hashable) -> None:
+        for token in self._depends_on.pop(node, ()):
+            dependents = self._dependents.get(token)
+            if dependents is not None:
+                dependents.discard(node)
+                if not dependents:
+                    del self._dependents[token]
+        self._provides.pop(node, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._depends_on.clear()
+            self._provides.clear()
+            self._dependents.clear()
+
+    def depends_on(self, node: Hashable) -> FrozenSet[str]:
+        return self._depends_on.get(node, frozenset())
+
+    def provides(self, node: Hashable) -> FrozenSet[str]:
+        return self._provides.get(node, frozenset())
+
+    def __contains__(self, node: Hashable) -> bool:
+        return node in self._depends_on
+
+    def __len__(self) -> int:
+        return len(self._depends_on)
+
+    def affected(self, changed: Iterable[str]) -> Tuple[List[Hashable], List[Hashable]]:
+        """
+        Nodes depending, directly or transitively, on any `changed` token.
+
+        Returns `(ordered, cyclic)`: `ordered` is a topological order of the
+        affected nodes that are not part of a dependency cycle; `cyclic` holds
+        the nodes on a cycle or depending on one, which cannot be ordered.
+        """
+        with self._lock:
+            affected: Set[Hashable] = set()
+            pending = deque(changed)
+            seen_tokens: Set[str] = set()
+            while pending:
+                token = pending.popleft()
+                if token in seen_tokens:
+                    continue
+                seen_tokens.add(token)
+                for node in self._dependents.get(token, ()):
+                    if node not in affected:
+                        affected.add(node)
+                        pending.extend(self._provides[node])
+
+            # Kahn's algorithm over the affected subgraph.
+            successors: Dict[Hashable, Set[Hashable]] = {node: set() for node in affected}
+            in_degree: Dict[Hashable, int] = dict.fromkeys(affected, 0)
+            for node in affected:
+                for token in self._provides[node]:
+                    for dependent in self._dependents.get(token, ()):
+                        if dependent in affected and dependent not in successors[node]:
+                            successors[node].add(dependent)
+                            in_degree[dependent] += 1
+
+        ready = deque(node for node, degree in in_degree.items() if degree == 0)
+        ordered: List[Hashable] = []
+        while ready:
+            node = ready.popleft()
+            ordered.append(node)
+            for dependent in successors[node]:
+                in_degree[dependent] -= 1
+                if in_degree[dependent] == 0:
+                    ready.append(dependent)
+
+        cyclic = [node for node, degree in in_degree.items() if degree > 0]
+        if cyclic:
+            self.logger.error(f"Dependency cycle among dynamic expressions: {cyclic}")
+        return ordered, cyclic
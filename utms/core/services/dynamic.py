@@ -1,6 +1,9 @@
+import logging
+import sys
+import time
 from dataclasses import dataclass, field
-from datetime import datetime
-from typing import Any, Dict, Optional, Tuple
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
 
 import hy
 from hy.models import Expression, Symbol
@@ -8,13 +11,46 @@ from hy.models import Expression, Symbol
 from utms.core.hy import evaluate_hy_expression
 from utms.core.hy.resolvers.base import HyResolver
 from utms.core.hy.resolvers.elements.variable import VariableResolver
+from utms.core.hy.scope import MISSING
+from utms.core.hy.utils import is_dynamic_content
 from utms.core.mixins.service import ServiceMixin
+from utms.core.services.audit import (
+    OUTCOME_ERROR,
+    OUTCOME_EVALUATED,
+    OUTCOME_MEMOIZED,
+    AuditLog,
+    audit_log,
+)
+from utms.core.services.dependency import DependencyGraph, collect_dependencies
+from utms.core.services.memo import ExpressionMemo
 from utms.utms_types import DynamicExpressionInfo, HyExpression
+from utms.utms_types.hy.types import DEFAULT_HISTORY_SIZE
+
+
+def _record_size(record) -> int:
+    """Shallow estimate of the memory held by an evaluation record"""
+    return (
+        sys.getsizeof(record)
+        + sys.getsizeof(record.value)
+        + sys.getsizeof(record.metadata)
+        + sys.getsizeof(record.record_id)
+    )
 
 
 @dataclass
 class DynamicRegistry:
+    """
+    Dynamic expressions by component type, label and attribute.
+
+    Registering an expression for a slot that already has one carries the
+    earlier evaluations over, so the counters of a slot cover all of its
+    evaluations. Retention is bounded per slot: at most `max_history` records
+    (None for no limit), none older than `max_age` (None for no limit).
+    """
+
     _data: Dict[str, Dict[str, Dict[str, DynamicExpressionInfo]]] = field(default_factory=dict)
+    max_history: Optional[int] = DEFAULT_HISTORY_SIZE
+    max_age: Optional[timedelta] = None
 
     def add(
         self,
@@ -28,7 +64,54 @@ class DynamicRegistry:
             self._data[component_type] = {}
         if component_label not in self._data[component_type]:
             self._data[component_type][component_label] = {}
-        self._data[component_type][component_label][attribute] = dynamic_info
+        attributes = self._data[component_type][component_label]
+        dynamic_info.set_max_history(self.max_history)
+        previous = attributes.get(attribute)
+        if previous is not None:
+            dynamic_info.absorb(previous)
+        if self.max_age is not None:
+            dynamic_info.expire(datetime.now() - self.max_age)
+        attributes[attribute] = dynamic_info
+
+    def configure(
+        self,
+        max_history: Optional[int] = DEFAULT_HISTORY_SIZE,
+        max_age: Optional[timedelta] = None,
+    ) -> None:
+        """Change the retention limits, applying them to the registered expressions"""
+        self.max_history = max_history
+        self.max_age = max_age
+        for _, _, _, dynamic_info in self:
+            dynamic_info.set_max_history(max_history)
+        self.expire()
+
+    def expire(self, now: Optional[datetime] = None) -> int:
+        """Drop the records older than `max_age`. Returns how many were dropped."""
+        if self.max_age is None:
+            return 0
+        before = (now or datetime.now()) - self.max_age
+        return sum(dynamic_info.expire(before) for _, _, _, dynamic_info in self)
+
+    def memory_stats(self) -> Dict[str, Any]:
+        """What the registry holds, with a rough size of the retained records"""
+        stats = {
+            "component_types": len(self._data),
+            "components": sum(len(labels) for labels in self._data.values()),
+            "expressions": 0,
+            "retained_records": 0,
+            "approx_record_bytes": 0,
+            "evaluations": 0,
+            "errors": 0,
+            "max_history": self.max_history,
+            "max_age_seconds": self.max_age.total_seconds() if self.max_age else None,
+        }
+        for _, _, _, dynamic_info in self:
+            stats["expressions"] += 1
+            stats["retained_records"] += len(dynamic_info.history)
+            stats["approx_record_bytes"] += sum(map(_record_size, dynamic_info.history))
+            stats["evaluations"] += dynamic_info.evaluation_count
+            stats["errors"] += dynamic_info.error_count
+        return stats
 
     def get(
         self, component_type: str, component_label: str, attribute: str
@@ -87,17 +170,33 @@ class DynamicResolutionService(ServiceMixin):
     - Coordinate dynamic expression resolution across different component types
     - Provide a unified interface for re-evaluation
     - Track and manage dynamic expressions
+    - Track what each expression depends on, so that a change re-evaluates
+      only the expressions it affects
+    - Memoize the results of pure and time-dependent expressions
+    - Keep a bounded evaluation history and aggregate counters per expression
+    - Report every evaluation to an audit log (see `utms.core.services.audit`)
     """
 
-    def __init__(self, resolver: Optional[HyResolver] = None):
+    def __init__(
+        self,
+        resolver: Optional[HyResolver] = None,
+        memo: Optional[ExpressionMemo] = None,
+        audit: Optional[AuditLog] = None,
+    ):
         """
         Initialize the dynamic resolution service
 
         Args:
             resolver: Optional custom resolver, defaults to base HyResolver
+            memo: Optional result memo, defaults to a new ExpressionMemo. Its
+                results are only valid for this service's resolver.
+            audit: Optional audit log, defaults to the global `audit_log`
         """
         self.resolver = resolver or HyResolver()
         self.registry = DynamicRegistry()
+        self.dependencies = DependencyGraph()
+        self.memo = memo if memo is not None else ExpressionMemo()
+        self.audit = audit if audit is not None else audit_log
 
     def evaluate(
         self,
@@ -106,6 +205,7 @@ class DynamicResolutionService(ServiceMixin):
         attribute: str,
         expression: Any,
         context: Optional[Dict[str, Any]] = None,
+        provides: Iterable[str] = (),
     ) -> Tuple[Any, DynamicExpressionInfo]:
         """
         Evaluate an expression and track its result
@@ -116,30 +216,22 @@ class DynamicResolutionService(ServiceMixin):
             attribute: Name of the attribute being evaluated (e.g., 'start', 'value')
             expression: The expression to evaluate
             context: Optional context for evaluation
+            provides: Dependency tokens other expressions use to refer to this
+                value (e.g. the variable name)
 
         Returns:
             Tuple of (resolved_value, dynamic_expression_info)
         """
-        try:
-            expr_str = hy.repr(expression)
-        except Exception:
-            expr_str = str(expression)
-        self.logger.info(
-            f"\n"
-            f"--- [AUDIT] DYNAMIC EVALUATION TRIGGERED ---\n"
-            f"    WHAT: {expr_str}\n"
-            f"    FOR:  {component_type} -> {component_label}\n"
-            f"    ATTR: {attribute}\n"
-            f"--------------------------------------------\n"
-        )
-        self.logger.debug(
-            "DynamicResolutionService: Evaluating for %s.%s.%s: EXPR=%s, CONTEXT_KEYS=%s",
-            component_type,
-            component_label,
-            attribute,
-            expression,
-            list(context.keys()) if context else "None",
-        )
+        started = time.perf_counter()
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug(
+                "DynamicResolutionService: Evaluating for %s.%s.%s: EXPR=%s, CONTEXT_KEYS=%s",
+                component_type,
+                component_label,
+                attribute,
+                expression,
+                list(context.keys()) if context else "None",
+            )
         hy_expr_to_resolve: Any  # Can be Hy object or already Python native
         if isinstance(expression, str):
             try:
@@ -162,20 +254,76 @@ class DynamicResolutionService(ServiceMixin):
                     },
                 )
                 self.registry.add(component_type, component_label, attribute, error_info)
+                self.audit.record(
+                    component_type,
+                    component_label,
+                    attribute,
+                    expression,
+                    time.perf_counter() - started,
+                    OUTCOME_ERROR,
+                    error=str(e),
+                )
                 raise
         else:
             hy_expr_to_resolve = expression
 
+        self.dependencies.set(
+            (component_type, component_label, attribute),
+            collect_dependencies(hy_expr_to_resolve),
+            provides,
+        )
+
+        memo_key = self.memo.key(hy_expr_to_resolve, context)
+        memoized_value = self.memo.get(memo_key)
+        if memoized_value is not MISSING:
+            self.logger.debug(
+                "DynamicResolutionService: Memoized value for %s.%s: %s",
+                component_label,
+                attribute,
+                memoized_value,
+            )
+            dynamic_info = DynamicExpressionInfo(
+                original=hy_expr_to_resolve, is_dynamic=is_dynamic_content(hy_expr_to_resolve)
+            )
+            dynamic_info.add_evaluation(
+                memoized_value,
+                original_expr=hy_expr_to_resolve,
+                metadata={"memoized": True, "purity": memo_key[0].name.lower()},
+                duration=time.perf_counter() - started,
+            )
+            self.registry.add(component_type, component_label, attribute, dynamic_info)
+            self.audit.record(
+                component_type,
+                component_label,
+                attribute,
+                hy_expr_to_resolve,
+                dynamic_info.history[-1].duration,
+                OUTCOME_MEMOIZED,
+            )
+            return memoized_value, dynamic_info
+
         try:
             resolved_value, dynamic_info_from_resolver = self.resolver.resolve(
                 expr=hy_expr_to_resolve, local_names=context, context=None
             )
             self.logger.debug(
-                f"DynamicResolutionService: Resolved value for {component_label}.{attribute}: {resolved_value}"
+                "DynamicResolutionService: Resolved value for %s.%s: %s",
+                component_label,
+                attribute,
+                resolved_value,
             )
+            self.memo.put(memo_key, resolved_value)
             self.registry.add(
                 component_type, component_label, attribute, dynamic_info_from_resolver
             )
+            self.audit.record(
+                component_type,
+                component_label,
+                attribute,
+                hy_expr_to_resolve,
+                time.perf_counter() - started,
+                OUTCOME_EVALUATED,
+            )
             return resolved_value, dynamic_info_from_resolver
 
         except Exception as e:
@@ -201,10 +349,39 @@ class DynamicResolutionService(ServiceMixin):
                     "attribute": attribute,
                     "context_keys": list(context.keys()) if context else None,
                 },
+                duration=time.perf_counter() - started,
             )
             self.registry.add(component_type, component_label, attribute, dynamic_info)
+            self.audit.record(
+                component_type,
+                component_label,
+                attribute,
+                hy_expr_to_resolve,
+                dynamic_info.history[-1].duration,
+                OUTCOME_ERROR,
+                error=str(e),
+            )
             raise
 
+    def configure_history(
+        self,
+        max_history: Optional[int] = DEFAULT_HISTORY_SIZE,
+        max_age: Optional[timedelta] = None,
+    ) -> None:
+        """
+        Set how much evaluation history the registry retains per expression
+
+        Args:
+            max_history: Records kept per expression, None for no limit
+            max_age: Age past which records are dropped, None for no limit
+        """
+        self.registry.configure(max_history=max_history, max_age=max_age)
+
+    def history_stats(self) -> Dict[str, Any]:
+        """Memory held by the registry, see `DynamicRegistry.memory_stats()`"""
+        self.registry.expire()
+        return self.registry.memory_stats()
+
     def get_dynamic_info(
         self, component_type: str, component_label: str, attribute: str
     ) -> Optional[DynamicExpressionInfo]:
@@ -254,37 +431,88 @@ class DynamicResolutionService(ServiceMixin):
                 continue
             if component_label and reg_comp_label != component_label:
                 continue
+            self._reevaluate(
+                results, reg_comp_type, reg_comp_label, reg_attr, dynamic_info, context
+            )
+        return results
 
-            try:
-                value, updated_dynamic_info = self.evaluate(
-                    component_type=reg_comp_type,
-                    component_label=reg_comp_label,
-                    attribute=reg_attr,
-                    expression=dynamic_info.original,
-                    context=context,
-                )
-                # Store result
-                if reg_comp_type not in results:
-                    results[reg_comp_type] = {}
-                if reg_comp_label not in results[reg_comp_type]:
-                    results[reg_comp_type][reg_comp_label] = {}
-                results[reg_comp_type][reg_comp_label][reg_attr] = value
+    def evaluate_affected(
+        self,
+        changed: Iterable[str],
+        context: Optional[Dict[str, Any]] = None,
+        component_type: Optional[str] = None,
+        reevaluate: Optional[Callable[[str, str, str], Any]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Re-evaluate only the expressions depending on the `changed` dependency
+        tokens (see `utms.core.services.dependency`), dependencies first,
+        optionally only those of `component_type`.
 
-            except Exception as e:
-                self.logger.error(
-                    "Error re-evaluating %s.%s.%s: %s",
-                    reg_comp_type,
-                    reg_comp_label,
-                    reg_attr,
-                    str(e),
+        Expressions are evaluated from the registry. Components that keep the
+        values themselves pass `reevaluate`, which is called with
+        (component_type, component_label, attribute) instead and returns the
+        new value.
+
+        Expressions caught in a dependency cycle are not evaluated; their
+        result is an error string, as for failed evaluations.
+
+        Returns:
+            Dictionary of updated values, shaped like `evaluate_all()`'s
+        """
+        results = {}
+        ordered, cyclic = self.dependencies.affected(changed)
+        for reg_comp_type, reg_comp_label, reg_attr in ordered:
+            if component_type and reg_comp_type != component_type:
+                continue
+            if reevaluate is not None:
+                results.setdefault(reg_comp_type, {}).setdefault(reg_comp_label, {})[reg_attr] = (
+                    reevaluate(reg_comp_type, reg_comp_label, reg_attr)
                 )
-                if reg_comp_type not in results:
-                    results[reg_comp_type] = {}
-                if reg_comp_label not in results[reg_comp_type]:
-                    results[reg_comp_type][reg_comp_label] = {}
-                results[reg_comp_type][reg_comp_label][reg_attr] = f"Error: {str(e)}"
+                continue
+            dynamic_info = self.registry.get(reg_comp_type, reg_comp_label, reg_attr)
+            if dynamic_info is None:
+                continue
+            self._reevaluate(
+                results, reg_comp_type, reg_comp_label, reg_attr, dynamic_info, context
+            )
+        for reg_comp_type, reg_comp_label, reg_attr in cyclic:
+            if component_type and reg_comp_type != component_type:
+                continue
+            results.setdefault(reg_comp_type, {}).setdefault(reg_comp_label, {})[
+                reg_attr
+            ] = "Error: dependency cycle"
         return results
 
+    def _reevaluate(
+        self,
+        results: Dict[str, Any],
+        component_type: str,
+        component_label: str,
+        attribute: str,
+        dynamic_info: DynamicExpressionInfo,
+        context: Optional[Dict[str, Any]],
+    ) -> None:
+        component_results = results.setdefault(component_type, {}).setdefault(component_label, {})
+        try:
+            value, _ = self.evaluate(
+                component_type=component_type,
+                component_label=component_label,
+                attribute=attribute,
+                expression=dynamic_info.original,
+                context=context,
+                provides=self.dependencies.provides((component_type, component_label, attribute)),
+            )
+            component_results[attribute] = value
+        except Exception as e:
+            self.logger.error(
+                "Error re-evaluating %s.%s.%s: %s",
+                component_type,
+                component_label,
+                attribute,
+                str(e),
+            )
+            component_results[attribute] = f"Error: {str(e)}"
+
     def clear_history(
         self,
         component_type: Optional[str] = None,
@@ -306,9 +534,7 @@ class DynamicResolutionService(ServiceMixin):
 
             if dynamic_info and dynamic_info.history:
                 if before:
-                    dynamic_info.history = [
-                        record for record in dynamic_info.history if record.timestamp >= before
-                    ]
+                    dynamic_info.expire(before)
                 else:
                     dynamic_info.history.clear()
 
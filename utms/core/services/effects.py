@@ -0,0 +1,277 @@
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional
+
+from utms.core.mixins import ServiceMixin
+
+DEFAULT_EFFECT_WORKERS = 4
+# Effects submitted but not yet finished, beyond which new ones are rejected.
+DEFAULT_EFFECT_MAX_PENDING = 256
+# Seconds a caller waits for an effect's result before giving up on it.
+DEFAULT_EFFECT_TIMEOUT = 30.0
+
+
+class EffectRejectedError(RuntimeError):
+    """The executor already has `max_pending` effects in flight."""
+
+
+class EffectTimeoutError(TimeoutError):
+    """An awaited effect did not finish within its timeout."""
+
+
+@dataclass
+class EffectStats:
+    """Counters and latencies of one kind of effect."""
+
+    submitted: int = 0
+    completed: int = 0
+    failed: int = 0
+    timed_out: int = 0
+    rejected: int = 0
+    total_wait: float = 0.0
+    max_wait: float = 0.0
+    total_run: float = 0.0
+    max_run: float = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        finished = self.completed + self.failed
+        return {
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "failed": self.failed,
+            "timed_out": self.timed_out,
+            "rejected": self.rejected,
+            "mean_wait": self.total_wait / finished if finished else None,
+            "max_wait": self.max_wait,
+            "mean_run": self.total_run / finished if finished else None,
+            "max_run": self.max_run,
+        }
+
+
+class EffectExecutor(ServiceMixin):
+    """
+    Runs side effects (shell commands, HTTP calls, MQTT publishes, hooks) on a
+    bounded pool of worker threads, so that a slow one cannot stall request
+    handling or the scheduler tick.
+
+    `run()` waits for the result up to a timeout; `fire()` returns at once and
+    only logs failures. An effect started from a worker thread, e.g. a
+    `(shell ...)` inside an enqueued hook, runs on a thread of its own instead
+    of waiting for another worker, so that hooks filling the pool cannot
+    deadlock it; the hook still waits for it at most the timeout.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = DEFAULT_EFFECT_WORKERS,
+        max_pending: int = DEFAULT_EFFECT_MAX_PENDING,
+        timeout: Optional[float] = DEFAULT_EFFECT_TIMEOUT,
+    ):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.timeout = timeout
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._pending = 0
+        self._running = 0
+        # Threads for effects started by effects; see _start_detached().
+        self._detached_slots = threading.BoundedSemaphore(max_workers)
+        self._stats: Dict[str, EffectStats] = {}
+
+    def configure(
+        self,
+        max_workers: Optional[int] = None,
+        max_pending: Optional[int] = None,
+        timeout: Optional[float] = None,
+    ) -> None:
+        """Change the limits. Effects already queued finish on the old pool."""
+        with self._lock:
+            if max_pending is not None:
+                self.max_pending = max(1, int(max_pending))
+            if timeout is not None:
+                self.timeout = float(timeout) if timeout > 0 else None
+            if max_workers is not None and max(1, int(max_workers)) != self.max_workers:
+                self.max_workers = max(1, int(max_workers))
+                # Effects holding a slot of the old semaphore release it there.
+                self._detached_slots = threading.BoundedSemaphore(self.max_workers)
+                if self._pool is not None:
+                    self._pool.shutdown(wait=False)
+                    self._pool = None
+
+    @property
+    def in_worker(self) -> bool:
+        """Whether the calling thread is running an effect."""
+        return getattr(self._local, "active", False)
+
+    def _stats_for(self, name: str) -> EffectStats:
+        stats = self._stats.get(name)
+        if stats is None:
+            stats = self._stats[name] = EffectStats()
+        return stats
+
+    def submit(self, name: str, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Future:
+        """
+        Queue `fn(*args, **kwargs)` as an effect called `name` (used for the
+        metrics). Raises EffectRejectedError if too many effects are pending.
+        """
+        with self._lock:
+            stats = self._stats_for(name)
+            if self._pending >= self.max_pending:
+                stats.rejected += 1
+                raise EffectRejectedError(
+                    f"Effect '{name}' rejected: {self._pending} effects already pending"
+                )
+            stats.submitted += 1
+            self._pending += 1
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="utms-effect"
+                )
+            pool = self._pool
+        try:
+            return pool.submit(self._call, name, time.perf_counter(), fn, args, kwargs)
+        except Exception:
+            with self._lock:
+                self._pending -= 1
+            raise
+
+    def _call(self, name: str, queued_at: float, fn: Callable[..., Any], args, kwargs) -> Any:
+        started = time.perf_counter()
+        with self._lock:
+            self._running += 1
+        self._local.active = True
+        failed = True
+        try:
+            result = fn(*args, **kwargs)
+            failed = False
+            return result
+        finally:
+            self._local.active = False
+            finished = time.perf_counter()
+            with self._lock:
+                self._running -= 1
+                self._pending -= 1
+                stats = self._stats_for(name)
+                if failed:
+                    stats.failed += 1
+                else:
+                    stats.completed += 1
+                stats.total_wait += started - queued_at
+                stats.max_wait = max(stats.max_wait, started - queued_at)
+                stats.total_run += finished - started
+                stats.max_run = max(stats.max_run, finished - started)
+
+    def run(
+        self,
+        name: str,
+        fn: Callable[..., Any],
+        *args: Any,
+        timeout: Optional[float] = None,
+        **kwargs: Any,
+    ) -> Any:
+        """
+        Run an effect and return its result, waiting at most `timeout` seconds
+        (the executor default if None). Raises EffectTimeoutError after that;
+        the effect itself keeps running to completion on its worker.
+        """
+        if self.in_worker:
+            future = self._start_detached(name, fn, args, kwargs)
+        else:
+            future = self.submit(name, fn, *args, **kwargs)
+        timeout = self.timeout if timeout is None else timeout
+        try:
+            return future.result(timeout=timeout)
+        except FutureTimeoutError:
+            with self._lock:
+                self._stats_for(name).timed_out += 1
+            self.logger.error(f"Effect '{name}' did not finish within {timeout}s")
+            raise EffectTimeoutError(f"Effect '{name}' did not finish within {timeout}s") from None
+
+    def _start_detached(self, name: str, fn: Callable[..., Any], args, kwargs) -> Future:
+        """
+        Start an effect on a new daemon thread rather than the pool, for
+        effects started by an effect. The thread counts as a worker, so the
+        effects it starts in turn get threads of their own too. At most
+        `max_workers` such threads run at once; past that, the effect is
+        rejected with EffectRejectedError.
+        """
+        with self._lock:
+            slots = self._detached_slots
+            stats = self._stats_for(name)
+            if not slots.acquire(blocking=False):
+                stats.rejected += 1
+                raise EffectRejectedError(
+                    f"Effect '{name}' rejected: {self.max_workers} nested effects already running"
+                )
+            stats.submitted += 1
+            self._pending += 1
+        future: Future = Future()
+        queued_at = time.perf_counter()
+
+        def _target() -> None:
+            try:
+                if not future.set_running_or_notify_cancel():
+                    with self._lock:
+                        self._pending -= 1
+                    return
+                try:
+                    future.set_result(self._call(name, queued_at, fn, args, kwargs))
+                except BaseException as e:
+                    future.set_exception(e)
+            finally:
+                slots.release()
+
+        try:
+            threading.Thread(target=_target, name=f"utms-effect-{name}", daemon=True).start()
+        except BaseException:
+            slots.release()
+            with self._lock:
+                self._pending -= 1
+            raise
+        return future
+
+    def fire(
+        self, name: str, fn: Callable[..., Any], *args: Any, **kwargs: Any
+    ) -> Optional[Future]:
+        """
+        Queue an effect without waiting for it. Failures, including rejection,
+        are logged; returns the future, or None if the effect was rejected.
+        """
+        try:
+            future = self.submit(name, fn, *args, **kwargs)
+        except EffectRejectedError as e:
+            self.logger.error(str(e))
+            return None
+
+        def _log_failure(done: Future) -> None:
+            error = done.exception()
+            if error is not None:
+                self.logger.error(f"Effect '{name}' failed: {error}", exc_info=error)
+
+        future.add_done_callback(_log_failure)
+        return future
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "workers": self.max_workers,
+                "running": self._running,
+                "queued": self._pending - self._running,
+                "max_pending": self.max_pending,
+                "timeout": self.timeout,
+                "effects": {name: stats.to_dict() for name, stats in self._stats.items()},
+            }
+
+    def shutdown(self, wait: bool = True) -> None:
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=wait)
+
+
+# Global effect executor instance
+effect_executor = EffectExecutor()
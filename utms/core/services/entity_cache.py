@@ -0,0 +1,172 @@
+import sys
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, Optional
+
+from utms.core.mixins import ServiceMixin
+
+
+def estimate_entity_component_size(component: Any) -> int:
+    """
+    Cheap, shallow estimate of the memory held by an EntityComponent's entities.
+
+    Walks entities, their attribute dicts, TypedValues and the top level of list
+    values. It is not exact, but it is proportional to what the component holds,
+    which is all the LRU needs to decide what to evict.
+    """
+    total = 0
+    for entity in list(getattr(component, "_items", {}).values()):
+        total += sys.getsizeof(entity)
+        attributes = getattr(entity, "attributes", {}) or {}
+        total += sys.getsizeof(attributes)
+        for attr_name, typed_value in attributes.items():
+            total += sys.getsizeof(attr_name) + sys.getsizeof(typed_value)
+            value = getattr(typed_value, "_value", None)
+            total += sys.getsizeof(value)
+            if isinstance(value, (list, tuple)):
+                total += sum(sys.getsizeof(item) for item in value)
+            original = getattr(typed_value, "original", None)
+            if original is not None:
+                total += sys.getsizeof(original)
+    return total
+
+
+@dataclass
+class _CacheEntry:
+    component: Any
+    # A plain Lock rather than an RLock: a checkout may be released by a
+    # different thread than the one that took it.
+    lock: threading.Lock = field(default_factory=threading.Lock)
+    size_bytes: int = 0
+
+
+class EntityComponentCache(ServiceMixin):
+    """
+    Process-wide LRU cache of loaded, per-user EntityComponents.
+
+    The first request for a user loads the component; later requests only
+    refresh it with `sync_from_disk()`. Entries are evicted least-recently-used
+    first once either the number of cached users or the estimated memory
+    footprint exceeds its limit.
+    """
+
+    def __init__(self, max_users: int = 16, max_memory_bytes: int = 256 * 1024 * 1024):
+        self.max_users = max_users
+        self.max_memory_bytes = max_memory_bytes
+        self._entries: "OrderedDict[str, _CacheEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def configure(
+        self, max_users: Optional[int] = None, max_memory_bytes: Optional[int] = None
+    ) -> None:
+        """Update the eviction limits and evict immediately if they are now exceeded."""
+        with self._lock:
+            if max_users is not None:
+                self.max_users = max(1, int(max_users))
+            if max_memory_bytes is not None:
+                self.max_memory_bytes = max(0, int(max_memory_bytes))
+            self._evict_locked(keep=None)
+
+    def get(self, username: str, factory: Callable[[], Any]) -> Any:
+        """
+        Return the cached component for `username`, creating and loading it with
+        `factory()` on a miss and syncing it with the files on disk on a hit.
+        """
+        with self.checkout(username, factory) as component:
+            return component
+
+    @contextmanager
+    def checkout(self, username: str, factory: Callable[[], Any]) -> Iterator[Any]:
+        """
+        Like `get()`, but hold the user's component for the whole block. Other
+        checkouts of the same user wait until it ends, so a request never sees
+        the component while another one is changing it.
+        """
+        with self._lock:
+            entry = self._entries.get(username)
+            if entry is None:
+                entry = _CacheEntry(component=None)
+                self._entries[username] = entry
+            self._entries.move_to_end(username)
+
+        # Loading and syncing happen outside the global lock so that one user's
+        # slow disk scan never blocks requests for other users.
+        with entry.lock:
+            if entry.component is None:
+                with self._lock:
+                    self.misses += 1
+                self.logger.debug(f"Entity component cache MISS for user '{username}'.")
+                try:
+                    component = factory()
+                    component.load()
+                    if not component.is_loaded():
+                        raise RuntimeError(
+                            f"Entity component for user '{username}' failed to load."
+                        )
+                except Exception:
+                    with self._lock:
+                        if self._entries.get(username) is entry:
+                            del self._entries[username]
+                    raise
+                entry.component = component
+                entry.size_bytes = estimate_entity_component_size(component)
+            else:
+                with self._lock:
+                    self.hits += 1
+                self.logger.debug(
+                    f"Entity component cache HIT for user '{username}'. Syncing from disk."
+                )
+                if entry.component.sync_from_disk():
+                    entry.size_bytes = estimate_entity_component_size(entry.component)
+            yield entry.component
+
+        with self._lock:
+            self._evict_locked(keep=username)
+
+    def invalidate(self, username: Optional[str] = None) -> None:
+        """Drop one user's component, or every cached component if no user is given."""
+        with self._lock:
+            if username is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(username, None)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "users": len(self._entries),
+                "max_users": self.max_users,
+                "memory_bytes": sum(e.size_bytes for e in self._entries.values()),
+                "max_memory_bytes": self.max_memory_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+    def _evict_locked(self, keep: Optional[str]) -> None:
+        """Evict LRU entries until both limits hold. Never evicts `keep`."""
+
+        def over_limit() -> bool:
+            if len(self._entries) > self.max_users:
+                return True
+            if self.max_memory_bytes:
+                used = sum(e.size_bytes for e in self._entries.values())
+                return used > self.max_memory_bytes
+            return False
+
+        while self._entries and over_limit():
+            victim = next((name for name in self._entries if name != keep), None)
+            if victim is None:
+                break
+            del self._entries[victim]
+            self.evictions += 1
+            self.logger.info(f"Evicted entity component for user '{victim}' from cache.")
+
+
+# Global cache instance
+entity_component_cache = EntityComponentCache()
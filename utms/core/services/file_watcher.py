@@ -0,0 +1,186 @@
+import ctypes
+import ctypes.util
+import os
+import struct
+import sys
+import weakref
+from typing import Dict, Optional, Set
+
+from utms.core.logger import get_logger
+from utms.core.mixins import ServiceMixin
+
+logger = get_logger()
+
+# inotify(7) event masks.
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+
+_WATCH_MASK = (
+    IN_MODIFY
+    | IN_CLOSE_WRITE
+    | IN_MOVED_FROM
+    | IN_MOVED_TO
+    | IN_CREATE
+    | IN_DELETE
+    | IN_DELETE_SELF
+    | IN_MOVE_SELF
+    | IN_ONLYDIR
+)
+# Events after which the set of watched directories may be out of date.
+_RESCAN_MASK = IN_Q_OVERFLOW | IN_IGNORED | IN_DELETE_SELF | IN_MOVE_SELF
+
+# wd, mask, cookie, length of the name that follows
+_EVENT = struct.Struct("iIII")
+_READ_SIZE = 64 * 1024
+
+
+class FileWatcher(ServiceMixin):
+    """
+    Polling watcher, and the interface of the event-driven ones.
+
+    `poll()` returns the paths changed since the previous call, or None when
+    the caller has to rescan everything itself. Polling knows nothing between
+    calls, so it always returns None.
+    """
+
+    backend = "poll"
+
+    def watch(self, directory: str) -> None:
+        """Start reporting changes to the files directly inside `directory`."""
+
+    def poll(self) -> Optional[Set[str]]:
+        return None
+
+    def close(self) -> None:
+        pass
+
+
+def _load_inotify():
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        libc.inotify_init1.argtypes = [ctypes.c_int]
+        libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+    except (OSError, AttributeError):
+        return None
+    return libc
+
+
+_libc = _load_inotify()
+
+
+class InotifyWatcher(FileWatcher):
+    """
+    Linux inotify watcher, using libc through ctypes.
+
+    Directories are watched non-recursively. A change is reported by path
+    whatever its mtime says, so successive writes within the filesystem's
+    timestamp resolution are not missed. When the kernel queue overflows or a
+    watched directory goes away, `poll()` asks for a full rescan instead.
+    """
+
+    backend = "inotify"
+
+    def __init__(self):
+        if _libc is None:
+            raise OSError("inotify is not available on this system")
+        fd = _libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if fd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, f"inotify_init1 failed: {os.strerror(errno)}")
+        self._fd = fd
+        self._finalizer = weakref.finalize(self, os.close, fd)
+        self._paths_by_wd: Dict[int, str] = {}
+        self._wds_by_path: Dict[str, int] = {}
+        self._rescan_needed = False
+
+    def watch(self, directory: str) -> None:
+        directory = os.path.abspath(directory)
+        if directory in self._wds_by_path or not self._finalizer.alive:
+            return
+        wd = _libc.inotify_add_watch(self._fd, os.fsencode(directory), _WATCH_MASK)
+        if wd < 0:
+            errno = ctypes.get_errno()
+            # Typically ENOSPC (max_user_watches) or a directory that vanished;
+            # rescanning keeps the caller correct either way.
+            self.logger.warning(f"Cannot watch '{directory}': {os.strerror(errno)}")
+            self._rescan_needed = True
+            return
+        self._paths_by_wd[wd] = directory
+        self._wds_by_path[directory] = wd
+
+    def poll(self) -> Optional[Set[str]]:
+        if not self._finalizer.alive:
+            return None
+        changed: Set[str] = set()
+        while True:
+            try:
+                data = os.read(self._fd, _READ_SIZE)
+            except BlockingIOError:
+                break
+            if not data:
+                break
+            self._parse_events(data, changed)
+
+        if self._rescan_needed:
+            self._rescan_needed = False
+            return None
+        return changed
+
+    def _parse_events(self, data: bytes, changed: Set[str]) -> None:
+        offset = 0
+        while offset + _EVENT.size <= len(data):
+            wd, mask, _cookie, name_length = _EVENT.unpack_from(data, offset)
+            name_start = offset + _EVENT.size
+            name = data[name_start : name_start + name_length].rstrip(b"\0")
+            offset = name_start + name_length
+
+            if mask & _RESCAN_MASK:
+                self._rescan_needed = True
+                if mask & IN_IGNORED:
+                    self._forget(wd)
+                continue
+            if mask & IN_ISDIR:
+                # A new or removed subdirectory changes what has to be watched.
+                self._rescan_needed = True
+                continue
+            directory = self._paths_by_wd.get(wd)
+            if directory is not None and name:
+                changed.add(os.path.join(directory, os.fsdecode(name)))
+
+    def _forget(self, wd: int) -> None:
+        directory = self._paths_by_wd.pop(wd, None)
+        if directory is not None:
+            self._wds_by_path.pop(directory, None)
+
+    def close(self) -> None:
+        self._finalizer()
+        self._paths_by_wd.clear()
+        self._wds_by_path.clear()
+
+
+def create_file_watcher(backend: str = "inotify") -> FileWatcher:
+    """
+    The best available watcher for `backend` ("inotify" or "poll").
+
+    Falls back to polling when inotify is unavailable or cannot be initialized.
+    """
+    if backend == "inotify":
+        try:
+            return InotifyWatcher()
+        except OSError as e:
+            logger.info(f"File change notifications unavailable ({e}); polling instead.")
+    elif backend != "poll":
+        logger.warning(f"Unknown file watcher backend '{backend}'; polling instead.")
+    return FileWatcher()
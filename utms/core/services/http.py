@@ -0,0 +1,244 @@
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from http.cookiejar import DefaultCookiePolicy
+from typing import Any, Dict, Hashable, Optional, Tuple
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from utms.core.mixins import ServiceMixin
+
+DEFAULT_HTTP_TIMEOUT = 10.0
+DEFAULT_HTTP_POOL_SIZE = 10
+# Requests in flight to one host at a time; further callers wait for a slot.
+DEFAULT_HTTP_MAX_PER_HOST = 4
+DEFAULT_HTTP_CACHE_SIZE = 256
+
+
+@dataclass
+class CachedResponse:
+    response: requests.Response
+    # time.monotonic() after which the response must be revalidated.
+    fresh_until: float
+
+    @property
+    def validators(self) -> Dict[str, str]:
+        """Conditional request headers to revalidate the response with."""
+        headers = {}
+        if "ETag" in self.response.headers:
+            headers["If-None-Match"] = self.response.headers["ETag"]
+        if "Last-Modified" in self.response.headers:
+            headers["If-Modified-Since"] = self.response.headers["Last-Modified"]
+        return headers
+
+
+def _cache_control(response: requests.Response) -> Dict[str, Optional[str]]:
+    directives: Dict[str, Optional[str]] = {}
+    for part in response.headers.get("Cache-Control", "").split(","):
+        name, _, value = part.strip().partition("=")
+        if name:
+            directives[name.lower()] = value.strip('"') or None
+    return directives
+
+
+def freshness_lifetime(response: requests.Response) -> Optional[float]:
+    """
+    Seconds `response` may be reused without revalidation according to its
+    headers; None if it must not be stored at all.
+    """
+    directives = _cache_control(response)
+    if "no-store" in directives:
+        return None
+    if "no-cache" in directives:
+        return 0.0
+    for name in ("s-maxage", "max-age"):
+        if directives.get(name):
+            try:
+                return max(0.0, float(directives[name]))
+            except ValueError:
+                pass
+    if "Expires" in response.headers:
+        try:
+            expires = parsedate_to_datetime(response.headers["Expires"])
+            date = (
+                parsedate_to_datetime(response.headers["Date"])
+                if "Date" in response.headers
+                else None
+            )
+            if date is not None:
+                return max(0.0, (expires - date).total_seconds())
+            return max(0.0, expires.timestamp() - time.time())
+        except (TypeError, ValueError):
+            return 0.0
+    if "ETag" in response.headers or "Last-Modified" in response.headers:
+        # Can be revalidated cheaply, though not reused as is.
+        return 0.0
+    return None
+
+
+class HttpClient(ServiceMixin):
+    """
+    Shared HTTP client for Hy builtins: one pooled `requests.Session`, a
+    default timeout, a cap on concurrent requests per host, and an opt-in
+    response cache.
+
+    A GET is cached only when asked to, with `cache=True` (freshness from
+    Cache-Control, Expires and validators) or `ttl=<seconds>` (reused for
+    that long regardless of headers). Stale entries with an ETag or
+    Last-Modified are revalidated with a conditional request, and a 304
+    reuses the cached body. Cached responses are shared, so callers must not
+    mutate them.
+
+    The session serves every user, so it keeps no cookies: those a response
+    sets are dropped, as with a bare `requests.get`, instead of being sent on
+    other users' requests to the same host.
+    """
+
+    def __init__(
+        self,
+        timeout: float = DEFAULT_HTTP_TIMEOUT,
+        pool_size: int = DEFAULT_HTTP_POOL_SIZE,
+        max_per_host: int = DEFAULT_HTTP_MAX_PER_HOST,
+        cache_size: int = DEFAULT_HTTP_CACHE_SIZE,
+    ):
+        self.timeout = timeout
+        self.max_per_host = max_per_host
+        self.cache_size = cache_size
+        self.session = requests.Session()
+        self.session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self._host_slots: Dict[str, threading.BoundedSemaphore] = {}
+        self._cache: "OrderedDict[Hashable, CachedResponse]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+
+    def configure(
+        self,
+        timeout: Optional[float] = None,
+        max_per_host: Optional[int] = None,
+        cache_size: Optional[int] = None,
+    ) -> None:
+        with self._lock:
+            if timeout is not None:
+                self.timeout = float(timeout) if timeout > 0 else None
+            if max_per_host is not None and max(1, int(max_per_host)) != self.max_per_host:
+                self.max_per_host = max(1, int(max_per_host))
+                # Requests holding a slot of an old semaphore release it there.
+                self._host_slots.clear()
+            if cache_size is not None:
+                self.cache_size = max(0, int(cache_size))
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+
+    def _slot(self, url: str) -> Tuple[str, threading.BoundedSemaphore]:
+        host = urlsplit(url).netloc.lower()
+        with self._lock:
+            slot = self._host_slots.get(host)
+            if slot is None:
+                slot = self._host_slots[host] = threading.BoundedSemaphore(self.max_per_host)
+        return host, slot
+
+    def request(self, method: str, url: str, **kwargs: Any) -> requests.Response:
+        """Send a request through the session, within the per-host limit."""
+        kwargs.setdefault("timeout", self.timeout)
+        host, slot = self._slot(url)
+        wait = kwargs["timeout"]
+        if isinstance(wait, tuple):
+            wait = wait[0]  # (connect, read) timeouts
+        if not slot.acquire(timeout=wait):
+            raise requests.exceptions.Timeout(
+                f"Timed out waiting for one of {self.max_per_host} connections to {host}"
+            )
+        try:
+            return self.session.request(method, url, **kwargs)
+        finally:
+            slot.release()
+
+    def _cache_key(self, url: str, params: Any, kwargs: Dict[str, Any]) -> Hashable:
+        """
+        Everything that can change the response to a GET: the URL, params,
+        headers, credentials and cookies.
+        """
+        options = {
+            name: value for name, value in kwargs.items() if name not in ("headers", "timeout")
+        }
+        return (
+            url,
+            repr(params),
+            repr(sorted((kwargs.get("headers") or {}).items())),
+            repr(sorted(options.items())),
+        )
+
+    def get(
+        self,
+        url: str,
+        params: Any = None,
+        cache: bool = False,
+        ttl: Optional[float] = None,
+        **kwargs: Any,
+    ) -> requests.Response:
+        """
+        GET `url`. With `cache` or `ttl` set, reuse or revalidate a cached
+        response for the same URL, params, headers, credentials and cookies.
+        """
+        if not (cache or ttl is not None) or self.cache_size <= 0:
+            return self.request("GET", url, params=params, **kwargs)
+
+        key = self._cache_key(url, params, kwargs)
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is not None:
+                self._cache.move_to_end(key)
+                if time.monotonic() < entry.fresh_until:
+                    self.hits += 1
+                    return entry.response
+
+        request_kwargs = dict(kwargs)
+        if entry is not None and entry.validators:
+            request_kwargs["headers"] = {**(kwargs.get("headers") or {}), **entry.validators}
+        response = self.request("GET", url, params=params, **request_kwargs)
+
+        lifetime = ttl if ttl is not None else freshness_lifetime(response)
+        if response.status_code == 304 and entry is not None:
+            with self._lock:
+                self.revalidated += 1
+                entry.fresh_until = time.monotonic() + (lifetime or 0.0)
+            return entry.response
+
+        with self._lock:
+            self.misses += 1
+            if response.status_code == 200 and lifetime is not None:
+                self._cache[key] = CachedResponse(response, time.monotonic() + lifetime)
+                self._cache.move_to_end(key)
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+            else:
+                self._cache.pop(key, None)
+        return response
+
+    def clear_cache(self) -> None:
+        with self._lock:
+            self._cache.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "timeout": self.timeout,
+                "max_per_host": self.max_per_host,
+                "cached": len(self._cache),
+                "hits": self.hits,
+                "revalidated": self.revalidated,
+                "misses": self.misses,
+            }
+
+
+# Global HTTP client instance
+http_client = HttpClient()
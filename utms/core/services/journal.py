@@ -0,0 +1,142 @@
+import os
+import pickle
+import struct
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+from utms.core.mixins import ServiceMixin
+from utms.core.services.snapshot import file_fingerprint
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None
+
+JOURNAL_MAGIC = b"UTMSJRNL"
+JOURNAL_VERSION = 1
+# magic, format version
+_HEADER = struct.Struct("<8sI")
+# length of the pickled record that follows
+_RECORD_PREFIX = struct.Struct("<I")
+
+
+class EntityJournal(ServiceMixin):
+    """
+    Append-only log of entity mutations, one file per user.
+
+    Records are plain dicts, stored as a length prefix followed by their pickle.
+    Appends are a single `write()` to a file opened in append mode, so writers in
+    several processes do not interleave records. A record cut short by a crash is
+    ignored on read and cut off before the next append.
+
+    The journal only holds what is not yet in the canonical Hy files; once the
+    owner has folded it back into them it calls `reset()`.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        # Size up to which the file is known to end on a record boundary.
+        self._verified_size = -1
+
+    @property
+    def size_bytes(self) -> int:
+        try:
+            return os.path.getsize(self.path)
+        except FileNotFoundError:
+            return 0
+
+    @property
+    def is_empty(self) -> bool:
+        return self.size_bytes <= _HEADER.size
+
+    def fingerprint(self) -> Optional[Dict[str, int]]:
+        return file_fingerprint(self.path)
+
+    @contextmanager
+    def locked(self) -> Iterator[None]:
+        """Hold an exclusive inter-process lock on the journal (advisory, POSIX only)."""
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with open(self.path + ".lock", "a") as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+    def append(self, record: Dict[str, Any]) -> bool:
+        """Append one record. Returns False if it cannot be pickled."""
+        try:
+            blob = pickle.dumps(record, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception as e:
+            self.logger.debug(f"Record for '{record.get('entity')}' cannot be journaled: {e}")
+            return False
+        with self.locked():
+            self._repair_tail()
+            with open(self.path, "ab") as f:
+                if f.tell() == 0:
+                    f.write(_HEADER.pack(JOURNAL_MAGIC, JOURNAL_VERSION))
+                f.write(_RECORD_PREFIX.pack(len(blob)) + blob)
+                self._verified_size = f.tell()
+        return True
+
+    def records(self) -> List[Dict[str, Any]]:
+        """All complete records, oldest first."""
+        records, _ = self._read()
+        return records
+
+    def reset(self) -> None:
+        """Drop every record. The caller must hold `locked()`."""
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+        self._verified_size = 0
+
+    def _read(self):
+        """Returns the decodable records and the offset just past the last of them."""
+        try:
+            with open(self.path, "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            return [], 0
+        if len(data) < _HEADER.size:
+            return [], 0
+        magic, version = _HEADER.unpack_from(data, 0)
+        if magic != JOURNAL_MAGIC or version != JOURNAL_VERSION:
+            self.logger.error(f"Ignoring entity journal '{self.path}' with an unknown format.")
+            return [], 0
+
+        records = []
+        offset = _HEADER.size
+        while offset + _RECORD_PREFIX.size <= len(data):
+            (length,) = _RECORD_PREFIX.unpack_from(data, offset)
+            start = offset + _RECORD_PREFIX.size
+            if start + length > len(data):
+                break
+            try:
+                records.append(pickle.loads(data[start : start + length]))
+            except Exception as e:
+                self.logger.warning(f"Stopping at unreadable record in '{self.path}': {e}")
+                break
+            offset = start + length
+        if offset < len(data):
+            self.logger.warning(
+                f"Entity journal '{self.path}' has {len(data) - offset} trailing bytes "
+                "from an interrupted write. They are ignored."
+            )
+        return records, offset
+
+    def _repair_tail(self) -> None:
+        """Cut off a partial trailing record so the next append starts on a boundary."""
+        size = self.size_bytes
+        if size == 0 or size == self._verified_size:
+            return
+        _, good_offset = self._read()
+        if good_offset == 0:
+            self.reset()
+        elif good_offset < size:
+            with open(self.path, "r+b") as f:
+                f.truncate(good_offset)
+        self._verified_size = good_offset
@@ -0,0 +1,237 @@
+import copy
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from typing import Any, Dict, Hashable, Mapping, Optional, Tuple
+
+import hy
+
+from utms.core.hy.evaluation import structural_key
+from utms.core.hy.purity import Purity, classify
+from utms.core.hy.scope import MISSING, python_name
+from utms.core.hy.utils import collect_symbols
+from utms.core.mixins import ServiceMixin
+from utms.core.services.snapshot import value_fingerprint
+
+DEFAULT_MEMO_SIZE = 4096
+# Time-dependent results are reused for this long, so that e.g. every entity
+# evaluating `(get-ntp-date)` during one load shares a single clock reading.
+DEFAULT_TIME_DEPENDENT_TTL = 1.0
+# Bumped whenever the key or value layout of persisted entries changes.
+MEMO_FORMAT_VERSION = 1
+
+MemoKey = Tuple[Purity, Hashable]
+
+_IMMUTABLE_TYPES = (
+    str,
+    bytes,
+    int,
+    float,
+    complex,
+    bool,
+    type(None),
+    Decimal,
+    datetime,
+    date,
+    timedelta,
+)
+
+
+def _lookup(context: Optional[Mapping[str, Any]], name: str) -> Any:
+    """`name` in `context`, falling back to its snake_case spelling like the resolver does."""
+    if not context:
+        return MISSING
+    if name in context:
+        return context[name]
+    return context.get(python_name(name), MISSING)
+
+
+def _portable(skey: Hashable) -> Hashable:
+    """
+    `skey` with every Hy model replaced by its repr, so that it can be pickled:
+    models made by the reader keep a reference to it.
+    """
+    if isinstance(skey, tuple):
+        return tuple(_portable(item) for item in skey)
+    if isinstance(skey, hy.models.Object):
+        return repr(skey)
+    return skey
+
+
+def _detached(value: Any) -> Any:
+    """A copy of `value` that callers may mutate without corrupting the memo."""
+    if isinstance(value, _IMMUTABLE_TYPES):
+        return value
+    return copy.deepcopy(value)
+
+
+class ExpressionMemo(ServiceMixin):
+    """
+    Memoized results of dynamic expressions, classified with `purity.classify()`.
+
+    A result is keyed by the structure of its expression together with a
+    fingerprint of the value of every name the expression references, so it is
+    reused only while those values are unchanged. Pure results are kept until
+    evicted (and can be persisted with `export_pure()`); time-dependent ones
+    expire after `time_ttl` seconds; side-effecting expressions are never
+    memoized.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_MEMO_SIZE,
+        time_ttl: float = DEFAULT_TIME_DEPENDENT_TTL,
+    ):
+        self.max_entries = max_entries
+        self.time_ttl = time_ttl
+        # key -> (value, expiry on the monotonic clock, or None for pure results)
+        self._entries: "OrderedDict[MemoKey, Tuple[Any, Optional[float]]]" = OrderedDict()
+        # structural key -> (purity, referenced names, portable structural key)
+        self._analyses: "OrderedDict[Hashable, Tuple[Purity, Tuple[str, ...], Hashable]]" = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+        # Counts changes to pure entries, so owners know when to persist them.
+        self.pure_version = 0
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.evictions = 0
+
+    def configure(
+        self, max_entries: Optional[int] = None, time_ttl: Optional[float] = None
+    ) -> None:
+        with self._lock:
+            if max_entries is not None:
+                self.max_entries = max(0, int(max_entries))
+                self._evict_locked()
+            if time_ttl is not None:
+                self.time_ttl = max(0.0, float(time_ttl))
+
+    def _analyze(self, skey: Hashable, expr: Any) -> Tuple[Purity, Tuple[str, ...], Hashable]:
+        with self._lock:
+            analysis = self._analyses.get(skey)
+            if analysis is not None:
+                self._analyses.move_to_end(skey)
+                return analysis
+        analysis = (classify(expr), tuple(sorted(collect_symbols(expr))), _portable(skey))
+        with self._lock:
+            self._analyses[skey] = analysis
+            while len(self._analyses) > max(self.max_entries, 1):
+                self._analyses.popitem(last=False)
+        return analysis
+
+    def key(self, expr: Any, context: Optional[Mapping[str, Any]] = None) -> Optional[MemoKey]:
+        """The memo key of evaluating `expr` in `context`, or None if it must not be memoized."""
+        try:
+            skey = structural_key(expr)
+            hash(skey)
+        except TypeError:
+            return None
+        purity, names, portable_key = self._analyze(skey, expr)
+        if purity is Purity.SIDE_EFFECTING:
+            return None
+        bindings = []
+        for name in names:
+            value = _lookup(context, name)
+            if value is not MISSING:
+                bindings.append((name, value_fingerprint(value)))
+        return purity, (portable_key, tuple(bindings))
+
+    def get(self, key: Optional[MemoKey]) -> Any:
+        """The memoized result for `key`, or MISSING."""
+        if key is None:
+            return MISSING
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return MISSING
+            value, expires_at = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._entries[key]
+                self.expired += 1
+                self.misses += 1
+                return MISSING
+            self._entries.move_to_end(key)
+            self.hits += 1
+        return _detached(value)
+
+    def put(self, key: Optional[MemoKey], value: Any) -> None:
+        if key is None or self.max_entries <= 0:
+            return
+        purity = key[0]
+        if purity is Purity.TIME_DEPENDENT:
+            if self.time_ttl <= 0:
+                return
+            expires_at: Optional[float] = time.monotonic() + self.time_ttl
+        else:
+            expires_at = None
+        value = _detached(value)
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            if purity is Purity.PURE:
+                self.pure_version += 1
+            self._evict_locked()
+
+    def _evict_locked(self) -> None:
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def export_pure(self) -> Dict[str, Any]:
+        """
+        The pure entries, most recently used last, in a form `import_pure()`
+        accepts. Entries whose value cannot be pickled are left out.
+        """
+        with self._lock:
+            candidates = [
+                (key, value)
+                for key, (value, expires_at) in self._entries.items()
+                if expires_at is None
+            ]
+        entries = []
+        for key, value in candidates:
+            try:
+                pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+            except Exception:
+                continue
+            entries.append((key, value))
+        return {"version": MEMO_FORMAT_VERSION, "entries": entries}
+
+    def import_pure(self, exported: Optional[Dict[str, Any]]) -> int:
+        """Add entries saved by `export_pure()`. Returns how many were added."""
+        if not exported or exported.get("version") != MEMO_FORMAT_VERSION:
+            return 0
+        added = 0
+        with self._lock:
+            # Imported entries rank below those used in this process.
+            for key, value in reversed(list(exported.get("entries", ()))):
+                if key in self._entries or key[0] is not Purity.PURE:
+                    continue
+                self._entries[key] = (value, None)
+                self._entries.move_to_end(key, last=False)
+                added += 1
+            self._evict_locked()
+        return added
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._analyses.clear()
+            self.pure_version += 1
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "expired": self.expired,
+                "evictions": self.evictions,
+            }
@@ -0,0 +1,253 @@
+import atexit
+import threading
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Callable, Deque, Dict, Tuple, Union
+
+from utms.core.mixins import ServiceMixin
+
+# Messages buffered while the broker is unreachable; the oldest are dropped
+# past this.
+DEFAULT_MQTT_BUFFER_SIZE = 1000
+# QoS 1/2 messages sent but not yet acknowledged, before sending pauses.
+DEFAULT_MQTT_MAX_INFLIGHT = 20
+# Messages handed to the client per pass of the sender thread.
+MQTT_BATCH_SIZE = 50
+DEFAULT_MQTT_KEEPALIVE = 60
+
+Payload = Union[str, bytes, None]
+
+
+@dataclass
+class MqttMessage:
+    topic: str
+    payload: Payload
+    qos: int = 0
+    retain: bool = False
+
+
+def _paho_client() -> Any:
+    import paho.mqtt.client as mqtt
+
+    return mqtt.Client(mqtt.CallbackAPIVersion.VERSION2)
+
+
+class MqttPublisher(ServiceMixin):
+    """
+    Long-lived MQTT connection to one broker, replacing a connect, publish
+    and disconnect per message.
+
+    `publish()` only queues the message. A sender thread hands queued messages
+    to the client in batches while it is connected; paho's network loop keeps
+    the connection alive and reconnects with backoff after it drops. While the
+    broker is unreachable messages wait in a bounded local buffer. QoS 0
+    messages count as sent once the client accepts them; QoS 1 and 2 messages
+    stay tracked until the broker acknowledges them, at most `max_inflight`
+    at a time, and go back to the front of the buffer if the connection drops
+    first, so they are delivered at least once.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int = 1883,
+        client_factory: Callable[[], Any] = _paho_client,
+        max_buffer: int = DEFAULT_MQTT_BUFFER_SIZE,
+        max_inflight: int = DEFAULT_MQTT_MAX_INFLIGHT,
+        keepalive: int = DEFAULT_MQTT_KEEPALIVE,
+    ):
+        self.host = host
+        self.port = port
+        self.max_inflight = max_inflight
+        self._buffer: Deque[MqttMessage] = deque(maxlen=max_buffer)
+        self._inflight: Dict[int, MqttMessage] = {}
+        self._acked_early: set = set()
+        self._sending_tracked = False
+        self._condition = threading.Condition()
+        self._connected = False
+        self._closed = False
+        self.sent = 0
+        self.acknowledged = 0
+        self.dropped = 0
+
+        self._client = client_factory()
+        self._client.on_connect = self._on_connect
+        self._client.on_disconnect = self._on_disconnect
+        self._client.on_publish = self._on_publish
+        self._client.reconnect_delay_set(min_delay=1, max_delay=60)
+        self._client.connect_async(host, port, keepalive)
+        self._client.loop_start()
+        self._sender = threading.Thread(
+            target=self._run, name=f"utms-mqtt-{host}:{port}", daemon=True
+        )
+        self._sender.start()
+
+    @property
+    def connected(self) -> bool:
+        return self._connected
+
+    def publish(
+        self, topic: str, payload: Payload = None, qos: int = 0, retain: bool = False
+    ) -> None:
+        """Queue a message. Never blocks on the network."""
+        with self._condition:
+            if self._closed:
+                raise RuntimeError(f"MQTT publisher for {self.host}:{self.port} is closed")
+            if len(self._buffer) == self._buffer.maxlen:
+                self.dropped += 1
+                self.logger.warning(
+                    f"MQTT buffer for {self.host}:{self.port} is full; dropping the oldest message"
+                )
+            self._buffer.append(MqttMessage(topic, payload, qos, retain))
+            self._condition.notify()
+
+    def _next_batch(self) -> Tuple[MqttMessage, ...]:
+        """Messages that may be sent now, removed from the buffer. Call with the condition held."""
+        batch = []
+        inflight = len(self._inflight)
+        while self._buffer and len(batch) < MQTT_BATCH_SIZE:
+            message = self._buffer[0]
+            if message.qos > 0:
+                if inflight >= self.max_inflight:
+                    break
+                inflight += 1
+            batch.append(self._buffer.popleft())
+        return tuple(batch)
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while not self._closed and not (self._connected and self._next_batch_ready()):
+                    self._condition.wait()
+                if self._closed:
+                    return
+                batch = self._next_batch()
+            # The client is called without holding the condition: paho runs
+            # on_publish with its own locks held.
+            for index, message in enumerate(batch):
+                if not self._send(message):
+                    with self._condition:
+                        self._buffer.extendleft(reversed(batch[index:]))
+                        # Back off instead of spinning on a client that refuses messages.
+                        self._condition.wait(timeout=1.0)
+                    break
+
+    def _next_batch_ready(self) -> bool:
+        if not self._buffer:
+            return False
+        return self._buffer[0].qos == 0 or len(self._inflight) < self.max_inflight
+
+    def _send(self, message: MqttMessage) -> bool:
+        self._sending_tracked = message.qos > 0
+        try:
+            info = self._client.publish(
+                message.topic, message.payload, qos=message.qos, retain=message.retain
+            )
+        except Exception as e:
+            self._sending_tracked = False
+            self.logger.error(f"MQTT publish to '{message.topic}' failed: {e}")
+            return False
+        with self._condition:
+            self._sending_tracked = False
+            if info.rc != 0:
+                self.logger.debug(
+                    f"MQTT publish to '{message.topic}' not accepted (rc={info.rc}); "
+                    "keeping it buffered"
+                )
+                return False
+            self.sent += 1
+            if message.qos > 0:
+                if info.mid in self._acked_early:
+                    self._acked_early.discard(info.mid)
+                    self.acknowledged += 1
+                else:
+                    self._inflight[info.mid] = message
+            self._condition.notify_all()
+        return True
+
+    def _on_connect(self, client, userdata, flags, reason_code, properties=None) -> None:
+        if getattr(reason_code, "is_failure", False):
+            self.logger.warning(
+                f"MQTT connection to {self.host}:{self.port} refused: {reason_code}"
+            )
+            return
+        self.logger.info(f"Connected to MQTT broker {self.host}:{self.port}")
+        with self._condition:
+            self._connected = True
+            self._condition.notify_all()
+
+    def _on_disconnect(self, client, userdata, flags, reason_code, properties=None) -> None:
+        with self._condition:
+            self._connected = False
+            # Unacknowledged messages are resent once the connection is back.
+            self._buffer.extendleft(reversed(list(self._inflight.values())))
+            self._inflight.clear()
+            self._acked_early.clear()
+        if not self._closed:
+            self.logger.warning(
+                f"Lost connection to MQTT broker {self.host}:{self.port}: {reason_code}"
+            )
+
+    def _on_publish(self, client, userdata, mid, reason_code=None, properties=None) -> None:
+        with self._condition:
+            if self._inflight.pop(mid, None) is not None:
+                self.acknowledged += 1
+                self._condition.notify_all()
+            elif self._sending_tracked:
+                # Acknowledged before _send() could record it.
+                self._acked_early.add(mid)
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Wait until every message has been sent and acknowledged. Returns False on timeout."""
+        with self._condition:
+            return self._condition.wait_for(
+                lambda: not self._buffer and not self._inflight, timeout=timeout
+            )
+
+    def close(self, timeout: float = 1.0) -> None:
+        """Try to deliver what is queued for up to `timeout` seconds, then disconnect."""
+        if self._connected:
+            self.flush(timeout)
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        self._sender.join(timeout)
+        try:
+            self._client.disconnect()
+            self._client.loop_stop()
+        except Exception as e:
+            self.logger.debug(f"Error disconnecting from MQTT broker {self.host}:{self.port}: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        with self._condition:
+            return {
+                "connected": self._connected,
+                "buffered": len(self._buffer),
+                "inflight": len(self._inflight),
+                "sent": self.sent,
+                "acknowledged": self.acknowledged,
+                "dropped": self.dropped,
+            }
+
+
+_publishers: Dict[Tuple[str, int], MqttPublisher] = {}
+_publishers_lock = threading.Lock()
+
+
+def get_mqtt_publisher(host: str, port: int = 1883) -> MqttPublisher:
+    """The shared publisher for a broker, connecting on first use."""
+    key = (str(host), int(port))
+    with _publishers_lock:
+        publisher = _publishers.get(key)
+        if publisher is None:
+            publisher = _publishers[key] = MqttPublisher(*key)
+        return publisher
+
+
+@atexit.register
+def close_mqtt_publishers() -> None:
+    with _publishers_lock:
+        publishers = list(_publishers.values())
+        _publishers.clear()
+    for publisher in publishers:
+        publisher.close()
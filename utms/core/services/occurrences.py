@@ -0,0 +1,180 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+import pytz
+
+from utms.core.mixins import ServiceMixin
+from utms.core.time import DecimalTimeStamp
+from utms.utms_types.recurrence.pattern import RecurrencePattern
+
+# Occurrences kept across all cached windows before the least recently used
+# windows are evicted.
+DEFAULT_OCCURRENCE_CACHE_SIZE = 200_000
+# Width in seconds of the windows that fixed schedules are expanded in.
+OCCURRENCE_BUCKET_SECONDS = 7 * 86400
+# Buckets next_occurrence() searches before giving up, like the year-long
+# search of RecurrencePattern.next_occurrence().
+NEXT_OCCURRENCE_MAX_BUCKETS = 54
+
+
+def pattern_definition_hash(pattern: RecurrencePattern) -> str:
+    """A digest of everything that decides when `pattern` occurs."""
+    constraints = [
+        (constraint.kind, constraint.description, constraint.kind or id(constraint.func))
+        for constraint in pattern.constraints
+    ]
+    definition = repr((pattern.spec, constraints))
+    return hashlib.blake2b(definition.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _tz_key(local_tz: Any) -> str:
+    return getattr(local_tz, "zone", None) or str(local_tz)
+
+
+class OccurrenceCache(ServiceMixin):
+    """
+    LRU cache of expanded pattern occurrences, shared by the calendar and the
+    scheduler agent.
+
+    Entries are keyed by (pattern label, definition hash, time zone, window).
+    A pattern with a fixed schedule (see `RecurrencePattern.depends_on_start`)
+    is expanded in week-long buckets, so overlapping calendar windows share
+    them, and the agent's `next_occurrence` lookups are answered from them
+    too. Any other pattern is cached per exact window. Since the key includes
+    the definition hash, a changed pattern never hits old entries;
+    `invalidate()` drops them once the pattern component reloads or replaces
+    a pattern.
+    """
+
+    def __init__(self, max_occurrences: int = DEFAULT_OCCURRENCE_CACHE_SIZE):
+        self.max_occurrences = max_occurrences
+        self._entries: "OrderedDict[Hashable, Tuple[float, ...]]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _lookup(self, key: Hashable) -> Optional[Tuple[float, ...]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def _store(self, key: Hashable, occurrences: Tuple[float, ...]) -> None:
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= max(1, len(previous))
+            self._entries[key] = occurrences
+            self._size += max(1, len(occurrences))
+            while self._size > self.max_occurrences and len(self._entries) > 1:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= max(1, len(evicted))
+
+    def occurrences(
+        self,
+        pattern: RecurrencePattern,
+        start: DecimalTimeStamp,
+        end: DecimalTimeStamp,
+        local_tz: Any = pytz.utc,
+    ) -> List[DecimalTimeStamp]:
+        """The occurrences of `pattern.iter_occurrences(start, end, local_tz)`."""
+        prefix = (pattern.label, pattern_definition_hash(pattern), _tz_key(local_tz))
+        if pattern.depends_on_start():
+            key = prefix + ("window", float(start), float(end))
+            cached = self._lookup(key)
+            if cached is None:
+                cached = tuple(float(ts) for ts in pattern.iter_occurrences(start, end, local_tz))
+                self._store(key, cached)
+            return [DecimalTimeStamp(value) for value in cached]
+
+        # The first occurrence after `start`, then every scheduled time up to `end`.
+        # It comes from the expansion itself, not next_occurrence(), which keeps
+        # the old UTC offset across a DST change.
+        first_occurrence = next(iter(pattern.iter_occurrences(start, end, local_tz)), None)
+        if first_occurrence is None:
+            return []
+        first = float(first_occurrence)
+        end_value = float(end)
+        result = [first]
+        bucket = int(first // OCCURRENCE_BUCKET_SECONDS)
+        while bucket * OCCURRENCE_BUCKET_SECONDS < end_value:
+            cached = self._bucket(prefix, pattern, bucket, local_tz)
+            result.extend(value for value in cached if first < value < end_value)
+            bucket += 1
+        return [DecimalTimeStamp(value) for value in result]
+
+    def _bucket(
+        self, prefix: Tuple, pattern: RecurrencePattern, bucket: int, local_tz: Any
+    ) -> Tuple[float, ...]:
+        key = prefix + ("bucket", bucket)
+        cached = self._lookup(key)
+        if cached is None:
+            cached = self._expand_bucket(pattern, bucket, local_tz)
+            self._store(key, cached)
+        return cached
+
+    @staticmethod
+    def _expand_bucket(pattern: RecurrencePattern, bucket: int, local_tz: Any) -> Tuple[float, ...]:
+        bucket_start = bucket * OCCURRENCE_BUCKET_SECONDS
+        # Start a little early: the first candidate comes a minute or two after the start.
+        occurrences = pattern.iter_occurrences(
+            DecimalTimeStamp(bucket_start - 120),
+            DecimalTimeStamp(bucket_start + OCCURRENCE_BUCKET_SECONDS),
+            local_tz,
+        )
+        return tuple(value for value in map(float, occurrences) if value >= bucket_start)
+
+    def next_occurrence(
+        self, pattern: RecurrencePattern, from_time: DecimalTimeStamp, local_tz: Any = pytz.utc
+    ) -> DecimalTimeStamp:
+        """
+        The first occurrence of `pattern` after `from_time`. For a fixed schedule
+        it is read from the same week buckets as `occurrences()`, so the
+        agent's lookups from ever-changing clock times add no entries of their
+        own. Any other pattern is solved with `pattern.next_occurrence()`
+        without caching, as its starting points are rarely reused.
+        """
+        if pattern.depends_on_start():
+            return pattern.next_occurrence(from_time, local_tz=local_tz)
+
+        prefix = (pattern.label, pattern_definition_hash(pattern), _tz_key(local_tz))
+        start_value = float(from_time)
+        first_bucket = int(start_value // OCCURRENCE_BUCKET_SECONDS)
+        for bucket in range(first_bucket, first_bucket + NEXT_OCCURRENCE_MAX_BUCKETS):
+            for value in self._bucket(prefix, pattern, bucket, local_tz):
+                if value > start_value:
+                    return DecimalTimeStamp(value)
+        raise RuntimeError(
+            f"Could not find a matching next occurrence for pattern '{pattern.label}' "
+            f"from {from_time}"
+        )
+
+    def invalidate(self, label: Optional[str] = None) -> None:
+        """Drop the entries of the pattern `label`, or all entries."""
+        with self._lock:
+            if label is None:
+                self._entries.clear()
+                self._size = 0
+                return
+            for key in [key for key in self._entries if key[0] == label]:
+                self._size -= max(1, len(self._entries.pop(key)))
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "occurrences": self._size,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+# Global occurrence cache instance
+occurrence_cache = OccurrenceCache()
@@ -0,0 +1,256 @@
+import hashlib
+import mmap
+import os
+import pickle
+import struct
+import tempfile
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from utms.core.mixins import ServiceMixin
+from utms.utils.filesystem import fsync_directory
+
+SNAPSHOT_MAGIC = b"UTMSSNAP"
+SNAPSHOT_VERSION = 1
+# magic, format version, header length
+_PREAMBLE = struct.Struct("<8sIQ")
+
+
+def file_fingerprint(path: str) -> Optional[Dict[str, int]]:
+    """Cheap identity of a file's current contents: its size and nanosecond mtime."""
+    try:
+        stat_result = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return {"mtime_ns": stat_result.st_mtime_ns, "size": stat_result.st_size}
+
+
+def content_hash(path: str) -> Optional[str]:
+    """Hash of a file's bytes, or None if it does not exist."""
+    try:
+        with open(path, "rb") as f:
+            return hashlib.blake2b(f.read(), digest_size=16).hexdigest()
+    except FileNotFoundError:
+        return None
+
+
+def value_fingerprint(value: Any) -> str:
+    """
+    Stable digest of a Python value, based on its repr.
+
+    Values whose repr embeds an object address simply never match, which
+    costs a reparse but never serves stale data.
+    """
+    return hashlib.blake2b(repr(value).encode("utf-8"), digest_size=16).hexdigest()
+
+
+class EntitySnapshot(ServiceMixin):
+    """
+    A single binary file holding the parsed entities of every category file of a user.
+
+    Layout: a fixed preamble, a pickled header and a body of concatenated pickled
+    blobs, one per source file. The header maps each source path to its
+    fingerprint and the (offset, length) of its blob, so opening the snapshot
+    only reads the header; blobs are sliced out of a memory map on demand.
+
+    Changes are staged with `put()`/`discard()` and written by `commit()`, which
+    rewrites the file atomically, copying the bytes of unchanged blobs straight
+    from the old map and leaving out every source no longer retained.
+
+    Named extras (`put_extra()`/`read_extra()`) hold data that is not tied to a
+    source file, such as memoized expression results; they are stored as blobs
+    the same way but never garbage-collected by `retain_only()`.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = None
+        self._map: Optional[mmap.mmap] = None
+        self._body_offset = 0
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._staged: Dict[str, Tuple[Dict[str, Any], bytes]] = {}
+        self._extras: Dict[str, Dict[str, int]] = {}
+        self._staged_extras: Dict[str, bytes] = {}
+        self._dirty = False
+        self._open()
+
+    def _open(self) -> None:
+        self.close()
+        self._entries = {}
+        self._extras = {}
+        if not os.path.exists(self.path):
+            return
+        try:
+            self._file = open(self.path, "rb")
+            if os.fstat(self._file.fileno()).st_size < _PREAMBLE.size:
+                raise ValueError("truncated snapshot")
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, version, header_length = _PREAMBLE.unpack_from(self._map, 0)
+            if magic != SNAPSHOT_MAGIC or version != SNAPSHOT_VERSION:
+                raise ValueError(f"unsupported snapshot format (version {version})")
+            header_end = _PREAMBLE.size + header_length
+            header = pickle.loads(self._map[_PREAMBLE.size : header_end])
+            self._entries = header["files"]
+            self._extras = header.get("extras", {})
+            self._body_offset = header_end
+        except Exception as e:
+            self.logger.warning(f"Ignoring unreadable entity snapshot '{self.path}': {e}")
+            self.close()
+            self._entries = {}
+            self._extras = {}
+            self._dirty = True
+
+    def close(self) -> None:
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    @property
+    def exists(self) -> bool:
+        return self._map is not None
+
+    def sources(self) -> Iterable[str]:
+        return list(self._entries.keys())
+
+    def get_fingerprint(self, source_path: str) -> Optional[Dict[str, Any]]:
+        staged = self._staged.get(source_path)
+        if staged is not None:
+            return staged[0]
+        entry = self._entries.get(source_path)
+        return entry["fingerprint"] if entry else None
+
+    def read(self, source_path: str) -> Optional[Any]:
+        """Unpickle the blob stored for `source_path`, or None if there is none."""
+        staged = self._staged.get(source_path)
+        if staged is not None:
+            return pickle.loads(staged[1])
+        entry = self._entries.get(source_path)
+        if entry is None or self._map is None:
+            return None
+        start = self._body_offset + entry["offset"]
+        return pickle.loads(self._map[start : start + entry["length"]])
+
+    def put(self, source_path: str, fingerprint: Dict[str, Any], data: Any) -> bool:
+        """Stage new data for a source file. Returns False if it cannot be pickled."""
+        try:
+            blob = pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception as e:
+            self.logger.debug(f"Not snapshotting '{source_path}': {e}")
+            self.discard(source_path)
+            return False
+        self._staged[source_path] = (fingerprint, blob)
+        self._dirty = True
+        return True
+
+    def read_extra(self, name: str) -> Optional[Any]:
+        """Unpickle the extra stored under `name`, or None if there is none."""
+        staged = self._staged_extras.get(name)
+        if staged is not None:
+            return pickle.loads(staged)
+        entry = self._extras.get(name)
+        if entry is None or self._map is None:
+            return None
+        start = self._body_offset + entry["offset"]
+        return pickle.loads(self._map[start : start + entry["length"]])
+
+    def put_extra(self, name: str, data: Any) -> bool:
+        """Stage an extra. Returns False, keeping the previous one, if it cannot be pickled."""
+        try:
+            blob = pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception as e:
+            self.logger.debug(f"Not snapshotting extra '{name}': {e}")
+            return False
+        self._staged_extras[name] = blob
+        self._dirty = True
+        return True
+
+    def update_fingerprint(self, source_path: str, fingerprint: Dict[str, Any]) -> None:
+        """Record that unchanged data now belongs to a new fingerprint (e.g. after a touch)."""
+        staged = self._staged.get(source_path)
+        if staged is not None:
+            self._staged[source_path] = (fingerprint, staged[1])
+        elif source_path in self._entries:
+            self._entries[source_path] = {**self._entries[source_path], "fingerprint": fingerprint}
+        else:
+            return
+        self._dirty = True
+
+    def discard(self, source_path: str) -> None:
+        if self._staged.pop(source_path, None) is not None:
+            self._dirty = True
+        if self._entries.pop(source_path, None) is not None:
+            self._dirty = True
+
+    def retain_only(self, source_paths: Iterable[str]) -> None:
+        """Garbage-collect every entry whose source is not in `source_paths`."""
+        keep = set(source_paths)
+        for source_path in [p for p in self._entries if p not in keep]:
+            self.discard(source_path)
+        for source_path in [p for p in self._staged if p not in keep]:
+            self.discard(source_path)
+
+    def commit(self) -> None:
+        """Atomically write the snapshot if anything changed since it was opened."""
+        if not self._dirty:
+            return
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+
+        blobs = []
+        header_files: Dict[str, Dict[str, Any]] = {}
+        offset = 0
+        for source_path in sorted(set(self._entries) | set(self._staged)):
+            if source_path in self._staged:
+                fingerprint, blob = self._staged[source_path]
+            else:
+                entry = self._entries[source_path]
+                fingerprint = entry["fingerprint"]
+                start = self._body_offset + entry["offset"]
+                blob = self._map[start : start + entry["length"]]
+            header_files[source_path] = {
+                "fingerprint": fingerprint,
+                "offset": offset,
+                "length": len(blob),
+            }
+            blobs.append(blob)
+            offset += len(blob)
+
+        header_extras: Dict[str, Dict[str, int]] = {}
+        for name in sorted(set(self._extras) | set(self._staged_extras)):
+            if name in self._staged_extras:
+                blob = self._staged_extras[name]
+            else:
+                entry = self._extras[name]
+                start = self._body_offset + entry["offset"]
+                blob = self._map[start : start + entry["length"]]
+            header_extras[name] = {"offset": offset, "length": len(blob)}
+            blobs.append(blob)
+            offset += len(blob)
+
+        header = pickle.dumps(
+            {"files": header_files, "extras": header_extras}, protocol=pickle.HIGHEST_PROTOCOL
+        )
+        fd, temp_path = tempfile.mkstemp(
+            dir=os.path.dirname(self.path), prefix=".snapshot-", suffix=".tmp"
+        )
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(_PREAMBLE.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, len(header)))
+                f.write(header)
+                for blob in blobs:
+                    f.write(blob)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, self.path)
+        except Exception:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        fsync_directory(os.path.dirname(self.path))
+
+        self._staged = {}
+        self._staged_extras = {}
+        self._dirty = False
+        self._open()
+        self.logger.debug(f"Wrote entity snapshot '{self.path}' with {len(header_files)} files.")
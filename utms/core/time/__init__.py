@@ -1,4 +1,5 @@
 from .decimal import DecimalTimeLength, DecimalTimeRange, DecimalTimeStamp
+from .nanos import NanoTimeLength, NanoTimeStamp
 from .parser import TimeExpressionParser
 from .utils.conversion import (
     calculate_decimal_time,
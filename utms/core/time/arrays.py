@@ -0,0 +1,353 @@
+"""
+NumPy-backed arrays of timestamps and lengths.
+
+TimeStampArray and TimeLengthArray apply the operators of DecimalTimeStamp
+and DecimalTimeLength element-wise, and TimeRangeArray does the same for
+DecimalTimeRange. Values are stored as int64 nanoseconds, which covers the
+years 1678 to 2262; values outside that range raise OverflowError, and need
+the scalar types. As with the scalar types, plain numbers are seconds.
+Multiplication by integers is exact; other products and quotients are
+computed in float64, so they are as precise as float seconds would be, and
+rounded to the nearest nanosecond.
+
+NumPy is an optional dependency of utms, installed with the `arrays` extra
+(`pip install utms[arrays]`); importing this module requires it.
+"""
+
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from datetime import datetime, timedelta, tzinfo
+from decimal import Decimal
+from typing import Any, Iterable, Iterator, List, Optional, Union
+
+try:
+    import numpy as np
+except ImportError as e:
+    raise ImportError(
+        "utms.core.time.arrays requires numpy; install the 'arrays' extra: pip install utms[arrays]"
+    ) from e
+
+from .decimal import DecimalTimeLength, DecimalTimeStamp
+from .nanos import EPOCH, NANOS_PER_SECOND, NanoTimeStamp, _NanoSeconds
+
+_INT64 = np.iinfo(np.int64)
+_DECIMAL_NANOS = Decimal(NANOS_PER_SECOND)
+
+
+def _checked(values: Any) -> np.ndarray:
+    """Round float nanoseconds to int64, refusing values out of range."""
+    values = np.rint(np.asarray(values, dtype=np.float64))
+    if values.size and (np.nanmax(values) >= _INT64.max or np.nanmin(values) <= _INT64.min):
+        raise OverflowError("time value outside the int64 nanosecond range")
+    return values.astype(np.int64)
+
+
+def _scalar_ns(value: Any) -> int:
+    ns = (value if isinstance(value, _NanoSeconds) else NanoTimeStamp(value)).nanoseconds
+    if not _INT64.min <= ns <= _INT64.max:
+        raise OverflowError("time value outside the int64 nanosecond range")
+    return ns
+
+
+def _nanoseconds(value: Any) -> Union[int, np.ndarray]:
+    """Nanoseconds of an operand: an array, time value or number of seconds."""
+    if isinstance(value, _TimeArray):
+        return value._ns
+    if isinstance(value, np.ndarray):
+        if np.issubdtype(value.dtype, np.datetime64):
+            return value.astype("datetime64[ns]").astype(np.int64)
+        if np.issubdtype(value.dtype, np.timedelta64):
+            return value.astype("timedelta64[ns]").astype(np.int64)
+        if np.issubdtype(value.dtype, np.integer):
+            if value.size and np.abs(value).max() > _INT64.max // NANOS_PER_SECOND:
+                raise OverflowError("time value outside the int64 nanosecond range")
+            return value.astype(np.int64) * NANOS_PER_SECOND
+        if np.issubdtype(value.dtype, np.floating):
+            return _checked(value * NANOS_PER_SECOND)
+        value = value.tolist()
+    if isinstance(value, (list, tuple)):
+        return np.fromiter((_scalar_ns(item) for item in value), dtype=np.int64, count=len(value))
+    return _scalar_ns(value)
+
+
+def _factor(value: Any) -> Any:
+    """A multiplier or divisor: time values count as their seconds."""
+    if isinstance(value, (_TimeArray, _NanoSeconds, DecimalTimeStamp, DecimalTimeLength)):
+        return np.asarray(_nanoseconds(value), dtype=np.float64) / NANOS_PER_SECOND
+    if isinstance(value, Decimal):
+        return float(value)
+    return value
+
+
+def _nonzero(divisor: Any) -> Any:
+    """`divisor`, unless any element is zero: NumPy would only warn."""
+    if np.any(np.asarray(divisor) == 0):
+        raise ZeroDivisionError("division by a zero time value")
+    return divisor
+
+
+def _trunc_div(a: Any, b: Any) -> np.ndarray:
+    """a / b truncated toward zero, as Decimal's // does."""
+    quotient = np.abs(a) // np.abs(b)
+    return np.where((np.asarray(a) < 0) == (np.asarray(b) < 0), quotient, -quotient)
+
+
+class _TimeArray(ABC):
+    """Element-wise seconds stored as an int64 array of nanoseconds."""
+
+    __slots__ = ("_ns",)
+    # Make NumPy operands defer to the reflected operators below.
+    __array_ufunc__ = None
+    __hash__ = None  # type: ignore[assignment]
+
+    def __init__(self, values: Union[Iterable[Any], np.ndarray]) -> None:
+        if not isinstance(values, (np.ndarray, list, tuple, _TimeArray)):
+            values = list(values)
+        self._ns: np.ndarray = np.array(_nanoseconds(values), dtype=np.int64)
+
+    @classmethod
+    def from_nanoseconds(cls, nanoseconds: Any) -> Any:
+        instance = cls.__new__(cls)
+        instance._ns = np.asarray(nanoseconds, dtype=np.int64)
+        return instance
+
+    @property
+    def nanoseconds(self) -> np.ndarray:
+        return self._ns
+
+    def seconds(self) -> np.ndarray:
+        """The values as float64 seconds."""
+        return self._ns / NANOS_PER_SECOND
+
+    def __array__(self, dtype: Any = None, copy: Optional[bool] = None) -> np.ndarray:
+        return self.seconds() if dtype is None else self.seconds().astype(dtype)
+
+    def __len__(self) -> int:
+        return len(self._ns)
+
+    @property
+    def shape(self) -> tuple:
+        return self._ns.shape
+
+    @abstractmethod
+    def _scalar(self, ns: int) -> Any:
+        """The scalar time value of one element."""
+
+    def __getitem__(self, index: Any) -> Any:
+        selected = self._ns[index]
+        if np.ndim(selected) == 0:
+            return self._scalar(int(selected))
+        return type(self).from_nanoseconds(selected)
+
+    def __iter__(self) -> Iterator[Any]:
+        return (self._scalar(ns) for ns in self._ns.tolist())
+
+    def __floordiv__(self, other: Any) -> np.ndarray:
+        return _trunc_div(self._ns, _nonzero(_nanoseconds(other)))
+
+    def __rfloordiv__(self, other: Any) -> np.ndarray:
+        return _trunc_div(_nanoseconds(other), _nonzero(self._ns))
+
+    def __mod__(self, other: Any) -> np.ndarray:
+        return _trunc_div(np.fmod(self._ns, _nonzero(_nanoseconds(other))), NANOS_PER_SECOND)
+
+    def __rmod__(self, other: Any) -> np.ndarray:
+        return _trunc_div(np.fmod(_nanoseconds(other), _nonzero(self._ns)), NANOS_PER_SECOND)
+
+    def __lt__(self, other: Any) -> np.ndarray:
+        return self._ns < _nanoseconds(other)
+
+    def __le__(self, other: Any) -> np.ndarray:
+        return self._ns <= _nanoseconds(other)
+
+    def __gt__(self, other: Any) -> np.ndarray:
+        return self._ns > _nanoseconds(other)
+
+    def __ge__(self, other: Any) -> np.ndarray:
+        return self._ns >= _nanoseconds(other)
+
+    def __eq__(self, other: object) -> Any:  # type: ignore[override]
+        try:
+            return self._ns == _nanoseconds(other)
+        except (TypeError, ValueError, ArithmeticError):
+            return NotImplemented
+
+    def __ne__(self, other: object) -> Any:  # type: ignore[override]
+        try:
+            return self._ns != _nanoseconds(other)
+        except (TypeError, ValueError, ArithmeticError):
+            return NotImplemented
+
+    def _scaled(self, factor: Any) -> np.ndarray:
+        if isinstance(factor, (int, np.integer)) or (
+            isinstance(factor, np.ndarray) and np.issubdtype(factor.dtype, np.integer)
+        ):
+            _checked(self._ns.astype(np.float64) * factor)
+            return self._ns * factor
+        return _checked(self._ns * np.asarray(factor, dtype=np.float64))
+
+    def _divided(self, divisor: Any) -> np.ndarray:
+        return _checked(self._ns / _nonzero(np.asarray(_factor(divisor), dtype=np.float64)))
+
+    def _divide_into(self, dividend: Any) -> np.ndarray:
+        ratio = np.asarray(_factor(dividend), dtype=np.float64) / _nonzero(self.seconds())
+        return _checked(ratio * NANOS_PER_SECOND)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.seconds().tolist()})"
+
+
+class TimeStampArray(_TimeArray):
+    """Element-wise DecimalTimeStamp."""
+
+    __slots__ = ()
+
+    def _scalar(self, ns: int) -> DecimalTimeStamp:
+        return DecimalTimeStamp(Decimal(ns) / _DECIMAL_NANOS)
+
+    def copy(self) -> "TimeStampArray":
+        """Create a new instance with the same values."""
+        return TimeStampArray.from_nanoseconds(self._ns.copy())
+
+    def to_gregorian(self) -> List[datetime]:
+        """The timestamps as aware UTC datetimes."""
+        microseconds = np.rint(self._ns / 1000).astype(np.int64)
+        return [EPOCH + timedelta(microseconds=us) for us in microseconds.tolist()]
+
+    def to_datetime64(self) -> np.ndarray:
+        """The timestamps as a UTC datetime64[ns] array."""
+        return self._ns.astype("datetime64[ns]")
+
+    def date(self, tz: Optional[tzinfo] = None) -> np.ndarray:
+        """
+        The dates of the timestamps as a datetime64[D] array, in `tz` or, like
+        DecimalTimeStamp.date(), in local time.
+        """
+        seconds = self._ns // NANOS_PER_SECOND
+        fixed_offset = tz.utcoffset(None) if tz is not None else None
+        if fixed_offset is not None:
+            return ((seconds + int(fixed_offset.total_seconds())) // 86400).astype("datetime64[D]")
+        # Zones with transitions need the offset of each distinct timestamp.
+        unique, inverse = np.unique(seconds, return_inverse=True)
+        offsets = np.array(
+            [
+                (
+                    datetime.fromtimestamp(second, tz).utcoffset().total_seconds()
+                    if tz is not None
+                    else datetime.fromtimestamp(second).astimezone().utcoffset().total_seconds()
+                )
+                for second in unique.tolist()
+            ],
+            dtype=np.int64,
+        )
+        return ((seconds + offsets[inverse.reshape(seconds.shape)]) // 86400).astype(
+            "datetime64[D]"
+        )
+
+    def __add__(self, other: Any) -> "TimeStampArray":
+        return TimeStampArray.from_nanoseconds(self._ns + _nanoseconds(other))
+
+    def __radd__(self, other: Any) -> "TimeStampArray":
+        return TimeStampArray.from_nanoseconds(_nanoseconds(other) + self._ns)
+
+    def __sub__(self, other: Any) -> "TimeStampArray":
+        return TimeStampArray.from_nanoseconds(self._ns - _nanoseconds(other))
+
+    def __rsub__(self, other: Any) -> "TimeStampArray":
+        return TimeStampArray.from_nanoseconds(_nanoseconds(other) - self._ns)
+
+    def __mul__(self, other: Any) -> "TimeLengthArray":
+        return TimeLengthArray.from_nanoseconds(self._scaled(_factor(other)))
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, other: Any) -> "TimeLengthArray":
+        return TimeLengthArray.from_nanoseconds(self._divided(other))
+
+    def __rtruediv__(self, other: Any) -> "TimeLengthArray":
+        return TimeLengthArray.from_nanoseconds(self._divide_into(other))
+
+    def __neg__(self) -> "TimeStampArray":
+        return TimeStampArray.from_nanoseconds(-self._ns)
+
+    def __abs__(self) -> "TimeStampArray":
+        return TimeStampArray.from_nanoseconds(np.abs(self._ns))
+
+
+class TimeLengthArray(_TimeArray):
+    """Element-wise DecimalTimeLength."""
+
+    __slots__ = ()
+
+    def _scalar(self, ns: int) -> DecimalTimeLength:
+        return DecimalTimeLength(Decimal(ns) / _DECIMAL_NANOS)
+
+    def copy(self) -> "TimeLengthArray":
+        """Create a new instance with the same values."""
+        return TimeLengthArray.from_nanoseconds(self._ns.copy())
+
+    def to_timedelta(self) -> np.ndarray:
+        """The lengths as a timedelta64[ns] array."""
+        return self._ns.astype("timedelta64[ns]")
+
+    def __add__(self, other: Any) -> Union[TimeStampArray, "TimeLengthArray"]:
+        return self._like(other).from_nanoseconds(self._ns + _nanoseconds(other))
+
+    def __radd__(self, other: Any) -> Union[TimeStampArray, "TimeLengthArray"]:
+        return self._like(other).from_nanoseconds(_nanoseconds(other) + self._ns)
+
+    def __sub__(self, other: Any) -> Union[TimeStampArray, "TimeLengthArray"]:
+        return self._like(other).from_nanoseconds(self._ns - _nanoseconds(other))
+
+    def __rsub__(self, other: Any) -> "TimeLengthArray":
+        return TimeLengthArray.from_nanoseconds(_nanoseconds(other) - self._ns)
+
+    @staticmethod
+    def _like(other: Any) -> type:
+        """Lengths combined with timestamps give timestamps."""
+        if isinstance(other, (TimeStampArray, NanoTimeStamp, DecimalTimeStamp, datetime)):
+            return TimeStampArray
+        return TimeLengthArray
+
+    def __mul__(self, other: Any) -> "TimeLengthArray":
+        return TimeLengthArray.from_nanoseconds(self._scaled(_factor(other)))
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, other: Any) -> "TimeLengthArray":
+        return TimeLengthArray.from_nanoseconds(self._divided(other))
+
+    def __rtruediv__(self, other: Any) -> "TimeLengthArray":
+        return TimeLengthArray.from_nanoseconds(self._divide_into(other))
+
+    def __neg__(self) -> "TimeLengthArray":
+        return TimeLengthArray.from_nanoseconds(-self._ns)
+
+    def __abs__(self) -> "TimeLengthArray":
+        return TimeLengthArray.from_nanoseconds(np.abs(self._ns))
+
+
+@dataclass
+class TimeRangeArray:
+    """Element-wise DecimalTimeRange over arrays of starts and durations."""
+
+    _start: TimeStampArray
+    _duration: TimeLengthArray
+
+    @property
+    def start(self) -> TimeStampArray:
+        return self._start
+
+    @property
+    def duration(self) -> TimeLengthArray:
+        return self._duration
+
+    @property
+    def end(self) -> TimeStampArray:
+        return self._start + self._duration
+
+    def contains(self, timestamp: Any) -> np.ndarray:
+        return (self.start <= timestamp) & (self.end > timestamp)
+
+    def overlaps(self, other: Any) -> np.ndarray:
+        return (self.start < other.end) & (self.end > other.start)
@@ -9,6 +9,19 @@ from utms.utms_types.base.protocols import TimeLength, TimeRange, TimeStamp
 from utms.utms_types.unit import UnitManagerProtocol
 
 
+def _to_decimal(value: Union[int, float, Decimal, object]) -> Decimal:
+    """
+    Convert an operand to Decimal the way `Decimal(str(value))` does, skipping
+    the string round-trip for ints and Decimals, which convert exactly.
+    """
+    value_type = type(value)
+    if value_type is Decimal:
+        return value
+    if value_type is int:
+        return Decimal(value)
+    return Decimal(str(value))
+
+
 class DecimalTimeStamp(TimeStamp):
     """Default implementation of TimeStamp using Decimal for precision."""
 
@@ -42,7 +55,7 @@ class DecimalTimeStamp(TimeStamp):
         elif isinstance(value, datetime):
             self._value: Decimal = Decimal(str(value.timestamp()))
         else:
-            self._value = Decimal(str(value))
+            self._value = _to_decimal(value)
 
     def __float__(self) -> float:
         return float(self._value)
@@ -57,7 +70,7 @@ class DecimalTimeStamp(TimeStamp):
             return DecimalTimeStamp(self._value + other._value)
         if isinstance(other, DecimalTimeLength):
             return DecimalTimeStamp(self._value + other._seconds)
-        return DecimalTimeStamp(self._value + Decimal(str(other)))
+        return DecimalTimeStamp(self._value + _to_decimal(other))
 
     def __radd__(
         self, other: Union["TimeStamp", "TimeLength", int, float, Decimal]
@@ -66,7 +79,7 @@ class DecimalTimeStamp(TimeStamp):
             return DecimalTimeStamp(self._value + other._value)
         elif isinstance(other, DecimalTimeLength):
             return DecimalTimeStamp(other._seconds + self._value)
-        return DecimalTimeStamp(Decimal(str(other)) + self._value)
+        return DecimalTimeStamp(_to_decimal(other) + self._value)
 
     def __iadd__(
         self, other: Union["TimeStamp", "TimeLength", int, float, Decimal]
@@ -76,7 +89,7 @@ class DecimalTimeStamp(TimeStamp):
         elif isinstance(other, DecimalTimeLength):
             self._value += other._seconds
         else:
-            self._value += Decimal(str(other))
+            self._value += _to_decimal(other)
         return self
 
     def __sub__(
@@ -86,7 +99,7 @@ class DecimalTimeStamp(TimeStamp):
             return DecimalTimeStamp(self._value - other._value)
         if isinstance(other, DecimalTimeLength):
             return DecimalTimeStamp(self._value - other._seconds)
-        return DecimalTimeStamp(self._value - Decimal(str(other)))
+        return DecimalTimeStamp(self._value - _to_decimal(other))
 
     def __rsub__(
         self, other: Union["TimeStamp", "TimeLength", int, float, Decimal]
@@ -95,7 +108,7 @@ class DecimalTimeStamp(TimeStamp):
             return DecimalTimeStamp(other._value - self._value)
         if isinstance(other, DecimalTimeLength):
             return DecimalTimeStamp(other._seconds - self._value)
-        return DecimalTimeStamp(Decimal(str(other)) - self._value)
+        return DecimalTimeStamp(_to_decimal(other) - self._value)
 
     def __isub__(
         self, other: Union["TimeStamp", "TimeLength", int, float, Decimal]
@@ -105,7 +118,7 @@ class DecimalTimeStamp(TimeStamp):
         elif isinstance(other, DecimalTimeLength):
             self._value -= other._seconds
         else:
-            self._value -= Decimal(str(other))
+            self._value -= _to_decimal(other)
         return self
 
     def __truediv__(
@@ -115,7 +128,7 @@ class DecimalTimeStamp(TimeStamp):
             return DecimalTimeLength(self._value / other._value)
         if isinstance(other, DecimalTimeLength):
             return DecimalTimeLength(self._value / other._seconds)
-        return DecimalTimeLength(self._value / Decimal(str(other)))
+        return DecimalTimeLength(self._value / _to_decimal(other))
 
     def __rtruediv__(
         self, other: Union["TimeStamp", "TimeLength", int, float, Decimal]
@@ -124,7 +137,7 @@ class DecimalTimeStamp(TimeStamp):
             return DecimalTimeLength(other._value / self._value)
         if isinstance(other, DecimalTimeLength):
             return DecimalTimeLength(other._seconds / self._value)
-        return DecimalTimeLength(Decimal(str(other)) / self._value)
+        return DecimalTimeLength(_to_decimal(other) / self._value)
 
     def __itruediv__(
         self, other: Union["TimeStamp", "TimeLength", int, float, Decimal]
@@ -134,7 +147,7 @@ class DecimalTimeStamp(TimeStamp):
         elif isinstance(other, DecimalTimeLength):
             self._value /= other._seconds
         else:
-            self._value /= Decimal(str(other))
+            self._value /= _to_decimal(other)
         return DecimalTimeLength(self._value)
 
     def __floordiv__(self, other: Union["TimeStamp", "TimeLength", int, float, Decimal]) -> int:
@@ -142,14 +155,14 @@ class DecimalTimeStamp(TimeStamp):
             return int(self._value // other._value)
         if isinstance(other, DecimalTimeLength):
             return int(self._value // other._seconds)
-        return int(self._value // Decimal(str(other)))
+        return int(self._value // _to_decimal(other))
 
     def __rfloordiv__(self, other: Union["TimeStamp", "TimeLength", int, float, Decimal]) -> int:
         if isinstance(other, DecimalTimeStamp):
             return int(other._value // self._value)
         if isinstance(other, DecimalTimeLength):
             return int(other._seconds // self._value)
-        return int(Decimal(str(other)) // self._value)
+        return int(_to_decimal(other) // self._value)
 
     def __ifloordiv__(self, other: Union["TimeStamp", "TimeLength", int, float, Decimal]) -> int:
         if isinstance(other, DecimalTimeStamp):
@@ -157,7 +170,7 @@ class DecimalTimeStamp(TimeStamp):
         elif isinstance(other, DecimalTimeLength):
             self._value //= other._seconds
         else:
-            self._value //= Decimal(str(other))
+            self._value //= _to_decimal(other)
         return int(self)
 
     def __mul__(
@@ -167,7 +180,7 @@ class DecimalTimeStamp(TimeStamp):
             return DecimalTimeLength(self._value * other._value)
         if isinstance(other, DecimalTimeLength):
             return DecimalTimeLength(self._value * other._seconds)
-        return DecimalTimeLength(self._value * Decimal(str(other)))
+        return DecimalTimeLength(self._value * _to_decimal(other))
 
     def __rmul__(
         self, other: Union["TimeStamp", "TimeLength", int, float, Decimal]
@@ -176,7 +189,7 @@ class DecimalTimeStamp(TimeStamp):
             return DecimalTimeLength(other._value * self._value)
         if isinstance(other, DecimalTimeLength):
             return DecimalTimeLength(other._seconds * self._value)
-        return DecimalTimeLength(Decimal(str(other)) * self._value)
+        return DecimalTimeLength(_to_decimal(other) * self._value)
 
     def __imul__(
         self, other: Union["TimeStamp", "TimeLength", int, float, Decimal]
@@ -186,7 +199,7 @@ class DecimalTimeStamp(TimeStamp):
         elif isinstance(other, DecimalTimeLength):
             self._value *= other._seconds
         else:
-            self._value *= Decimal(str(other))
+            self._value *= _to_decimal(other)
         return DecimalTimeLength(self._value)
 
     def __mod__(self, other: Union["TimeStamp", "TimeLength", int, float, Decimal]) -> int:
@@ -194,14 +207,14 @@ class DecimalTimeStamp(TimeStamp):
             return int(self._value % other._value)
         if isinstance(other, DecimalTimeLength):
             return int(self._value % other._seconds)
-        return int(self._value % Decimal(str(other)))
+        return int(self._value % _to_decimal(other))
 
     def __rmod__(self, other: Union["TimeStamp", "TimeLength", int, float, Decimal]) -> int:
         if isinstance(other, DecimalTimeStamp):
             return int(other._value % self._value)
         if isinstance(other, DecimalTimeLength):
             return int(other._seconds % self._value)
-        return int(Decimal(str(other)) % self._value)
+        return int(_to_decimal(other) % self._value)
 
     def __imod__(self, other: Union["TimeStamp", "TimeLength", int, float, Decimal]) -> int:
         if isinstance(other, DecimalTimeStamp):
@@ -209,34 +222,34 @@ class DecimalTimeStamp(TimeStamp):
         elif isinstance(other, DecimalTimeLength):
             self._value %= other._seconds
         else:
-            self._value %= Decimal(str(other))
+            self._value %= _to_decimal(other)
         return int(self)
 
     def __lt__(self, other: Union["TimeStamp", int, float, Decimal]) -> bool:
         if isinstance(other, DecimalTimeStamp):
             return self._value < other._value
-        return self._value < Decimal(str(other))
+        return self._value < _to_decimal(other)
 
     def __le__(self, other: Union["TimeStamp", int, float, Decimal]) -> bool:
         if isinstance(other, DecimalTimeStamp):
             return self._value <= other._value
-        return self._value <= Decimal(str(other))
+        return self._value <= _to_decimal(other)
 
     def __gt__(self, other: Union["TimeStamp", int, float, Decimal]) -> bool:
         if isinstance(other, DecimalTimeStamp):
             return self._value > other._value
-        return self._value > Decimal(str(other))
+        return self._value > _to_decimal(other)
 
     def __ge__(self, other: Union["TimeStamp", int, float, Decimal]) -> bool:
         if isinstance(other, DecimalTimeStamp):
             return self._value >= other._value
-        return self._value >= Decimal(str(other))
+        return self._value >= _to_decimal(other)
 
     def __eq__(self, other: object) -> bool:
         if isinstance(other, DecimalTimeStamp):
             return self._value == other._value
         if isinstance(other, (int, float, Decimal)):
-            return self._value == Decimal(str(other))
+            return self._value == _to_decimal(other)
         return NotImplemented
 
     def __neg__(self) -> "DecimalTimeStamp":
@@ -268,7 +281,7 @@ class DecimalTimeLength:
         if isinstance(seconds, DecimalTimeLength):
             self._seconds = seconds._seconds
         else:
-            self._seconds = Decimal(str(seconds))
+            self._seconds = _to_decimal(seconds)
 
     def copy(self) -> "DecimalTimeLength":
         """Create a new instance with the same value."""
@@ -292,7 +305,7 @@ class DecimalTimeLength:
             return DecimalTimeLength(self._seconds + other._seconds)
         elif isinstance(other, DecimalTimeStamp):
             return DecimalTimeStamp(self._seconds + other._value)
-        return DecimalTimeLength(self._seconds + Decimal(str(other)))
+        return DecimalTimeLength(self._seconds + _to_decimal(other))
 
     def __radd__(
         self, other: Union["TimeStamp", "TimeLength", int, float, Decimal]
@@ -301,7 +314,7 @@ class DecimalTimeLength:
             return DecimalTimeLength(other._seconds + self._seconds)
         elif isinstance(other, DecimalTimeStamp):
             return DecimalTimeStamp(other._value + self._seconds)
-        return DecimalTimeLength(Decimal(str(other)) + self._seconds)
+        return DecimalTimeLength(_to_decimal(other) + self._seconds)
 
     def __iadd__(
         self, other: Union["TimeStamp", "TimeLength", int, float, Decimal]
@@ -312,7 +325,7 @@ class DecimalTimeLength:
             self._seconds += other._value
             return DecimalTimeStamp(self._seconds)
         else:
-            self._seconds += Decimal(str(other))
+            self._seconds += _to_decimal(other)
         return self
 
     def __sub__(
@@ -322,12 +335,12 @@ class DecimalTimeLength:
             return DecimalTimeLength(self._seconds - other._seconds)
         elif isinstance(other, DecimalTimeStamp):
             return DecimalTimeStamp(self._seconds - other._value)
-        return DecimalTimeLength(self._seconds - Decimal(str(other)))
+        return DecimalTimeLength(self._seconds - _to_decimal(other))
 
     def __rsub__(
         self, other: Union["TimeStamp", "TimeLength", int, float, Decimal]
     ) -> Union["DecimalTimeStamp", "DecimalTimeLength"]:
-        return DecimalTimeLength(Decimal(str(other)) - self._seconds)
+        return DecimalTimeLength(_to_decimal(other) - self._seconds)
 
     def __isub__(
         self, other: Union["TimeStamp", "TimeLength", int, float, Decimal]
@@ -338,23 +351,23 @@ class DecimalTimeLength:
             self._seconds -= other._value
             return DecimalTimeStamp(self._seconds)
         else:
-            self._seconds -= Decimal(str(other))
+            self._seconds -= _to_decimal(other)
         return self
 
     def __mul__(
         self, other: Union["TimeStamp", "TimeLength", int, float, Decimal]
     ) -> "DecimalTimeLength":
-        return DecimalTimeLength(self._seconds * Decimal(str(other)))
+        return DecimalTimeLength(self._seconds * _to_decimal(other))
 
     def __rmul__(
         self, other: Union["TimeStamp", "TimeLength", int, float, Decimal]
     ) -> "DecimalTimeLength":
-        return DecimalTimeLength(Decimal(str(other)) * self._seconds)
+        return DecimalTimeLength(_to_decimal(other) * self._seconds)
 
     def __imul__(
         self, other: Union["TimeStamp", "TimeLength", int, float, Decimal]
     ) -> "DecimalTimeLength":
-        self._seconds *= Decimal(str(other))
+        self._seconds *= _to_decimal(other)
         return self
 
     def __truediv__(
@@ -364,41 +377,41 @@ class DecimalTimeLength:
             return DecimalTimeLength(
                 self._seconds / other._seconds
             )  # Returns ratio between lengths
-        return DecimalTimeLength(self._seconds / Decimal(str(other)))
+        return DecimalTimeLength(self._seconds / _to_decimal(other))
 
     def __rtruediv__(
         self, other: Union["TimeStamp", "TimeLength", int, float, Decimal]
     ) -> "DecimalTimeLength":
-        return DecimalTimeLength(Decimal(str(other)) / self._seconds)
+        return DecimalTimeLength(_to_decimal(other) / self._seconds)
 
     def __itruediv__(
         self, other: Union["TimeStamp", "TimeLength", int, float, Decimal]
     ) -> "DecimalTimeLength":
-        self._seconds /= Decimal(str(other))
+        self._seconds /= _to_decimal(other)
         return self
 
     def __floordiv__(self, other: Union["TimeStamp", "TimeLength", int, float, Decimal]) -> int:
         if isinstance(other, DecimalTimeLength):
             return int(self._seconds // other._seconds)
-        return int(self._seconds // Decimal(str(other)))
+        return int(self._seconds // _to_decimal(other))
 
     def __rfloordiv__(self, other: Union["TimeStamp", "TimeLength", int, float, Decimal]) -> int:
-        return int(Decimal(str(other)) // self._seconds)
+        return int(_to_decimal(other) // self._seconds)
 
     def __ifloordiv__(self, other: Union["TimeStamp", "TimeLength", int, float, Decimal]) -> int:
-        self._seconds //= Decimal(str(other))
+        self._seconds //= _to_decimal(other)
         return int(self)
 
     def __mod__(self, other: Union["TimeStamp", "TimeLength", int, float, Decimal]) -> int:
         if isinstance(other, DecimalTimeLength):
             return int(self._seconds % other._seconds)
-        return int(self._seconds % Decimal(str(other)))
+        return int(self._seconds % _to_decimal(other))
 
     def __rmod__(self, other: Union["TimeStamp", "TimeLength", int, float, Decimal]) -> int:
-        return int(Decimal(str(other)) % self._seconds)
+        return int(_to_decimal(other) % self._seconds)
 
     def __imod__(self, other: Union["TimeStamp", "TimeLength", int, float, Decimal]) -> int:
-        self._seconds %= Decimal(str(other))
+        self._seconds %= _to_decimal(other)
         return int(self)
 
     # Unary operations
@@ -420,28 +433,28 @@ class DecimalTimeLength:
     def __lt__(self, other: Union["TimeLength", int, float, Decimal]) -> bool:
         if isinstance(other, DecimalTimeLength):
             return bool(self._seconds < other._seconds)
-        return bool(self._seconds < Decimal(str(other)))
+        return bool(self._seconds < _to_decimal(other))
 
     def __le__(self, other: Union["TimeLength", int, float, Decimal]) -> bool:
         if isinstance(other, DecimalTimeLength):
             return bool(self._seconds <= other._seconds)
-        return bool(self._seconds <= Decimal(str(other)))
+        return bool(self._seconds <= _to_decimal(other))
 
     def __gt__(self, other: Union["TimeLength", int, float, Decimal]) -> bool:
         if isinstance(other, DecimalTimeLength):
             return bool(self._seconds > other._seconds)
-        return bool(self._seconds > Decimal(str(other)))
+        return bool(self._seconds > _to_decimal(other))
 
     def __ge__(self, other: Union["TimeLength", int, float, Decimal]) -> bool:
         if isinstance(other, DecimalTimeLength):
             return bool(self._seconds >= other._seconds)
-        return bool(self._seconds >= Decimal(str(other)))
+        return bool(self._seconds >= _to_decimal(other))
 
     def __eq__(self, other: object) -> bool:
         if isinstance(other, DecimalTimeLength):
             return bool(self._seconds == other._seconds)
         if isinstance(other, (int, float, Decimal)):
-            return bool(self._seconds == Decimal(str(other)))
+            return bool(self._seconds == _to_decimal(other))
         return NotImplemented
 
     def __str__(self) -> str:
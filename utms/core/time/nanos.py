@@ -0,0 +1,374 @@
+import time
+from datetime import date, datetime, timedelta, timezone
+from decimal import MAX_EMAX, MAX_PREC, MIN_EMIN, Context, Decimal
+from typing import Any, Optional, Tuple, Union
+
+from utms.utms_types.base.protocols import TimeStamp
+
+from .decimal import DecimalTimeLength, DecimalTimeStamp
+
+NANOS_PER_SECOND = 10**9
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+# Scaling by powers of ten in this context never rounds.
+_EXACT = Context(prec=MAX_PREC, Emax=MAX_EMAX, Emin=MIN_EMIN)
+
+# A value is either a whole number of nanoseconds (ns, None) or, when it needs
+# more precision than that, Decimal seconds (None, seconds).
+_Parts = Tuple[Optional[int], Optional[Decimal]]
+
+
+def _from_decimal(seconds: Decimal) -> _Parts:
+    if seconds.is_finite():
+        if seconds.as_tuple().exponent >= -9:
+            return int(seconds.scaleb(9, _EXACT)), None
+        scaled = seconds.scaleb(9, _EXACT)
+        if scaled == scaled.to_integral_value():
+            return int(scaled), None
+    return None, seconds
+
+
+def _datetime_ns(value: datetime) -> int:
+    if value.tzinfo is None:
+        value = value.astimezone()
+    delta = value - EPOCH
+    return (delta.days * 86400 + delta.seconds) * NANOS_PER_SECOND + delta.microseconds * 1000
+
+
+def _parts(value: Any) -> _Parts:
+    """Split an operand into nanoseconds or Decimal seconds."""
+    if isinstance(value, _NanoSeconds):
+        return value._ns, value._dec
+    if type(value) is int:
+        return value * NANOS_PER_SECOND, None
+    if isinstance(value, DecimalTimeStamp):
+        return _from_decimal(value._value)
+    if isinstance(value, DecimalTimeLength):
+        return _from_decimal(value._seconds)
+    if isinstance(value, float):
+        if value.is_integer():
+            return int(value) * NANOS_PER_SECOND, None
+        # Same digits as the Decimal types take from str().
+        digits = repr(value)
+        whole, _, fraction = digits.partition(".")
+        if "e" in digits or "n" in digits or len(fraction) > 9:
+            return _from_decimal(Decimal(digits))
+        ns = abs(int(whole)) * NANOS_PER_SECOND + int(fraction.ljust(9, "0"))
+        return (-ns if digits[0] == "-" else ns), None
+    if isinstance(value, datetime):
+        return _datetime_ns(value), None
+    if isinstance(value, Decimal):
+        return _from_decimal(value)
+    return _from_decimal(Decimal(str(value)))
+
+
+def _decimal(parts: _Parts) -> Decimal:
+    ns, seconds = parts
+    if seconds is None:
+        return Decimal(ns).scaleb(-9, _EXACT)
+    return seconds
+
+
+def _trunc_div(a: int, b: int) -> int:
+    """a / b truncated toward zero, as Decimal's // does."""
+    quotient = abs(a) // abs(b)
+    return quotient if (a < 0) == (b < 0) else -quotient
+
+
+def _add(a: _Parts, b: _Parts) -> _Parts:
+    if a[0] is not None and b[0] is not None:
+        return a[0] + b[0], None
+    return _from_decimal(_decimal(a) + _decimal(b))
+
+
+def _sub(a: _Parts, b: _Parts) -> _Parts:
+    if a[0] is not None and b[0] is not None:
+        return a[0] - b[0], None
+    return _from_decimal(_decimal(a) - _decimal(b))
+
+
+def _mul(a: _Parts, b: _Parts) -> _Parts:
+    if a[0] is not None and b[0] is not None:
+        ns, remainder = divmod(a[0] * b[0], NANOS_PER_SECOND)
+        if not remainder:
+            return ns, None
+    return _from_decimal(_decimal(a) * _decimal(b))
+
+
+def _div(a: _Parts, b: _Parts) -> _Parts:
+    if a[0] is not None and b[0]:
+        ns, remainder = divmod(a[0] * NANOS_PER_SECOND, b[0])
+        if not remainder:
+            return ns, None
+    return _from_decimal(_decimal(a) / _decimal(b))
+
+
+def _floordiv(a: _Parts, b: _Parts) -> int:
+    if a[0] is not None and b[0]:
+        return _trunc_div(a[0], b[0])
+    return int(_decimal(a) // _decimal(b))
+
+
+def _mod(a: _Parts, b: _Parts) -> int:
+    if a[0] is not None and b[0]:
+        remainder = abs(a[0]) % abs(b[0])
+        return _trunc_div(-remainder if a[0] < 0 else remainder, NANOS_PER_SECOND)
+    return int(_decimal(a) % _decimal(b))
+
+
+def _compare(a: _Parts, b: _Parts) -> int:
+    if a[0] is not None and b[0] is not None:
+        left, right = a[0], b[0]
+    else:
+        left, right = _decimal(a), _decimal(b)
+    return (left > right) - (left < right)
+
+
+class _NanoSeconds:
+    """
+    Seconds stored as an int count of nanoseconds.
+
+    Values that need more than nanosecond precision, such as the results of
+    inexact division, are kept as Decimal seconds instead, and arithmetic on
+    them follows the Decimal types.
+    """
+
+    __slots__ = ("_ns", "_dec")
+
+    def __init__(self, value: Union[int, float, Decimal, datetime, "_NanoSeconds"]) -> None:
+        self._ns: Optional[int]
+        self._dec: Optional[Decimal]
+        self._ns, self._dec = _parts(value)
+
+    @classmethod
+    def _from_parts(cls, parts: _Parts) -> Any:
+        instance = cls.__new__(cls)
+        instance._ns, instance._dec = parts
+        return instance
+
+    @property
+    def nanoseconds(self) -> int:
+        """The value in whole nanoseconds, truncated if it is more precise."""
+        if self._ns is not None:
+            return self._ns
+        return int(self._dec.scaleb(9, _EXACT))
+
+    def to_decimal(self) -> Decimal:
+        """The value in seconds as a Decimal."""
+        return _decimal((self._ns, self._dec))
+
+    def __float__(self) -> float:
+        if self._ns is not None:
+            return self._ns / NANOS_PER_SECOND
+        return float(self._dec)
+
+    def __int__(self) -> int:
+        if self._ns is not None:
+            return _trunc_div(self._ns, NANOS_PER_SECOND)
+        return int(self._dec)
+
+    def __floordiv__(self, other: Any) -> int:
+        return _floordiv((self._ns, self._dec), _parts(other))
+
+    def __rfloordiv__(self, other: Any) -> int:
+        return _floordiv(_parts(other), (self._ns, self._dec))
+
+    def __mod__(self, other: Any) -> int:
+        return _mod((self._ns, self._dec), _parts(other))
+
+    def __rmod__(self, other: Any) -> int:
+        return _mod(_parts(other), (self._ns, self._dec))
+
+    __ifloordiv__ = __floordiv__
+    __imod__ = __mod__
+
+    def __lt__(self, other: Any) -> bool:
+        if isinstance(other, _NanoSeconds) and self._ns is not None and other._ns is not None:
+            return self._ns < other._ns
+        return _compare((self._ns, self._dec), _parts(other)) < 0
+
+    def __le__(self, other: Any) -> bool:
+        if isinstance(other, _NanoSeconds) and self._ns is not None and other._ns is not None:
+            return self._ns <= other._ns
+        return _compare((self._ns, self._dec), _parts(other)) <= 0
+
+    def __gt__(self, other: Any) -> bool:
+        if isinstance(other, _NanoSeconds) and self._ns is not None and other._ns is not None:
+            return self._ns > other._ns
+        return _compare((self._ns, self._dec), _parts(other)) > 0
+
+    def __ge__(self, other: Any) -> bool:
+        if isinstance(other, _NanoSeconds) and self._ns is not None and other._ns is not None:
+            return self._ns >= other._ns
+        return _compare((self._ns, self._dec), _parts(other)) >= 0
+
+    def __str__(self) -> str:
+        if self._ns is None:
+            return str(self._dec)
+        whole, fraction = divmod(abs(self._ns), NANOS_PER_SECOND)
+        sign = "-" if self._ns < 0 else ""
+        if not fraction:
+            return f"{sign}{whole}"
+        return f"{sign}{whole}.{fraction:09d}".rstrip("0")
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self})"
+
+
+class NanoTimeStamp(_NanoSeconds, TimeStamp):
+    """
+    Implementation of TimeStamp on int nanoseconds, for hot paths where the
+    Decimal arithmetic of DecimalTimeStamp dominates.
+    """
+
+    __slots__ = ()
+
+    def copy(self) -> "NanoTimeStamp":
+        """Create a new instance with the same value."""
+        return NanoTimeStamp._from_parts((self._ns, self._dec))
+
+    @classmethod
+    def now(cls) -> "NanoTimeStamp":
+        return cls._from_parts((time.time_ns(), None))
+
+    def to_gregorian(self) -> Optional[datetime]:
+        try:
+            return datetime.fromtimestamp(float(self), tz=timezone.utc)
+        except (ValueError, OSError, OverflowError):
+            return None
+
+    def is_same_day(self, other: "NanoTimeStamp") -> bool:
+        """Check if two timestamps are on the same day"""
+        return self.date() == datetime.fromtimestamp(float(other)).date()
+
+    def date(self) -> date:
+        """Get the date part of the timestamp"""
+        return datetime.fromtimestamp(float(self)).date()
+
+    def __add__(self, other: Any) -> "NanoTimeStamp":
+        return NanoTimeStamp._from_parts(_add((self._ns, self._dec), _parts(other)))
+
+    def __radd__(self, other: Any) -> "NanoTimeStamp":
+        return NanoTimeStamp._from_parts(_add(_parts(other), (self._ns, self._dec)))
+
+    def __sub__(self, other: Any) -> "NanoTimeStamp":
+        return NanoTimeStamp._from_parts(_sub((self._ns, self._dec), _parts(other)))
+
+    def __rsub__(self, other: Any) -> "NanoTimeStamp":
+        return NanoTimeStamp._from_parts(_sub(_parts(other), (self._ns, self._dec)))
+
+    def __mul__(self, other: Any) -> "NanoTimeLength":
+        return NanoTimeLength._from_parts(_mul((self._ns, self._dec), _parts(other)))
+
+    def __rmul__(self, other: Any) -> "NanoTimeLength":
+        return NanoTimeLength._from_parts(_mul(_parts(other), (self._ns, self._dec)))
+
+    def __truediv__(self, other: Any) -> "NanoTimeLength":
+        return NanoTimeLength._from_parts(_div((self._ns, self._dec), _parts(other)))
+
+    def __rtruediv__(self, other: Any) -> "NanoTimeLength":
+        return NanoTimeLength._from_parts(_div(_parts(other), (self._ns, self._dec)))
+
+    # Instances are immutable; the in-place operators rebind.
+    __iadd__ = __add__
+    __isub__ = __sub__
+    __imul__ = __mul__
+    __itruediv__ = __truediv__
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, NanoTimeStamp) and self._ns is not None and other._ns is not None:
+            return self._ns == other._ns
+        if isinstance(other, (NanoTimeStamp, DecimalTimeStamp, int, float, Decimal)):
+            return _compare((self._ns, self._dec), _parts(other)) == 0
+        return NotImplemented
+
+    def __neg__(self) -> "NanoTimeStamp":
+        return NanoTimeStamp._from_parts(_sub((0, None), (self._ns, self._dec)))
+
+    def __pos__(self) -> "NanoTimeStamp":
+        return self.copy()
+
+    def __abs__(self) -> "NanoTimeStamp":
+        return -self if self < 0 else self.copy()
+
+    def __round__(self, ndigits: Optional[int] = None) -> "NanoTimeStamp":
+        value = self.to_decimal()
+        return NanoTimeStamp(round(value, ndigits) if ndigits is not None else round(value))
+
+
+class NanoTimeLength(_NanoSeconds):
+    """Implementation of TimeLength on int nanoseconds, see NanoTimeStamp."""
+
+    __slots__ = ()
+
+    def copy(self) -> "NanoTimeLength":
+        """Create a new instance with the same value."""
+        return NanoTimeLength._from_parts((self._ns, self._dec))
+
+    def to_timedelta(self) -> timedelta:
+        """Converts the value to a datetime.timedelta object."""
+        return timedelta(seconds=float(self))
+
+    @staticmethod
+    def _result_type(other: Any) -> type:
+        """A length combined with a timestamp gives a timestamp, otherwise a length."""
+        if isinstance(other, (NanoTimeStamp, DecimalTimeStamp)):
+            return NanoTimeStamp
+        return NanoTimeLength
+
+    def __add__(self, other: Any) -> Union[NanoTimeStamp, "NanoTimeLength"]:
+        result_type = self._result_type(other)
+        return result_type._from_parts(_add((self._ns, self._dec), _parts(other)))
+
+    def __radd__(self, other: Any) -> Union[NanoTimeStamp, "NanoTimeLength"]:
+        result_type = self._result_type(other)
+        return result_type._from_parts(_add(_parts(other), (self._ns, self._dec)))
+
+    def __sub__(self, other: Any) -> Union[NanoTimeStamp, "NanoTimeLength"]:
+        result_type = self._result_type(other)
+        return result_type._from_parts(_sub((self._ns, self._dec), _parts(other)))
+
+    def __rsub__(self, other: Any) -> "NanoTimeLength":
+        return NanoTimeLength._from_parts(_sub(_parts(other), (self._ns, self._dec)))
+
+    def __mul__(self, other: Any) -> "NanoTimeLength":
+        if type(other) is int and self._ns is not None:
+            return NanoTimeLength._from_parts((self._ns * other, None))
+        return NanoTimeLength._from_parts(_mul((self._ns, self._dec), _parts(other)))
+
+    def __rmul__(self, other: Any) -> "NanoTimeLength":
+        if type(other) is int and self._ns is not None:
+            return NanoTimeLength._from_parts((other * self._ns, None))
+        return NanoTimeLength._from_parts(_mul(_parts(other), (self._ns, self._dec)))
+
+    def __truediv__(self, other: Any) -> "NanoTimeLength":
+        return NanoTimeLength._from_parts(_div((self._ns, self._dec), _parts(other)))
+
+    def __rtruediv__(self, other: Any) -> "NanoTimeLength":
+        return NanoTimeLength._from_parts(_div(_parts(other), (self._ns, self._dec)))
+
+    # Instances are immutable; the in-place operators rebind.
+    __iadd__ = __add__
+    __isub__ = __sub__
+    __imul__ = __mul__
+    __itruediv__ = __truediv__
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, NanoTimeLength) and self._ns is not None and other._ns is not None:
+            return self._ns == other._ns
+        if isinstance(other, (NanoTimeLength, DecimalTimeLength, int, float, Decimal)):
+            return _compare((self._ns, self._dec), _parts(other)) == 0
+        return NotImplemented
+
+    def __neg__(self) -> "NanoTimeLength":
+        return NanoTimeLength._from_parts(_sub((0, None), (self._ns, self._dec)))
+
+    def __pos__(self) -> "NanoTimeLength":
+        return self.copy()
+
+    def __abs__(self) -> "NanoTimeLength":
+        return -self if self < 0 else self.copy()
+
+    def __round__(self, ndigits: Optional[int] = None) -> "NanoTimeLength":
+        value = self.to_decimal()
+        return NanoTimeLength(round(value, ndigits) if ndigits is not None else round(value))
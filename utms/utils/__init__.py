@@ -14,5 +14,5 @@ from .display import (
     print_parsed_date,
     print_row,
 )
-from .filesystem import sanitize_filename
+from .filesystem import fsync_directory, sanitize_filename, write_file_atomically
 from .hytools import format_hy_value, hy_to_python, list_to_dict, python_to_hy, py_list_to_hy_expression, python_to_hy_model, hy_model_to_python
@@ -1 +1 @@
-from .filesystem import sanitize_filename
+from .filesystem import fsync_directory, sanitize_filename, write_file_atomically
@@ -1,6 +1,13 @@
+import os
 import re
+import tempfile
 import unicodedata
 
+# Read once at import: os.umask() can only be read by setting it, which would
+# briefly change it for every thread of the process.
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
 
 def sanitize_filename(filename: str, replacement: str = "_") -> str:
     """
@@ -48,3 +55,50 @@ def sanitize_filename(filename: str, replacement: str = "_") -> str:
             filename = filename[:max_len]
 
     return filename if filename else "default_sanitized"
+
+
+def write_file_atomically(path: str, content: str, encoding: str = "utf-8") -> None:
+    """
+    Replaces the contents of `path` so that readers, and the file after a crash,
+    see either the old or the new contents in full, never a truncated mix.
+
+    Writes to a temporary file in the same directory, syncs it to disk,
+    renames it over `path` and syncs the directory.
+    """
+    directory = os.path.dirname(path) or "."
+    fd, temp_path = tempfile.mkstemp(
+        dir=directory, prefix=f".{os.path.basename(path)}.", suffix=".tmp"
+    )
+    try:
+        with os.fdopen(fd, "w", encoding=encoding) as f:
+            f.write(content)
+            f.flush()
+            os.fsync(f.fileno())
+        try:
+            mode = os.stat(path).st_mode & 0o7777
+        except FileNotFoundError:
+            mode = 0o666 & ~_UMASK
+        os.chmod(temp_path, mode)
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    fsync_directory(directory)
+
+
+def fsync_directory(directory: str) -> None:
+    """
+    Sync a directory's entries to disk, so that a file renamed into it is
+    still there after a crash. A no-op where directories cannot be opened.
+    """
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
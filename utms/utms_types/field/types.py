@@ -1,5 +1,6 @@
 from datetime import datetime
 import json
+import weakref
 from decimal import Decimal
 from enum import Enum
 from typing import Any, Dict, List, Optional, Union
@@ -49,11 +50,147 @@ class FieldType(Enum):
         return self.value
 
 
+class AttributeDescriptor:
+    """
+    The schema metadata of a TypedValue: its type, item type, enum choices and
+    what it references.
+
+    Descriptors are immutable and interned, so every value of one attribute (say,
+    the `status` of all of a user's tasks) points at a single shared instance
+    instead of carrying its own copy. Build them with `AttributeDescriptor.of()`.
+    The intern table holds them weakly: a descriptor no value uses any more is
+    dropped from it.
+    """
+
+    _FIELDS = (
+        "field_type",
+        "item_type",
+        "enum_choices",
+        "item_schema_type",
+        "referenced_entity_type",
+        "referenced_entity_category",
+    )
+    __slots__ = _FIELDS + ("__weakref__",)
+
+    _interned: "weakref.WeakValueDictionary[tuple, AttributeDescriptor]" = (
+        weakref.WeakValueDictionary()
+    )
+
+    @classmethod
+    def of(
+        cls,
+        field_type: Optional[Union[FieldType, str]],
+        item_type: Optional[Union[FieldType, str]] = None,
+        enum_choices: Optional[List[Any]] = None,
+        item_schema_type: Optional[str] = None,
+        referenced_entity_type: Optional[str] = None,
+        referenced_entity_category: Optional[str] = None,
+    ) -> "AttributeDescriptor":
+        if isinstance(field_type, str):
+            field_type = FieldType.from_string(field_type)
+        if item_type and isinstance(item_type, str):
+            item_type = FieldType.from_string(item_type)
+        fields = (
+            field_type,
+            item_type,
+            tuple(enum_choices or ()),
+            item_schema_type,
+            referenced_entity_type,
+            referenced_entity_category,
+        )
+        # Equal values of different types (a hy String and a str, 1 and True)
+        # must not share a descriptor, so the key includes the types.
+        key = (
+            fields[:2]
+            + (tuple((type(choice), choice) for choice in fields[2]),)
+            + tuple((type(value), value) for value in fields[3:])
+        )
+        try:
+            return cls._interned[key]
+        except KeyError:
+            pass
+        except TypeError:
+            # Unhashable enum choices; such a descriptor just isn't shared.
+            return cls(*fields)
+        return cls._interned.setdefault(key, cls(*fields))
+
+    def __init__(
+        self,
+        field_type: FieldType,
+        item_type: Optional[FieldType],
+        enum_choices: tuple,
+        item_schema_type: Optional[str],
+        referenced_entity_type: Optional[str],
+        referenced_entity_category: Optional[str],
+    ):
+        set_slot = object.__setattr__
+        set_slot(self, "field_type", field_type)
+        set_slot(self, "item_type", item_type)
+        set_slot(self, "enum_choices", enum_choices)
+        set_slot(self, "item_schema_type", item_schema_type)
+        set_slot(self, "referenced_entity_type", referenced_entity_type)
+        set_slot(self, "referenced_entity_category", referenced_entity_category)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"AttributeDescriptor is immutable; use replace() to change '{name}'")
+
+    def _fields(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self._FIELDS}
+
+    def replace(self, **changes: Any) -> "AttributeDescriptor":
+        """Returns the (interned) descriptor with `changes` applied."""
+        return self.of(**{**self._fields(), **changes})
+
+    def __reduce__(self):
+        # Unpickled descriptors go through the intern table as well.
+        return (_descriptor_from_fields, (self._fields(),))
+
+    def __repr__(self) -> str:
+        return f"AttributeDescriptor({self._fields()})"
+
+
+def _descriptor_from_fields(fields: Dict[str, Any]) -> AttributeDescriptor:
+    return AttributeDescriptor.of(**fields)
+
+
+def _descriptor_property(name: str) -> property:
+    def getter(self: "TypedValue") -> Any:
+        return getattr(self.descriptor, name)
+
+    def setter(self: "TypedValue", value: Any) -> None:
+        self.descriptor = self.descriptor.replace(**{name: value})
+
+    return property(getter, setter, doc=f"The `{name}` of this value's AttributeDescriptor.")
+
+
 class TypedValue:
+    """
+    A value together with the schema type it is coerced to.
+
+    Schema metadata lives on a shared `AttributeDescriptor`; the properties below
+    keep the old per-value attribute names working.
+    """
+
+    __slots__ = ("descriptor", "is_dynamic", "_value", "original")
+
+    field_type = _descriptor_property("field_type")
+    item_type = _descriptor_property("item_type")
+    item_schema_type = _descriptor_property("item_schema_type")
+    referenced_entity_type = _descriptor_property("referenced_entity_type")
+    referenced_entity_category = _descriptor_property("referenced_entity_category")
+
+    @property
+    def enum_choices(self) -> List[Any]:
+        return list(self.descriptor.enum_choices)
+
+    @enum_choices.setter
+    def enum_choices(self, choices: Optional[List[Any]]) -> None:
+        self.descriptor = self.descriptor.replace(enum_choices=choices)
+
     def __init__(
         self,
         value: Any,
-        field_type: Union[FieldType, str],
+        field_type: Optional[Union[FieldType, str]] = None,
         item_type: Optional[Union[FieldType, str]] = None,
         is_dynamic: bool = False,
         original: Optional[str] = None,
@@ -61,23 +198,29 @@ class TypedValue:
         item_schema_type: Optional[str] = None,
         referenced_entity_type: Optional[str] = None,
         referenced_entity_category: Optional[str] = None,
+        descriptor: Optional[AttributeDescriptor] = None,
     ):
         """
         Initializes a TypedValue, enforcing a clean two-step process:
         1. Normalize the input from any format into a rich Python object.
         2. Coerce that Python object into the specified FieldType.
-        """
-        if isinstance(field_type, str): self.field_type = FieldType.from_string(field_type)
-        else: self.field_type = field_type
-
-        if item_type and isinstance(item_type, str): self.item_type = FieldType.from_string(item_type)
-        else: self.item_type = item_type
 
+        Callers that build many values of one attribute pass its `descriptor`
+        instead of the schema fields, which are then ignored.
+        """
+        if descriptor is None:
+            if field_type is None:
+                raise ValueError("TypedValue needs a field_type or a descriptor")
+            descriptor = AttributeDescriptor.of(
+                field_type=field_type,
+                item_type=item_type,
+                enum_choices=enum_choices,
+                item_schema_type=item_schema_type,
+                referenced_entity_type=referenced_entity_type,
+                referenced_entity_category=referenced_entity_category,
+            )
+        self.descriptor = descriptor
         self.is_dynamic = is_dynamic
-        self.enum_choices = enum_choices or []
-        self.item_schema_type = item_schema_type
-        self.referenced_entity_type = referenced_entity_type
-        self.referenced_entity_category = referenced_entity_category
 
         if self.is_dynamic or self.field_type in (FieldType.CODE, FieldType.ACTION):
             self._value = value
@@ -131,8 +274,9 @@ class TypedValue:
                 if isinstance(py_value, dict): return py_value
                 return {'value': py_value}
             elif self.field_type == FieldType.ENUM:
-                if self.enum_choices and py_value in self.enum_choices: return py_value
-                return self.enum_choices[0] if self.enum_choices else None
+                choices = self.descriptor.enum_choices
+                if choices and py_value in choices: return py_value
+                return choices[0] if choices else None
             elif self.field_type in [FieldType.CODE, FieldType.ACTION, FieldType.ENTITY_REFERENCE]:
                 return py_value
             else:
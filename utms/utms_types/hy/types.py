@@ -1,8 +1,9 @@
 import uuid
+from collections import deque
 from dataclasses import dataclass, field
 from datetime import datetime
 from decimal import Decimal
-from typing import Any, Callable
+from typing import Any, Callable, Deque
 from typing import Dict
 from typing import Dict as PyDict
 from typing import List
@@ -82,6 +83,11 @@ PropertyDict: TypeAlias = Dict[str, PropertyValue]
 NamesList: TypeAlias = Optional[Union[HyList, PyList[str]]]
 
 
+# Evaluation records kept per dynamic expression unless configured otherwise;
+# older evaluations only count towards the aggregate counters.
+DEFAULT_HISTORY_SIZE = 16
+
+
 @dataclass
 class EvaluationRecord:
     """
@@ -93,6 +99,7 @@ class EvaluationRecord:
         original_expr: The expression used for this specific evaluation
         record_id: Unique identifier for the record
         metadata: Additional context or metadata about the evaluation
+        duration: Seconds the evaluation took, if measured
     """
 
     value: Any
@@ -100,6 +107,15 @@ class EvaluationRecord:
     original_expr: Optional[Any] = None
     record_id: str = field(default_factory=lambda: str(uuid.uuid4()))
     metadata: dict = field(default_factory=dict)
+    duration: Optional[float] = None
+
+    @property
+    def is_error(self) -> bool:
+        return "error_type" in self.metadata
+
+
+def _history_deque(records: Any = (), max_history: Optional[int] = DEFAULT_HISTORY_SIZE) -> Deque:
+    return deque(records, maxlen=max_history)
 
 
 @dataclass
@@ -107,37 +123,62 @@ class DynamicExpressionInfo:
     """
     Comprehensive tracking of a dynamic expression's lifecycle
 
+    Only the last `max_history` evaluations are kept as records (None keeps
+    them all); the counters cover every evaluation since the expression was
+    first tracked.
+
     Attributes:
         original: The original, base dynamic expression
         is_dynamic: Whether the expression is considered dynamic
-        history: List of evaluation records
+        history: The most recent evaluation records, oldest first
         created_at: When the dynamic expression was first tracked
-        last_evaluated: Timestamp of the most recent evaluation
         evaluation_count: Number of times the expression has been evaluated
+        error_count: Number of those evaluations that failed
+        total_duration: Seconds spent in the evaluations that were timed
+        max_duration: Longest timed evaluation, in seconds
+        last_evaluated: Timestamp of the most recent evaluation
     """
 
     original: Any
     is_dynamic: bool = True
-    history: List[EvaluationRecord] = field(default_factory=list)
+    history: Deque[EvaluationRecord] = field(default_factory=_history_deque)
     created_at: datetime = field(default_factory=datetime.now)
+    evaluation_count: int = 0
+    error_count: int = 0
+    timed_count: int = 0
+    total_duration: float = 0.0
+    max_duration: float = 0.0
+    last_evaluated: Optional[datetime] = None
+
+    def __post_init__(self):
+        if not isinstance(self.history, deque):
+            self.history = _history_deque(self.history)
 
     @property
-    def last_evaluated(self) -> Optional[datetime]:
-        """Get the timestamp of the most recent evaluation"""
-        return self.history[-1].timestamp if self.history else None
+    def max_history(self) -> Optional[int]:
+        return self.history.maxlen
 
     @property
-    def evaluation_count(self) -> int:
-        """Get the total number of evaluations"""
-        return len(self.history)
+    def mean_duration(self) -> Optional[float]:
+        """Mean seconds per timed evaluation"""
+        return self.total_duration / self.timed_count if self.timed_count else None
 
     @property
     def latest_value(self) -> Optional[Any]:
         """Get the most recently evaluated value"""
         return self.history[-1].value if self.history else None
 
+    def set_max_history(self, max_history: Optional[int]) -> None:
+        """Keep at most `max_history` records from now on, dropping the oldest"""
+        if max_history != self.history.maxlen:
+            self.history = _history_deque(self.history, max_history)
+
     def add_evaluation(
-        self, value: Any, original_expr: Optional[Any] = None, metadata: Optional[dict] = None
+        self,
+        value: Any,
+        original_expr: Optional[Any] = None,
+        metadata: Optional[dict] = None,
+        duration: Optional[float] = None,
     ) -> EvaluationRecord:
         """
         Add a new evaluation to the expression's history
@@ -146,16 +187,59 @@ class DynamicExpressionInfo:
             value: The resolved value
             original_expr: Optional specific expression used for this evaluation
             metadata: Optional additional context for the evaluation
+            duration: Optional seconds the evaluation took
 
         Returns:
             The created EvaluationRecord
         """
         record = EvaluationRecord(
-            value=value, original_expr=original_expr or self.original, metadata=metadata or {}
+            value=value,
+            original_expr=original_expr or self.original,
+            metadata=metadata or {},
+            duration=duration,
         )
         self.history.append(record)
+        self._count(record)
         return record
 
+    def _count(self, record: EvaluationRecord) -> None:
+        self.evaluation_count += 1
+        if record.is_error:
+            self.error_count += 1
+        if record.duration is not None:
+            self.timed_count += 1
+            self.total_duration += record.duration
+            self.max_duration = max(self.max_duration, record.duration)
+        if self.last_evaluated is None or record.timestamp >= self.last_evaluated:
+            self.last_evaluated = record.timestamp
+
+    def absorb(self, previous: "DynamicExpressionInfo") -> None:
+        """
+        Take over the counters and records of `previous`, an earlier info for
+        the same expression slot, as if its evaluations had been made here.
+        """
+        if previous is self:
+            return
+        self.created_at = min(self.created_at, previous.created_at)
+        self.evaluation_count += previous.evaluation_count
+        self.error_count += previous.error_count
+        self.timed_count += previous.timed_count
+        self.total_duration += previous.total_duration
+        self.max_duration = max(self.max_duration, previous.max_duration)
+        if previous.last_evaluated and (
+            self.last_evaluated is None or previous.last_evaluated > self.last_evaluated
+        ):
+            self.last_evaluated = previous.last_evaluated
+        self.history = _history_deque([*previous.history, *self.history], self.history.maxlen)
+
+    def expire(self, before: datetime) -> int:
+        """Drop the records made before `before`. Returns how many were dropped."""
+        kept = [record for record in self.history if record.timestamp >= before]
+        dropped = len(self.history) - len(kept)
+        if dropped:
+            self.history = _history_deque(kept, self.history.maxlen)
+        return dropped
+
     def get_evaluations_since(self, timestamp: datetime) -> List[EvaluationRecord]:
         """
         Retrieve evaluations that occurred after a specific timestamp
@@ -173,10 +257,21 @@ class DynamicExpressionInfo:
             f"DynamicExpressionInfo("
             f"original={self.original}, "
             f"is_dynamic={self.is_dynamic}, "
-            f"evaluations={len(self.history)}, "
+            f"evaluations={self.evaluation_count}, "
             f"last_evaluated={self.last_evaluated})"
         )
 
+    def stats(self) -> dict:
+        """Aggregate counters over every evaluation of the expression"""
+        return {
+            "evaluation_count": self.evaluation_count,
+            "error_count": self.error_count,
+            "mean_duration": self.mean_duration,
+            "max_duration": self.max_duration if self.timed_count else None,
+            "retained_records": len(self.history),
+            "max_history": self.max_history,
+        }
+
     def to_dict(self) -> dict:
         """
         Convert the DynamicExpressionInfo to a dictionary representation
@@ -190,6 +285,7 @@ class DynamicExpressionInfo:
             "last_evaluated": self.last_evaluated.isoformat() if self.last_evaluated else None,
             "evaluation_count": self.evaluation_count,
             "latest_value": self.latest_value,
+            "stats": self.stats(),
             "history": [
                 {
                     "record_id": record.record_id,
@@ -197,6 +293,7 @@ class DynamicExpressionInfo:
                     "timestamp": record.timestamp.isoformat(),
                     "original_expr": str(record.original_expr),
                     "metadata": record.metadata,
+                    "duration": record.duration,
                 }
                 for record in self.history
             ],
@@ -42,6 +42,10 @@ class Modifier:
 class Constraint:
     func: ConstraintFunc
     description: str
+    # Set by the pattern methods whose constraint is fully described by the
+    # RecurrenceSpec ("weekdays", "between", "except_between"); None for
+    # arbitrary functions.
+    kind: Optional[str] = None
 
 
 class RecurrencePatternProtocol(Protocol):
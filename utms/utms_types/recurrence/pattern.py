@@ -1,7 +1,8 @@
 # utms/utms_types/recurrence/pattern.py
 
+from bisect import bisect_left, bisect_right
 from datetime import datetime, time, timedelta, timezone
-from typing import Any, List, Optional, Union
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple, Union
 import pytz
 
 from utms.core.config.constants import (
@@ -20,6 +21,16 @@ from .base import (
     RecurrenceSpec,
 )
 
+MINUTES_IN_DAY = 24 * 60
+# How far ahead next_occurrence() looks before giving up.
+MAX_SEARCH_DAYS = 365
+
+
+def _minute_of_day(clock: str) -> int:
+    """Minutes since midnight of an "HH:MM" string, as parsed by `between()`."""
+    parts = list(map(int, str(clock).split(':')))
+    return parts[0] * 60 + parts[1]
+
 
 class RecurrencePattern:
     def __init__(self, units_provider: Optional[UnitManagerProtocol] = None):
@@ -31,6 +42,8 @@ class RecurrencePattern:
         self.parser = TimeExpressionParser(units_provider=units_provider)
         self.frequency_type: Optional[FrequencyType] = None
         self._original_interval: Optional[str] = None
+        # The (start, end) windows of except_between(), for next_occurrence().
+        self._except_windows: List[Tuple[str, str]] = []
 
     @classmethod
     def every(cls, interval: Union[str, DecimalTimeLength], units_provider: Optional[UnitManagerProtocol] = None) -> "RecurrencePattern":
@@ -67,7 +80,7 @@ class RecurrencePattern:
         def weekday_constraint(dt: datetime) -> bool:
             return dt.weekday() in weekdays
         
-        self.add_constraint(weekday_constraint, f"On days: {', '.join(days)}")
+        self.add_constraint(weekday_constraint, f"On days: {', '.join(days)}", kind="weekdays")
         return self
 
     def at(self, *times: str) -> "RecurrencePattern":
@@ -107,7 +120,7 @@ class RecurrencePattern:
             current_time = dt.time().replace(second=0, microsecond=0)
             return start_time_obj <= current_time < end_time_obj
         
-        self.add_constraint(range_constraint, f"Between {start} and {end}")
+        self.add_constraint(range_constraint, f"Between {start} and {end}", kind="between")
         return self
 
 
@@ -117,8 +130,122 @@ class RecurrencePattern:
             raise ValueError(f"Cannot convert from_time '{from_time}' to a valid datetime object.")
 
         start_dt_local = gregorian_time.astimezone(local_tz)
+        at_rules, at_times, interval_seconds = self._timing_rules()
 
-        # Extract at rules and times once
+        # Fast path for simple interval patterns with no constraints
+        if not self.constraints and not at_times and not at_rules and interval_seconds:
+            # Just add the interval
+            next_dt = start_dt_local + timedelta(seconds=interval_seconds)
+            return DecimalTimeStamp(next_dt)
+
+        solver = self._solver(at_rules, at_times, interval_seconds)
+        if solver is None:
+            return self._scan_next_occurrence(start_dt_local, at_times, at_rules, interval_seconds, local_tz)
+
+        start = start_dt_local.replace(tzinfo=None)
+        end_search = start + timedelta(days=MAX_SEARCH_DAYS)
+        # The scan tries a candidate only while the one before it is in range.
+        candidate = solver(start, end_search)
+        if candidate is None:
+            raise RuntimeError(f"Could not find a matching next occurrence for pattern '{self.label}' from {start_dt_local}")
+        return self._to_timestamp(candidate.replace(tzinfo=start_dt_local.tzinfo), local_tz)
+
+    def iter_occurrences(
+        self, start: DecimalTimeStamp, end: DecimalTimeStamp, local_tz: pytz.BaseTzInfo = pytz.utc
+    ) -> Iterator[DecimalTimeStamp]:
+        """
+        The occurrences after `start` and before `end`, in order: what calling
+        next_occurrence() from `start`, then from each result, gives, but
+        expanded in one pass over the pattern's schedule.
+
+        Each occurrence is at the wall-clock time of its own day in
+        `local_tz`, so a daily 09:00 stays at 09:00 across a DST change
+        (chained next_occurrence() calls keep the old UTC offset for the
+        first occurrence after it).
+        """
+        gregorian_time = start.to_gregorian()
+        if gregorian_time is None:
+            raise ValueError(f"Cannot convert start '{start}' to a valid datetime object.")
+        start_dt_local = gregorian_time.astimezone(local_tz)
+        at_rules, at_times, interval_seconds = self._timing_rules()
+
+        if not self.constraints and not at_times and not at_rules and interval_seconds:
+            step = timedelta(seconds=interval_seconds)
+            current = start_dt_local + step
+            while (occurrence := DecimalTimeStamp(current)) < end:
+                yield occurrence
+                current += step
+            return
+
+        solver = self._solver(at_rules, at_times, interval_seconds)
+        if solver is None:
+            occurrence = start
+            while True:
+                try:
+                    occurrence = self.next_occurrence(occurrence, local_tz=local_tz)
+                except RuntimeError:
+                    return
+                if not occurrence < end:
+                    return
+                yield occurrence
+
+        end_gregorian = end.to_gregorian()
+        if end_gregorian is None:
+            raise ValueError(f"Cannot convert end '{end}' to a valid datetime object.")
+        # Wall-clock bound past `end` in any UTC offset; the exact check is on the timestamps.
+        limit = end_gregorian.astimezone(local_tz).replace(tzinfo=None) + timedelta(days=1)
+        candidate = start_dt_local.replace(tzinfo=None)
+        while True:
+            candidate = solver(candidate, limit)
+            if candidate is None:
+                return
+            occurrence = DecimalTimeStamp(self._localize(candidate, local_tz))
+            if not occurrence < end:
+                return
+            yield occurrence
+
+    def occurrences_between(
+        self,
+        start: DecimalTimeStamp,
+        end: DecimalTimeStamp,
+        local_tz: pytz.BaseTzInfo = pytz.utc,
+        as_array: bool = False,
+    ) -> Union[List[DecimalTimeStamp], Any]:
+        """
+        All of `iter_occurrences()` as a list or, with `as_array`, as a NumPy
+        array of epoch seconds (that needs NumPy, from the `arrays` extra).
+        """
+        occurrences = self.iter_occurrences(start, end, local_tz)
+        if not as_array:
+            return list(occurrences)
+        try:
+            import numpy
+        except ImportError as e:
+            raise ImportError(
+                "occurrences_between(as_array=True) requires numpy; "
+                "install the 'arrays' extra: pip install utms[arrays]"
+            ) from e
+        return numpy.fromiter((float(occurrence) for occurrence in occurrences), dtype=numpy.float64)
+
+    def depends_on_start(self) -> bool:
+        """
+        Whether which times are occurrences depends on where the search
+        starts, as with intervals counted from the previous occurrence. If
+        not, the occurrences are a fixed set of times that any window can be
+        cut from.
+        """
+        at_rules, at_times, interval_seconds = self._timing_rules()
+        if self._solver(at_rules, at_times, interval_seconds) is None:
+            return True
+        if at_times and not interval_seconds:
+            # The at-time jumps skip an at-time one minute after a rejected one.
+            minutes = sorted({t.hour * 60 + t.minute for t in at_times})
+            adjacent = any(b - a == 1 for a, b in zip(minutes, minutes[1:]))
+            return adjacent or (minutes[0] == 0 and minutes[-1] == MINUTES_IN_DAY - 1)
+        return bool(interval_seconds) and not at_times and not at_rules
+
+    def _timing_rules(self) -> Tuple[Dict[str, Any], List[time], Optional[float]]:
+        """The at rules, the parsed at-times and the interval in seconds of the spec."""
         at_rules = dict(self.spec.at_args) if hasattr(self.spec, 'at_args') and self.spec.at_args else {}
         at_times = []
         if hasattr(self.spec, 'times') and self.spec.times:
@@ -128,18 +255,164 @@ class RecurrencePattern:
 
         # Get interval in seconds as a float
         interval_seconds = float(self.spec.interval._seconds) if self.spec.interval else None
+        return at_rules, at_times, interval_seconds
+
+    @staticmethod
+    def _localize(wall_time: datetime, local_tz: Any) -> datetime:
+        if hasattr(local_tz, "localize"):
+            return local_tz.normalize(local_tz.localize(wall_time))
+        return wall_time.replace(tzinfo=local_tz)
+
+    def _solver(
+        self, at_rules: Dict[str, Any], at_times: List[time], interval_seconds: Optional[float]
+    ) -> Optional[Any]:
+        """
+        A function `(after, limit) -> Optional[datetime]` giving the occurrence
+        that follows the naive wall-clock time `after`, if it is before
+        `limit`; None if the constraints need the minute scan.
+        """
+        schedule = self._daily_schedule(at_times, at_rules)
+        if schedule is None:
+            return None
+        if at_times and not interval_seconds:
+            # The scan jumps from one at-time to the next here; follow the same jumps.
+            if not all(t.second == 0 and t.microsecond == 0 and t.tzinfo is None for t in at_times):
+                return None
+            at_minutes = sorted({t.hour * 60 + t.minute for t in at_times})
+            return lambda after, limit: self._follow_at_times(after, at_minutes, schedule, limit)
+
+        wait = interval_seconds if interval_seconds and not at_times and not at_rules else None
+
+        def solve(after: datetime, limit: datetime) -> Optional[datetime]:
+            # The scan tries a minute only while the one before it is in range.
+            return self._first_scheduled(
+                self._earliest_after(after, wait), schedule, limit + timedelta(minutes=1)
+            )
 
-        # Fast path for simple interval patterns with no constraints
-        if not self.constraints and not at_times and not at_rules and interval_seconds:
-            # Just add the interval
-            next_dt = start_dt_local + timedelta(seconds=interval_seconds)
-            return DecimalTimeStamp(next_dt)
-
+        return solve
+
+    def _daily_schedule(
+        self, at_times: List[time], at_rules: Dict[str, Any]
+    ) -> Optional[Tuple[List[int], Optional[Set[int]]]]:
+        """
+        The minutes of the day at which the pattern may fire, sorted, and the
+        weekdays it is limited to (None for every day), worked out from the
+        spec. None if a constraint is an arbitrary function, or an `at` rule
+        is not on the time of day, so that candidates have to be tried.
+        """
+        kinds = [constraint.kind for constraint in self.constraints]
+        if None in kinds or kinds.count("weekdays") > 1 or kinds.count("between") > 1:
+            return None
+        if kinds.count("except_between") != len(self._except_windows):
+            return None
+
+        minutes: Any
+        if at_times:
+            minutes = {
+                t.hour * 60 + t.minute
+                for t in at_times
+                # Candidates are whole, naive minutes; anything else never matches.
+                if t.second == 0 and t.microsecond == 0 and t.tzinfo is None
+            }
+        elif at_rules:
+            if not set(at_rules) <= {"hour", "minute", "second"}:
+                return None
+            if at_rules.get("second", 0) != 0:
+                minutes = set()
+            else:
+                minutes = {
+                    hour * 60 + minute
+                    for hour in range(24)
+                    if hour == at_rules.get("hour", hour)
+                    for minute in range(60)
+                    if minute == at_rules.get("minute", minute)
+                }
+        else:
+            minutes = range(MINUTES_IN_DAY)
+
+        if "between" in kinds:
+            start, end = _minute_of_day(self.spec.start_time), _minute_of_day(self.spec.end_time)
+            minutes = [m for m in minutes if start <= m < end]
+        for except_start, except_end in self._except_windows:
+            start, end = _minute_of_day(except_start), _minute_of_day(except_end)
+            minutes = [m for m in minutes if not start <= m < end]
+
+        weekdays = set(self.spec.weekdays) if "weekdays" in kinds else None
+        return sorted(minutes), weekdays
+
+    @staticmethod
+    def _earliest_after(start: datetime, interval_seconds: Optional[float]) -> datetime:
+        """The first minute the scan would accept after `start`, `interval_seconds` on if given."""
+        earliest = start.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        if interval_seconds:
+            due = (start + timedelta(seconds=interval_seconds)).replace(second=0, microsecond=0)
+            while (due - start).total_seconds() < interval_seconds:
+                due += timedelta(minutes=1)
+            earliest = max(earliest, due)
+        return earliest
+
+    @staticmethod
+    def _first_scheduled(
+        earliest: datetime, schedule: Tuple[List[int], Optional[Set[int]]], limit: datetime
+    ) -> Optional[datetime]:
+        """
+        Jump straight to the first scheduled minute from `earliest` on, on an
+        allowed weekday, if it is before `limit`.
+        """
+        minutes, weekdays = schedule
+        day = earliest.date()
+        first_minute = earliest.hour * 60 + earliest.minute
+        while minutes and day <= limit.date():
+            if weekdays is None or day.weekday() in weekdays:
+                index = bisect_left(minutes, first_minute)
+                if index < len(minutes):
+                    candidate = datetime.combine(day, time(*divmod(minutes[index], 60)))
+                    return candidate if candidate < limit else None
+            day += timedelta(days=1)
+            first_minute = 0
+        return None
+
+    @staticmethod
+    def _follow_at_times(
+        visited: datetime,
+        at_minutes: List[int],
+        schedule: Tuple[List[int], Optional[Set[int]]],
+        limit: datetime,
+    ) -> Optional[datetime]:
+        """
+        Visit the at-times in the order the scan jumps to them (the first one
+        after the next minute, today or tomorrow) while the last one visited is
+        before `limit`, and return the first that is scheduled on an allowed
+        weekday.
+        """
+        minutes, weekdays = schedule
+        allowed = set(minutes)
+        while allowed and visited < limit:
+            after = visited.replace(second=0, microsecond=0) + timedelta(minutes=1)
+            index = bisect_right(at_minutes, after.hour * 60 + after.minute)
+            if index < len(at_minutes):
+                day, minute = after.date(), at_minutes[index]
+            else:
+                day, minute = after.date() + timedelta(days=1), at_minutes[0]
+            visited = datetime.combine(day, time(*divmod(minute, 60)))
+            if minute in allowed and (weekdays is None or day.weekday() in weekdays):
+                return visited
+        return None
+
+    def _scan_next_occurrence(
+        self,
+        start_dt_local: datetime,
+        at_times: List[time],
+        at_rules: Dict[str, Any],
+        interval_seconds: Optional[float],
+        local_tz: pytz.BaseTzInfo,
+    ) -> DecimalTimeStamp:
+        """Try candidate minutes one by one; for constraints only known as functions."""
         # For patterns with specific times or constraints, use smarter jumping
         candidate_dt = start_dt_local
 
         # Safety limit - but now we'll jump more efficiently
-        max_days = 365
+        max_days = MAX_SEARCH_DAYS
         end_search = start_dt_local + timedelta(days=max_days)
 
         # Track when we started for interval calculations
@@ -198,15 +471,19 @@ class RecurrencePattern:
                 is_trigger_time = True
 
             if is_trigger_time:
-                # Ensure proper timezone
-                if candidate_dt.tzinfo is None:
-                    candidate_dt = local_tz.localize(candidate_dt)
-                elif candidate_dt.tzinfo != local_tz:
-                    candidate_dt = candidate_dt.astimezone(local_tz)
-                return DecimalTimeStamp(candidate_dt)
+                return self._to_timestamp(candidate_dt, local_tz)
 
         raise RuntimeError(f"Could not find a matching next occurrence for pattern '{self.label}' from {start_dt_local}")
 
+    @staticmethod
+    def _to_timestamp(candidate_dt: datetime, local_tz: pytz.BaseTzInfo) -> DecimalTimeStamp:
+        # Ensure proper timezone
+        if candidate_dt.tzinfo is None:
+            candidate_dt = local_tz.localize(candidate_dt)
+        elif candidate_dt.tzinfo != local_tz:
+            candidate_dt = candidate_dt.astimezone(local_tz)
+        return DecimalTimeStamp(candidate_dt)
+
     def except_between(self, start: str, end: str) -> "RecurrencePattern":
         try:
             start_parts = list(map(int, start.split(':')))
@@ -220,11 +497,16 @@ class RecurrencePattern:
             if dt is None: return True
             return not (except_start <= dt.time().replace(second=0, microsecond=0) < except_end)
         
-        self.add_constraint(exclude_range_constraint, f"Except between {start} and {end}")
+        self._except_windows.append((start, end))
+        self.add_constraint(
+            exclude_range_constraint, f"Except between {start} and {end}", kind="except_between"
+        )
         return self
 
-    def add_constraint(self, func: ConstraintFunc, description: str) -> None:
-        self.constraints.append(Constraint(func, description))
+    def add_constraint(
+        self, func: ConstraintFunc, description: str, kind: Optional[str] = None
+    ) -> None:
+        self.constraints.append(Constraint(func, description, kind))
 
     def to_hy(self) -> HyNode:
         def make_property(name: str, value: Any, original: str = None) -> HyNode:
@@ -5,6 +5,7 @@ from typing import List, Dict, Any, Set
 import pytz
 
 from utms.core.config import UTMSConfig
+from utms.core.services.occurrences import occurrence_cache
 from utms.core.time import DecimalTimeStamp
 from utms.utms_types.field.types import FieldType
 from utms.web.dependencies import get_config
@@ -100,21 +101,18 @@ async def get_calendar_events(
                 continue
 
             try:
-                # Start searching from the beginning of the calendar view
-                current_ts = pattern.next_occurrence(from_time=start_ts - 86400, local_tz=local_tz)
-                
-                # Safety loop
-                while current_ts < end_ts:
-                    start_dt = current_ts.to_gregorian()
-                    
-                    # For patterns with a 'between' clause, we can calculate an end time
-                    end_dt = None
-                    if pattern.spec.start_time and pattern.spec.end_time:
-                        duration_start = datetime.strptime(pattern.spec.start_time, "%H:%M")
-                        duration_end = datetime.strptime(pattern.spec.end_time, "%H:%M")
-                        duration = duration_end - duration_start
-                        end_dt = start_dt + duration
-                    
+                # For patterns with a 'between' clause, we can calculate an end time
+                duration = None
+                if pattern.spec.start_time and pattern.spec.end_time:
+                    duration_start = datetime.strptime(pattern.spec.start_time, "%H:%M")
+                    duration_end = datetime.strptime(pattern.spec.end_time, "%H:%M")
+                    duration = duration_end - duration_start
+
+                # Start searching from the day before the calendar view
+                for occurrence_ts in occurrence_cache.occurrences(pattern, start_ts - 86400, end_ts, local_tz):
+                    start_dt = occurrence_ts.to_gregorian()
+                    end_dt = start_dt + duration if duration is not None else None
+
                     events.append(CalendarEvent(
                         id=f"{entity_id}:planned:{start_dt.isoformat()}",
                         title=f"{entity.name} (Planned)",
@@ -125,8 +123,6 @@ async def get_calendar_events(
                         textColor="#1565c0",
                         extendedProps={"entityId": entity_id, "type": "planned"}
                     ))
-                    
-                    current_ts = pattern.next_occurrence(from_time=current_ts, local_tz=local_tz)
 
             except (RuntimeError, ValueError) as e:
                 print(f"Could not calculate planned occurrences for {entity.name}: {e}")
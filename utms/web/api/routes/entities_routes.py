@@ -1,5 +1,6 @@
 import hy
-from typing import Any, Dict, List, Optional, Union
+from contextlib import ExitStack
+from typing import Any, Dict, Iterator, List, Optional, Union
 from datetime import datetime, timedelta
 
 from fastapi import APIRouter, Body, Depends, HTTPException, Query
@@ -8,6 +9,8 @@ from fastapi.responses import JSONResponse
 from utms.core.components.elements.entity import EntityComponent
 from utms.core.config import UTMSConfig
 from utms.core.logger import get_logger
+from utms.core.services.effects import effect_executor
+from utms.core.services.entity_cache import entity_component_cache
 from utms.utils import sanitize_filename
 from utms.core.time.parser import TimeExpressionParser
 from utms.core.time import DecimalTimeLength
@@ -30,29 +33,44 @@ logger = get_logger()
 def get_user_entity_component(
     main_config: UTMSConfig = Depends(get_config),
     current_user: CurrentUser = Depends(get_current_user),
-) -> EntityComponent:
+) -> Iterator[EntityComponent]:
     """
-    A FastAPI dependency that creates and loads an EntityComponent
-    scoped to the currently authenticated user for a single request.
+    A FastAPI dependency that provides the long-lived EntityComponent of the
+    currently authenticated user, refreshed against the files on disk. The
+    component is held for the whole request, so requests of the same user
+    are serialized.
     """
     username = current_user.username 
     if not username:
         raise HTTPException(status_code=500, detail="Username claim not found in token.")
-        
-    logger.debug(f"Creating request-scoped EntityComponent for user: {username}")
 
-    user_entity_component = EntityComponent(
-        config_dir=main_config.utms_dir,
-        component_manager=main_config._component_manager, 
-        username=username
+    config_component = main_config._component_manager.get("config")
+    entity_component_cache.configure(
+        max_users=config_component.get_config_value("entity-cache-max-users"),
+        max_memory_bytes=_megabytes_to_bytes(
+            config_component.get_config_value("entity-cache-max-memory-mb")
+        ),
     )
-    try:
-        user_entity_component.load()
-    except Exception as e:
-        logger.error(f"Failed to load entities component for user '{username}': {e}", exc_info=True)
-        raise HTTPException(status_code=500, detail="Failed to load user-specific entities data.")
-    
-    return user_entity_component
+
+    def create_component() -> EntityComponent:
+        logger.debug(f"Creating cached EntityComponent for user: {username}")
+        return EntityComponent(
+            config_dir=main_config.utms_dir,
+            component_manager=main_config._component_manager,
+            username=username,
+        )
+
+    with ExitStack() as stack:
+        try:
+            component = stack.enter_context(entity_component_cache.checkout(username, create_component))
+        except Exception as e:
+            logger.error(f"Failed to load entities component for user '{username}': {e}", exc_info=True)
+            raise HTTPException(status_code=500, detail="Failed to load user-specific entities data.")
+        yield component
+
+
+def _megabytes_to_bytes(value: Optional[Any]) -> Optional[int]:
+    return None if value is None else int(float(value) * 1024 * 1024)
 
 @router.get(
     "/api/entities/types",
@@ -70,6 +88,30 @@ async def get_entity_types_with_details_api(
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
 
+@router.get(
+    "/api/entities/dynamic-registry",
+    response_class=JSONResponse,
+    summary="Get the memory held by the evaluation history of dynamic expressions",
+)
+async def get_dynamic_registry_stats_api(
+    entities_component: EntityComponent = Depends(get_user_entity_component),
+):
+    try:
+        return entities_component._loader._dynamic_service.history_stats()
+    except Exception as e:
+        logger.error(f"Error fetching dynamic registry stats: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
+
+
+@router.get(
+    "/api/entities/effects",
+    response_class=JSONResponse,
+    summary="Get queue depth and latency of side-effecting Hy builtins and hooks",
+)
+async def get_effect_executor_stats_api():
+    return effect_executor.stats()
+
+
 @router.get(
     "/api/entities",
     response_class=JSONResponse,